@@ -0,0 +1,231 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that compares the throughput of the SpeedSentry and
+AsyncSpeedSentry classes against a local stand-in server.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import asyncio
+import concurrent.futures
+import time
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+import speedsentry
+import stand_in_server
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to compare the throughput of the
+synchronous and asyncio SpeedSentry clients.  Requests are issued against a
+local stand-in server that adds a fixed delay to every response to simulate
+network latency.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def run_sync(authority : str, number_requests : int, threads : int) -> float:
+    """
+    Function that issues requests using the synchronous client from a thread
+    pool, mimicking the use of run_in_executor.
+
+    :param authority:
+        The stand-in server authority.
+
+    :param number_requests:
+        The number of requests to issue.
+
+    :param threads:
+        The number of worker threads.
+
+    :return:
+        Returns the elapsed time, in seconds.
+
+    :type authority:       str
+    :type number_requests: int
+    :type threads:         int
+    :rtype:                float
+
+    """
+
+    with speedsentry.SpeedSentry(
+            customer_identifier = stand_in_server.CUSTOMER_IDENTIFIER,
+            customer_secret = stand_in_server.CUSTOMER_SECRET,
+            maximum_connections_per_host = threads,
+            authority = authority
+        ) as api:
+        api.status_list()
+
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(threads) as executor:
+            futures = [ executor.submit(api.status_list)
+                        for i in range(number_requests)
+                      ]
+            for future in futures:
+                future.result()
+
+        elapsed = time.perf_counter() - start
+
+    return elapsed
+
+
+async def run_async(
+    authority : str,
+    number_requests : int,
+    concurrency : int
+    ) -> float:
+    """
+    Coroutine that issues requests using the asyncio client.
+
+    :param authority:
+        The stand-in server authority.
+
+    :param number_requests:
+        The number of requests to issue.
+
+    :param concurrency:
+        The maximum number of requests in flight at once.
+
+    :return:
+        Returns the elapsed time, in seconds.
+
+    :type authority:       str
+    :type number_requests: int
+    :type concurrency:     int
+    :rtype:                float
+
+    """
+
+    async with speedsentry.AsyncSpeedSentry(
+            customer_identifier = stand_in_server.CUSTOMER_IDENTIFIER,
+            customer_secret = stand_in_server.CUSTOMER_SECRET,
+            maximum_connections = concurrency,
+            authority = authority
+        ) as api:
+        await api.status_list()
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one_request():
+            async with semaphore:
+                await api.status_list()
+
+        start = time.perf_counter()
+        await asyncio.gather(*[ one_request() for i in range(number_requests) ])
+        elapsed = time.perf_counter() - start
+
+    return elapsed
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-n",
+    "--requests",
+    help = "You can use this switch to specify the number of requests.",
+    type = int,
+    default = 500,
+    dest = 'number_requests'
+)
+
+command_line_parser.add_argument(
+    "-t",
+    "--threads",
+    help = "You can use this switch to specify the number of threads used by "
+           "the synchronous client.",
+    type = int,
+    default = 8,
+    dest = 'threads'
+)
+
+command_line_parser.add_argument(
+    "-c",
+    "--concurrency",
+    help = "You can use this switch to specify the number of requests in "
+           "flight for the asyncio client.",
+    type = int,
+    default = 100,
+    dest = 'concurrency'
+)
+
+command_line_parser.add_argument(
+    "-d",
+    "--delay",
+    help = "You can use this switch to specify the simulated per-response "
+           "delay in seconds.",
+    type = float,
+    default = 0.05,
+    dest = 'response_delay'
+)
+
+arguments = command_line_parser.parse_args()
+
+with stand_in_server.StandInServer(
+        response_delay = arguments.response_delay
+    ) as server:
+    sync_time = run_sync(
+        server.authority,
+        arguments.number_requests,
+        arguments.threads
+    )
+    async_time = asyncio.run(
+        run_async(
+            server.authority,
+            arguments.number_requests,
+            arguments.concurrency
+        )
+    )
+
+print(
+    "%-40s %10.3f s %10.1f req/s"%(
+        "SpeedSentry, %d threads"%arguments.threads,
+        sync_time,
+        arguments.number_requests / sync_time
+    )
+)
+print(
+    "%-40s %10.3f s %10.1f req/s"%(
+        "AsyncSpeedSentry, %d in flight"%arguments.concurrency,
+        async_time,
+        arguments.number_requests / async_time
+    )
+)
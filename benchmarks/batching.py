@@ -0,0 +1,198 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that measures the number of requests and the time
+taken to look up every monitor and its status individually, in a batch, and
+with windowed batching across threads.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import base64
+import threading
+import time
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+import speedsentry
+import stand_in_server
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to compare looking up each monitor
+and its status with individual requests, with an explicit batch, and with one
+thread per monitor using windowed batching.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def individual(api, monitor_ids : list):
+    """
+    Function that looks up each monitor and status with individual requests.
+
+    :param api:
+        The API instance to use.
+
+    :param monitor_ids:
+        The monitor IDs to look up.
+
+    :type api:         speedsentry.SpeedSentry
+    :type monitor_ids: list
+
+    """
+
+    for monitor_id in monitor_ids:
+        api.monitors_get(monitor_id)
+        api.status_get(monitor_id)
+
+
+def explicit_batch(api, monitor_ids : list):
+    """
+    Function that looks up each monitor and status within a batch.
+
+    :param api:
+        The API instance to use.
+
+    :param monitor_ids:
+        The monitor IDs to look up.
+
+    :type api:         speedsentry.SpeedSentry
+    :type monitor_ids: list
+
+    """
+
+    with api.batch() as batch:
+        futures = [
+            (batch.monitors_get(i), batch.status_get(i)) for i in monitor_ids
+        ]
+
+    for monitor, status in futures:
+        monitor.result()
+        status.result()
+
+
+def threaded(api, monitor_ids : list):
+    """
+    Function that looks up each monitor and status from its own thread.
+
+    :param api:
+        The API instance to use.
+
+    :param monitor_ids:
+        The monitor IDs to look up.
+
+    :type api:         speedsentry.SpeedSentry
+    :type monitor_ids: list
+
+    """
+
+    threads = [
+        threading.Thread(target = individual, args = (api, [ monitor_id ]))
+        for monitor_id in monitor_ids
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-m",
+    "--monitors",
+    help = "You can use this switch to specify the number of monitors.",
+    type = int,
+    default = 50,
+    dest = 'number_monitors'
+)
+
+command_line_parser.add_argument(
+    "-w",
+    "--window",
+    help = "You can use this switch to specify the batch window, in seconds.",
+    type = float,
+    default = 0.005,
+    dest = 'window'
+)
+
+arguments = command_line_parser.parse_args()
+
+secret = base64.b64encode(stand_in_server.CUSTOMER_SECRET).decode('utf-8')
+monitor_ids = list(range(1, arguments.number_monitors + 1))
+
+with stand_in_server.StandInServer(
+        number_monitors = arguments.number_monitors
+    ) as server:
+    configurations = (
+        ("individual", individual, None),
+        ("threaded", threaded, None),
+        ("explicit batch", explicit_batch, None),
+        ("threaded, window", threaded, arguments.window)
+    )
+
+    print("%-18s %10s %10s"%("Configuration", "requests", "ms"))
+
+    for name, function, window in configurations:
+        api = speedsentry.SpeedSentry(
+            stand_in_server.CUSTOMER_IDENTIFIER,
+            secret,
+            authority = server.authority,
+            maximum_connections_per_host = arguments.number_monitors,
+            batch_window = window
+        )
+
+        with api:
+            api.capabilities_get()
+
+            starting_requests = server.request_count
+            start = time.monotonic()
+            function(api, monitor_ids)
+            elapsed = time.monotonic() - start
+
+        print(
+            "%-18s %10d %10.1f"%(
+                name,
+                server.request_count - starting_requests,
+                1.0E3 * elapsed
+            )
+        )
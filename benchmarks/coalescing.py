@@ -0,0 +1,202 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that measures single-flight request coalescing when
+many threads issue identical calls at the same moment.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import base64
+import threading
+import time
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+import speedsentry
+import stand_in_server
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to compare the number of requests
+sent and the call throughput, with and without request coalescing, when a
+number of threads repeatedly call status_list and regions_list together.  The
+tool also confirms that every caller receives an independent result.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def run_threads(api, number_threads : int, number_rounds : int) -> tuple:
+    """
+    Function that has a number of threads call the API in lock step.
+
+    :param api:
+        The API instance to use.
+
+    :param number_threads:
+        The number of threads.
+
+    :param number_rounds:
+        The number of rounds of calls made by each thread.
+
+    :return:
+        Returns a tuple holding the elapsed time, in seconds, the number of
+        calls made, and a list of errors.
+
+    :type api:            speedsentry.SpeedSentry
+    :type number_threads: int
+    :type number_rounds:  int
+    :rtype:               tuple
+
+    """
+
+    barrier = threading.Barrier(number_threads)
+    errors = list()
+
+    def worker():
+        try:
+            for round_index in range(number_rounds):
+                barrier.wait()
+                status = api.status_list()
+                regions = api.regions_list()
+
+                if status.get(1) != "working" or len(regions) != 4:
+                    errors.append("unexpected result")
+
+                # Mutations must not be visible to other callers.
+                status[1] = "failed"
+                regions.clear()
+        except Exception as e:
+            errors.append(repr(e))
+            barrier.abort()
+
+    threads = [
+        threading.Thread(target = worker) for i in range(number_threads)
+    ]
+
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.monotonic() - start
+    return (elapsed, 2 * number_threads * number_rounds, errors)
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-t",
+    "--threads",
+    help = "You can use this switch to specify the number of threads.",
+    type = int,
+    default = 32,
+    dest = 'number_threads'
+)
+
+command_line_parser.add_argument(
+    "-r",
+    "--rounds",
+    help = "You can use this switch to specify the number of rounds per "
+           "thread.",
+    type = int,
+    default = 20,
+    dest = 'number_rounds'
+)
+
+command_line_parser.add_argument(
+    "-d",
+    "--delay",
+    help = "You can use this switch to specify the simulated server response "
+           "time, in seconds.",
+    type = float,
+    default = 0.02,
+    dest = 'delay'
+)
+
+arguments = command_line_parser.parse_args()
+
+secret = base64.b64encode(stand_in_server.CUSTOMER_SECRET).decode('utf-8')
+
+with stand_in_server.StandInServer(response_delay = arguments.delay) as server:
+    print(
+        "%-14s %10s %10s %10s %12s %8s"%(
+            "Coalescing",
+            "calls",
+            "requests",
+            "shared",
+            "calls/s",
+            "errors"
+        )
+    )
+
+    for coalesce in (False, True):
+        api = speedsentry.SpeedSentry(
+            stand_in_server.CUSTOMER_IDENTIFIER,
+            secret,
+            authority = server.authority,
+            maximum_connections_per_host = arguments.number_threads,
+            coalesce_requests = coalesce
+        )
+
+        with api:
+            api.capabilities_get()
+            starting_requests = server.request_count
+            elapsed, number_calls, errors = run_threads(
+                api,
+                arguments.number_threads,
+                arguments.number_rounds
+            )
+
+            print(
+                "%-14s %10d %10d %10d %12.1f %8d"%(
+                    "on" if coalesce else "off",
+                    number_calls,
+                    server.request_count - starting_requests,
+                    api.coalesced_requests,
+                    number_calls / elapsed,
+                    len(errors)
+                )
+            )
+
+            for error in sorted(set(errors)):
+                print("    %s"%error)
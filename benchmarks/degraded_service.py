@@ -0,0 +1,188 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that measures how long calls take to fail when the
+service is slow or returning errors.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import base64
+import time
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+import speedsentry
+import stand_in_server
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to measure the time taken by calls
+against a stand-in server that is either slow to respond or failing with 503
+status codes.  The tool reports the time per call, the number of retries, and
+the circuit breaker state so you can see calls bounded by their deadline and
+rejected immediately once the breaker opens.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def timed_calls(api, number_calls : int, timeout : float) -> list:
+    """
+    Function that issues a number of calls and records the outcome of each.
+
+    :param api:
+        The API instance to use.
+
+    :param number_calls:
+        The number of calls to issue.
+
+    :param timeout:
+        The per-call deadline, in seconds.
+
+    :return:
+        Returns a list of tuples holding the elapsed time and the outcome of
+        each call.
+
+    :type api:          speedsentry.SpeedSentry
+    :type number_calls: int
+    :type timeout:      float or None
+    :rtype:             list
+
+    """
+
+    result = list()
+    for i in range(number_calls):
+        start = time.monotonic()
+        try:
+            api.hosts_list(timeout = timeout)
+            outcome = "ok"
+        except speedsentry.CommunicationErrorException as e:
+            outcome = type(e).__name__
+
+        result.append((time.monotonic() - start, outcome))
+
+    return result
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-n",
+    "--calls",
+    help = "You can use this switch to specify the number of calls per "
+           "scenario.",
+    type = int,
+    default = 8,
+    dest = 'number_calls'
+)
+
+command_line_parser.add_argument(
+    "-d",
+    "--delay",
+    help = "You can use this switch to specify the response delay, in "
+           "seconds, of the slow server.",
+    type = float,
+    default = 2.0,
+    dest = 'delay'
+)
+
+command_line_parser.add_argument(
+    "-t",
+    "--timeout",
+    help = "You can use this switch to specify the per-call deadline, in "
+           "seconds.",
+    type = float,
+    default = 0.5,
+    dest = 'timeout'
+)
+
+arguments = command_line_parser.parse_args()
+
+secret = base64.b64encode(stand_in_server.CUSTOMER_SECRET).decode('utf-8')
+
+with stand_in_server.StandInServer() as server:
+    scenarios = (
+        ("slow", dict(response_delay = arguments.delay)),
+        ("failing", dict(failure_count = 1000000))
+    )
+
+    print("%-8s %5s %-28s %10s"%("Scenario", "Call", "Outcome", "ms"))
+
+    for scenario_name, settings in scenarios:
+        server.response_delay = settings.get('response_delay', 0)
+        server.failure_count = settings.get('failure_count', 0)
+
+        api = speedsentry.SpeedSentry(
+            stand_in_server.CUSTOMER_IDENTIFIER,
+            secret,
+            authority = server.authority,
+            retry_policy = speedsentry.RetryPolicy(initial_backoff = 0.05),
+            circuit_breaker = speedsentry.CircuitBreaker(
+                failure_threshold = 3
+            )
+        )
+
+        with api:
+            calls = timed_calls(api, arguments.number_calls, arguments.timeout)
+            statistics = api.policy_statistics
+
+        for index, (elapsed, outcome) in enumerate(calls):
+            print(
+                "%-8s %5d %-28s %10.1f"%(
+                    scenario_name,
+                    index,
+                    outcome,
+                    1.0E3 * elapsed
+                )
+            )
+
+        print(
+            "%-8s retries %d, timeouts %d, breaker %s, rejections %d"%(
+                scenario_name,
+                statistics.retries,
+                statistics.timeouts,
+                statistics.circuit_state,
+                statistics.circuit_rejections
+            )
+        )
+        print()
+
+    server.response_delay = 0
+    server.failure_count = 0
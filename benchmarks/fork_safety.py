@@ -0,0 +1,191 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that confirms an API instance created before a fork
+can be used by the child processes without sharing the parent's connections.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import base64
+import multiprocessing
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+import speedsentry
+import stand_in_server
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to check that an API instance
+created in a parent process can be used by forked worker processes.  The
+parent warms its connection and time delta against a stand-in server with a
+skewed clock, then a pool of forked workers issues requests using the same
+instance.  The tool reports any worker request received on one of the
+parent's connections, and any time delta request or rejected request made by
+the workers.  The parent then confirms that its own connection still works.
+The tool exits with a non-zero status if any worker request was received on
+one of the parent's connections, if any worker request failed, or if the
+parent's connection could not be reused.
+
+"""
+
+CLOCK_SKEW = 120
+"""
+The amount, in seconds, the stand-in server clock is ahead of the local clock.
+
+"""
+
+api = None
+"""
+The API instance shared with the worker processes.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def worker(number_calls : int) -> tuple:
+    """
+    Function run in each worker process.
+
+    :param number_calls:
+        The number of calls to issue.
+
+    :return:
+        Returns a tuple holding the process ID and a list of errors.
+
+    :type number_calls: int
+    :rtype:             tuple
+
+    """
+
+    errors = list()
+    for i in range(number_calls):
+        try:
+            status = api.status_list()
+            if status.get(1) != "working":
+                errors.append("unexpected result")
+        except Exception as e:
+            errors.append(repr(e))
+
+    return (os.getpid(), errors)
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-p",
+    "--processes",
+    help = "You can use this switch to specify the number of worker "
+           "processes.",
+    type = int,
+    default = 8,
+    dest = 'number_processes'
+)
+
+command_line_parser.add_argument(
+    "-n",
+    "--calls",
+    help = "You can use this switch to specify the number of calls per "
+           "worker process.",
+    type = int,
+    default = 25,
+    dest = 'number_calls'
+)
+
+arguments = command_line_parser.parse_args()
+
+secret = base64.b64encode(stand_in_server.CUSTOMER_SECRET).decode('utf-8')
+
+with stand_in_server.StandInServer(time_skew = CLOCK_SKEW) as server:
+    api = speedsentry.SpeedSentry(
+        stand_in_server.CUSTOMER_IDENTIFIER,
+        secret,
+        authority = server.authority
+    )
+
+    with api:
+        api.capabilities_get()
+        api.status_list()
+
+        parent_ports = set(server.client_ports)
+        starting_ports = server.client_ports.copy()
+        starting_time_deltas = server.time_delta_count
+        starting_rejections = server.unauthorized_count
+
+        context = multiprocessing.get_context("fork")
+        with context.Pool(arguments.number_processes) as pool:
+            results = pool.map(
+                worker,
+                [ arguments.number_calls ] * arguments.number_processes,
+                chunksize = 1
+            )
+
+        worker_ports = server.client_ports - starting_ports
+        reused = sum(worker_ports[port] for port in parent_ports)
+        errors = [ error for pid, result in results for error in result ]
+
+        pids = set(pid for pid, result in results)
+        print("Worker processes:             %d"%len(pids))
+        print("Worker calls:                 %d"%sum(worker_ports.values()))
+        print("Worker connections:           %d"%len(worker_ports))
+        print("Calls on parent connections:  %d"%reused)
+        print(
+            "Worker time delta requests:   %d"%(
+                server.time_delta_count - starting_time_deltas
+            )
+        )
+        print(
+            "Worker rejected requests:     %d"%(
+                server.unauthorized_count - starting_rejections
+            )
+        )
+        print("Worker errors:                %d"%len(errors))
+        for error in sorted(set(errors)):
+            print("    %s"%error)
+
+        before = server.client_ports.copy()
+        api.status_list()
+        parent_ok = set(server.client_ports - before) <= parent_ports
+        print(
+            "Parent connection reused:     %s"%("yes" if parent_ok else "no")
+        )
+
+if reused or errors or not parent_ok:
+    sys.exit(1)
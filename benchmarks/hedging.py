@@ -0,0 +1,216 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that measures the effect of request hedging on tail
+latency.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import base64
+import time
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+import speedsentry
+import stand_in_server
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to compare response time percentiles
+with and without request hedging against a stand-in server where a fraction
+of responses are slow.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def percentile(ordered : list, value : float) -> float:
+    """
+    Function that returns a percentile of a sorted list.
+
+    :param ordered:
+        The sorted values.
+
+    :param value:
+        The desired percentile, from 0 to 100.
+
+    :return:
+        Returns the percentile.
+
+    :type ordered: list
+    :type value:   float
+    :rtype:        float
+
+    """
+
+    index = int(round(value / 100.0 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def measure(api, number_calls : int) -> list:
+    """
+    Function that issues a mix of read requests and measures each call.
+
+    :param api:
+        The API instance to use.
+
+    :param number_calls:
+        The number of calls to issue.
+
+    :return:
+        Returns a sorted list of call times, in seconds.
+
+    :type api:          speedsentry.SpeedSentry
+    :type number_calls: int
+    :rtype:             list
+
+    """
+
+    calls = (
+        lambda: api.status_list(),
+        lambda: api.monitors_get(3),
+        lambda: api.multiple_list()
+    )
+
+    result = list()
+    for i in range(number_calls):
+        start = time.monotonic()
+        calls[i % len(calls)]()
+        result.append(time.monotonic() - start)
+
+    return sorted(result)
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-n",
+    "--calls",
+    help = "You can use this switch to specify the number of calls per "
+           "configuration.",
+    type = int,
+    default = 600,
+    dest = 'number_calls'
+)
+
+command_line_parser.add_argument(
+    "-f",
+    "--slow-fraction",
+    help = "You can use this switch to specify the fraction of responses "
+           "that are slow.",
+    type = float,
+    default = 0.03,
+    dest = 'slow_fraction'
+)
+
+command_line_parser.add_argument(
+    "-d",
+    "--slow-delay",
+    help = "You can use this switch to specify the added delay, in seconds, "
+           "of slow responses.",
+    type = float,
+    default = 0.25,
+    dest = 'slow_delay'
+)
+
+command_line_parser.add_argument(
+    "-p",
+    "--percentile",
+    help = "You can use this switch to specify the hedge percentile.",
+    type = float,
+    default = 95.0,
+    dest = 'percentile'
+)
+
+arguments = command_line_parser.parse_args()
+
+secret = base64.b64encode(stand_in_server.CUSTOMER_SECRET).decode('utf-8')
+
+with stand_in_server.StandInServer() as server:
+    server.slow_fraction = arguments.slow_fraction
+    server.slow_delay = arguments.slow_delay
+
+    configurations = (
+        ("no hedging", None),
+        (
+            "hedged p%g"%arguments.percentile,
+            speedsentry.HedgingPolicy(percentile = arguments.percentile)
+        )
+    )
+
+    print(
+        "%-16s %9s %9s %9s %9s %8s %8s %9s"%(
+            "Configuration",
+            "p50 ms",
+            "p90 ms",
+            "p99 ms",
+            "max ms",
+            "hedges",
+            "won",
+            "requests"
+        )
+    )
+
+    for name, hedging_policy in configurations:
+        starting_requests = server.request_count
+        api = speedsentry.SpeedSentry(
+            stand_in_server.CUSTOMER_IDENTIFIER,
+            secret,
+            authority = server.authority,
+            hedging_policy = hedging_policy
+        )
+
+        with api:
+            api.capabilities_get()
+            times = measure(api, arguments.number_calls)
+            statistics = api.policy_statistics
+
+        print(
+            "%-16s %9.2f %9.2f %9.2f %9.2f %8d %8d %9d"%(
+                name,
+                1.0E3 * percentile(times, 50),
+                1.0E3 * percentile(times, 90),
+                1.0E3 * percentile(times, 99),
+                1.0E3 * times[-1],
+                statistics.hedges,
+                statistics.hedges_won,
+                server.request_count - starting_requests
+            )
+        )
@@ -0,0 +1,237 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that compares the installed JSON codecs on realistic
+response payloads and verifies that signed payloads do not depend on the
+codec.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import timeit
+import json
+import base64
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+from speedsentry import codec
+from speedsentry import outbound_rest_api_v1
+import stand_in_server
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to compare the time taken by each
+installed JSON codec to decode realistic /v1/multiple/list and
+/v1/latency/list responses.  The tool also confirms that signed payloads are
+byte-for-byte identical to those built with json.dumps.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def reference_payload(signer, message, time_delta : int) -> str:
+    """
+    Function that builds a signed payload by encoding the envelope with
+    json.dumps.
+
+    :param signer:
+        The message signer.
+
+    :param message:
+        The message to be signed.
+
+    :param time_delta:
+        The time delta, in seconds.
+
+    :return:
+        Returns the signed payload.
+
+    :type signer:     outbound_rest_api_v1.MessageSigner
+    :type message:    dict or list
+    :type time_delta: int
+    :rtype:           str
+
+    """
+
+    raw_message = json.dumps(message).encode('utf-8')
+    raw_hash = signer.sign(raw_message, signer.window(time_delta))
+
+    return json.dumps(
+        {
+            'cid' : stand_in_server.CUSTOMER_IDENTIFIER,
+            'data' : base64.b64encode(raw_message).decode('utf-8'),
+            'hash' : base64.b64encode(raw_hash).decode('utf-8')
+        }
+    )
+
+
+def time_call(function, minimum_time : float = 0.5) -> float:
+    """
+    Function that measures the average time of a callable.
+
+    :param function:
+        The callable to measure.
+
+    :param minimum_time:
+        The minimum total measurement time, in seconds.
+
+    :return:
+        Returns the average time per call, in seconds.
+
+    :type function:     callable
+    :type minimum_time: float
+    :rtype:             float
+
+    """
+
+    timer = timeit.Timer(function)
+    number, elapsed = timer.autorange()
+    repeat = max(1, int(minimum_time / max(elapsed, 1.0E-9)))
+    return min(timer.repeat(repeat = min(repeat, 5), number = number)) / number
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-m",
+    "--monitors",
+    help = "You can use this switch to specify the number of monitors in the "
+           "multiple list response.",
+    type = int,
+    default = 200,
+    dest = 'number_monitors'
+)
+
+command_line_parser.add_argument(
+    "-l",
+    "--latency-entries",
+    help = "You can use this switch to specify the number of entries in the "
+           "latency list response.",
+    type = int,
+    default = 20000,
+    dest = 'number_latency_entries'
+)
+
+arguments = command_line_parser.parse_args()
+
+signer = outbound_rest_api_v1.MessageSigner(
+    stand_in_server.CUSTOMER_IDENTIFIER,
+    stand_in_server.CUSTOMER_SECRET
+)
+
+messages = [
+    dict(),
+    { 'monitor_id' : 12, 'start_timestamp' : 1, 'end_timestamp' : None },
+    [ { 'uri' : "/café/☃", 'keywords' : [ "a2V5" ] } ] * 20
+]
+
+for message in messages:
+    if signer.build_payload(message, 0) != reference_payload(
+            signer,
+            message,
+            0
+        ):
+        sys.stderr.write("*** Signed payload differs from reference.\n")
+        exit(1)
+
+print("Signed payloads are identical to the json.dumps reference.")
+
+message = messages[1]
+reference_time = time_call(lambda: reference_payload(signer, message, 0))
+template_time = time_call(lambda: signer.build_payload(message, 0))
+print(
+    "Payload build: json.dumps envelope %.2f us, template envelope %.2f us"%(
+        1.0E6 * reference_time,
+        1.0E6 * template_time
+    )
+)
+print()
+
+payloads = (
+    (
+        "multiple_list",
+        json.dumps(
+            stand_in_server.build_multiple_response(arguments.number_monitors)
+        ).encode('utf-8')
+    ),
+    (
+        "latency_list",
+        json.dumps(
+            stand_in_server.build_latency_response(
+                arguments.number_latency_entries // 2,
+                arguments.number_latency_entries // 2
+            )
+        ).encode('utf-8')
+    )
+)
+
+print(
+    "%-16s %-26s %10s %12s %10s"%(
+        "Payload",
+        "Decoder",
+        "size kB",
+        "ms/decode",
+        "MB/s"
+    )
+)
+
+for payload_name, payload in payloads:
+    decoders = [
+        (
+            "json.loads(bytes.decode)",
+            lambda p = payload: json.loads(p.decode('utf-8'))
+        )
+    ]
+
+    for c in codec.available_codecs():
+        decoders.append(
+            ("%s codec"%c.name, lambda p = payload, c = c: c.loads(p))
+        )
+
+    for decoder_name, decoder in decoders:
+        elapsed = time_call(decoder)
+        print(
+            "%-16s %-26s %10.1f %12.3f %10.1f"%(
+                payload_name,
+                decoder_name,
+                len(payload) / 1024.0,
+                1.0E3 * elapsed,
+                len(payload) / elapsed / 1048576.0
+            )
+        )
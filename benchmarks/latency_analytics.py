@@ -0,0 +1,275 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that compares computing per monitor and region
+latency statistics with Python loops and with the latency_analytics module.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import collections
+import math
+import time
+
+import numpy
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+import speedsentry
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to measure the time needed to
+compute the sample count, average, variance, and p50, p95, and p99 latency of
+each monitor and region from a synthetic set of LatencyEntry instances, using
+Python loops and using the latency_analytics module.  The tool also reports
+the time needed to summarize the same data held as a frame, and to summarize
+a mix of raw samples and aggregated populations.
+
+"""
+
+START_TIMESTAMP = 1640995200
+"""
+The timestamp of the first synthetic sample.
+
+"""
+
+PERCENTILES = (50, 95, 99)
+"""
+The percentiles computed.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def build_entries(
+        number_entries : int,
+        number_monitors : int,
+        number_regions : int
+    ) -> list:
+    """
+    Function that builds a list of synthetic latency entries.
+
+    :param number_entries:
+        The number of entries.
+
+    :param number_monitors:
+        The number of monitors.
+
+    :param number_regions:
+        The number of regions.
+
+    :return:
+        Returns a list of LatencyEntry instances.
+
+    :type number_entries:  int
+    :type number_monitors: int
+    :type number_regions:  int
+    :rtype:                list
+
+    """
+
+    generator = numpy.random.default_rng(1)
+    monitor_id = generator.integers(1, number_monitors + 1, number_entries)
+    region_id = generator.integers(1, number_regions + 1, number_entries)
+    latency = generator.gamma(2.0, 0.05, number_entries)
+
+    return [
+        speedsentry.LatencyEntry(
+            {
+                'monitor_id' : m,
+                'timestamp' : START_TIMESTAMP + 60 * i,
+                'latency' : l,
+                'region_id' : r
+            }
+        )
+        for i, (m, r, l) in enumerate(
+            zip(monitor_id.tolist(), region_id.tolist(), latency.tolist())
+        )
+    ]
+
+
+def summarize_with_loops(entries : list) -> dict:
+    """
+    Function that computes per monitor and region statistics using Python
+    loops.
+
+    :param entries:
+        The latency entries.
+
+    :return:
+        Returns a dictionary keyed by monitor ID and region ID holding a
+        tuple of the sample count, average, variance, and percentiles.
+
+    :type entries: list
+    :rtype:        dict
+
+    """
+
+    groups = collections.defaultdict(list)
+    for entry in entries:
+        groups[(entry['monitor_id'], entry['region_id'])].append(
+            entry['latency']
+        )
+
+    result = dict()
+    for key, values in groups.items():
+        values.sort()
+        number_values = len(values)
+        average = sum(values) / number_values
+        variance = sum((v - average) ** 2 for v in values) / number_values
+        result[key] = (
+            (number_values, average, variance)
+          + tuple(
+                values[max(math.ceil(p / 100.0 * number_values) - 1, 0)]
+                for p in PERCENTILES
+            )
+        )
+
+    return result
+
+
+def timed(function) -> tuple:
+    """
+    Function that times a single call.
+
+    :param function:
+        The function to time.
+
+    :return:
+        Returns a tuple holding the elapsed time, in seconds, and the value
+        returned by the call.
+
+    :type function: callable
+    :rtype:         tuple
+
+    """
+
+    start = time.perf_counter()
+    result = function()
+    return (time.perf_counter() - start, result)
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-e",
+    "--entries",
+    help = "You can use this switch to specify the number of samples.",
+    type = int,
+    default = 1000000,
+    dest = 'number_entries'
+)
+
+command_line_parser.add_argument(
+    "-m",
+    "--monitors",
+    help = "You can use this switch to specify the number of monitors.",
+    type = int,
+    default = 100,
+    dest = 'number_monitors'
+)
+
+arguments = command_line_parser.parse_args()
+
+entries = build_entries(arguments.number_entries, arguments.number_monitors, 4)
+
+loop_time, expected = timed(lambda: summarize_with_loops(entries))
+list_time, summary = timed(
+    lambda: speedsentry.latency_analytics.summarize(
+        entries,
+        percentiles = PERCENTILES
+    )
+)
+
+frame = speedsentry.LatencyFrame.from_entries(entries, aggregated = False)
+frame_time, summary = timed(
+    lambda: speedsentry.latency_analytics.summarize(
+        frame,
+        percentiles = PERCENTILES
+    )
+)
+
+oldest = frame.order_by('timestamp').between(
+    None,
+    START_TIMESTAMP + 30 * arguments.number_entries
+)
+newest = frame.order_by('timestamp').between(
+    START_TIMESTAMP + 30 * arguments.number_entries + 1,
+    None
+)
+aggregated = speedsentry.latency_rollup.rollup(oldest, 3600)
+mixed_time, mixed = timed(
+    lambda: speedsentry.latency_analytics.summarize(
+        newest,
+        aggregated,
+        percentiles = PERCENTILES
+    )
+)
+
+largest_difference = 0.0
+for i, key in enumerate(zip(summary['monitor_id'], summary['region_id'])):
+    values = expected[(int(key[0]), int(key[1]))]
+    computed = (
+        summary['number_samples'][i],
+        summary['average'][i],
+        summary['variance'][i]
+    ) + tuple(
+        summary[speedsentry.latency_analytics.percentile_name(p)][i]
+        for p in PERCENTILES
+    )
+    largest_difference = max(
+        largest_difference,
+        max(abs(a - b) for a, b in zip(values, computed))
+    )
+
+print("Samples:                          %d"%arguments.number_entries)
+print("Groups:                           %d"%len(summary['average']))
+print("Python loops over entries:        %8.1f ms"%(1.0E3 * loop_time))
+print("Vectorized, from entries:         %8.1f ms"%(1.0E3 * list_time))
+print("Vectorized, from frame:           %8.1f ms"%(1.0E3 * frame_time))
+print("Vectorized, mixed data:           %8.1f ms"%(1.0E3 * mixed_time))
+print("    Raw samples:                  %d"%len(newest))
+print("    Aggregated entries:           %d"%len(aggregated))
+print("Largest difference from loops:    %.3g"%largest_difference)
+print(
+    "Mixed data variance error:        %.3g"%(
+        numpy.abs(mixed['variance'] - summary['variance']).max()
+    )
+)
@@ -0,0 +1,291 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that measures the throughput of incremental latency
+anomaly detection across many monitors.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import tempfile
+import time
+
+import numpy
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+import speedsentry
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to measure the number of samples per
+second an AnomalyDetector can process when samples for many monitors arrive
+interleaved, one round of samples per minute.  A latency regression of a
+given size is injected into a subset of the monitors partway through so the
+tool can also report how many regressions were detected and how many
+monitors without a regression reported an anomaly.  The tool then measures
+the size of a checkpoint and the time needed to save and restore it.
+
+"""
+
+START_TIMESTAMP = 1640995200
+"""
+The timestamp of the first synthetic sample.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def build_frame(
+        number_monitors : int,
+        number_rounds : int,
+        regressed : int,
+        increase : float
+    ):
+    """
+    Function that builds a frame of synthetic samples, one sample per monitor
+    each minute, ordered by timestamp.
+
+    :param number_monitors:
+        The number of monitors.
+
+    :param number_rounds:
+        The number of samples per monitor.
+
+    :param regressed:
+        The number of monitors given a latency regression half way through.
+
+    :param increase:
+        The fractional increase in latency of the regression.
+
+    :return:
+        Returns the frame.
+
+    :type number_monitors: int
+    :type number_rounds:   int
+    :type regressed:       int
+    :type increase:        float
+    :rtype:                speedsentry.LatencyFrame
+
+    """
+
+    generator = numpy.random.default_rng(1)
+    number_entries = number_monitors * number_rounds
+    index = numpy.arange(number_entries, dtype = 'int64')
+    monitor_id = 1 + index % number_monitors
+    round_number = index // number_monitors
+    timestamp = START_TIMESTAMP + 60 * round_number
+
+    median = 0.05 + 0.1 * generator.random(number_monitors)
+    latency = median[monitor_id - 1] * generator.lognormal(
+        0.0,
+        0.05,
+        number_entries
+    )
+    latency[
+          (monitor_id <= regressed)
+        & (round_number >= number_rounds // 2)
+    ] *= 1.0 + increase
+
+    return speedsentry.LatencyFrame(
+        {
+            'monitor_id' : monitor_id,
+            'timestamp' : timestamp,
+            'latency' : latency,
+            'region_id' : numpy.ones(number_entries, dtype = 'int64'),
+            'average' : latency,
+            'variance' : numpy.zeros(number_entries),
+            'minimum' : latency,
+            'maximum' : latency,
+            'start_timestamp' : timestamp,
+            'end_timestamp' : timestamp,
+            'number_samples' : numpy.ones(number_entries, dtype = 'int64')
+        },
+        ('timestamp', )
+    )
+
+
+def timed(function) -> tuple:
+    """
+    Function that times a single call.
+
+    :param function:
+        The function to time.
+
+    :return:
+        Returns a tuple holding the elapsed time, in seconds, and the value
+        returned by the call.
+
+    :type function: callable
+    :rtype:         tuple
+
+    """
+
+    start = time.perf_counter()
+    result = function()
+    return (time.perf_counter() - start, result)
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-m",
+    "--monitors",
+    help = "You can use this switch to specify the number of monitors.",
+    type = int,
+    default = 10000,
+    dest = 'number_monitors'
+)
+
+command_line_parser.add_argument(
+    "-r",
+    "--rounds",
+    help = "You can use this switch to specify the number of samples per "
+           "monitor.",
+    type = int,
+    default = 200,
+    dest = 'number_rounds'
+)
+
+command_line_parser.add_argument(
+    "-g",
+    "--regressed",
+    help = "You can use this switch to specify the number of monitors given "
+           "a latency regression.",
+    type = int,
+    default = 100,
+    dest = 'regressed'
+)
+
+command_line_parser.add_argument(
+    "-i",
+    "--increase",
+    help = "You can use this switch to specify the fractional increase in "
+           "latency of the regression.",
+    type = float,
+    default = 0.25,
+    dest = 'increase'
+)
+
+arguments = command_line_parser.parse_args()
+
+frame = build_frame(
+    arguments.number_monitors,
+    arguments.number_rounds,
+    arguments.regressed,
+    arguments.increase
+)
+number_samples = len(frame)
+
+entries = [
+    speedsentry.LatencyEntry(
+        {
+            'monitor_id' : m,
+            'timestamp' : t,
+            'latency' : l,
+            'region_id' : 1
+        }
+    )
+    for m, t, l in zip(
+        frame.monitor_id.tolist(),
+        frame.timestamp.tolist(),
+        frame.latency.tolist()
+    )
+]
+
+print("Monitors:                       %d"%arguments.number_monitors)
+print("Samples:                        %d"%number_samples)
+print()
+print("%-30s %10s %14s"%("Detectors", "ms", "samples/s"))
+
+configurations = (
+    ("ewma", (speedsentry.EwmaDetector(),)),
+    ("cusum", (speedsentry.CusumDetector(),)),
+    ("seasonal", (speedsentry.SeasonalDetector(),)),
+    ("all, frame", None),
+    ("all, streamed entries", None)
+)
+
+for name, detectors in configurations:
+    detector = speedsentry.AnomalyDetector(detectors)
+    if name == "all, streamed entries":
+        elapsed, anomalies = timed(lambda: detector.update(iter(entries)))
+    else:
+        elapsed, anomalies = timed(lambda: detector.update(frame))
+
+    print(
+        "%-30s %10.1f %14.0f"%(
+            name,
+            1.0E3 * elapsed,
+            number_samples / elapsed
+        )
+    )
+
+detected = set(
+    a.monitor_id for a in anomalies if a.monitor_id <= arguments.regressed
+)
+false_alarms = set(
+    a.monitor_id for a in anomalies if a.monitor_id > arguments.regressed
+)
+
+print()
+print(
+    "Regressions detected:           %d of %d"%(
+        len(detected),
+        arguments.regressed
+    )
+)
+print(
+    "Monitors with false alarms:     %d of %d"%(
+        len(false_alarms),
+        arguments.number_monitors - arguments.regressed
+    )
+)
+
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, "anomaly.json")
+    save_time, unused = timed(lambda: detector.save(path))
+    restored = speedsentry.AnomalyDetector()
+    load_time, unused = timed(lambda: restored.load(path))
+    checkpoint_size = os.path.getsize(path)
+
+print()
+print("Checkpoint size:                %8.1f kB"%(checkpoint_size / 1024))
+print("Save checkpoint:                %8.1f ms"%(1.0E3 * save_time))
+print("Restore checkpoint:             %8.1f ms"%(1.0E3 * load_time))
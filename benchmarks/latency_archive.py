@@ -0,0 +1,339 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that measures the time needed to open and scan a
+memory mapped latency archive.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import json
+import tempfile
+import time
+
+import numpy
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+import speedsentry
+import stand_in_server
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to measure the time needed to open a
+latency archive, to seek to a one day range, and to scan every row computing
+the average latency of each monitor.  For comparison, the tool also reports
+the time needed to read the same columns fully into memory and to decode the
+equivalent latency_list JSON response.
+
+"""
+
+CHUNK_SIZE = 1000000
+"""
+The number of rows appended to the archive at a time.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def build_chunk(
+        first_row : int,
+        number_rows : int,
+        number_monitors : int,
+        number_regions : int,
+        start_timestamp : int
+    ):
+    """
+    Function that builds a frame of synthetic recent entries.  Each group of
+    number_monitors rows shares a timestamp, one minute after the previous
+    group.
+
+    :param first_row:
+        The index of the first row.
+
+    :param number_rows:
+        The number of rows to build.
+
+    :param number_monitors:
+        The number of monitors.
+
+    :param number_regions:
+        The number of regions.
+
+    :param start_timestamp:
+        The timestamp of the first row.
+
+    :return:
+        Returns the frame.
+
+    :type first_row:       int
+    :type number_rows:     int
+    :type number_monitors: int
+    :type number_regions:  int
+    :type start_timestamp: int
+    :rtype:                speedsentry.LatencyFrame
+
+    """
+
+    index = numpy.arange(first_row, first_row + number_rows, dtype = 'int64')
+    timestamp = start_timestamp + 60 * (index // number_monitors)
+    latency = 0.05 + 0.01 * (index % 97)
+
+    return speedsentry.LatencyFrame(
+        {
+            'monitor_id' : 1 + index % number_monitors,
+            'timestamp' : timestamp,
+            'latency' : latency,
+            'region_id' : 1 + index % number_regions,
+            'average' : latency,
+            'variance' : numpy.zeros(number_rows),
+            'minimum' : latency,
+            'maximum' : latency,
+            'start_timestamp' : timestamp,
+            'end_timestamp' : timestamp,
+            'number_samples' : numpy.ones(number_rows, dtype = 'int64')
+        },
+        ('timestamp',)
+    )
+
+
+def scan(frame) -> numpy.ndarray:
+    """
+    Function that computes the average latency of each monitor.
+
+    :param frame:
+        The frame to scan.
+
+    :return:
+        Returns the average latency, indexed by monitor ID.
+
+    :type frame: speedsentry.LatencyFrame
+    :rtype:      numpy.ndarray
+
+    """
+
+    monitor_id = frame.monitor_id
+    totals = numpy.bincount(monitor_id, weights = frame.latency)
+    counts = numpy.bincount(monitor_id)
+
+    return totals / numpy.maximum(counts, 1)
+
+
+def load(directory : str) -> dict:
+    """
+    Function that reads the recent columns of an archive fully into memory.
+
+    :param directory:
+        The archive directory.
+
+    :return:
+        Returns the columns, keyed by column name.
+
+    :type directory: str
+    :rtype:          dict
+
+    """
+
+    return {
+        name : numpy.fromfile(
+            os.path.join(
+                directory,
+                speedsentry.latency_archive.column_filename('recent', name)
+            ),
+            dtype = dtype
+        )
+        for name, dtype in speedsentry.latency_archive.TABLES['recent']
+    }
+
+
+def best(function, number_repeats : int) -> float:
+    """
+    Function that reports the shortest of several timed calls.
+
+    :param function:
+        The function to time.
+
+    :param number_repeats:
+        The number of calls.
+
+    :return:
+        Returns the shortest time, in seconds.
+
+    :type function:       callable
+    :type number_repeats: int
+    :rtype:               float
+
+    """
+
+    result = None
+    for i in range(number_repeats):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        result = elapsed if result is None else min(result, elapsed)
+
+    return result
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-e",
+    "--entries",
+    help = "You can use this switch to specify the number of recent entries "
+           "held in the archive.",
+    type = int,
+    default = 5000000,
+    dest = 'number_entries'
+)
+
+command_line_parser.add_argument(
+    "-j",
+    "--json-entries",
+    help = "You can use this switch to specify the number of entries in the "
+           "JSON response used for comparison.",
+    type = int,
+    default = 200000,
+    dest = 'number_json_entries'
+)
+
+command_line_parser.add_argument(
+    "-m",
+    "--monitors",
+    help = "You can use this switch to specify the number of monitors.",
+    type = int,
+    default = 1000,
+    dest = 'number_monitors'
+)
+
+command_line_parser.add_argument(
+    "-r",
+    "--repeats",
+    help = "You can use this switch to specify the number of times each "
+           "measurement is repeated.  The best time is reported.",
+    type = int,
+    default = 5,
+    dest = 'number_repeats'
+)
+
+arguments = command_line_parser.parse_args()
+
+start_timestamp = 1640995200
+number_entries = arguments.number_entries
+number_repeats = arguments.number_repeats
+
+with tempfile.TemporaryDirectory() as directory:
+    with speedsentry.LatencyArchive(directory) as archive:
+        start = time.perf_counter()
+        for first_row in range(0, number_entries, CHUNK_SIZE):
+            archive.append(
+                build_chunk(
+                    first_row,
+                    min(CHUNK_SIZE, number_entries - first_row),
+                    arguments.number_monitors,
+                    4,
+                    start_timestamp
+                )
+            )
+        write_time = time.perf_counter() - start
+
+    archive_bytes = sum(
+        os.path.getsize(os.path.join(directory, name))
+        for name in os.listdir(directory)
+    )
+
+    archive = speedsentry.LatencyArchive(directory)
+    frame = archive.recent()
+    last_timestamp = int(frame.timestamp[-1])
+    day = archive.recent(last_timestamp - 86399, last_timestamp)
+
+    open_time = best(
+        lambda: speedsentry.LatencyArchive(directory).close(),
+        number_repeats
+    )
+    seek_time = best(
+        lambda: archive.recent(last_timestamp - 86399, last_timestamp),
+        number_repeats
+    )
+    scan_time = best(lambda: scan(archive.recent()), number_repeats)
+
+    load_time = best(lambda: load(directory), number_repeats)
+    archive.close()
+
+response = stand_in_server.build_latency_response(
+    arguments.number_json_entries,
+    0,
+    number_monitors = arguments.number_monitors
+)
+encoded = json.dumps(response).encode('utf-8')
+json_time = best(lambda: json.loads(encoded), number_repeats)
+
+scanned_bytes = 16 * number_entries
+print("Archive rows:                %d"%number_entries)
+print("Archive size:                %.1f MB"%(archive_bytes / 1.0E6))
+print("Write time:                  %.1f ms"%(1.0E3 * write_time))
+print("Open time:                   %.3f ms"%(1.0E3 * open_time))
+print(
+    "Seek to one day:             %.3f ms (%d rows)"%(
+        1.0E3 * seek_time,
+        len(day)
+    )
+)
+print(
+    "Scan, per monitor average:   %.1f ms (%.1f M rows/s, %.0f MB/s)"%(
+        1.0E3 * scan_time,
+        number_entries / scan_time / 1.0E6,
+        scanned_bytes / scan_time / 1.0E6
+    )
+)
+print(
+    "Read columns into memory:    %.1f ms (%.1f M rows/s)"%(
+        1.0E3 * load_time,
+        number_entries / load_time / 1.0E6
+    )
+)
+print(
+    "Decode JSON response:        %.1f ms for %d rows (%.2f M rows/s, "
+    "%.1f MB)"%(
+        1.0E3 * json_time,
+        arguments.number_json_entries,
+        arguments.number_json_entries / json_time / 1.0E6,
+        len(encoded) / 1.0E6
+    )
+)
@@ -0,0 +1,309 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that compares long range latency queries answered
+from raw samples with the same queries answered from a rollup pyramid.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import time
+
+import numpy
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+import speedsentry
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to measure the cost of summarizing
+the latency of a single monitor and region over a long time range, either
+from every raw sample or from a rollup pyramid.  The pyramid is built one day
+at a time to measure incremental updates and the results of both approaches
+are compared.
+
+"""
+
+START_TIMESTAMP = 1640995200
+"""
+The timestamp of the first synthetic sample.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def build_day(
+        day : int,
+        number_monitors : int,
+        number_regions : int,
+        generator
+    ):
+    """
+    Function that builds a frame holding one day of synthetic samples taken
+    once a minute for every monitor and region.
+
+    :param day:
+        The zero based day number.
+
+    :param number_monitors:
+        The number of monitors.
+
+    :param number_regions:
+        The number of regions.
+
+    :param generator:
+        The random number generator used to produce latencies.
+
+    :return:
+        Returns the frame.
+
+    :type day:             int
+    :type number_monitors: int
+    :type number_regions:  int
+    :type generator:       numpy.random.Generator
+    :rtype:                speedsentry.LatencyFrame
+
+    """
+
+    number_series = number_monitors * number_regions
+    number_rows = 1440 * number_series
+    index = numpy.arange(number_rows, dtype = 'int64')
+    series = index % number_series
+    timestamp = (
+          START_TIMESTAMP
+        + 86400 * day
+        + 60 * (index // number_series)
+        + generator.integers(0, 60, number_rows)
+    )
+    latency = generator.gamma(2.0, 0.05, number_rows)
+
+    return speedsentry.LatencyFrame(
+        {
+            'monitor_id' : 1 + series // number_regions,
+            'timestamp' : timestamp,
+            'latency' : latency,
+            'region_id' : 1 + series % number_regions,
+            'average' : latency,
+            'variance' : numpy.zeros(number_rows),
+            'minimum' : latency,
+            'maximum' : latency,
+            'start_timestamp' : timestamp,
+            'end_timestamp' : timestamp,
+            'number_samples' : numpy.ones(number_rows, dtype = 'int64')
+        }
+    )
+
+
+def best(function, number_repeats : int) -> tuple:
+    """
+    Function that reports the shortest of several timed calls.
+
+    :param function:
+        The function to time.
+
+    :param number_repeats:
+        The number of calls.
+
+    :return:
+        Returns a tuple holding the shortest time, in seconds, and the value
+        returned by the last call.
+
+    :type function:       callable
+    :type number_repeats: int
+    :rtype:               tuple
+
+    """
+
+    elapsed = None
+    for i in range(number_repeats):
+        start = time.perf_counter()
+        result = function()
+        duration = time.perf_counter() - start
+        elapsed = duration if elapsed is None else min(elapsed, duration)
+
+    return (elapsed, result)
+
+
+def raw_summary(frame, start_timestamp : int, end_timestamp : int) -> tuple:
+    """
+    Function that summarizes monitor 1 as seen from region 1 from the raw
+    samples.
+
+    :param frame:
+        The raw samples for every monitor and region, sorted by timestamp as
+        returned by a latency archive.
+
+    :param start_timestamp:
+        The earliest timestamp of interest.
+
+    :param end_timestamp:
+        The latest timestamp of interest.
+
+    :return:
+        Returns a tuple holding the number of samples, average, variance,
+        minimum, and maximum.
+
+    :type frame:           speedsentry.LatencyFrame
+    :type start_timestamp: int
+    :type end_timestamp:   int
+    :rtype:                tuple
+
+    """
+
+    selected = frame.between(start_timestamp, end_timestamp).series(1, 1)
+    latency = selected.latency
+    return (
+        len(latency),
+        latency.mean(),
+        latency.var(),
+        latency.min(),
+        latency.max()
+    )
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-d",
+    "--days",
+    help = "You can use this switch to specify the number of days of "
+           "history.",
+    type = int,
+    default = 90,
+    dest = 'number_days'
+)
+
+command_line_parser.add_argument(
+    "-m",
+    "--monitors",
+    help = "You can use this switch to specify the number of monitors.",
+    type = int,
+    default = 5,
+    dest = 'number_monitors'
+)
+
+command_line_parser.add_argument(
+    "-r",
+    "--repeats",
+    help = "You can use this switch to specify the number of times each "
+           "query is repeated.  The best time is reported.",
+    type = int,
+    default = 5,
+    dest = 'number_repeats'
+)
+
+arguments = command_line_parser.parse_args()
+
+generator = numpy.random.default_rng(1)
+pyramid = speedsentry.RollupPyramid()
+
+days = list()
+update_times = list()
+for day in range(arguments.number_days):
+    frame = build_day(day, arguments.number_monitors, 4, generator)
+    days.append(frame)
+
+    start = time.perf_counter()
+    pyramid.update(frame)
+    update_times.append(time.perf_counter() - start)
+
+raw = speedsentry.LatencyFrame.concatenate(days).order_by('timestamp')
+
+end_timestamp = START_TIMESTAMP + 86400 * arguments.number_days - 1
+resolution = pyramid.choose_resolution(START_TIMESTAMP, end_timestamp)
+buckets = pyramid.query(START_TIMESTAMP, end_timestamp, 1, 1)
+
+raw_time, expected = best(
+    lambda: raw_summary(raw, START_TIMESTAMP, end_timestamp),
+    arguments.number_repeats
+)
+pyramid_time, summary = best(
+    lambda: pyramid.summary(START_TIMESTAMP, end_timestamp, 1, 1),
+    arguments.number_repeats
+)
+
+print("Raw samples held:            %d"%len(raw))
+print(
+    "Buckets held:                %s"%(
+        ", ".join(
+            "%d at %d s"%(pyramid.number_buckets(r), r)
+            for r in pyramid.resolutions
+        )
+    )
+)
+print(
+    "Update, one day:             %.1f ms first, %.1f ms last"%(
+        1.0E3 * update_times[0],
+        1.0E3 * update_times[-1]
+    )
+)
+print(
+    "Raw query:                   %.3f ms (%d samples)"%(
+        1.0E3 * raw_time,
+        expected[0]
+    )
+)
+print(
+    "Pyramid query:               %.3f ms (%d buckets at %d s)"%(
+        1.0E3 * pyramid_time,
+        len(buckets),
+        resolution
+    )
+)
+print(
+    "Samples, raw / pyramid:      %d / %d"%(
+        expected[0],
+        summary.number_samples[0]
+    )
+)
+print(
+    "Average error:               %.3g"%abs(summary.average[0] - expected[1])
+)
+print(
+    "Variance relative error:     %.3g"%(
+        abs(summary.variance[0] - expected[2]) / expected[2]
+    )
+)
+print(
+    "Minimum and maximum match:   %s"%(
+        "yes" if summary.minimum[0] == expected[3] and
+                 summary.maximum[0] == expected[4] else "no"
+    )
+)
@@ -0,0 +1,315 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that compares the accuracy and memory use of latency
+sketches against exact percentiles.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import pickle
+import time
+
+import numpy
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+import speedsentry
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to compare per monitor latency
+sketches against exact percentiles computed from every sample.  The tool
+reports the largest relative error of the p50, p95, p99, and p99.9 latency
+across all monitors, the memory needed to hold every sample against the
+serialized size of the sketches, and the time needed to build, merge, and
+serialize the sketches.  Samples are drawn from a log-normal distribution
+with a different median for each monitor.
+
+"""
+
+START_TIMESTAMP = 1640995200
+"""
+The timestamp of the first synthetic sample.
+
+"""
+
+PERCENTILES = (50, 95, 99, 99.9)
+"""
+The percentiles compared.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def build_frame(number_entries : int, number_monitors : int):
+    """
+    Function that builds a frame of synthetic samples.
+
+    :param number_entries:
+        The number of samples.
+
+    :param number_monitors:
+        The number of monitors.
+
+    :return:
+        Returns the frame.
+
+    :type number_entries:  int
+    :type number_monitors: int
+    :rtype:                speedsentry.LatencyFrame
+
+    """
+
+    generator = numpy.random.default_rng(1)
+    index = numpy.arange(number_entries, dtype = 'int64')
+    monitor_id = 1 + index % number_monitors
+    timestamp = START_TIMESTAMP + 60 * (index // number_monitors)
+    latency = generator.lognormal(
+        numpy.log(0.05 + 0.002 * monitor_id),
+        0.8,
+        number_entries
+    )
+
+    return speedsentry.LatencyFrame(
+        {
+            'monitor_id' : monitor_id,
+            'timestamp' : timestamp,
+            'latency' : latency,
+            'region_id' : numpy.ones(number_entries, dtype = 'int64'),
+            'average' : latency,
+            'variance' : numpy.zeros(number_entries),
+            'minimum' : latency,
+            'maximum' : latency,
+            'start_timestamp' : timestamp,
+            'end_timestamp' : timestamp,
+            'number_samples' : numpy.ones(number_entries, dtype = 'int64')
+        }
+    )
+
+
+def exact_percentiles(frame) -> dict:
+    """
+    Function that computes exact percentiles for each monitor.
+
+    :param frame:
+        The frame holding every sample.
+
+    :return:
+        Returns a dictionary keyed by monitor ID holding a tuple of the
+        exact percentiles.
+
+    :type frame: speedsentry.LatencyFrame
+    :rtype:      dict
+
+    """
+
+    frame = frame.order_by('monitor_id')
+    return {
+        monitor_id : tuple(
+            numpy.percentile(
+                frame.monitor(monitor_id).average,
+                PERCENTILES,
+                method = 'lower'
+            ).tolist()
+        )
+        for monitor_id in numpy.unique(frame.monitor_id).tolist()
+    }
+
+
+def largest_errors(estimated : dict, exact : dict) -> list:
+    """
+    Function that determines the largest relative error of each percentile.
+
+    :param estimated:
+        The estimated percentiles, keyed by key tuple.
+
+    :param exact:
+        The exact percentiles, keyed by monitor ID.
+
+    :return:
+        Returns a list holding the largest relative error of each
+        percentile.
+
+    :type estimated: dict
+    :type exact:     dict
+    :rtype:          list
+
+    """
+
+    result = [ 0.0 ] * len(PERCENTILES)
+    for (monitor_id,), values in estimated.items():
+        for i, (value, expected) in enumerate(zip(values, exact[monitor_id])):
+            result[i] = max(result[i], abs(value - expected) / expected)
+
+    return result
+
+
+def timed(function) -> tuple:
+    """
+    Function that times a single call.
+
+    :param function:
+        The function to time.
+
+    :return:
+        Returns a tuple holding the elapsed time, in seconds, and the value
+        returned by the call.
+
+    :type function: callable
+    :rtype:         tuple
+
+    """
+
+    start = time.perf_counter()
+    result = function()
+    return (time.perf_counter() - start, result)
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-e",
+    "--entries",
+    help = "You can use this switch to specify the number of samples.",
+    type = int,
+    default = 2000000,
+    dest = 'number_entries'
+)
+
+command_line_parser.add_argument(
+    "-m",
+    "--monitors",
+    help = "You can use this switch to specify the number of monitors.",
+    type = int,
+    default = 1000,
+    dest = 'number_monitors'
+)
+
+command_line_parser.add_argument(
+    "-s",
+    "--streamed",
+    help = "You can use this switch to specify the number of samples added "
+           "one entry at a time, as from SpeedSentry.latency_stream.",
+    type = int,
+    default = 200000,
+    dest = 'number_streamed'
+)
+
+arguments = command_line_parser.parse_args()
+
+frame = build_frame(arguments.number_entries, arguments.number_monitors)
+exact_time, exact = timed(lambda: exact_percentiles(frame))
+
+sketches = speedsentry.SketchMap()
+build_time, number_added = timed(lambda: sketches.update(frame))
+
+half = arguments.number_entries // 2
+first = speedsentry.SketchMap()
+first.update(frame.between(None, int(frame.timestamp[half])))
+second = speedsentry.SketchMap()
+second.update(frame.between(int(frame.timestamp[half]) + 1, None))
+serialize_time, serialized = timed(lambda: second.to_bytes())
+restore_time, restored = timed(
+    lambda: speedsentry.SketchMap.from_bytes(serialized)
+)
+merge_time, unused = timed(lambda: first.merge(restored))
+
+entries = [
+    speedsentry.LatencyEntry(
+        {
+            'monitor_id' : m,
+            'timestamp' : t,
+            'latency' : l,
+            'region_id' : 1
+        }
+    )
+    for m, t, l in zip(
+        frame.monitor_id[:arguments.number_streamed].tolist(),
+        frame.timestamp[:arguments.number_streamed].tolist(),
+        frame.latency[:arguments.number_streamed].tolist()
+    )
+]
+streamed = speedsentry.SketchMap()
+stream_time, unused = timed(lambda: streamed.update(iter(entries)))
+
+estimated = sketches.percentiles(PERCENTILES)
+errors = largest_errors(estimated, exact)
+merged_errors = largest_errors(first.percentiles(PERCENTILES), exact)
+full_size = len(sketches.to_bytes())
+exact_size = len(pickle.dumps(frame.average))
+
+print("Samples:                          %d"%arguments.number_entries)
+print("Monitors:                         %d"%len(sketches))
+print("Relative accuracy:                %g"%sketches.relative_accuracy)
+print()
+print("%-12s %18s %18s"%("Percentile", "largest error", "after merge"))
+for percentile, error, merged_error in zip(
+        PERCENTILES,
+        errors,
+        merged_errors
+    ):
+    print(
+        "p%-11g %17.3f%% %17.3f%%"%(
+            percentile,
+            100 * error,
+            100 * merged_error
+        )
+    )
+
+print()
+print("Every sample, float64:            %8.1f kB"%(exact_size / 1024))
+print("Serialized sketches:              %8.1f kB"%(full_size / 1024))
+print(
+    "Average bytes per monitor:        %8.1f"%(
+        full_size / len(sketches)
+    )
+)
+print()
+print("Exact percentiles:                %8.1f ms"%(1.0E3 * exact_time))
+print("Sketches from frame:              %8.1f ms"%(1.0E3 * build_time))
+print(
+    "Sketches from streamed entries:   %8.1f ms (%d entries)"%(
+        1.0E3 * stream_time,
+        arguments.number_streamed
+    )
+)
+print("Serialize half:                   %8.1f ms"%(1.0E3 * serialize_time))
+print("Restore half:                     %8.1f ms"%(1.0E3 * restore_time))
+print("Merge halves:                     %8.1f ms"%(1.0E3 * merge_time))
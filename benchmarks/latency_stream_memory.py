@@ -0,0 +1,217 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that compares the peak memory used by latency_list
+and latency_stream against a large synthetic response.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import time
+import tracemalloc
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+import speedsentry
+import stand_in_server
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to compare the peak memory used when
+reading latency entries with latency_list and with latency_stream.  Responses
+of increasing size are served by a local stand-in server.  The response body
+is encoded before measurement starts so only client allocations are counted.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def measure(function) -> tuple:
+    """
+    Function that measures the peak traced memory and elapsed time of a
+    callable.
+
+    :param function:
+        The callable to measure.  The callable should return the number of
+        entries received.
+
+    :return:
+        Returns a tuple holding the number of entries, the peak memory in
+        bytes, and the elapsed time in seconds.
+
+    :type function: callable
+    :rtype:         tuple
+
+    """
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        number_entries = function()
+        elapsed = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return (number_entries, peak, elapsed)
+
+
+def run_list(api) -> int:
+    """
+    Function that reads all latency entries using latency_list.
+
+    :param api:
+        The API instance to use.
+
+    :return:
+        Returns the number of entries received.
+
+    :type api: speedsentry.SpeedSentry
+    :rtype:    int
+
+    """
+
+    recent, aggregated = api.latency_list()
+    return len(recent) + len(aggregated)
+
+
+def run_stream(api, chunk_size : int) -> int:
+    """
+    Function that reads all latency entries using latency_stream.  Entries
+    are discarded as they are received.
+
+    :param api:
+        The API instance to use.
+
+    :param chunk_size:
+        The streaming chunk size, in bytes.
+
+    :return:
+        Returns the number of entries received.
+
+    :type api:        speedsentry.SpeedSentry
+    :type chunk_size: int
+    :rtype:           int
+
+    """
+
+    number_entries = 0
+    for entry in api.latency_stream(chunk_size = chunk_size):
+        number_entries += 1
+
+    return number_entries
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-n",
+    "--entries",
+    help = "You can use this switch to specify the largest number of entries "
+           "in the synthetic response.  Smaller responses are also measured.",
+    type = int,
+    default = 400000,
+    dest = 'number_entries'
+)
+
+command_line_parser.add_argument(
+    "-c",
+    "--chunk-size",
+    help = "You can use this switch to specify the streaming chunk size in "
+           "bytes.",
+    type = int,
+    default = speedsentry.outbound_rest_api_v1.DEFAULT_CHUNK_SIZE,
+    dest = 'chunk_size'
+)
+
+arguments = command_line_parser.parse_args()
+
+print(
+    "%-16s %10s %14s %10s %14s %10s"%(
+        "Entries",
+        "body MB",
+        "list peak MB",
+        "list s",
+        "stream peak MB",
+        "stream s"
+    )
+)
+
+number_entries = max(4, arguments.number_entries // 16)
+while number_entries <= arguments.number_entries:
+    response = stand_in_server.build_latency_response(
+        number_recent = number_entries // 4,
+        number_aggregated = number_entries - number_entries // 4
+    )
+
+    with stand_in_server.StandInServer(latency_response = response) as server:
+        del response
+        with speedsentry.SpeedSentry(
+                customer_identifier = stand_in_server.CUSTOMER_IDENTIFIER,
+                customer_secret = stand_in_server.CUSTOMER_SECRET,
+                authority = server.authority
+            ) as api:
+            api.status_list()
+
+            list_entries, list_peak, list_time = measure(
+                lambda: run_list(api)
+            )
+            stream_entries, stream_peak, stream_time = measure(
+                lambda: run_stream(api, arguments.chunk_size)
+            )
+
+            if list_entries != stream_entries:
+                sys.stderr.write("*** Entry counts differ.\n")
+                exit(1)
+
+            body_size = server.latency_response_size
+
+    print(
+        "%-16d %10.1f %14.1f %10.3f %14.1f %10.3f"%(
+            list_entries,
+            body_size / 1048576.0,
+            list_peak / 1048576.0,
+            list_time,
+            stream_peak / 1048576.0,
+            stream_time
+        )
+    )
+
+    number_entries *= 2
@@ -0,0 +1,320 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that compares repeatedly downloading the latency
+history with incremental synchronization into a local latency store.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import base64
+import tempfile
+import time
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+import speedsentry
+import stand_in_server
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to compare the bytes received and
+the time taken to keep an up to date copy of the latency history, either by
+calling latency_list each time or by calling latency_query with a local
+latency store.  New entries are added to the stand-in server before each
+refresh.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def run(
+        api,
+        server,
+        history : dict,
+        refresh,
+        number_refreshes : int,
+        number_new : int,
+        window : int
+    ) -> tuple:
+    """
+    Function that performs a number of refreshes.
+
+    :param api:
+        The API instance to use.
+
+    :param server:
+        The stand-in server.
+
+    :param history:
+        The latency response held by the stand-in server.
+
+    :param refresh:
+        A callable taking the API instance and a start timestamp that
+        performs a single refresh and returns the recent and aggregated
+        entries.
+
+    :param number_refreshes:
+        The number of refreshes to perform.
+
+    :param number_new:
+        The number of new entries added before each refresh.
+
+    :param window:
+        The time span, in seconds, ending at the newest entry that each
+        refresh requests.  A value of None requests the full history.
+
+    :return:
+        Returns a tuple holding the elapsed time, in seconds, the number of
+        bytes received, and the number of recent entries held after the last
+        refresh.
+
+    :type api:              speedsentry.SpeedSentry
+    :type server:           stand_in_server.StandInServer
+    :type history:          dict
+    :type refresh:          callable
+    :type number_refreshes: int
+    :type number_new:       int
+    :type window:           int or None
+    :rtype:                 tuple
+
+    """
+
+    starting_bytes = server.latency_bytes_sent
+    last = max(e['timestamp'] for e in history['recent'])
+    elapsed = 0
+    recent = []
+    for i in range(number_refreshes):
+        server.append_latency(
+            [
+                {
+                    'monitor_id' : 1 + j % 10,
+                    'timestamp' : last + 60 * (1 + j // 10),
+                    'latency' : 0.1,
+                    'region_id' : 1 + j % 4
+                }
+                for j in range(number_new)
+            ]
+        )
+
+        last += 60 * ((number_new + 9) // 10)
+        start_timestamp = last - window if window is not None else None
+
+        start = time.monotonic()
+        recent, aggregated = refresh(api, start_timestamp)
+        elapsed += time.monotonic() - start
+
+    return (elapsed, server.latency_bytes_sent - starting_bytes, len(recent))
+
+
+
+def limits(start_timestamp : int) -> dict:
+    """
+    Function that builds the query parameters for a refresh.
+
+    :param start_timestamp:
+        The first timestamp requested.  A value of None requests the full
+        history.
+
+    :return:
+        Returns the query parameters.
+
+    :type start_timestamp: int or None
+    :rtype:                dict
+
+    """
+
+    if start_timestamp is not None:
+        result = { 'start_timestamp' : start_timestamp }
+    else:
+        result = dict()
+
+    return result
+
+
+def list_refresh(api, start_timestamp : int) -> tuple:
+    """
+    Function that refreshes using latency_list.
+
+    :param api:
+        The API instance to use.
+
+    :param start_timestamp:
+        The first timestamp requested.  A value of None requests the full
+        history.
+
+    :return:
+        Returns the recent and aggregated entries.
+
+    :type api:             speedsentry.SpeedSentry
+    :type start_timestamp: int or None
+    :rtype:                tuple
+
+    """
+
+    return api.latency_list(**limits(start_timestamp))
+
+
+def query_refresh(api, start_timestamp : int) -> tuple:
+    """
+    Function that refreshes using latency_query.
+
+    :param api:
+        The API instance to use.
+
+    :param start_timestamp:
+        The first timestamp requested.  A value of None requests the full
+        history.
+
+    :return:
+        Returns the recent and aggregated entries.
+
+    :type api:             speedsentry.SpeedSentry
+    :type start_timestamp: int or None
+    :rtype:                tuple
+
+    """
+
+    return api.latency_query(**limits(start_timestamp))
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-e",
+    "--entries",
+    help = "You can use this switch to specify the number of recent entries "
+           "initially held by the server.",
+    type = int,
+    default = 20000,
+    dest = 'number_entries'
+)
+
+command_line_parser.add_argument(
+    "-r",
+    "--refreshes",
+    help = "You can use this switch to specify the number of refreshes.",
+    type = int,
+    default = 20,
+    dest = 'number_refreshes'
+)
+
+command_line_parser.add_argument(
+    "-n",
+    "--new",
+    help = "You can use this switch to specify the number of entries added "
+           "before each refresh.",
+    type = int,
+    default = 40,
+    dest = 'number_new'
+)
+
+command_line_parser.add_argument(
+    "-w",
+    "--window",
+    help = "You can use this switch to specify the time span, in seconds, "
+           "requested by the windowed refreshes.",
+    type = int,
+    default = 86400,
+    dest = 'window'
+)
+
+arguments = command_line_parser.parse_args()
+
+secret = base64.b64encode(stand_in_server.CUSTOMER_SECRET).decode('utf-8')
+
+print(
+    "%-24s %12s %12s %10s"%("Configuration", "bytes", "ms", "entries")
+)
+
+with tempfile.TemporaryDirectory() as directory:
+    configurations = (
+        ("latency_list, full", False, list_refresh, None),
+        ("latency_query, full", True, query_refresh, None),
+        ("latency_list, window", False, list_refresh, arguments.window),
+        ("latency_query, window", True, query_refresh, arguments.window)
+    )
+
+    for index, (name, use_store, refresh, window) in enumerate(
+            configurations
+        ):
+        history = stand_in_server.build_latency_response(
+            arguments.number_entries,
+            arguments.number_entries // 4
+        )
+
+        with stand_in_server.StandInServer(
+                latency_response = history
+            ) as server:
+            if use_store:
+                store = speedsentry.LatencyStore(
+                    os.path.join(directory, "latency%d.sqlite3"%index)
+                )
+            else:
+                store = None
+
+            api = speedsentry.SpeedSentry(
+                stand_in_server.CUSTOMER_IDENTIFIER,
+                secret,
+                authority = server.authority,
+                latency_store = store
+            )
+
+            with api:
+                elapsed, number_bytes, number_recent = run(
+                    api,
+                    server,
+                    history,
+                    refresh,
+                    arguments.number_refreshes,
+                    arguments.number_new,
+                    window
+                )
+
+            if store is not None:
+                store.close()
+
+        print(
+            "%-24s %12d %12.1f %10d"%(
+                name,
+                number_bytes,
+                1.0E3 * elapsed,
+                number_recent
+            )
+        )
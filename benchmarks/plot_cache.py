@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that measures the effect of the plot cache on a
+status page that repeatedly requests the same rolling latency plots.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import base64
+import tempfile
+import time
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+import speedsentry
+import stand_in_server
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to compare the number of requests
+and the time taken by a status page that repeatedly requests "last 24 hours"
+latency plots for a set of monitors.  Each call computes its start timestamp
+from the current time, so without rounding to a time bucket no two calls made
+in different seconds share a cache entry.  A second process is simulated by
+a new cache sharing the first cache's directory.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def measure(api, number_calls : int, number_monitors : int) -> float:
+    """
+    Function that issues a series of rolling plot requests.
+
+    :param api:
+        The API instance to use.
+
+    :param number_calls:
+        The number of calls to issue.
+
+    :param number_monitors:
+        The number of monitors plotted.
+
+    :return:
+        Returns the elapsed time, in seconds.
+
+    :type api:             speedsentry.SpeedSentry
+    :type number_calls:    int
+    :type number_monitors: int
+    :rtype:                float
+
+    """
+
+    start = time.monotonic()
+    for i in range(number_calls):
+        api.latency_plot(
+            monitor_id = 1 + i % number_monitors,
+            start_timestamp = int(time.time()) - 86400,
+            width = 640,
+            height = 480
+        )
+
+    return time.monotonic() - start
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-n",
+    "--calls",
+    help = "You can use this switch to specify the number of calls per "
+           "configuration.",
+    type = int,
+    default = 200,
+    dest = 'number_calls'
+)
+
+command_line_parser.add_argument(
+    "-m",
+    "--monitors",
+    help = "You can use this switch to specify the number of monitors "
+           "plotted.",
+    type = int,
+    default = 10,
+    dest = 'number_monitors'
+)
+
+command_line_parser.add_argument(
+    "-d",
+    "--delay",
+    help = "You can use this switch to specify the simulated server "
+           "rendering time, in seconds.",
+    type = float,
+    default = 0.02,
+    dest = 'delay'
+)
+
+arguments = command_line_parser.parse_args()
+
+secret = base64.b64encode(stand_in_server.CUSTOMER_SECRET).decode('utf-8')
+
+with tempfile.TemporaryDirectory() as directory, \
+     stand_in_server.StandInServer(response_delay = arguments.delay) as server:
+    print(
+        "%-28s %10s %10s %8s %8s"%("Cache", "requests", "ms", "hits", "disk")
+    )
+
+    configurations = (
+        ("off", None),
+        ("on, no time bucket", speedsentry.PlotCache(time_bucket = None)),
+        ("on", speedsentry.PlotCache(directory = directory)),
+        ("on, new process, disk", speedsentry.PlotCache(directory = directory))
+    )
+
+    for name, plot_cache in configurations:
+        api = speedsentry.SpeedSentry(
+            stand_in_server.CUSTOMER_IDENTIFIER,
+            secret,
+            authority = server.authority,
+            plot_cache = plot_cache
+        )
+
+        with api:
+            starting_requests = server.request_count
+            elapsed = measure(
+                api,
+                arguments.number_calls,
+                arguments.number_monitors
+            )
+
+        statistics = plot_cache.statistics if plot_cache is not None else None
+        print(
+            "%-28s %10d %10.1f %8d %8d"%(
+                name,
+                server.request_count - starting_requests,
+                1.0E3 * elapsed,
+                statistics.hits if statistics is not None else 0,
+                statistics.disk_hits if statistics is not None else 0
+            )
+        )
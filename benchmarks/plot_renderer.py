@@ -0,0 +1,253 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that measures the time needed to render latency
+plots locally.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import io
+import time
+
+import numpy
+import matplotlib.figure
+import matplotlib.backends.backend_agg
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+import speedsentry
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to measure the time needed to render
+a history plot as the length of the history grows, with the renderer's
+decimation and with the full series drawn directly by matplotlib.  The tool
+then measures rendering a set of dashboard plots in this process and with a
+pool of worker processes.
+
+"""
+
+START_TIMESTAMP = 1640995200
+"""
+The timestamp of the first synthetic sample.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def build_frame(number_entries : int, number_monitors : int):
+    """
+    Function that builds a frame of synthetic samples taken once a minute
+    for each monitor.
+
+    :param number_entries:
+        The number of samples.
+
+    :param number_monitors:
+        The number of monitors.
+
+    :return:
+        Returns the frame.
+
+    :type number_entries:  int
+    :type number_monitors: int
+    :rtype:                speedsentry.LatencyFrame
+
+    """
+
+    generator = numpy.random.default_rng(1)
+    index = numpy.arange(number_entries, dtype = 'int64')
+    timestamp = START_TIMESTAMP + 60 * (index // number_monitors)
+    latency = generator.gamma(2.0, 0.05, number_entries)
+
+    return speedsentry.LatencyFrame(
+        {
+            'monitor_id' : 1 + index % number_monitors,
+            'timestamp' : timestamp,
+            'latency' : latency,
+            'region_id' : numpy.ones(number_entries, dtype = 'int64'),
+            'average' : latency,
+            'variance' : numpy.zeros(number_entries),
+            'minimum' : latency,
+            'maximum' : latency,
+            'start_timestamp' : timestamp,
+            'end_timestamp' : timestamp,
+            'number_samples' : numpy.ones(number_entries, dtype = 'int64')
+        }
+    )
+
+
+def render_directly(frame, width : int, height : int) -> bytes:
+    """
+    Function that renders every sample of a frame without decimation.
+
+    :param frame:
+        The frame to plot, sorted by timestamp.
+
+    :param width:
+        The plot width, in pixels.
+
+    :param height:
+        The plot height, in pixels.
+
+    :return:
+        Returns the PNG image.
+
+    :type frame:  speedsentry.LatencyFrame
+    :type width:  int
+    :type height: int
+    :rtype:       bytes
+
+    """
+
+    figure = matplotlib.figure.Figure(
+        figsize = (width / 100, height / 100),
+        dpi = 100
+    )
+    canvas = matplotlib.backends.backend_agg.FigureCanvasAgg(figure)
+    axes = figure.add_subplot(1, 1, 1)
+    axes.plot(
+        frame.timestamp.astype('datetime64[s]'),
+        frame.average,
+        linewidth = 1
+    )
+    axes.grid(True)
+    figure.tight_layout()
+
+    output = io.BytesIO()
+    canvas.print_figure(output, format = 'png', dpi = 100)
+
+    return output.getvalue()
+
+
+def timed(function) -> float:
+    """
+    Function that times a single call.
+
+    :param function:
+        The function to time.
+
+    :return:
+        Returns the elapsed time, in seconds.
+
+    :type function: callable
+    :rtype:         float
+
+    """
+
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-d",
+    "--dashboards",
+    help = "You can use this switch to specify the number of dashboard "
+           "plots rendered.",
+    type = int,
+    default = 48,
+    dest = 'number_dashboards'
+)
+
+command_line_parser.add_argument(
+    "-p",
+    "--processes",
+    help = "You can use this switch to specify the number of worker "
+           "processes.  By default one process per CPU is used.",
+    type = int,
+    default = None,
+    dest = 'number_processes'
+)
+
+arguments = command_line_parser.parse_args()
+
+width = 800
+height = 400
+
+print("%-12s %14s %14s"%("Samples", "decimated ms", "direct ms"))
+for number_entries in (10000, 100000, 1000000, 4000000):
+    frame = build_frame(number_entries, 1)
+    renderer = speedsentry.PlotRenderer(frame)
+    renderer.render(width = width, height = height)
+
+    decimated = timed(lambda: renderer.render(width = width, height = height))
+    direct = timed(
+        lambda: render_directly(renderer.frame, width, height)
+    )
+
+    print(
+        "%-12d %14.1f %14.1f"%(
+            number_entries,
+            1.0E3 * decimated,
+            1.0E3 * direct
+        )
+    )
+
+number_monitors = arguments.number_dashboards // 2
+renderer = speedsentry.PlotRenderer(build_frame(2000000, number_monitors))
+requests = [
+    {
+        'monitor_id' : 1 + i // 2,
+        'plot_type' : "history" if i % 2 == 0 else "histogram",
+        'width' : 640,
+        'height' : 320
+    }
+    for i in range(arguments.number_dashboards)
+]
+
+serial = timed(lambda: renderer.render_many(requests, processes = 1))
+parallel = timed(
+    lambda: renderer.render_many(requests, arguments.number_processes)
+)
+
+print()
+print(
+    "%d dashboard plots from 2000000 samples:"%arguments.number_dashboards
+)
+print("    This process:   %8.1f ms"%(1.0E3 * serial))
+print(
+    "    Worker pool:    %8.1f ms (%d CPUs)"%(
+        1.0E3 * parallel,
+        os.cpu_count()
+    )
+)
@@ -0,0 +1,165 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that compares dictionary backed and compact slotted
+record classes.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import timeit
+import tracemalloc
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+import speedsentry
+from speedsentry import dictionary_object
+import stand_in_server
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to compare the memory used per
+record, construction time, and attribute access time of the dictionary backed
+record classes against their compact slotted equivalents.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def memory_per_record(class_type, raw_entries : list) -> float:
+    """
+    Function that measures the memory used per record.
+
+    :param class_type:
+        The record class to measure.
+
+    :param raw_entries:
+        The raw entries used to construct records.
+
+    :return:
+        Returns the average memory, in bytes, used per record.
+
+    :type class_type:  class
+    :type raw_entries: list
+    :rtype:            float
+
+    """
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        records = [ class_type(e) for e in raw_entries ]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    del records
+    return (after - before) / len(raw_entries)
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-n",
+    "--records",
+    help = "You can use this switch to specify the number of records.",
+    type = int,
+    default = 100000,
+    dest = 'number_records'
+)
+
+arguments = command_line_parser.parse_args()
+number_records = arguments.number_records
+
+response = stand_in_server.build_latency_response(
+    number_recent = number_records,
+    number_aggregated = number_records
+)
+
+benchmarks = (
+    (speedsentry.LatencyEntry, response['recent'], 'latency'),
+    (speedsentry.AggregatedLatencyEntry, response['aggregated'], 'variance')
+)
+
+print(
+    "%-34s %10s %12s %12s %12s"%(
+        "Class",
+        "bytes/rec",
+        "build us",
+        "attr ns",
+        "item ns"
+    )
+)
+
+for dict_class, raw_entries, attribute in benchmarks:
+    for class_type in (dict_class, dictionary_object.slotted_class(dict_class)):
+        if class_type is dict_class:
+            description = "%s (dict)"%class_type.__name__
+        else:
+            description = "%s (slotted)"%class_type.__name__
+
+        per_record = memory_per_record(class_type, raw_entries)
+
+        build_time = timeit.timeit(
+            lambda: [ class_type(e) for e in raw_entries ],
+            number = 1
+        )
+
+        record = class_type(raw_entries[0])
+        access_count = 1000000
+        attribute_time = timeit.timeit(
+            "record.%s"%attribute,
+            globals = { 'record' : record },
+            number = access_count
+        )
+        item_time = timeit.timeit(
+            "record['%s']"%attribute,
+            globals = { 'record' : record },
+            number = access_count
+        )
+
+        print(
+            "%-34s %10.1f %12.3f %12.1f %12.1f"%(
+                description,
+                per_record,
+                1.0E6 * build_time / len(raw_entries),
+                1.0E9 * attribute_time / access_count,
+                1.0E9 * item_time / access_count
+            )
+        )
@@ -0,0 +1,161 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that measures the effect of the response cache on
+calls to endpoints whose data changes rarely.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import base64
+import time
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+import speedsentry
+import stand_in_server
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to compare the number of requests
+and the time taken by a mix of capabilities, hosts, and regions calls, with
+and without the response cache.  A monitors update is issued part way through
+the run to show that affected entries are discarded.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def measure(api, number_calls : int) -> float:
+    """
+    Function that issues a mix of metadata calls.
+
+    :param api:
+        The API instance to use.
+
+    :param number_calls:
+        The number of calls to issue.
+
+    :return:
+        Returns the elapsed time, in seconds.
+
+    :type api:          speedsentry.SpeedSentry
+    :type number_calls: int
+    :rtype:             float
+
+    """
+
+    calls = (
+        lambda: api.capabilities_get(),
+        lambda: api.hosts_list(),
+        lambda: api.regions_list(),
+        lambda: api.regions_get(2)
+    )
+
+    start = time.monotonic()
+    for i in range(number_calls):
+        if i == number_calls // 2:
+            api.monitors_update([])
+
+        calls[i % len(calls)]()
+
+    return time.monotonic() - start
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-n",
+    "--calls",
+    help = "You can use this switch to specify the number of calls per "
+           "configuration.",
+    type = int,
+    default = 400,
+    dest = 'number_calls'
+)
+
+command_line_parser.add_argument(
+    "-d",
+    "--delay",
+    help = "You can use this switch to specify the simulated server response "
+           "time, in seconds.",
+    type = float,
+    default = 0.005,
+    dest = 'delay'
+)
+
+arguments = command_line_parser.parse_args()
+
+secret = base64.b64encode(stand_in_server.CUSTOMER_SECRET).decode('utf-8')
+
+with stand_in_server.StandInServer(response_delay = arguments.delay) as server:
+    print(
+        "%-12s %10s %10s %8s %8s %8s"%(
+            "Cache",
+            "requests",
+            "ms",
+            "hits",
+            "misses",
+            "invalid"
+        )
+    )
+
+    for response_cache in (None, speedsentry.ResponseCache()):
+        api = speedsentry.SpeedSentry(
+            stand_in_server.CUSTOMER_IDENTIFIER,
+            secret,
+            authority = server.authority,
+            response_cache = response_cache
+        )
+
+        with api:
+            starting_requests = server.request_count
+            elapsed = measure(api, arguments.number_calls)
+            statistics = api.cache_statistics
+
+        print(
+            "%-12s %10d %10.1f %8d %8d %8d"%(
+                "off" if response_cache is None else "on",
+                server.request_count - starting_requests,
+                1.0E3 * elapsed,
+                statistics.hits if statistics is not None else 0,
+                statistics.misses if statistics is not None else 0,
+                statistics.invalidations if statistics is not None else 0
+            )
+        )
@@ -0,0 +1,239 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that measures message signing throughput.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import timeit
+import struct
+import hmac
+import json
+import base64
+import time
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+from speedsentry import outbound_rest_api_v1
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to compare the throughput of the
+cached per-window HMAC signer against computing a fresh HMAC per message.
+
+"""
+
+CUSTOMER_IDENTIFIER = "0123456789ABCDEF"
+"""
+The customer identifier used for the benchmark.
+
+"""
+
+CUSTOMER_SECRET = bytes(range(outbound_rest_api_v1.SECRET_LENGTH))
+"""
+The customer secret used for the benchmark.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def build_payload_uncached(message, time_delta : int) -> str:
+    """
+    Function that builds a signed payload without caching keyed HMAC state.
+    This mirrors the approach used prior to the introduction of the
+    MessageSigner class.
+
+    :param message:
+        The message to be signed.
+
+    :param time_delta:
+        The time delta, in seconds.
+
+    :return:
+        Returns the signed payload.
+
+    :type message:    dict or list
+    :type time_delta: int
+    :rtype:           str
+
+    """
+
+    raw_message = json.dumps(message).encode('utf-8')
+    hash_time_value = int((int(time.time()) + time_delta) / 30)
+    key = CUSTOMER_SECRET + struct.pack('<Q', hash_time_value)
+    raw_hash = hmac.new(
+        key = key,
+        msg = raw_message,
+        digestmod = outbound_rest_api_v1.HASH_ALGORITHM
+    ).digest()
+
+    return json.dumps(
+        {
+            'cid' : CUSTOMER_IDENTIFIER,
+            'data' : base64.b64encode(raw_message).decode('utf-8'),
+            'hash' : base64.b64encode(raw_hash).decode('utf-8')
+        }
+    )
+
+
+def build_large_message(number_entries : int) -> list:
+    """
+    Function that builds a large monitors update message.
+
+    :param number_entries:
+        The number of monitor entries to include.
+
+    :return:
+        Returns the message.
+
+    :type number_entries: int
+    :rtype:               list
+
+    """
+
+    return [
+        {
+            'uri' : "https://www.example.com/path/to/page/%d"%i,
+            'method' : "post",
+            'content_check_mode' : "any_keywords",
+            'keywords' : [ "a2V5d29yZA==", "b3RoZXI=" ],
+            'post_content_type' : "json",
+            'post_user_agent' : "SpeedSentry Benchmark",
+            'post_content' : "eyJ2YWx1ZSI6IDQyfQ=="
+        }
+        for i in range(number_entries)
+    ]
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-n",
+    "--iterations",
+    help = "You can use this switch to specify the number of messages to "
+           "sign per measurement.",
+    type = int,
+    default = 50000,
+    dest = 'iterations'
+)
+
+arguments = command_line_parser.parse_args()
+iterations = arguments.iterations
+
+signer = outbound_rest_api_v1.MessageSigner(
+    CUSTOMER_IDENTIFIER,
+    CUSTOMER_SECRET
+)
+
+messages = [
+    ("small (empty dict)", dict()),
+    ("medium (latency query)", { 'monitor_id' : 12, 'start_timestamp' : 1 }),
+    ("large (100 monitor entries)", build_large_message(100))
+]
+
+window = signer.window(0)
+key = CUSTOMER_SECRET + struct.pack('<Q', window)
+expected = hmac.new(
+    key = key,
+    msg = b"check",
+    digestmod = outbound_rest_api_v1.HASH_ALGORITHM
+).digest()
+
+if signer.sign(b"check", window) != expected:
+    sys.stderr.write("*** Cached signer produced an incorrect hash.\n")
+    exit(1)
+
+print(
+    "%-30s %15s %15s %10s"%(
+        "Message",
+        "uncached msg/s",
+        "cached msg/s",
+        "speedup"
+    )
+)
+
+for description, message in messages:
+    count = max(1, iterations // (1 + len(json.dumps(message)) // 256))
+    uncached = timeit.timeit(
+        lambda: build_payload_uncached(message, 0),
+        number = count
+    )
+    cached = timeit.timeit(
+        lambda: signer.build_payload(message, 0),
+        number = count
+    )
+
+    print(
+        "%-30s %15.0f %15.0f %9.2fx"%(
+            description,
+            count / uncached,
+            count / cached,
+            uncached / cached
+        )
+    )
+
+raw_messages = [
+    ("sign only, 16 bytes", b"x" * 16),
+    ("sign only, 64 kB", b"x" * 65536)
+]
+
+for description, raw_message in raw_messages:
+    count = max(1, iterations // (1 + len(raw_message) // 256))
+    uncached = timeit.timeit(
+        lambda: hmac.new(
+            key = key,
+            msg = raw_message,
+            digestmod = outbound_rest_api_v1.HASH_ALGORITHM
+        ).digest(),
+        number = count
+    )
+    cached = timeit.timeit(
+        lambda: signer.sign(raw_message, window),
+        number = count
+    )
+
+    print(
+        "%-30s %15.0f %15.0f %9.2fx"%(
+            description,
+            count / uncached,
+            count / cached,
+            uncached / cached
+        )
+    )
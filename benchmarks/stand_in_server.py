@@ -0,0 +1,730 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python module that provides a small, local stand-in for the SpeedSentry REST
+API.  The stand-in verifies message hashes exactly as the real service does and
+returns synthetic data.  It is used by the benchmarks in this directory.
+
+You can also run this module directly to start a stand-in server.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import argparse
+import threading
+import time
+import struct
+import hashlib
+import hmac
+import json
+import base64
+import random
+import collections
+import http.server
+
+###############################################################################
+# Globals:
+#
+
+CUSTOMER_IDENTIFIER = "0123456789ABCDEF"
+"""
+The customer identifier accepted by the stand-in server.
+
+"""
+
+CUSTOMER_SECRET = bytes(range(56))
+"""
+The customer secret accepted by the stand-in server.
+
+"""
+
+REQUEST_QUEUE_SIZE = 128
+"""
+The number of pending connections the stand-in server's listening socket
+holds.  This must be at least the largest number of threads used by the
+benchmarks so that no connection is refused while requests are handled.
+
+"""
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to run a local stand-in for the
+SpeedSentry REST API.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def build_latency_response(
+    number_recent : int,
+    number_aggregated : int,
+    number_monitors : int = 10,
+    number_regions : int = 4,
+    start_timestamp : int = 1640995200
+    ) -> dict:
+    """
+    Function you can use to generate a synthetic /v1/latency/list response.
+
+    :param number_recent:
+        The number of raw latency entries to generate.
+
+    :param number_aggregated:
+        The number of aggregated latency entries to generate.
+
+    :param number_monitors:
+        The number of distinct monitors to spread entries across.
+
+    :param number_regions:
+        The number of distinct regions to spread entries across.
+
+    :param start_timestamp:
+        The timestamp of the first generated entry.
+
+    :return:
+        Returns a dictionary matching the shape of the real response.
+
+    :type number_recent:     int
+    :type number_aggregated: int
+    :type number_monitors:   int
+    :type number_regions:    int
+    :type start_timestamp:   int
+    :rtype:                  dict
+
+    """
+
+    generator = random.Random(1)
+
+    aggregated = list()
+    for i in range(number_aggregated):
+        timestamp = start_timestamp + 3600 * (i // number_monitors)
+        average = generator.uniform(0.05, 0.5)
+        aggregated.append(
+            {
+                'monitor_id' : 1 + i % number_monitors,
+                'timestamp' : timestamp + generator.randrange(3600),
+                'latency' : average * generator.uniform(0.8, 1.2),
+                'region_id' : 1 + (i // number_monitors) % number_regions,
+                'average' : average,
+                'variance' : average * average * 0.01,
+                'minimum' : average * 0.5,
+                'maximum' : average * 2.0,
+                'start_timestamp' : timestamp,
+                'end_timestamp' : timestamp + 3599,
+                'number_samples' : 60
+            }
+        )
+
+    recent_start = start_timestamp + 3600 * (
+        (number_aggregated + number_monitors - 1) // number_monitors
+    )
+
+    recent = list()
+    for i in range(number_recent):
+        recent.append(
+            {
+                'monitor_id' : 1 + i % number_monitors,
+                'timestamp' : recent_start + 60 * (i // number_monitors),
+                'latency' : generator.uniform(0.05, 0.5),
+                'region_id' : 1 + (i // number_monitors) % number_regions
+            }
+        )
+
+    return { 'status' : 'OK', 'recent' : recent, 'aggregated' : aggregated }
+
+
+def build_multiple_response(number_monitors : int) -> dict:
+    """
+    Function you can use to generate a synthetic /v1/multiple/list response.
+
+    :param number_monitors:
+        The number of monitors to include.
+
+    :return:
+        Returns a dictionary matching the shape of the real response.
+
+    :type number_monitors: int
+    :rtype:                dict
+
+    """
+
+    monitors = dict()
+    host_schemes = dict()
+    monitor_status = dict()
+    events = list()
+    for i in range(number_monitors):
+        monitor_id = i + 1
+        host_scheme_id = i // 4 + 1
+        monitors[str(i)] = {
+            'monitor_id' : monitor_id,
+            'host_scheme_id' : host_scheme_id,
+            'user_ordering' : i,
+            'path' : "/page/%d"%i,
+            'url' : "https://host%d.example.com/page/%d"%(host_scheme_id, i),
+            'method' : "get",
+            'content_check_mode' : "no_check",
+            'keywords' : [ base64.b64encode(b"keyword").decode('utf-8') ],
+            'post_content_type' : "text",
+            'post_user_agent' : "",
+            'post_content' : ""
+        }
+        host_schemes[str(host_scheme_id)] = {
+            'host_scheme_id' : host_scheme_id,
+            'url' : "https://host%d.example.com"%host_scheme_id,
+            'ssl_expiration_timestamp' : 1700000000
+        }
+        monitor_status[str(monitor_id)] = "working"
+        events.append(
+            {
+                'event_id' : i + 1,
+                'monitor_id' : monitor_id,
+                'timestamp' : 1640995200 + i,
+                'event_type' : "working"
+            }
+        )
+
+    return {
+        'status' : 'OK',
+        'monitors' : monitors,
+        'host_schemes' : host_schemes,
+        'events' : events,
+        'monitor_status' : monitor_status
+    }
+
+###############################################################################
+# Class ThreadingServer:
+#
+
+class ThreadingServer(http.server.ThreadingHTTPServer):
+    """
+    Class that handles each request on its own thread, with a listen backlog
+    large enough for the benchmarks.
+
+    """
+
+    request_queue_size = REQUEST_QUEUE_SIZE
+    daemon_threads = True
+
+###############################################################################
+# Class StandInServer:
+#
+
+class StandInServer(object):
+    """
+    Class that runs a stand-in SpeedSentry REST API server on a background
+    thread.
+
+    """
+
+    def __init__(
+        self,
+        port : int = 0,
+        response_delay : float = 0,
+        time_skew : int = 0,
+        latency_response : dict = None,
+        number_monitors : int = 20
+        ):
+        """
+        Method that initializes the StandInServer class.
+
+        :param port:
+            The local port to listen on.  A value of 0 selects a free port.
+
+        :param response_delay:
+            A delay, in seconds, added to every response.  You can use this
+            value to simulate network and server latency.
+
+        :param time_skew:
+            The number of seconds the stand-in server's clock is ahead of the
+            local clock.
+
+        :param latency_response:
+            An optional response to return for /v1/latency/list.
+
+        :param number_monitors:
+            The number of monitors reported by the stand-in.
+
+        You can set the failure_count attribute to have the next
+        failure_count authenticated requests fail with failure_status.  You
+        can set the time_delta_drop_count attribute to have the connections
+        carrying the next time_delta_drop_count /td requests closed without a
+        response.  You
+        can set the slow_fraction and slow_delay attributes to add slow_delay
+        seconds to a random fraction of responses.  The client_ports
+        attribute counts the requests received from each client port.  The
+        latency_bytes_sent attribute counts the bytes of /v1/latency/list
+        response bodies sent.
+
+        :type port:             int
+        :type response_delay:   float
+        :type time_skew:        int
+        :type latency_response: dict or None
+        :type number_monitors:  int
+
+        """
+
+        super().__init__()
+
+        self.response_delay = response_delay
+        self.time_skew = time_skew
+        self.request_count = 0
+        self.time_delta_count = 0
+        self.unauthorized_count = 0
+        self.connection_count = 0
+        self.failure_count = 0
+        self.failure_status = 503
+        self.time_delta_drop_count = 0
+        self.slow_fraction = 0
+        self.slow_delay = 0
+        self.client_ports = collections.Counter()
+        self.latency_bytes_sent = 0
+
+        self.__lock = threading.Lock()
+        self.__latency_data = (
+            latency_response if latency_response is not None
+                else build_latency_response(100, 100)
+        )
+        self.__latency_response = json.dumps(
+            self.__latency_data
+        ).encode('utf-8')
+
+        multiple = build_multiple_response(number_monitors)
+        self.__responses = {
+            "v1/capabilities/get" : {
+                'status' : 'OK',
+                'capabilities' : {
+                    'maximum_number_monitors' : number_monitors,
+                    'polling_interval' : 60,
+                    'customer_active' : True,
+                    'multi_region_checking' : True,
+                    'supports_wordpress' : True,
+                    'supports_rest_api' : True,
+                    'supports_content_checking' : True,
+                    'supports_keyword_checking' : True,
+                    'supports_post_method' : True,
+                    'supports_latency_tracking' : True,
+                    'supports_ssl_expiration_checking' : True,
+                    'supports_ping_based_polling' : True,
+                    'supports_maintenance_mode' : True,
+                    'supports_rollups' : True,
+                    'paused' : False
+                }
+            },
+            "v1/hosts/list" : {
+                'status' : 'OK',
+                'host_schemes' : multiple['host_schemes']
+            },
+            "v1/monitors/list" : {
+                'status' : 'OK',
+                'monitors' : {
+                    str(m['monitor_id']) : m
+                    for m in multiple['monitors'].values()
+                }
+            },
+            "v1/regions/list" : {
+                'status' : 'OK',
+                'regions' : {
+                    "1" : { 'region_id' : 1, 'description' : "US East" },
+                    "2" : { 'region_id' : 2, 'description' : "US West" },
+                    "3" : { 'region_id' : 3, 'description' : "Europe" },
+                    "4" : { 'region_id' : 4, 'description' : "Asia" }
+                }
+            },
+            "v1/events/list" : {
+                'status' : 'OK',
+                'events' : multiple['events']
+            },
+            "v1/status/list" : {
+                'status' : 'OK',
+                'monitor_status' : multiple['monitor_status']
+            },
+            "v1/multiple/list" : multiple,
+            "v1/monitors/update" : { 'status' : 'OK' },
+            "v1/events/create" : { 'status' : 'OK' }
+        }
+
+        stand_in = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                stand_in.count_connection()
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                stand_in.count_client_port(self.client_address[1])
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length)
+                status, content_type, payload = stand_in.handle(
+                    self.path[1:],
+                    body
+                )
+
+                if status is None:
+                    self.close_connection = True
+                    return
+
+                if stand_in.response_delay:
+                    time.sleep(stand_in.response_delay)
+
+                if stand_in.slow_fraction                    and \
+                   random.random() < stand_in.slow_fraction     :
+                    time.sleep(stand_in.slow_delay)
+
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.__server = ThreadingServer(("127.0.0.1", port), Handler)
+        self.__thread = None
+
+
+    @property
+    def authority(self):
+        """
+        Read-only property holding the authority of this stand-in server.
+
+        :type: str
+
+        """
+
+        return "http://127.0.0.1:%d"%self.__server.server_address[1]
+
+
+    @property
+    def latency_response_size(self):
+        """
+        Read-only property holding the size, in bytes, of the encoded
+        /v1/latency/list response body.
+
+        :type: int
+
+        """
+
+        return len(self.__latency_response)
+
+
+    def append_latency(self, recent : list):
+        """
+        Method you can use to add recent entries to the /v1/latency/list
+        response.
+
+        :param recent:
+            The recent latency entries to add.
+
+        :type recent: list
+
+        """
+
+        with self.__lock:
+            self.__latency_data['recent'].extend(recent)
+            self.__latency_response = json.dumps(
+                self.__latency_data
+            ).encode('utf-8')
+
+
+    def start(self):
+        """
+        Method you can use to start the server on a background thread.
+
+        """
+
+        self.__thread = threading.Thread(
+            target = self.__server.serve_forever,
+            daemon = True
+        )
+        self.__thread.start()
+        return self
+
+
+    def stop(self):
+        """
+        Method you can use to stop the server.
+
+        """
+
+        self.__server.shutdown()
+        self.__server.server_close()
+
+
+    def __enter__(self):
+        return self.start()
+
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.stop()
+
+
+    def count_connection(self):
+        """
+        Method that records a newly accepted connection.
+
+        """
+
+        with self.__lock:
+            self.connection_count += 1
+
+
+    def count_client_port(self, port : int):
+        """
+        Method that records a request received from a client port.
+
+        :param port:
+            The client port.
+
+        :type port: int
+
+        """
+
+        with self.__lock:
+            self.client_ports[port] += 1
+
+
+    def handle(self, slug : str, body : bytes) -> tuple:
+        """
+        Method that processes a single request.
+
+        :param slug:
+            The requested slug.
+
+        :param body:
+            The raw request body.
+
+        :return:
+            Returns a tuple holding the status code, content type, and
+            response payload.  The status code is None if the connection
+            should be closed without a response.
+
+        :type slug: str
+        :type body: bytes
+        :rtype:     tuple
+
+        """
+
+        server_time = int(time.time()) + self.time_skew
+        request = json.loads(body)
+
+        if slug == "td":
+            with self.__lock:
+                self.time_delta_count += 1
+                drop = self.time_delta_drop_count > 0
+                if drop:
+                    self.time_delta_drop_count -= 1
+
+            if drop:
+                return (None, None, None)
+
+            response = {
+                'status' : 'OK',
+                'time_delta' : server_time - int(request['timestamp'])
+            }
+            return (200, 'application/json', json.dumps(response).encode())
+
+        raw_message = base64.b64decode(request['data'])
+        received_hash = base64.b64decode(request['hash'])
+        key = CUSTOMER_SECRET + struct.pack('<Q', server_time // 30)
+        expected_hash = hmac.new(
+            key = key,
+            msg = raw_message,
+            digestmod = hashlib.sha256
+        ).digest()
+
+        if request['cid'] != CUSTOMER_IDENTIFIER                or \
+           not hmac.compare_digest(received_hash, expected_hash)   :
+            with self.__lock:
+                self.unauthorized_count += 1
+
+            return (401, 'text/plain', b"unauthorized")
+
+        with self.__lock:
+            self.request_count += 1
+            fail = self.failure_count > 0
+            if fail:
+                self.failure_count -= 1
+
+        if fail:
+            return (self.failure_status, 'text/plain', b"unavailable")
+
+        message = json.loads(raw_message)
+        if slug == "v1/latency/list":
+            payload = self.__handle_latency(message)
+            with self.__lock:
+                self.latency_bytes_sent += len(payload)
+
+            return (200, 'application/json', payload)
+        elif slug == "v1/latency/plot":
+            return (200, 'image/png', b"\x89PNG\r\n\x1a\n" + bytes(4096))
+        elif slug.endswith("/get"):
+            return self.__handle_get(slug, message)
+        elif slug in self.__responses:
+            response = json.dumps(self.__responses[slug]).encode('utf-8')
+            return (200, 'application/json', response)
+        else:
+            return (404, 'text/plain', b"not found")
+
+
+    def __handle_latency(self, message : dict) -> bytes:
+        """
+        Method used internally to build a /v1/latency/list response, applying
+        any timestamp, monitor, and region limits in the request.
+
+        :param message:
+            The decoded request message.
+
+        :return:
+            Returns the encoded response.
+
+        :type message: dict
+        :rtype:        bytes
+
+        """
+
+        with self.__lock:
+            if not message:
+                return self.__latency_response
+
+            data = self.__latency_data
+            start = message.get('start_timestamp')
+            end = message.get('end_timestamp')
+            monitor_id = message.get('monitor_id')
+            region_id = message.get('region_id')
+
+            def included(entry):
+                return (
+                        (start is None or entry['timestamp'] >= start)
+                    and (end is None or entry['timestamp'] <= end)
+                    and (
+                           monitor_id is None
+                        or entry['monitor_id'] == monitor_id
+                    )
+                    and (region_id is None or entry['region_id'] == region_id)
+                )
+
+            response = {
+                'status' : 'OK',
+                'recent' : [ e for e in data['recent'] if included(e) ],
+                'aggregated' : [ e for e in data['aggregated'] if included(e) ]
+            }
+
+        return json.dumps(response).encode('utf-8')
+
+
+    def __handle_get(self, slug : str, message : dict) -> tuple:
+        """
+        Method used internally to process the single-entry get endpoints.
+
+        :param slug:
+            The requested slug.
+
+        :param message:
+            The decoded message.
+
+        :return:
+            Returns a tuple holding the status code, content type, and
+            response payload.
+
+        :type slug:    str
+        :type message: dict
+        :rtype:        tuple
+
+        """
+
+        if slug == "v1/capabilities/get":
+            response = self.__responses[slug]
+        elif slug == "v1/hosts/get":
+            hosts = self.__responses["v1/hosts/list"]['host_schemes']
+            entry = hosts.get(str(message['host_scheme_id']))
+            response = { 'status' : 'OK', 'host_scheme' : entry }
+        elif slug == "v1/monitors/get":
+            monitors = self.__responses["v1/monitors/list"]['monitors']
+            entry = monitors.get(str(message['monitor_id']))
+            response = { 'status' : 'OK', 'monitor' : entry }
+        elif slug == "v1/regions/get":
+            regions = self.__responses["v1/regions/list"]['regions']
+            entry = regions.get(str(message['region_id']))
+            response = { 'status' : 'OK', 'region' : entry }
+        elif slug == "v1/events/get":
+            events = self.__responses["v1/events/list"]['events']
+            index = message['event_id'] - 1
+            entry = events[index] if 0 <= index < len(events) else None
+            response = { 'status' : 'OK', 'event' : entry }
+        elif slug == "v1/status/get":
+            status = self.__responses["v1/status/list"]['monitor_status']
+            entry = status.get(str(message['monitor_id']))
+            response = { 'status' : 'OK', 'monitor_status' : entry }
+        else:
+            return (404, 'text/plain', b"not found")
+
+        if None in response.values():
+            response = { 'status' : 'failed, unknown ID' }
+
+        return (200, 'application/json', json.dumps(response).encode())
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+    command_line_parser.add_argument(
+        "-v",
+        "--version",
+        action = 'version',
+        version = VERSION
+    )
+
+    command_line_parser.add_argument(
+        "-p",
+        "--port",
+        help = "You can use this switch to specify the port to listen on.",
+        type = int,
+        default = 8080,
+        dest = 'port'
+    )
+
+    command_line_parser.add_argument(
+        "-d",
+        "--delay",
+        help = "You can use this switch to specify a per-response delay in "
+               "seconds.",
+        type = float,
+        default = 0,
+        dest = 'response_delay'
+    )
+
+    arguments = command_line_parser.parse_args()
+    server = StandInServer(
+        port = arguments.port,
+        response_delay = arguments.response_delay
+    )
+
+    sys.stdout.write("Listening on %s\n"%server.authority)
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,222 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Python command-line tool that measures call throughput when a single API
+instance is shared by a number of threads, and confirms that a shift in the
+server clock is resolved with a single time delta request.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import argparse
+import base64
+import threading
+import time
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+
+import speedsentry
+import stand_in_server
+
+###############################################################################
+# Globals:
+#
+
+VERSION = "1a"
+"""
+The tool version number.
+
+"""
+
+DESCRIPTION = """
+Copyright 2021-2022 Inesonic, LLC
+
+You can use this small command line tool to measure the call throughput of a
+single API instance shared by 1, 8, and 64 threads.  Half way through each
+run the stand-in server clock is shifted so every thread's next request is
+rejected at the same moment.  The tool reports the number of time delta
+requests needed to recover, which should be one per shift.
+
+"""
+
+THREAD_COUNTS = (1, 8, 64)
+"""
+The thread counts to measure.
+
+"""
+
+CLOCK_SHIFT = 600
+"""
+The amount, in seconds, the stand-in server clock is shifted during each run.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def run_threads(
+        api,
+        server,
+        number_threads : int,
+        number_rounds : int
+    ) -> tuple:
+    """
+    Function that has a number of threads call a shared API instance.
+
+    :param api:
+        The API instance to use.
+
+    :param server:
+        The stand-in server.  The server clock is shifted half way through
+        the run.
+
+    :param number_threads:
+        The number of threads.
+
+    :param number_rounds:
+        The number of calls made by each thread.
+
+    :return:
+        Returns a tuple holding the elapsed time, in seconds, the number of
+        calls made, and a list of errors.
+
+    :type api:            speedsentry.SpeedSentry
+    :type server:         stand_in_server.StandInServer
+    :type number_threads: int
+    :type number_rounds:  int
+    :rtype:               tuple
+
+    """
+
+    barrier = threading.Barrier(number_threads)
+    errors = list()
+
+    def worker():
+        try:
+            for round_index in range(number_rounds):
+                if round_index == number_rounds // 2:
+                    if barrier.wait() == 0:
+                        server.time_skew += CLOCK_SHIFT
+
+                    barrier.wait()
+
+                status = api.status_list()
+                if status.get(1) != "working":
+                    errors.append("unexpected result")
+        except Exception as e:
+            errors.append(repr(e))
+            barrier.abort()
+
+    threads = [
+        threading.Thread(target = worker) for i in range(number_threads)
+    ]
+
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.monotonic() - start
+    return (elapsed, number_threads * number_rounds, errors)
+
+###############################################################################
+# Main:
+#
+
+command_line_parser = argparse.ArgumentParser(description = DESCRIPTION)
+
+command_line_parser.add_argument(
+    "-v",
+    "--version",
+    action = 'version',
+    version = VERSION
+)
+
+command_line_parser.add_argument(
+    "-r",
+    "--rounds",
+    help = "You can use this switch to specify the number of calls per "
+           "thread.",
+    type = int,
+    default = 20,
+    dest = 'number_rounds'
+)
+
+command_line_parser.add_argument(
+    "-d",
+    "--delay",
+    help = "You can use this switch to specify the simulated server response "
+           "time, in seconds.",
+    type = float,
+    default = 0.01,
+    dest = 'delay'
+)
+
+arguments = command_line_parser.parse_args()
+
+secret = base64.b64encode(stand_in_server.CUSTOMER_SECRET).decode('utf-8')
+
+with stand_in_server.StandInServer(response_delay = arguments.delay) as server:
+    print(
+        "%-8s %10s %12s %10s %10s %12s %8s"%(
+            "Threads",
+            "calls",
+            "calls/s",
+            "td",
+            "rejected",
+            "connections",
+            "errors"
+        )
+    )
+
+    for number_threads in THREAD_COUNTS:
+        api = speedsentry.SpeedSentry(
+            stand_in_server.CUSTOMER_IDENTIFIER,
+            secret,
+            authority = server.authority,
+            maximum_connections_per_host = number_threads,
+            coalesce_requests = False
+        )
+
+        with api:
+            api.capabilities_get()
+
+            starting_time_deltas = server.time_delta_count
+            starting_rejections = server.unauthorized_count
+            starting_connections = server.connection_count
+            elapsed, number_calls, errors = run_threads(
+                api,
+                server,
+                number_threads,
+                arguments.number_rounds
+            )
+
+            print(
+                "%-8d %10d %12.1f %10d %10d %12d %8d"%(
+                    number_threads,
+                    number_calls,
+                    number_calls / elapsed,
+                    server.time_delta_count - starting_time_deltas,
+                    server.unauthorized_count - starting_rejections,
+                    server.connection_count - starting_connections,
+                    len(errors)
+                )
+            )
+
+            for error in sorted(set(errors)):
+                print("    %s"%error)
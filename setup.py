@@ -156,6 +156,17 @@ List of packages this package depends on.
 
 """
 
+EXTRA_DEPENDENCIES = {
+    'async' : [ 'aiohttp >= 3.8.0' ],
+    'frame' : [ 'numpy >= 1.17.0' ],
+    'plot' : [ 'numpy >= 1.17.0', 'matplotlib >= 3.1.0', 'pillow >= 6.0.0' ],
+    'fast_json' : [ 'orjson >= 3.6.0' ]
+}
+"""
+Dictionary of optional packages, keyed by the feature that requires them.
+
+"""
+
 EXAMPLES_DIRECTORY = 'examples'
 """
 The name of the examples directory.
@@ -256,6 +267,7 @@ setuptools.setup(
         MAXIMUM_PYTHON_VERSION
     ),
     install_requires = DEPENDENCIES,
+    extras_require = EXTRA_DEPENDENCIES,
     scripts = example_files,
     project_urls = PROJECT_URLS
 )
@@ -30,6 +30,9 @@ This module defines the following classes for your use:
 |                             | class will generally return one or more       |
 |                             | instances of the classes listed below.        |
 +-----------------------------+-----------------------------------------------+
+| AsyncSpeedSentry            | An asyncio version of the SpeedSentry API.    |
+|                             | Requires the aiohttp package.                 |
++-----------------------------+-----------------------------------------------+
 | Capabilities                | Typed dictionary holding information about    |
 |                             | the capabilities you are granted under your   |
 |                             | subscription.                                 |
@@ -57,6 +60,89 @@ This module defines the following classes for your use:
 | AggregatedLatencyEntry      | Typed dictionary holding a single aggregated  |
 |                             | latency entry.                                |
 +-----------------------------+-----------------------------------------------+
+| LatencyFrame                | Columnar latency data backed by NumPy arrays. |
+|                             | Requires the numpy package.                   |
++-----------------------------+-----------------------------------------------+
+| LazyList                    | Sequence returned by list endpoints when lazy |
+|                             | records are enabled.                          |
++-----------------------------+-----------------------------------------------+
+| LazyDict                    | Mapping returned by list endpoints when lazy  |
+|                             | records are enabled.                          |
++-----------------------------+-----------------------------------------------+
+| JsonCodec                   | Base class for the JSON codecs used to decode |
+|                             | responses.  StandardJsonCodec and OrjsonCodec |
+|                             | are provided.                                 |
++-----------------------------+-----------------------------------------------+
+| RequestBatch                | Batch returned by SpeedSentry.batch that      |
+|                             | collects individual lookups into list calls.  |
++-----------------------------+-----------------------------------------------+
+| ServerStatistics            | Typed dictionary holding request and clock    |
+|                             | skew statistics.                              |
++-----------------------------+-----------------------------------------------+
+| RetryPolicy                 | Policy controlling request timeouts and the   |
+|                             | retry of idempotent requests with backoff.    |
++-----------------------------+-----------------------------------------------+
+| CircuitBreaker              | Breaker that rejects requests while the       |
+|                             | service is degraded.                          |
++-----------------------------+-----------------------------------------------+
+| HedgingPolicy               | Policy that sends a duplicate read request    |
+|                             | when a response is slower than usual.         |
++-----------------------------+-----------------------------------------------+
+| PolicyStatistics            | Typed dictionary holding retry and hedge      |
+|                             | counts and the circuit breaker state.         |
++-----------------------------+-----------------------------------------------+
+| ResponseCache               | Size bounded cache of responses from          |
+|                             | endpoints whose data changes rarely.          |
++-----------------------------+-----------------------------------------------+
+| CacheStatistics             | Typed dictionary holding response cache hit   |
+|                             | and miss counts.                              |
++-----------------------------+-----------------------------------------------+
+| PlotCache                   | Cache of rendered latency plots bounded by    |
+|                             | size in bytes, with an optional disk tier.    |
++-----------------------------+-----------------------------------------------+
+| PlotCacheStatistics         | Typed dictionary holding plot cache hit and   |
+|                             | miss counts and sizes.                        |
++-----------------------------+-----------------------------------------------+
+| TimeDeltaStore              | On-disk store you can use to persist the      |
+|                             | measured server time delta across process     |
+|                             | restarts.                                     |
++-----------------------------+-----------------------------------------------+
+| LatencyStore                | On-disk store holding latency entries so that |
+|                             | only newer entries are downloaded.            |
++-----------------------------+-----------------------------------------------+
+| LatencyArchive              | Append-only, memory mapped columnar archive   |
+|                             | of latency history.  Requires the numpy       |
+|                             | package.                                      |
++-----------------------------+-----------------------------------------------+
+| RollupPyramid               | Latency statistics rolled up at several time  |
+|                             | resolutions for long range queries.  Requires |
+|                             | the numpy package.                            |
++-----------------------------+-----------------------------------------------+
+| PlotRenderer                | Renders latency plots locally from latency    |
+|                             | data already obtained.  Requires the numpy    |
+|                             | and matplotlib packages.                      |
++-----------------------------+-----------------------------------------------+
+| LatencySketch               | Mergeable quantile sketch you can use to      |
+|                             | track latency percentiles without keeping     |
+|                             | every sample.                                 |
++-----------------------------+-----------------------------------------------+
+| SketchMap                   | Latency sketches per monitor, per region, or  |
+|                             | per monitor and region that can be merged     |
+|                             | across processes and nodes.                   |
++-----------------------------+-----------------------------------------------+
+| AnomalyDetector             | Incremental detection of latency regressions  |
+|                             | per monitor and region, with checkpoints.     |
++-----------------------------+-----------------------------------------------+
+| LatencyAnomaly              | Typed dictionary holding a latency anomaly    |
+|                             | reported by an AnomalyDetector.               |
++-----------------------------+-----------------------------------------------+
+| Detector                    | Base class for the anomaly detectors.         |
+|                             | EwmaDetector, CusumDetector, and              |
+|                             | SeasonalDetector are provided.                |
++-----------------------------+-----------------------------------------------+
+| Transport                   | Pool of persistent connections you can share  |
+|                             | between multiple SpeedSentry instances.       |
++-----------------------------+-----------------------------------------------+
 | SpeedSentryException        | Base class for all SpeedSentry exceptions.    |
 +-----------------------------+-----------------------------------------------+
 | CustomerIdentifierException | Exception that is raised when the a provided  |
@@ -68,10 +154,23 @@ This module defines the following classes for your use:
 | CommunicationErrorException | Exception that is raised when a communication |
 |                             | error is detected.                            |
 +-----------------------------+-----------------------------------------------+
+| TimeoutException            | Exception that is raised when the server does |
+|                             | not respond in time.                          |
++-----------------------------+-----------------------------------------------+
+| DeadlineExceededException   | Exception that is raised when a call does not |
+|                             | complete before its deadline.                 |
++-----------------------------+-----------------------------------------------+
+| CircuitOpenException        | Exception that is raised when a request is    |
+|                             | rejected by an open circuit breaker.          |
++-----------------------------+-----------------------------------------------+
 | DecodingErrorException      | Exception that is raised when the received    |
 |                             | data could not be decoded.                    |
 +-----------------------------+-----------------------------------------------+
 
+The latency_analytics module provides functions you can use to compute
+averages, variances, and percentiles of latency data grouped by monitor,
+region, and time bucket.  The module requires the numpy package.
+
 """
 
 ###############################################################################
@@ -87,14 +186,50 @@ from .speedsentry import Region as Region
 from .speedsentry import Event as Event
 from .speedsentry import LatencyEntry as LatencyEntry
 from .speedsentry import AggregatedLatencyEntry as AggregatedLatencyEntry
+from .speedsentry import ServerStatistics as ServerStatistics
+from .speedsentry import RequestBatch as RequestBatch
+from .speedsentry import PolicyStatistics as PolicyStatistics
+from .speedsentry import CacheStatistics as CacheStatistics
+from .speedsentry import PlotCacheStatistics as PlotCacheStatistics
+from .latency_frame import LatencyFrame as LatencyFrame
+from .lazy import LazyList as LazyList
+from .lazy import LazyDict as LazyDict
+from .codec import JsonCodec as JsonCodec
+from .codec import StandardJsonCodec as StandardJsonCodec
+from .codec import OrjsonCodec as OrjsonCodec
+from .policy import RetryPolicy as RetryPolicy
+from .policy import CircuitBreaker as CircuitBreaker
+from .policy import HedgingPolicy as HedgingPolicy
+from .response_cache import ResponseCache as ResponseCache
+from .plot_cache import PlotCache as PlotCache
 
 from .exceptions import SpeedSentryException as SpeedSentryException
 from .exceptions import CustomerIdentifierException as CustomerIdentifierException
 from .exceptions import CustomerSecretException as CustomerSecretException
 from .exceptions import CommunicationErrorException as CommunicationErrorException
+from .exceptions import TimeoutException as TimeoutException
+from .exceptions import DeadlineExceededException as DeadlineExceededException
+from .exceptions import CircuitOpenException as CircuitOpenException
 from .exceptions import DecodingErrorException as DecodingErrorException
 
+from .transport import Transport as Transport
+from .time_delta_store import TimeDeltaStore as TimeDeltaStore
+from .latency_store import LatencyStore as LatencyStore
+from .latency_archive import LatencyArchive as LatencyArchive
+from .latency_rollup import RollupPyramid as RollupPyramid
+from .plot_renderer import PlotRenderer as PlotRenderer
+from . import latency_analytics as latency_analytics
+from .latency_sketch import LatencySketch as LatencySketch
+from .latency_sketch import SketchMap as SketchMap
+from .latency_anomaly import LatencyAnomaly as LatencyAnomaly
+from .latency_anomaly import Detector as Detector
+from .latency_anomaly import EwmaDetector as EwmaDetector
+from .latency_anomaly import CusumDetector as CusumDetector
+from .latency_anomaly import SeasonalDetector as SeasonalDetector
+from .latency_anomaly import AnomalyDetector as AnomalyDetector
+
 from .speedsentry import SpeedSentry as SpeedSentry
+from .async_speedsentry import AsyncSpeedSentry as AsyncSpeedSentry
 
 ###############################################################################
 # Test code:
@@ -0,0 +1,579 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software: you can redistribute it and/or modify it
+#   under the terms of the GNU General Public License as published by the Free
+#   Software Foundation, either version 3 of the License, or (at your option)
+#   any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+#   more details.
+#
+#   You should have received a copy of the GNU General Public License along
+#   with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+
+"""
+Python module that can be used to send messages via a generic webhook
+mechanism from within an asyncio event loop.
+
+This module will include support for posting messages only if the aiohttp
+module and related dependencies are included.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import asyncio
+import time
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .exceptions import CommunicationErrorException
+from .exceptions import TimeoutException
+from . import outbound_rest_api_v1 as outbound_rest_api_v1
+from . import codec as codec_module
+
+###############################################################################
+# Globals:
+#
+
+DEFAULT_MAXIMUM_CONNECTIONS = 100
+"""
+The default maximum number of simultaneous connections across all hosts.
+
+"""
+
+DEFAULT_MAXIMUM_CONNECTIONS_PER_HOST = 0
+"""
+The default maximum number of simultaneous connections to a single host.  A
+value of 0 indicates no per-host limit.
+
+"""
+
+DEFAULT_IDLE_TIMEOUT = 60
+"""
+The default time, in seconds, an idle connection is kept open.
+
+"""
+
+###############################################################################
+# Class AsyncServer:
+#
+
+class AsyncServer(object):
+    """
+    Class that tracks information about a remote server.  This class is the
+    asyncio equivalent of outbound_rest_api_v1.Server.  Any number of requests
+    can be in flight at once on a single event loop.
+
+    """
+
+    def __init__(
+        self,
+        customer_identifier : str,
+        customer_secret : bytes,
+        authority : str,
+        time_delta_slug : str = outbound_rest_api_v1.DEFAULT_TIME_DELTA_SLUG,
+        session = None,
+        maximum_connections : int = DEFAULT_MAXIMUM_CONNECTIONS,
+        maximum_connections_per_host : int = \
+            DEFAULT_MAXIMUM_CONNECTIONS_PER_HOST,
+        idle_timeout : float = DEFAULT_IDLE_TIMEOUT,
+        time_delta_refresh_interval : float = \
+            outbound_rest_api_v1.DEFAULT_TIME_DELTA_REFRESH_INTERVAL,
+        window_guard : float = outbound_rest_api_v1.DEFAULT_WINDOW_GUARD,
+        time_delta_store = None,
+        codec : codec_module.JsonCodec = None
+        ):
+        """
+        Method that initializes the AsyncServer class.
+
+        :param customer_identifier:
+            Your customer identifier encoded as an ASCII string of 16
+            hexidecimal digits.
+
+        :param customer_secret:
+            Your customer secret.
+
+        :param authority:
+            The server authority.
+
+        :param time_delta_slug:
+            The endpoint used to determine the time delta between this
+            machine and the server.
+
+        :param session:
+            An optional aiohttp.ClientSession to use.  If supplied, the session
+            will not be closed when this instance is closed.  If None, a
+            session will be created on first use and owned by this instance.
+
+        :param maximum_connections:
+            The maximum number of simultaneous connections.  Ignored if a
+            session is supplied.
+
+        :param maximum_connections_per_host:
+            The maximum number of simultaneous connections to a single host.
+            A value of 0 indicates no limit.  Ignored if a session is
+            supplied.
+
+        :param idle_timeout:
+            The time, in seconds, idle connections are kept open.  Ignored if
+            a session is supplied.
+
+        :param time_delta_refresh_interval:
+            The interval, in seconds, after which the time delta is refreshed
+            before the next request rather than waiting for a request to be
+            rejected.  A value of None disables proactive refresh.
+
+        :param window_guard:
+            Requests expected to reach the server within this many seconds of
+            a signing window boundary are held until the boundary passes.  A
+            value of 0 disables this behavior.
+
+        :param time_delta_store:
+            An optional store used to persist the measured time delta across
+            process restarts.  If supplied, a fresh stored time delta is used
+            in place of an initial time delta of zero.
+
+        :param codec:
+            The JSON codec used to decode responses.  If None, the fastest
+            installed codec is used.  Signed payloads do not depend on the
+            codec.
+
+        :type customer_identifier:          str
+        :type customer_secret:              bytes
+        :type authority:                    str
+        :type time_delta_slug:              str
+        :type session:                      aiohttp.ClientSession or None
+        :type maximum_connections:          int
+        :type maximum_connections_per_host: int
+        :type idle_timeout:                 float
+        :type time_delta_refresh_interval:  float or None
+        :type window_guard:                 float
+        :type time_delta_store:             time_delta_store.TimeDeltaStore
+        :type codec:                        codec.JsonCodec or None
+
+        """
+
+        super().__init__()
+
+        if aiohttp is None:
+            raise ImportError(
+                "the aiohttp package is required to use the asyncio API."
+            )
+
+        self.__codec = codec if codec is not None \
+                           else codec_module.default_codec()
+        self.__customer_identifier = customer_identifier
+        self.__signer = outbound_rest_api_v1.MessageSigner(
+            customer_identifier,
+            customer_secret
+        )
+        self.__authority = outbound_rest_api_v1.fix_authority(authority)
+        self.__time_delta_slug = outbound_rest_api_v1.fix_slug(
+            time_delta_slug
+        )
+        self.__clock = outbound_rest_api_v1.ClockSkewTracker(
+            refresh_interval = time_delta_refresh_interval,
+            window_guard = window_guard
+        )
+        self.__time_delta_generation = 0
+        self.__time_delta_lock = None
+
+        self.__time_delta_store = time_delta_store
+        outbound_rest_api_v1.restore_time_delta(
+            self.__clock,
+            time_delta_store,
+            self.__authority,
+            customer_identifier
+        )
+
+        self.__maximum_connections = maximum_connections
+        self.__maximum_connections_per_host = maximum_connections_per_host
+        self.__idle_timeout = idle_timeout
+
+        self.__session = session
+        self.__owns_session = session is None
+
+
+    async def close(self):
+        """
+        Method you can use to release any connections held by this server.
+        Sessions supplied by the caller are left open.
+
+        """
+
+        if self.__owns_session and self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, exception_type, exception_value, traceback):
+        await self.close()
+
+
+    async def post_message(self, slug : str, message : dict) -> dict:
+        """
+        Method that will issue a request to a remote server.  If needed, the
+        method will query for an updated time delta and perform a retry.
+
+        Note that this method will raise an exception if communication was not
+        successful.
+
+        :param slug:
+            The slug to be used.
+
+        :param message:
+            A dictionary holding the message to be sent.
+
+        :return:
+            Returns a dictionary with the response.
+
+        :type slug:    str
+        :type message: dict
+        :rtype:        dict
+
+        """
+
+        return await self.__post(
+            outbound_rest_api_v1.fix_slug(slug),
+            message,
+            False
+        )
+
+
+    async def post_binary_message(self, slug : str, message : dict) -> bytes:
+        """
+        Method that will issue a request to a remote server that expects a
+        binary response.  If needed, the method will query for an updated time
+        delta and perform a retry.
+
+        Note that this method will raise an exception if communication was not
+        successful.
+
+        :param slug:
+            The slug to be used.
+
+        :param message:
+            A dictionary holding the message to be sent.
+
+        :return:
+            Returns a bytes object holding the response.
+
+        :type slug:    str
+        :type message: dict
+        :rtype:        bytes
+
+        """
+
+        return await self.__post(
+            outbound_rest_api_v1.fix_slug(slug),
+            message,
+            True
+        )
+
+
+    @property
+    def codec(self):
+        """
+        Read-only property holding the JSON codec used to decode responses.
+
+        :type: codec.JsonCodec
+
+        """
+
+        return self.__codec
+
+
+    @property
+    def statistics(self):
+        """
+        Read-only property holding a snapshot of request and clock skew
+        statistics for this server.
+
+        :type: outbound_rest_api_v1.ServerStatistics
+
+        """
+
+        return self.__clock.statistics
+
+
+    async def __post(self, slug : str, message : dict, binary : bool):
+        """
+        Method used internally to issue a request, refreshing the time delta
+        proactively when due and retrying once if the request is rejected.
+
+        :param slug:
+            The cleaned slug to be used.
+
+        :param message:
+            A dictionary holding the message to be sent.
+
+        :param binary:
+            If True, a binary response is expected.
+
+        :return:
+            Returns the response.
+
+        :type slug:    str
+        :type message: dict
+        :type binary:  bool
+        :rtype:        dict or bytes
+
+        """
+
+        if self.__clock.refresh_due():
+            try:
+                await self.__update_time_delta(
+                    self.__time_delta_generation,
+                    proactive = True
+                )
+            except CommunicationErrorException:
+                self.__clock.record_refresh_attempt()
+
+        generation = self.__time_delta_generation
+        response = await self.__attempt(slug, message, binary)
+        if response is None:
+            self.__clock.record_authentication_failure()
+            await self.__update_time_delta(generation, proactive = False)
+            response = await self.__attempt(slug, message, binary)
+            if response is None:
+                raise CommunicationErrorException(status_code = 401)
+
+        return response
+
+
+    async def __attempt(self, slug : str, message : dict, binary : bool):
+        """
+        Method used internally to sign and send a single request.
+
+        :param slug:
+            The cleaned slug to be used.
+
+        :param message:
+            A dictionary holding the message to be sent.
+
+        :param binary:
+            If True, a binary response is expected.
+
+        :return:
+            Returns the response or None if the request could not be
+            authenticated.
+
+        :type slug:    str
+        :type message: dict
+        :type binary:  bool
+        :rtype:        dict, bytes, or None
+
+        """
+
+        delay = self.__clock.signing_delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        time_delta = self.__clock.signing_time_delta()
+        self.__clock.record_request(time_delta)
+
+        status_code, body = await self.__send(slug, message, time_delta)
+
+        if binary:
+            result = outbound_rest_api_v1.decode_binary_response(
+                status_code,
+                body
+            )
+        else:
+            result = outbound_rest_api_v1.decode_message_response(
+                slug,
+                status_code,
+                body,
+                self.__codec
+            )
+
+        return result
+
+
+    async def __update_time_delta(self, generation : int, proactive : bool):
+        """
+        Method used internally to refresh the time delta.  Concurrent callers
+        that used the same time delta share a single request to the time
+        delta endpoint.
+
+        :param generation:
+            The time delta generation the caller last used.
+
+        :param proactive:
+            If True, the refresh is being performed before the time delta is
+            known to be stale.
+
+        :type generation: int
+        :type proactive:  bool
+
+        """
+
+        if self.__time_delta_lock is None:
+            self.__time_delta_lock = asyncio.Lock()
+
+        async with self.__time_delta_lock:
+            if generation == self.__time_delta_generation:
+                start = time.monotonic()
+                new_time_delta = await self.__time_delta()
+                round_trip_time = time.monotonic() - start
+
+                if new_time_delta is not None:
+                    self.__clock.record_time_delta(
+                        new_time_delta,
+                        round_trip_time,
+                        proactive
+                    )
+                    outbound_rest_api_v1.save_time_delta(
+                        self.__clock,
+                        self.__time_delta_store,
+                        self.__authority,
+                        self.__customer_identifier
+                    )
+
+                self.__time_delta_generation += 1
+
+
+    async def __time_delta(self): # -> Union(int, NoneType)
+        """
+        Method used internally to determine the system clock time delta
+        between us and the remote server.
+
+        :return:
+            Returns the measured time delta, in seconds.
+
+        :rtype: int or None
+
+        """
+
+        url = "%s/%s"%(self.__authority, self.__time_delta_slug)
+        payload = outbound_rest_api_v1.build_time_delta_payload()
+
+        session = self.__get_session()
+        try:
+            async with session.post(
+                    url,
+                    data = payload,
+                    headers = outbound_rest_api_v1.build_headers(
+                        'Inesonic, LLC',
+                        payload
+                    )
+                ) as response:
+                body = await response.read()
+                status_code = response.status
+        except asyncio.TimeoutError as e:
+            raise TimeoutException(status_message = "%s : %s"%(url, str(e)))
+        except aiohttp.ClientError as e:
+            raise CommunicationErrorException(
+                status_message = "%s : %s"%(url, str(e))
+            )
+
+        return outbound_rest_api_v1.decode_time_delta_response(
+            status_code,
+            body,
+            self.__codec
+        )
+
+
+    async def __send(
+        self,
+        slug : str,
+        message : dict,
+        time_delta : float
+        ):
+        """
+        Method used internally to sign and send a message.  Timeouts are
+        reported with TimeoutException and other transport failures with
+        CommunicationErrorException, as is done by the synchronous client.
+
+        :param slug:
+            The slug to be used.
+
+        :param message:
+            A dictionary holding the message to be sent.
+
+        :param time_delta:
+            The time delta to sign the message with.
+
+        :return:
+            Returns a tuple holding the status code and the response body.
+
+        :type slug:       str
+        :type message:    dict
+        :type time_delta: float
+        :rtype:           tuple
+
+        """
+
+        url = "%s/%s"%(self.__authority, slug)
+        payload = self.__signer.build_payload(message, time_delta)
+
+        session = self.__get_session()
+        try:
+            async with session.post(
+                    url,
+                    data = payload,
+                    headers = outbound_rest_api_v1.build_headers(
+                        'Python API: ' + self.__customer_identifier,
+                        payload
+                    )
+                ) as response:
+                body = await response.read()
+                status_code = response.status
+        except asyncio.TimeoutError as e:
+            raise TimeoutException(status_message = "%s : %s"%(url, str(e)))
+        except aiohttp.ClientError as e:
+            raise CommunicationErrorException(
+                status_message = "%s : %s"%(url, str(e))
+            )
+
+        return (status_code, body)
+
+
+    def __get_session(self):
+        """
+        Method used internally to obtain the client session, creating it if
+        needed.  The session is created lazily so that it is bound to the
+        running event loop.
+
+        :return:
+            Returns the client session.
+
+        :rtype: aiohttp.ClientSession
+
+        """
+
+        if self.__session is None:
+            connector = aiohttp.TCPConnector(
+                limit = self.__maximum_connections,
+                limit_per_host = self.__maximum_connections_per_host,
+                keepalive_timeout = self.__idle_timeout
+            )
+            self.__session = aiohttp.ClientSession(connector = connector)
+
+        return self.__session
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
@@ -0,0 +1,749 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+This Python module provides an asyncio API to simplify access to the
+SpeedSentry REST API.  The API mirrors the SpeedSentry class except that every
+endpoint method is a coroutine.
+
+This module requires the aiohttp package.
+
+"""
+
+###############################################################################
+# Imports:
+#
+
+from .exceptions import *
+from . import outbound_rest_api_v1 as outbound_rest_api_v1
+from . import async_outbound_rest_api_v1 as async_outbound_rest_api_v1
+from . import time_delta_store as time_delta_store
+from . import codec as codec_module
+from .speedsentry import Capabilities
+from .speedsentry import HostScheme
+from .speedsentry import Monitor
+from .speedsentry import Region
+from .speedsentry import Event
+from .speedsentry import ResponseDecoder
+from .speedsentry import SpeedSentry
+from .speedsentry import decode_customer_secret
+from .speedsentry import build_events_list_message
+from .speedsentry import build_events_create_message
+from .speedsentry import build_monitors_update_message
+
+###############################################################################
+# Class AsyncSpeedSentry:
+#
+
+class AsyncSpeedSentry(object):
+    """
+    Class you can use to access the SpeedSentry REST API from within an asyncio
+    event loop.  Any number of requests can be in flight at once.
+
+    """
+
+    SECRET_LENGTH = SpeedSentry.SECRET_LENGTH
+    """
+    The expected length of the customer secret after decoding, in bytes.
+
+    """
+
+    AUTHORITY = SpeedSentry.AUTHORITY
+    """
+    The authority for the customer REST API.
+
+    """
+
+    def __init__(
+        self,
+        customer_identifier,
+        customer_secret,
+        session = None,
+        maximum_connections : int = \
+            async_outbound_rest_api_v1.DEFAULT_MAXIMUM_CONNECTIONS,
+        maximum_connections_per_host : int = \
+            async_outbound_rest_api_v1.DEFAULT_MAXIMUM_CONNECTIONS_PER_HOST,
+        idle_timeout : float = async_outbound_rest_api_v1.DEFAULT_IDLE_TIMEOUT,
+        authority : str = None,
+        time_delta_refresh_interval : float = \
+            outbound_rest_api_v1.DEFAULT_TIME_DELTA_REFRESH_INTERVAL,
+        window_guard : float = outbound_rest_api_v1.DEFAULT_WINDOW_GUARD,
+        time_delta_store : time_delta_store.TimeDeltaStore = None,
+        compact_records : bool = False,
+        lazy_records : bool = False,
+        codec : codec_module.JsonCodec = None
+        ):
+        """
+        Method you can use to initialize the asyncio SpeedSentry REST API.
+
+        You should await the close method, or use this instance as an
+        asynchronous context manager, to release connections when you are
+        finished.
+
+        :param customer_identifier:
+            Your customer identifier encoded as an ASCII string of 16
+            hexidecimal digits.
+
+        :param customer_secret:
+            Your customer secret.  If you supply the secret as a string then
+            the secret will be decoded.  If you supply the secret as a bytes or
+            bytearray object, then the secret will be used, unmodified.
+
+        :param session:
+            An optional aiohttp.ClientSession to use.  If None, a session will
+            be created on first use and owned by this instance.
+
+        :param maximum_connections:
+            The maximum number of simultaneous connections.  Ignored if a
+            session is supplied.
+
+        :param maximum_connections_per_host:
+            The maximum number of simultaneous connections to a single host.
+            A value of 0 indicates no limit.  Ignored if a session is
+            supplied.
+
+        :param idle_timeout:
+            The time, in seconds, idle connections are kept open.  Ignored if
+            a session is supplied.
+
+        :param authority:
+            An optional authority to use in place of the default SpeedSentry
+            REST API authority.
+
+        :param time_delta_refresh_interval:
+            The interval, in seconds, after which the measured time delta
+            between this machine and the server is refreshed before the next
+            request.  A value of None disables proactive refresh so the time
+            delta is only refreshed after a request is rejected.
+
+        :param window_guard:
+            Requests expected to reach the server within this many seconds of
+            a signing window boundary are held until the boundary passes.  A
+            value of 0 disables this behavior.
+
+        :param time_delta_store:
+            An optional TimeDeltaStore used to persist the measured time delta
+            across process restarts.  Short-lived processes sharing a store
+            avoid a rejected first request on hosts with skewed clocks.
+
+        :param compact_records:
+            If True, results are returned as compact, slotted record classes
+            built by dictionary_object.slotted_class rather than dict
+            subclasses.  Compact records use far less memory and support the
+            same attribute and mapping access but are not dict instances.
+
+        :param lazy_records:
+            If True, list results hold the raw response data and only create
+            records for the elements you access.  Lists are returned as
+            LazyList instances and dictionaries as LazyDict instances.
+
+        :param codec:
+            The JSON codec used to decode responses.  If None, the fastest
+            installed codec is used.  Signed payloads do not depend on the
+            codec.
+
+        :type customer_identifier:          str
+        :type customer_secret:              str, bytes, or bytearray.
+        :type session:                      aiohttp.ClientSession or None
+        :type maximum_connections:          int
+        :type maximum_connections_per_host: int
+        :type idle_timeout:                 float
+        :type authority:                    str or None
+        :type time_delta_refresh_interval:  float or None
+        :type window_guard:                 float
+        :type time_delta_store:             TimeDeltaStore or None
+        :type compact_records:              bool
+        :type lazy_records:                 bool
+        :type codec:                        codec.JsonCodec or None
+
+        """
+
+        secret = decode_customer_secret(customer_identifier, customer_secret)
+
+        self.__rest_api = async_outbound_rest_api_v1.AsyncServer(
+            customer_identifier = customer_identifier,
+            customer_secret = secret,
+            authority = authority or AsyncSpeedSentry.AUTHORITY,
+            session = session,
+            maximum_connections = maximum_connections,
+            maximum_connections_per_host = maximum_connections_per_host,
+            idle_timeout = idle_timeout,
+            time_delta_refresh_interval = time_delta_refresh_interval,
+            window_guard = window_guard,
+            time_delta_store = time_delta_store,
+            codec = codec
+        )
+
+        self.__decoder = ResponseDecoder(compact_records, lazy_records)
+
+
+    @property
+    def statistics(self):
+        """
+        Read-only property holding a snapshot of request and clock skew
+        statistics, including an estimate of the number of authentication
+        retries avoided.
+
+        :type: ServerStatistics
+
+        """
+
+        return self.__rest_api.statistics
+
+
+    async def close(self):
+        """
+        Method you can use to release any connections held by this instance.
+        Sessions supplied by the caller are left open.
+
+        """
+
+        await self.__rest_api.close()
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, exception_type, exception_value, traceback):
+        await self.close()
+
+
+    async def capabilities_get(self) -> Capabilities:
+        """
+        Method you can use to obtain information on what features are supported
+        by your subscription.
+
+        :return:
+            Returns a Capabilities instance you can use to determine the
+            features supported by your subscription.
+
+        :rtype: Capabilities
+
+        """
+
+        response = await self.__post_message(
+            slug = "/v1/capabilities/get",
+            message = dict()
+        )
+
+        return self.__decoder.capabilities_get(response)
+
+
+    async def hosts_get(self, host_scheme_id : int) -> HostScheme:
+        """
+        Method you can use to obtain a single host/scheme entry indexed by
+        host/scheme ID.
+
+        :param host_scheme_id:
+            The host/scheme ID of the desired host/scheme.
+
+        :return:
+            Returns single HostScheme instance.
+
+        :type host_scheme_id: int
+        :rtype:               HostScheme
+
+        """
+
+        response = await self.__post_message(
+            slug = "/v1/hosts/get",
+            message = { 'host_scheme_id' : host_scheme_id }
+        )
+
+        return self.__decoder.hosts_get(response)
+
+
+    async def hosts_list(self) -> dict:
+        """
+        Method you can use to obtain a dictionary of host/scheme instances
+        indexed by host/scheme ID.
+
+        :return:
+            Returns a dictionary of HostScheme instances indexed by the
+            host/scheme ID.
+
+        :rtype: dict of HostScheme instances
+
+        """
+
+        response = await self.__post_message(
+            slug = "/v1/hosts/list",
+            message = dict()
+        )
+
+        return self.__decoder.hosts_list(response)
+
+
+    async def monitors_get(self, monitor_id : int) -> Monitor:
+        """
+        Method you can use to obtain information on a single monitor.
+
+        :param monitor_id:
+            The ID of the desired monitor.
+
+        :return:
+            Returns a Monitor instance describing this monitor.
+
+        :type monitor_id: int
+        :rtype:           Monitor instance
+
+        """
+
+        response = await self.__post_message(
+            slug = "/v1/monitors/get",
+            message = { 'monitor_id' : monitor_id }
+        )
+
+        return self.__decoder.monitors_get(response)
+
+
+    async def monitors_list(self, order_by : str = "monitor_id") -> dict:
+        """
+        Method you can use to obtain a list of all monitors.
+
+        :param order_by:
+            A string indicating the desired method the monitors should be
+            indexed.  Supported values are "monitor_id", "user_ordering",
+            or "url".
+
+        :return:
+            Returns a dictionary of Monitor instances.
+
+        :type order_by: str
+        :rtype:         dict of Monitor instances
+
+        """
+
+        response = await self.__post_message(
+            slug = "/v1/monitors/list",
+            message = { 'order_by' : order_by }
+        )
+
+        return self.__decoder.monitors_list(response)
+
+
+    async def monitors_update(self, monitor_data : list):
+        """
+        Method you can use to update monitor settings.
+
+        :param monitor_data:
+            A list of MonitorEntry instances.  The first entry has a user
+            ordering of 0, the second entry has a user ordering of 1, etc.
+
+        :type monitor_data: list
+
+        """
+
+        await self.__post_message(
+            slug = "/v1/monitors/update",
+            message = build_monitors_update_message(monitor_data)
+        )
+
+
+    async def regions_get(self, region_id : int) -> Region:
+        """
+        Method you can use to obtain information on a single region.
+
+        :param region_id:
+            The ID of the desired region.
+
+        :return:
+            Returns a Region instance describing this region.
+
+        :type region_id: int
+        :rtype:          Region instance
+
+        """
+
+        response = await self.__post_message(
+            slug = "/v1/regions/get",
+            message = { 'region_id' : region_id }
+        )
+
+        return self.__decoder.regions_get(response)
+
+
+    async def regions_list(self) -> dict:
+        """
+        Method you can use to obtain a dictionary holding information on all
+        regions.  The dictionary will be indexed by region ID.
+
+        :return:
+            Returns a dictionary of regions by region ID.
+
+        :rtype: dict
+
+        """
+
+        response = await self.__post_message(
+            slug = "/v1/regions/list",
+            message = dict()
+        )
+
+        return self.__decoder.regions_list(response)
+
+
+    async def events_get(self, event_id : int) -> Event:
+        """
+        Method you can use to obtain information on a single event.
+
+        :param event_id:
+            The ID of the desired event.
+
+        :return:
+            Returns an Event instance describing the event.
+
+        :type event_id: int
+        :rtype:         Event instance
+
+        """
+
+        response = await self.__post_message(
+            slug = "/v1/events/get",
+            message = { 'event_id' : event_id }
+        )
+
+        return self.__decoder.events_get(response)
+
+
+    async def events_list(
+        self,
+        start_timestamp : int = None,
+        end_timestamp : int = None
+        ) -> list:
+        """
+        Method you can use to obtain a list of events.
+
+        :param start_timestamp:
+            An optional starting Unix timestamp for events.  A value of None
+            means no start time.
+
+        :param end_timestamp:
+            An optional ending Unix timestamp for events.  A value of None
+            means no end time.
+
+        :return:
+            Returns a list of events.
+
+        :type start_timestamp: int or None
+        :type end_timestamp:   int or None
+        :rtype:                list
+
+        """
+
+        response = await self.__post_message(
+            slug = "/v1/events/list",
+            message = build_events_list_message(start_timestamp, end_timestamp)
+        )
+
+        return self.__decoder.events_list(response)
+
+
+    async def events_create(
+        self,
+        message : str,
+        type_index = None,
+        monitor_id = None
+        ):
+        """
+        Method you can use to generate a customer event.
+
+        :param message:
+            The message to be sent as part of the event.
+
+        :param type_index:
+            A value indicating the type of customer event to be created.  A
+            value of 1 indicates customer_1, a value of 2 indicates customer_2,
+            etc.  If not specified, then customer_1 is used.
+
+        :param monitor_id:
+            An optional monitor ID you can tie to this message.  If not
+            specified or None, then the first monitor ID is used.
+
+        :type message:    str
+        :type monitor_id: int or None
+
+        """
+
+        await self.__post_message(
+            slug = "/v1/events/create",
+            message = build_events_create_message(
+                message,
+                type_index,
+                monitor_id
+            )
+        )
+
+
+    async def status_get(self, monitor_id : int) -> str:
+        """
+        Method you can use to obtain status on a specific monitor.
+
+        :param monitor_id:
+            The ID of the desired monitor.
+
+        :return:
+            Returns a string holding "unknown", "working", or "failed"
+            indicating the last reported status for this monitor.
+
+        :type monitor_id: int
+        :rtype:           str
+
+        """
+
+        response = await self.__post_message(
+            slug = "/v1/status/get",
+            message = { 'monitor_id' : monitor_id }
+        )
+
+        return self.__decoder.status_get(response)
+
+
+    async def status_list(self) -> dict:
+        """
+        Method you can use to obtain a dictionary holding the status for each
+        monitor under your subscription.
+
+        :return:
+            Returns a dictionary holding the status of each monitor under your
+            subscription.  The dictionary is keyed by monitor ID.  Each entry
+            holds one of "unknown", "working", or "failed" indicating the last
+            reported status for the monitor.
+
+        :rtype: dict
+
+        """
+
+        response = await self.__post_message(
+            slug = "/v1/status/list",
+            message = dict()
+        )
+
+        return self.__decoder.status_list(response)
+
+
+    async def multiple_list(self) -> dict:
+        """
+        Method you can use to obtain a dictionary holding multiple useful
+        values in a single request.
+
+        :return:
+            Returns a dictionary holding:
+                * A dictionary of monitors by user order.
+                * A dictionary of authorities by host/scheme ID.
+                * A dictionary of events in chronological order.
+                * A dictionary of monitor status values by monitor ID.
+
+        :rtype: dict
+
+        """
+
+        response = await self.__post_message(
+            slug = "/v1/multiple/list",
+            message = dict()
+        )
+
+        return self.__decoder.multiple_list(response)
+
+
+    async def latency_list(self, as_frame : bool = False, **kwargs) -> tuple:
+        """
+        Method you can use to obtain latency entries.  Information can be
+        limited to a specific timeframe, region, and/or monitor.
+
+        :param as_frame:
+            If True, entries are returned as columnar LatencyFrame instances
+            rather than lists of entries.  Requires the numpy package.
+
+        :param start_timestamp:
+            An optional starting Unix timestamp for events.  A value of None
+            means no start time.
+
+        :param end_timestamp:
+            An optional ending Unix timestamp for events.  A value of None
+            means no end time.
+
+        :param region_id:
+            An optional region ID.  If specified, then only values for this
+            region will be included.  Note that this parameter is mutually
+            exclusive with monitor_id.
+
+        :param monitor_id:
+            An optional monitor ID.  If specified, then only values for this
+            monitor will be included.  Note that this parameter is mutually
+            exclusive with region_id.
+
+        :return:
+            Returns a tuple holding a list of LatencyEntry instances followed
+            by a list of AggregatedLatencyEntry instances.  The most recent
+            values will be in the first list.  The second list represents an
+            aggregation of older values stored at a lower resolution and with
+            additional information.
+
+            If as_frame is True, the tuple holds a LatencyFrame of recent
+            values followed by a LatencyFrame of aggregated values.
+
+        :type as_frame:        bool
+        :type start_timestamp: int
+        :type end_timestamp:   int
+        :type region_id:       int
+        :type monitor_id:      int
+        :rtype:                tuple
+
+        """
+
+        response = await self.__post_message(
+            slug = "/v1/latency/list",
+            message = kwargs
+        )
+
+        if as_frame:
+            result = self.__decoder.latency_frames(response)
+        else:
+            result = self.__decoder.latency_list(response)
+
+        return result
+
+
+    async def latency_plot(self, **kwargs) -> bytes:
+        """
+        Method you can use to obtain a pre-generated plot of latency data.
+
+        :param monitor_id:
+            An optional numeric monitor ID indicating the monitor of interest.
+            Data aggregated from all monitors will be used if this parameter is
+            not included.
+
+        :param region_id:
+            An optional numeric region ID indicating the region we want latency
+            plots for.  Data aggregated for all regions will be used if this
+            parameter is not included.
+
+        :param start_timestamp:
+            An optional Unix timestamp indicating the start date/time to be
+            used for the plot data.  IF excluded, then the oldest existing data
+            will be included.
+
+        :param end_timestamp:
+            An optional Unix timestamp indicating the end date/time to be used
+            for the plot data.  If excluded, now is assumed.
+
+        :param title:
+            An optional title to place on the plot.
+
+        :param x_axis_label:
+            An optional label to apply to the horizontal axis.
+
+        :param y_axis_label:
+            An optional label to apply to the vertical axis.
+
+        :param minimum_latency:
+            The lower bounds for the latency values to plot.  If excluded, then
+            a reasonable lower bound will be selected based on the source data.
+
+        :param maximum_latency:
+            The upper bounds for the latency values to plot.  If excluded, then
+            a reasonable upper bound will be selected based on the source data.
+
+        :param log_scale:
+            A boolean value indicating that a log scale should be used for
+            latency values.  A linear scale will be used by default.  This
+            value is only used for history plots.
+
+        :param width:
+            The desired plot width, in pixels.  Value can range from 100 to
+            2048.   The value 1024 will be used by default.
+
+        :param height:
+            The desired plot height in pixels.  Value can range from 100 to
+            2048.  The value 768 will be used by default.
+
+        :param plot_type:
+            The plot type to be generated.  Supported values are "history" and
+            "histogram".  A history plot will be generated by default.
+
+        :param format:
+            The format of the returned data.  Value can be "jpg" or "png".  PNG
+            encoded plots will be returned by default.
+
+        :return:
+            Returns a bytes object holding the plot image.
+
+        :type monitor_id:      int
+        :type region_id:       int
+        :type start_timestamp: int
+        :type end_timestamp:   int
+        :type title:           str
+        :type x_axis_label:    str
+        :type y_axis_label:    str
+        :type minimum_latency: float
+        :type maximum_latency: float
+        :type log_scale:       bool
+        :type width:           int
+        :type height:          int
+        :type plot_type:       str
+        :type format:          str
+        :rtype:                bytes
+
+        """
+
+        return await self.__rest_api.post_binary_message(
+            slug = "/v1/latency/plot",
+            message = kwargs
+        )
+
+
+    async def __post_message(self, slug : str, message : dict) -> dict:
+        """
+        Method used internally to post a message and check for successful
+        status.
+
+        :param slug:
+            The slug to be used.
+
+        :param message:
+            A dictionary holding the message to be sent.
+
+        :return:
+            Returns a dictionary with the response.
+
+        :type slug:    str
+        :type message: dict
+        :rtype:        dict
+
+        """
+
+        response = await self.__rest_api.post_message(
+            slug = slug,
+            message = message
+        )
+
+        return self.__decoder.check_status(slug, response)
+
+###############################################################################
+# Test code:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
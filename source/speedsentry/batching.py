@@ -0,0 +1,421 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that collects lookups of individual entries into a single
+request for the full list of entries.  Lookups can be collected over a short
+time window or within an explicit batch.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import threading
+import time
+import copy
+import concurrent.futures
+
+from .exceptions import CommunicationErrorException
+from .exceptions import DeadlineExceededException
+from . import fork_safety as fork_safety
+
+###############################################################################
+# Functions:
+#
+
+def find_entry(mapping, key, slug : str):
+    """
+    Function that locates an entry in a list response.  List responses may
+    be keyed by integer or string identifiers.
+
+    :param mapping:
+        The list response.
+
+    :param key:
+        The identifier of the desired entry.
+
+    :param slug:
+        The slug of the equivalent single entry endpoint, used in the
+        exception message if the entry does not exist.
+
+    :return:
+        Returns the entry.
+
+    :type mapping: dict
+    :type key:     int or str
+    :type slug:    str
+    :rtype:        object
+
+    """
+
+    for candidate in (key, str(key)):
+        if candidate in mapping:
+            return mapping[candidate]
+
+    try:
+        numeric_key = int(key)
+    except (TypeError, ValueError):
+        numeric_key = None
+
+    if numeric_key is not None and numeric_key in mapping:
+        return mapping[numeric_key]
+
+    raise CommunicationErrorException(
+        status_message = "%s : failed, unknown ID"%slug
+    )
+
+###############################################################################
+# Class BatchLoader:
+#
+
+class BatchLoader(object):
+    """
+    Class that collects lookups issued by concurrent threads within a short
+    window into a single list request.  The first lookup in a window waits
+    for the window to close, or for half of its deadline if that is shorter,
+    and then issues the request.  Every lookup in the window receives its
+    entry from the same response.
+
+    """
+
+    class _Window(object):
+        """
+        Class used internally to track the lookups in a single window.
+
+        """
+
+        __slots__ = ('done', 'mapping', 'exception', 'number_loads')
+
+        def __init__(self):
+            self.done = threading.Event()
+            self.mapping = None
+            self.exception = None
+            self.number_loads = 0
+
+
+    def __init__(self, fetch_all, slug : str, window : float):
+        """
+        Method that initializes the BatchLoader class.
+
+        :param fetch_all:
+            A callable that takes a timeout and returns a mapping of all
+            entries keyed by identifier.
+
+        :param slug:
+            The slug of the equivalent single entry endpoint.
+
+        :param window:
+            The time, in seconds, lookups are collected before the request is
+            issued.
+
+        :type fetch_all: callable
+        :type slug:      str
+        :type window:    float
+
+        """
+
+        super().__init__()
+
+        self.__fetch_all = fetch_all
+        self.__slug = slug
+        self.__window = window
+
+        self.__lock = threading.Lock()
+        self.__current = None
+        self.__loads = 0
+        self.__batches = 0
+        self.__fork_detector = fork_safety.ForkDetector()
+
+
+    @property
+    def loads(self):
+        """
+        Read-only property holding the number of lookups performed.
+
+        :type: int
+
+        """
+
+        return self.__loads
+
+
+    @property
+    def batches(self):
+        """
+        Read-only property holding the number of list requests issued.
+
+        :type: int
+
+        """
+
+        return self.__batches
+
+
+    def load(self, key, timeout : float = None):
+        """
+        Method you can use to look up a single entry.
+
+        :param key:
+            The identifier of the desired entry.
+
+        :param timeout:
+            An optional deadline, in seconds, for the lookup.
+
+        :return:
+            Returns the entry.
+
+        :type key:     int or str
+        :type timeout: float or None
+        :rtype:        object
+
+        """
+
+        self.reset_after_fork()
+        with self.__lock:
+            window = self.__current
+            leader = window is None
+            if leader:
+                window = BatchLoader._Window()
+                self.__current = window
+                self.__batches += 1
+
+            window.number_loads += 1
+            self.__loads += 1
+
+        if leader:
+            start = time.monotonic()
+            if timeout is None:
+                time.sleep(self.__window)
+            else:
+                time.sleep(max(0.0, min(self.__window, timeout / 2.0)))
+
+            with self.__lock:
+                self.__current = None
+
+            if timeout is not None:
+                timeout = max(0.0, timeout - (time.monotonic() - start))
+
+            try:
+                window.mapping = self.__fetch_all(timeout)
+            except BaseException as e:
+                window.exception = e
+            finally:
+                window.done.set()
+        elif not window.done.wait(timeout):
+            raise DeadlineExceededException(
+                status_message = "%s : deadline of %g s exceeded"%(
+                    self.__slug,
+                    timeout
+                )
+            )
+
+        if window.exception is not None:
+            raise window.exception
+
+        entry = find_entry(window.mapping, key, self.__slug)
+        if window.number_loads > 1:
+            entry = copy.deepcopy(entry)
+
+        return entry
+
+
+    def reset_after_fork(self):
+        """
+        Method you can call in a forked child process to replace the lock
+        inherited from the parent process and to forget any window that was
+        open in the parent.  The method is called automatically by the load
+        method and does nothing if the process has not forked.
+
+        """
+
+        if self.__fork_detector.forked():
+            self.__lock = threading.Lock()
+            self.__current = None
+
+###############################################################################
+# Class BatchFuture:
+#
+
+class BatchFuture(concurrent.futures.Future):
+    """
+    Future holding the result of a lookup within a batch.  Requesting the
+    result before the batch has been dispatched dispatches the batch.
+
+    """
+
+    def __init__(self, batch):
+        """
+        Method that initializes the BatchFuture class.
+
+        :param batch:
+            The batch this future belongs to.
+
+        :type batch: Batch
+
+        """
+
+        super().__init__()
+        self.__batch = batch
+
+
+    def result(self, timeout : float = None):
+        if not self.done():
+            self.__batch.dispatch()
+
+        return super().result(timeout)
+
+
+    def exception(self, timeout : float = None):
+        if not self.done():
+            self.__batch.dispatch()
+
+        return super().exception(timeout)
+
+###############################################################################
+# Class Batch:
+#
+
+class Batch(object):
+    """
+    Class that collects lookups and resolves them with a single list request
+    per endpoint.  Lookups return BatchFuture instances.  The batch is
+    dispatched when it is used as a context manager and the block exits, when
+    the dispatch method is called, or when the result of any future in the
+    batch is requested.
+
+    """
+
+    def __init__(self, loaders : dict, timeout : float = None):
+        """
+        Method that initializes the Batch class.
+
+        :param loaders:
+            A dictionary keyed by loader name.  Each value is a tuple holding
+            a callable that takes a timeout and returns a mapping of all
+            entries, followed by the slug of the equivalent single entry
+            endpoint.
+
+        :param timeout:
+            An optional deadline, in seconds, for each list request.
+
+        :type loaders: dict
+        :type timeout: float or None
+
+        """
+
+        super().__init__()
+
+        self.__loaders = loaders
+        self.__timeout = timeout
+        self.__pending = dict()
+        self.__lock = threading.Lock()
+
+
+    def load(self, loader_name : str, key) -> BatchFuture:
+        """
+        Method you can use to add a lookup to this batch.
+
+        :param loader_name:
+            The name of the loader to use.
+
+        :param key:
+            The identifier of the desired entry.
+
+        :return:
+            Returns a future holding the entry.
+
+        :type loader_name: str
+        :type key:         int or str
+        :rtype:            BatchFuture
+
+        """
+
+        if loader_name not in self.__loaders:
+            raise ValueError("unknown loader %s"%loader_name)
+
+        future = BatchFuture(self)
+        with self.__lock:
+            self.__pending.setdefault(loader_name, list()).append(
+                (key, future)
+            )
+
+        return future
+
+
+    def dispatch(self):
+        """
+        Method you can use to issue the list requests for all pending
+        lookups.  Lookups added after this call are collected into a new set
+        of requests.
+
+        """
+
+        with self.__lock:
+            pending = self.__pending
+            self.__pending = dict()
+
+        for loader_name, lookups in pending.items():
+            fetch_all, slug = self.__loaders[loader_name]
+            try:
+                mapping = fetch_all(self.__timeout)
+            except Exception as e:
+                for key, future in lookups:
+                    future.set_exception(e)
+            else:
+                shared = len(lookups) > 1
+                for key, future in lookups:
+                    try:
+                        entry = find_entry(mapping, key, slug)
+                    except CommunicationErrorException as e:
+                        future.set_exception(e)
+                    else:
+                        if shared:
+                            entry = copy.deepcopy(entry)
+
+                        future.set_result(entry)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        if exception_type is None:
+            self.dispatch()
+        else:
+            with self.__lock:
+                pending = self.__pending
+                self.__pending = dict()
+
+            for lookups in pending.values():
+                for key, future in lookups:
+                    future.cancel()
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
@@ -0,0 +1,232 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that provides interchangeable JSON codecs.  The fastest
+installed codec is selected by default.  The standard library codec is always
+available.
+
+Note that signed messages are always encoded with the standard library so
+that signed payloads are byte-for-byte identical regardless of the codec in
+use.  Codecs are used to decode responses and to encode unsigned data.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import abc
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+###############################################################################
+# Class JsonCodec:
+#
+
+class JsonCodec(abc.ABC):
+    """
+    Base class for JSON codecs.  Derived classes must implement the dumps
+    and loads methods.
+
+    """
+
+    NAME = None
+    """
+    The name of this codec.
+
+    """
+
+    @property
+    def name(self):
+        """
+        Read-only property holding the name of this codec.
+
+        :type: str
+
+        """
+
+        return self.NAME
+
+
+    @abc.abstractmethod
+    def dumps(self, value) -> bytes:
+        """
+        Method you can use to encode a value as UTF-8 encoded JSON.
+
+        :param value:
+            The value to be encoded.
+
+        :return:
+            Returns the encoded value.
+
+        :type value: object
+        :rtype:      bytes
+
+        """
+
+        raise NotImplementedError()
+
+
+    @abc.abstractmethod
+    def loads(self, data):
+        """
+        Method you can use to decode JSON data.  Errors are reported with
+        ValueError or a subclass.
+
+        :param data:
+            The JSON data to be decoded.
+
+        :return:
+            Returns the decoded value.
+
+        :type data: bytes or str
+        :rtype:     object
+
+        """
+
+        raise NotImplementedError()
+
+
+    def __repr__(self):
+        return "%s()"%type(self).__name__
+
+###############################################################################
+# Class StandardJsonCodec:
+#
+
+class StandardJsonCodec(JsonCodec):
+    """
+    JSON codec using the Python standard library json module.
+
+    """
+
+    NAME = "json"
+
+    def dumps(self, value) -> bytes:
+        return json.dumps(value).encode('utf-8')
+
+
+    def loads(self, data):
+        return json.loads(data)
+
+###############################################################################
+# Class OrjsonCodec:
+#
+
+class OrjsonCodec(JsonCodec):
+    """
+    JSON codec using the orjson package.
+
+    """
+
+    NAME = "orjson"
+
+    def __init__(self):
+        """
+        Method that initializes the OrjsonCodec class.
+
+        """
+
+        super().__init__()
+
+        if orjson is None:
+            raise ImportError(
+                "the orjson package is required to use the orjson codec."
+            )
+
+
+    def dumps(self, value) -> bytes:
+        return orjson.dumps(value)
+
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+###############################################################################
+# Functions:
+#
+
+def encode_signed_message(message) -> bytes:
+    """
+    Function used to encode a message that is to be signed.  The standard
+    library encoder is always used so that signed payloads do not depend on
+    the installed codecs.
+
+    :param message:
+        The message to be encoded.
+
+    :return:
+        Returns the UTF-8 encoded JSON message.
+
+    :type message: dict or list
+    :rtype:        bytes
+
+    """
+
+    return json.dumps(message).encode('utf-8')
+
+
+def available_codecs() -> list:
+    """
+    Function you can use to obtain an instance of every installed codec,
+    fastest first.
+
+    :return:
+        Returns a list of codec instances.
+
+    :rtype: list
+
+    """
+
+    result = list()
+    if orjson is not None:
+        result.append(OrjsonCodec())
+
+    result.append(StandardJsonCodec())
+    return result
+
+
+def default_codec() -> JsonCodec:
+    """
+    Function you can use to obtain the fastest installed codec.
+
+    :return:
+        Returns a codec instance.
+
+    :rtype: JsonCodec
+
+    """
+
+    return available_codecs()[0]
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
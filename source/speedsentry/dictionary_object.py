@@ -26,6 +26,13 @@ build_read_write_class to create class types.  The classes will accept a
 dictionary in their __init__ method that will be used to populate the values
 of the created attributes.
 
+The functions build_slotted_read_only_class and build_slotted_read_write_class
+create equivalent compact record classes that store values in __slots__
+rather than in a per-instance dictionary.  Compact classes behave as read-only
+or mutable mappings rather than dict subclasses.  The slotted_class function
+returns the compact equivalent of a class created by build_read_only_class or
+build_read_write_class.
+
 """
 
 ###############################################################################
@@ -37,6 +44,181 @@ from typing import Any
 
 import textwrap
 import copy
+import collections.abc
+
+###############################################################################
+# Globals:
+#
+
+__slotted_classes = dict()
+"""
+Dictionary of compact record classes, keyed by dictionary backed class.
+
+"""
+
+###############################################################################
+# Class SlottedRecord:
+#
+
+class SlottedRecord(collections.abc.Mapping):
+    """
+    Base class for compact, read-only record classes.  Values for known
+    attributes are held in __slots__.  Values for keys that are not known
+    attributes are retained in a small dictionary that is only created when
+    needed.
+
+    """
+
+    __slots__ = ( '__extra', )
+
+    _fields = ()
+    """
+    The names of the slotted attributes.
+
+    """
+
+    _setters = dict()
+    """
+    Dictionary of slot setter functions, keyed by attribute name.
+
+    """
+
+    def __init__(self, dictionary):
+        """
+        Method that initializes the record.
+
+        :param dictionary:
+            The dictionary, or iterable of key and value pairs, containing
+            the desired element values.
+
+        :type dictionary: dict or iterable
+
+        """
+
+        if isinstance(dictionary, collections.abc.Mapping):
+            dictionary = dictionary.items()
+
+        setters = self._setters
+        extra = None
+        for key, value in dictionary:
+            setter = setters.get(key)
+            if setter is not None:
+                setter(self, value)
+            else:
+                if extra is None:
+                    extra = dict()
+
+                extra[key] = value
+
+        object.__setattr__(self, '_SlottedRecord__extra', extra)
+
+
+    def __getitem__(self, key):
+        if key in self._setters:
+            try:
+                result = getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        elif self.__extra is not None:
+            result = self.__extra[key]
+        else:
+            raise KeyError(key)
+
+        return result
+
+
+    def __iter__(self):
+        for key in self._fields:
+            try:
+                getattr(self, key)
+                yield key
+            except AttributeError:
+                pass
+
+        if self.__extra is not None:
+            for key in self.__extra:
+                yield key
+
+
+    def __len__(self):
+        return sum(1 for key in self)
+
+
+    def __setattr__(self, name, value):
+        raise AttributeError("attribute %s is read-only"%name)
+
+
+    def __delattr__(self, name):
+        raise AttributeError("attribute %s is read-only"%name)
+
+
+    def __repr__(self):
+        return "%s(%r)"%(type(self).__name__, dict(self))
+
+
+    def __reduce__(self):
+        return (type(self), (dict(self), ))
+
+
+    def __deepcopy__(self, memo):
+        """
+        Method that performs a deep copy of this record.
+
+        :param memo:
+            The dictionary used as a memo during the copy.
+
+        :return:
+            Returns a new record of the same type.
+
+        :type memo: dict
+
+        """
+
+        return type(self)(
+            { k : copy.deepcopy(v, memo) for k, v in self.items() }
+        )
+
+###############################################################################
+# Class MutableSlottedRecord:
+#
+
+class MutableSlottedRecord(SlottedRecord, collections.abc.MutableMapping):
+    """
+    Base class for compact, mutable record classes.
+
+    """
+
+    __slots__ = ()
+
+    __setattr__ = object.__setattr__
+
+    __delattr__ = object.__delattr__
+
+    def __setitem__(self, key, value):
+        setter = self._setters.get(key)
+        if setter is not None:
+            setter(self, value)
+        else:
+            extra = self._SlottedRecord__extra
+            if extra is None:
+                extra = dict()
+                object.__setattr__(self, '_SlottedRecord__extra', extra)
+
+            extra[key] = value
+
+
+    def __delitem__(self, key):
+        if key in self._setters:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        else:
+            extra = self._SlottedRecord__extra
+            if extra is None:
+                raise KeyError(key)
+
+            del extra[key]
 
 ###############################################################################
 # Functions:
@@ -78,9 +260,10 @@ def build_read_only_class(
 Method that initializes the %s class.
 
 :param dictionary:
-    The dictionary containing the desired element values.
+    The dictionary, or iterable of key and value pairs, containing the
+    desired element values.
 
-:type dictionary: dict
+:type dictionary: dict or iterable
 
 """%class_name
 
@@ -89,7 +272,10 @@ Method that initializes the %s class.
         ( dict, ),
         {
             "__doc__" : __wrap(class_description),
-            "__init__" : __init__
+            "__init__" : __init__,
+            "_class_description" : class_description,
+            "_attribute_descriptions" : dict(attribute_descriptions),
+            "_read_only" : True
         }
     )
 
@@ -169,9 +355,10 @@ def build_read_write_class(
 Method that initializes the %s class.
 
 :param dictionary:
-    The dictionary containing the desired element values.
+    The dictionary, or iterable of key and value pairs, containing the
+    desired element values.
 
-:type dictionary: dict
+:type dictionary: dict or iterable
 
 """%class_name
 
@@ -180,7 +367,10 @@ Method that initializes the %s class.
         ( dict, ),
         {
             "__doc__" : __wrap(class_description),
-            "__init__" : __init__
+            "__init__" : __init__,
+            "_class_description" : class_description,
+            "_attribute_descriptions" : dict(attribute_descriptions),
+            "_read_only" : False
         }
     )
 
@@ -224,6 +414,173 @@ Method that performs a deep copy of this class.
     return class_type
 
 
+def build_slotted_read_only_class(
+    class_name : str,
+    class_description : str,
+    attribute_descriptions: dict
+    ):
+    """
+    Method that builds a compact record class with a given name and
+    read-only attributes.  Values are held in __slots__ and instances support
+    read-only mapping access, equality with other mappings, and deep copies.
+
+    :param class_name:
+        The name to assign to objects of this type.
+
+    :param class_description:
+        The docstring used to describe this dynamically generated class.
+
+    :param attribute_descriptions:
+        The dictionary holding the attribute descriptions.  The dictionary
+        should be with each value being a description.  Only keyed attributes
+        will be created.
+
+    :return:
+        Returns dynamically generated type you can use to represent returned
+        JSON data.
+
+    :type description: dict
+    :rtype:            class
+
+    """
+
+    return __build_slotted_class(
+        class_name,
+        class_description,
+        attribute_descriptions,
+        SlottedRecord
+    )
+
+
+def build_slotted_read_write_class(
+    class_name : str,
+    class_description : str,
+    attribute_descriptions: dict
+    ):
+    """
+    Method that builds a compact record class with a given name and
+    read-write attributes.  Values are held in __slots__ and instances support
+    mutable mapping access, equality with other mappings, and deep copies.
+
+    :param class_name:
+        The name to assign to objects of this type.
+
+    :param class_description:
+        The docstring used to describe this dynamically generated class.
+
+    :param attribute_descriptions:
+        The dictionary holding the attribute descriptions.  The dictionary
+        should be with each value being a description.  Only keyed attributes
+        will be created.
+
+    :return:
+        Returns dynamically generated type you can use to represent returned
+        JSON data.
+
+    :type description: dict
+    :rtype:            class
+
+    """
+
+    return __build_slotted_class(
+        class_name,
+        class_description,
+        attribute_descriptions,
+        MutableSlottedRecord
+    )
+
+
+def slotted_class(class_type):
+    """
+    Method that returns the compact record class equivalent to a class
+    created by build_read_only_class or build_read_write_class.  The compact
+    class is created once and reused.
+
+    :param class_type:
+        The dictionary backed class.
+
+    :return:
+        Returns the compact record class with the same name, description, and
+        attributes.
+
+    :type class_type: class
+    :rtype:           class
+
+    """
+
+    result = __slotted_classes.get(class_type)
+    if result is None:
+        if class_type._read_only:
+            builder = build_slotted_read_only_class
+        else:
+            builder = build_slotted_read_write_class
+
+        result = builder(
+            class_type.__name__,
+            class_type._class_description,
+            class_type._attribute_descriptions
+        )
+
+        __slotted_classes[class_type] = result
+
+    return result
+
+
+def __build_slotted_class(
+    class_name : str,
+    class_description : str,
+    attribute_descriptions: dict,
+    base_class
+    ):
+    """
+    Method used internally to build a compact record class.
+
+    :param class_name:
+        The name to assign to objects of this type.
+
+    :param class_description:
+        The docstring used to describe this dynamically generated class.
+
+    :param attribute_descriptions:
+        The dictionary holding the attribute descriptions.
+
+    :param base_class:
+        The base class, either SlottedRecord or MutableSlottedRecord.
+
+    :return:
+        Returns dynamically generated type.
+
+    :type description: dict
+    :type base_class:  class
+    :rtype:            class
+
+    """
+
+    fields = tuple(attribute_descriptions.keys())
+    class_type = type(base_class)(
+        class_name,
+        ( base_class, ),
+        {
+            "__doc__" : __wrap(class_description),
+            "__module__" : __name__,
+            "__slots__" : {
+                key : __wrap(docstring)
+                for key, docstring in attribute_descriptions.items()
+            },
+            "_fields" : fields,
+            "_class_description" : class_description,
+            "_attribute_descriptions" : dict(attribute_descriptions),
+            "_read_only" : base_class is SlottedRecord
+        }
+    )
+
+    class_type._setters = {
+        key : class_type.__dict__[key].__set__ for key in fields
+    }
+
+    return class_type
+
+
 def __wrap(text : str) -> str:
     """
     Function that wraps text, inserting newlines.
@@ -298,3 +655,18 @@ if __name__ == "__main__":
 
     print("obj2.d", str(obj2.d))
     print("obj2.e", str(obj2.e))
+
+    SlottedType1 = slotted_class(Type1)
+    obj3 = SlottedType1(dictionary_1)
+
+    print("obj3.a", str(obj3.a))
+    print("obj3['b']", str(obj3['b']))
+    print("obj3 == obj1", str(obj3 == obj1))
+
+    try:
+        obj3.b = 5
+    except AttributeError as e:
+        print("Got expected exception: %s"%str(e))
+
+    obj4 = copy.deepcopy(obj3)
+    print("deepcopy(obj3) == obj3", str(obj4 == obj3))
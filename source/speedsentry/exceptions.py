@@ -146,6 +146,105 @@ class CommunicationErrorException(SpeedSentryException):
 
         super().__init__(error_message)
 
+        self.__status_code = status_code
+        self.__status_message = status_message
+
+
+    @property
+    def status_code(self):
+        """
+        Read-only property holding the returned server status code.  A value
+        of None indicates no status was received.
+
+        :type: int or None
+
+        """
+
+        return self.__status_code
+
+
+    @property
+    def status_message(self):
+        """
+        Read-only property holding the failure status message.
+
+        :type: str or None
+
+        """
+
+        return self.__status_message
+
+###############################################################################
+# Class TimeoutException:
+#
+
+class TimeoutException(CommunicationErrorException):
+    """
+    Exception class that is raised when the server does not respond in time.
+
+    """
+
+    def __init__(self, status_message = None):
+        """
+        Method that initializes the TimeoutException.
+
+        :param status_message:
+            A message describing the error.
+
+        :type status_message: str
+
+        """
+
+        super().__init__(status_message = status_message)
+
+###############################################################################
+# Class DeadlineExceededException:
+#
+
+class DeadlineExceededException(TimeoutException):
+    """
+    Exception class that is raised when a call, including any retries, does
+    not complete before its deadline.
+
+    """
+
+    def __init__(self, status_message = None):
+        """
+        Method that initializes the DeadlineExceededException.
+
+        :param status_message:
+            A message describing the error.
+
+        :type status_message: str
+
+        """
+
+        super().__init__(status_message)
+
+###############################################################################
+# Class CircuitOpenException:
+#
+
+class CircuitOpenException(CommunicationErrorException):
+    """
+    Exception class that is raised when a request is rejected because the
+    circuit breaker is open.
+
+    """
+
+    def __init__(self, status_message = None):
+        """
+        Method that initializes the CircuitOpenException.
+
+        :param status_message:
+            A message describing the error.
+
+        :type status_message: str
+
+        """
+
+        super().__init__(status_message = status_message)
+
 ###############################################################################
 # Class DecodingErrorException:
 #
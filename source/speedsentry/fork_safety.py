@@ -0,0 +1,104 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that detects when an object is used in a child process forked
+from the process that created it.
+
+Pooled connections, locks, and in-flight calls copied into a child process by
+fork must not be used by the child.  Objects holding such state keep a
+ForkDetector and replace that state the first time they are used after a
+fork.  The process ID is compared, rather than relying on fork handlers, so
+that forks performed outside of Python, such as by pre-fork application
+servers, are also detected.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import os
+
+###############################################################################
+# Class ForkDetector:
+#
+
+class ForkDetector(object):
+    """
+    Class that detects a change of process ID.
+
+    """
+
+    def __init__(self):
+        """
+        Method that initializes the ForkDetector class.
+
+        """
+
+        super().__init__()
+        self.__pid = os.getpid()
+
+
+    @property
+    def pid(self):
+        """
+        Read-only property holding the ID of the process this detector was
+        created in, or last reported a fork in.
+
+        :type: int
+
+        """
+
+        return self.__pid
+
+
+    def forked(self) -> bool:
+        """
+        Method you can use to determine if the process ID has changed since
+        the detector was created or last reported a fork.  A fork is only
+        reported once per process.
+
+        :return:
+            Returns True if the process ID has changed.  Returns False if the
+            process ID is unchanged.
+
+        :rtype: bool
+
+        """
+
+        pid = os.getpid()
+        if pid != self.__pid:
+            self.__pid = pid
+            result = True
+        else:
+            result = False
+
+        return result
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
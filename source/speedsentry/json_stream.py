@@ -0,0 +1,289 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that incrementally decodes a JSON object as it arrives.
+
+The decoder walks the members of a top level JSON object.  Members whose
+values are arrays can be reported one element at a time so that large arrays
+never need to be held in memory.  Memory use is bounded by the chunk size plus
+the size of the largest single value rather than by the size of the document.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import codecs
+import json
+
+from .exceptions import DecodingErrorException
+
+###############################################################################
+# Globals:
+#
+
+WHITESPACE = " \t\n\r"
+"""
+Characters treated as insignificant whitespace between JSON tokens.
+
+"""
+
+###############################################################################
+# Class JsonObjectStream:
+#
+
+class JsonObjectStream(object):
+    """
+    Class that incrementally decodes a top level JSON object from an iterable
+    of bytes chunks.  Iterating over an instance yields tuples of the form
+    (key, value, is_element).  For members listed in array_keys whose value is
+    an array, one tuple is yielded per array element with is_element set to
+    True.  All other members, including empty arrays, are yielded whole with
+    is_element set to False.
+
+    """
+
+    def __init__(self, chunks, array_keys = ()):
+        """
+        Method that initializes the JsonObjectStream class.
+
+        :param chunks:
+            An iterable of bytes objects holding the UTF-8 encoded document.
+
+        :param array_keys:
+            The keys of members whose array values should be reported one
+            element at a time.
+
+        :type chunks:     iterable of bytes
+        :type array_keys: iterable of str
+
+        """
+
+        super().__init__()
+
+        self.__chunks = iter(chunks)
+        self.__array_keys = frozenset(array_keys)
+        self.__text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.__json_decoder = json.JSONDecoder()
+
+        self.__buffer = str()
+        self.__position = 0
+        self.__end_of_stream = False
+
+
+    def __iter__(self):
+        self.__expect('{')
+        if self.__peek() == '}':
+            self.__position += 1
+        else:
+            more = True
+            while more:
+                key = self.__value()
+                if not isinstance(key, str):
+                    raise DecodingErrorException(
+                        status_message = "expected JSON object key."
+                    )
+
+                self.__expect(':')
+
+                if key in self.__array_keys and self.__peek() == '[':
+                    self.__position += 1
+                    if self.__peek() == ']':
+                        self.__position += 1
+                        yield (key, list(), False)
+                    else:
+                        more_elements = True
+                        while more_elements:
+                            yield (key, self.__value(), True)
+                            more_elements = self.__separator(']')
+                else:
+                    yield (key, self.__value(), False)
+
+                more = self.__separator('}')
+
+        if self.__peek() is not None:
+            raise DecodingErrorException(
+                status_message = "unexpected data after JSON object."
+            )
+
+
+    def __separator(self, closing : str) -> bool:
+        """
+        Method used internally to consume either a comma or a closing
+        delimiter.
+
+        :param closing:
+            The expected closing delimiter.
+
+        :return:
+            Returns True if a comma was consumed.  Returns False if the
+            closing delimiter was consumed.
+
+        :type closing: str
+        :rtype:        bool
+
+        """
+
+        character = self.__peek()
+        if character == ',':
+            result = True
+        elif character == closing:
+            result = False
+        else:
+            raise DecodingErrorException(
+                status_message = "expected ',' or '%s' in JSON data."%closing
+            )
+
+        self.__position += 1
+        return result
+
+
+    def __expect(self, character : str):
+        """
+        Method used internally to consume an expected character.
+
+        :param character:
+            The expected character.
+
+        :type character: str
+
+        """
+
+        if self.__peek() != character:
+            raise DecodingErrorException(
+                status_message = "expected '%s' in JSON data."%character
+            )
+
+        self.__position += 1
+
+
+    def __peek(self):
+        """
+        Method used internally to skip whitespace and return the next
+        character without consuming it.
+
+        :return:
+            Returns the next character or None at the end of the stream.
+
+        :rtype: str or None
+
+        """
+
+        result = None
+        searching = True
+        while searching:
+            buffer = self.__buffer
+            position = self.__position
+            length = len(buffer)
+            while position < length and buffer[position] in WHITESPACE:
+                position += 1
+
+            self.__position = position
+            if position < length:
+                result = buffer[position]
+                searching = False
+            else:
+                searching = self.__fill()
+
+        return result
+
+
+    def __value(self):
+        """
+        Method used internally to decode the next complete JSON value.
+
+        :return:
+            Returns the decoded value.
+
+        :rtype: object
+
+        """
+
+        self.__peek()
+
+        result = None
+        decoding = True
+        while decoding:
+            try:
+                result, end = self.__json_decoder.raw_decode(
+                    self.__buffer,
+                    self.__position
+                )
+
+                # A value that ends exactly at the end of the buffer may be a
+                # truncated number so we only accept it once more data, or
+                # the end of the stream, has been seen.
+
+                if end < len(self.__buffer) or self.__end_of_stream:
+                    self.__position = end
+                    decoding = False
+                elif not self.__fill():
+                    self.__position = end
+                    decoding = False
+            except json.JSONDecodeError as e:
+                if not self.__fill():
+                    raise DecodingErrorException(
+                        status_message = "invalid JSON data: %s"%str(e)
+                    )
+
+        return result
+
+
+    def __fill(self) -> bool:
+        """
+        Method used internally to append the next chunk to the buffer.
+        Consumed text is discarded so the buffer never holds more than the
+        unconsumed tail plus one chunk.
+
+        :return:
+            Returns True if data was added.  Returns False at the end of the
+            stream.
+
+        :rtype: bool
+
+        """
+
+        result = False
+        while not result and not self.__end_of_stream:
+            chunk = next(self.__chunks, None)
+            if chunk is None:
+                self.__end_of_stream = True
+                text = self.__text_decoder.decode(b"", True)
+            else:
+                text = self.__text_decoder.decode(chunk)
+
+            if text:
+                self.__buffer = self.__buffer[self.__position:] + text
+                self.__position = 0
+                result = True
+
+        return result
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
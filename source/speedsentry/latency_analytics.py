@@ -0,0 +1,398 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that computes latency statistics for groups of monitors,
+regions, and time buckets using vectorized NumPy operations.  This module
+requires the numpy package.
+
+Raw samples and aggregated populations can be mixed.  Each row is weighted
+by the number of samples it represents.  Averages and variances are combined
+exactly, including the spread of each aggregated population.  Minimums and
+maximums are exact.  Percentiles are computed from the weighted distribution
+of row averages, which is exact for raw samples and treats each aggregated
+population as if every sample equalled the population's average.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from . import latency_frame as latency_frame
+
+###############################################################################
+# Globals:
+#
+
+GROUP_COLUMNS = ('monitor_id', 'region_id')
+"""
+The columns rows can be grouped by, in addition to time buckets.
+
+"""
+
+DEFAULT_PERCENTILES = (50, 95, 99)
+"""
+The default percentiles computed for each group.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def percentile_name(percentile : float) -> str:
+    """
+    Function you can use to obtain the name of the column holding a
+    percentile.
+
+    :param percentile:
+        The percentile, from 0 to 100.
+
+    :return:
+        Returns the column name, for example "p95" or "p99.9".
+
+    :type percentile: float
+    :rtype:           str
+
+    """
+
+    return "p%g"%percentile
+
+
+def to_frame(recent = (), aggregated = ()):
+    """
+    Function you can use to combine recent and aggregated entries into a
+    single frame.
+
+    :param recent:
+        The recent entries.  You can supply the list of LatencyEntry
+        instances or the LatencyFrame returned by SpeedSentry.latency_list,
+        or any LatencyFrame.
+
+    :param aggregated:
+        The aggregated entries.  You can supply the list of
+        AggregatedLatencyEntry instances or the LatencyFrame returned by
+        SpeedSentry.latency_list.
+
+    :return:
+        Returns the combined frame.
+
+    :type recent:     list or LatencyFrame
+    :type aggregated: list or LatencyFrame
+    :rtype:           LatencyFrame
+
+    """
+
+    if numpy is None:
+        raise ImportError(
+            "the numpy package is required to use latency analytics."
+        )
+
+    if not isinstance(recent, latency_frame.LatencyFrame):
+        recent = latency_frame.LatencyFrame.from_entries(
+            recent,
+            aggregated = False
+        )
+
+    if not isinstance(aggregated, latency_frame.LatencyFrame):
+        aggregated = latency_frame.LatencyFrame.from_entries(
+            aggregated,
+            aggregated = True
+        )
+
+    if len(aggregated) == 0:
+        result = recent
+    elif len(recent) == 0:
+        result = aggregated
+    else:
+        result = latency_frame.LatencyFrame(
+            {
+                name : numpy.concatenate(
+                    (recent.column(name), aggregated.column(name))
+                )
+                for name in latency_frame.COLUMN_NAMES
+            }
+        )
+
+    return result
+
+
+def summarize(
+        recent = (),
+        aggregated = (),
+        by : tuple = GROUP_COLUMNS,
+        resolution : int = None,
+        percentiles : tuple = DEFAULT_PERCENTILES
+    ) -> dict:
+    """
+    Function you can use to compute latency statistics for each group of
+    rows.
+
+    The average, variance, minimum, and maximum are exact.  Percentiles are
+    computed from the rows themselves, so an aggregated row is weighted as
+    number_samples copies of its average.  The spread of the samples within
+    an aggregated row is lost, so upper percentiles such as p95 and p99 are
+    understated for groups holding aggregated rows.
+
+    :param recent:
+        The recent entries.  You can supply the list of LatencyEntry
+        instances or the LatencyFrame returned by SpeedSentry.latency_list,
+        or any LatencyFrame.
+
+    :param aggregated:
+        The aggregated entries.  You can supply the list of
+        AggregatedLatencyEntry instances or the LatencyFrame returned by
+        SpeedSentry.latency_list.
+
+    :param by:
+        The columns to group by, any of "monitor_id" and "region_id".  An
+        empty tuple places every row in a single group, or in one group per
+        time bucket.
+
+    :param resolution:
+        An optional time bucket width, in seconds.  If specified, rows are
+        also grouped by the bucket holding their start timestamp.
+
+    :param percentiles:
+        The percentiles to compute, each from 0 to 100.
+
+    :return:
+        Returns a dictionary of equal length arrays, one element per group,
+        sorted by the group columns and then by time bucket.  The group
+        columns are included, along with "timestamp" holding the start of
+        each time bucket if a resolution is specified.  The dictionary also
+        holds "number_samples", "average", "variance", "standard_deviation",
+        "minimum", "maximum", and one column per percentile named as
+        returned by percentile_name.
+
+    :type recent:      list or LatencyFrame
+    :type aggregated:  list or LatencyFrame
+    :type by:          tuple
+    :type resolution:  int or None
+    :type percentiles: tuple
+    :rtype:            dict
+
+    """
+
+    frame = to_frame(recent, aggregated)
+
+    by = tuple(by)
+    for name in by:
+        if name not in GROUP_COLUMNS:
+            raise ValueError("can not group by %s"%name)
+
+    keys = [ frame.column(name) for name in by ]
+    if resolution is not None:
+        keys.append(frame.start_timestamp // resolution)
+
+    number_rows = len(frame)
+    average = frame.average
+    permutation = group_permutation(keys, average)
+    sorted_keys = [ key[permutation] for key in keys ]
+
+    change = numpy.zeros(max(number_rows - 1, 0), dtype = bool)
+    for key in sorted_keys:
+        change |= key[1:] != key[:-1]
+
+    if number_rows:
+        starts = numpy.concatenate(([ 0 ], numpy.flatnonzero(change) + 1))
+        group = numpy.concatenate(([ 0 ], numpy.cumsum(change)))
+    else:
+        starts = numpy.zeros(0, dtype = 'int64')
+        group = starts
+
+    result = {
+        name : key[starts] for name, key in zip(by, sorted_keys)
+    }
+    if resolution is not None:
+        result['timestamp'] = sorted_keys[-1][starts] * resolution
+
+    if len(starts):
+        number_samples = frame.number_samples[permutation]
+        weight = number_samples.astype('float64')
+        average = average[permutation]
+
+        total_weight = numpy.add.reduceat(weight, starts)
+        merged_average = numpy.add.reduceat(weight * average, starts)
+        merged_average /= total_weight
+
+        deviation = average - merged_average[group]
+        merged_variance = numpy.add.reduceat(
+            weight * (frame.variance[permutation] + deviation * deviation),
+            starts
+        ) / total_weight
+
+        result['number_samples'] = numpy.add.reduceat(number_samples, starts)
+        result['average'] = merged_average
+        result['variance'] = merged_variance
+        result['standard_deviation'] = numpy.sqrt(merged_variance)
+        result['minimum'] = numpy.minimum.reduceat(
+            frame.minimum[permutation],
+            starts
+        )
+        result['maximum'] = numpy.maximum.reduceat(
+            frame.maximum[permutation],
+            starts
+        )
+
+        if percentiles:
+            values = weighted_percentiles(
+                average,
+                weight,
+                starts,
+                percentiles
+            )
+            for percentile, value in zip(percentiles, values):
+                result[percentile_name(percentile)] = value
+    else:
+        for name in ('average', 'variance', 'standard_deviation'):
+            result[name] = numpy.zeros(0)
+
+        result['number_samples'] = numpy.zeros(0, dtype = 'int64')
+        result['minimum'] = numpy.zeros(0)
+        result['maximum'] = numpy.zeros(0)
+        for percentile in percentiles:
+            result[percentile_name(percentile)] = numpy.zeros(0)
+
+    return result
+
+
+def weighted_percentiles(
+        values,
+        weights,
+        starts,
+        percentiles : tuple
+    ) -> list:
+    """
+    Function you can use to compute weighted percentiles for a number of
+    groups at once.  Each percentile is the smallest value at which the
+    weighted cumulative distribution of its group reaches the percentile.
+    With unit weights this matches numpy.percentile using the inverted_cdf
+    method.
+
+    :param values:
+        The values, with the rows of each group contiguous and the values
+        within each group in ascending order.
+
+    :param weights:
+        The positive weight of each value.
+
+    :param starts:
+        The index of the first value in each group.
+
+    :param percentiles:
+        The percentiles to compute, each from 0 to 100.
+
+    :return:
+        Returns a list holding an array of per-group values for each
+        percentile.
+
+    :type values:      numpy.ndarray
+    :type weights:     numpy.ndarray
+    :type starts:      numpy.ndarray
+    :type percentiles: tuple
+    :rtype:            list
+
+    """
+
+    cumulative = numpy.cumsum(weights)
+
+    ends = numpy.concatenate((starts[1:], [ len(values) ])) - 1
+    before = numpy.concatenate(([ 0.0 ], cumulative[ends[:-1]]))
+    total = cumulative[ends] - before
+
+    result = list()
+    for percentile in percentiles:
+        if not 0 <= percentile <= 100:
+            raise ValueError("invalid percentile %r"%percentile)
+
+        index = numpy.searchsorted(
+            cumulative,
+            before + total * (percentile / 100.0),
+            side = 'left'
+        )
+        result.append(values[numpy.clip(index, starts, ends)])
+
+    return result
+
+
+def group_permutation(keys : list, values):
+    """
+    Function you can use to sort rows by a list of integer keys and then by
+    value.  Each key is reduced to a dense code so that the rows can be
+    ordered with one sort by value followed by one stable sort by the
+    combined code, rather than a lexicographic sort over every key.
+
+    :param keys:
+        The integer key arrays, most significant first.
+
+    :param values:
+        The values to order the rows of each group by.
+
+    :return:
+        Returns the permutation that sorts the rows.
+
+    :type keys:   list
+    :type values: numpy.ndarray
+    :rtype:       numpy.ndarray
+
+    """
+
+    order = numpy.argsort(values)
+    if not keys or len(values) == 0:
+        return order
+
+    code = numpy.zeros(len(values), dtype = 'int64')
+    span = 1
+    for key in keys:
+        minimum = int(key.min())
+        key_span = int(key.max()) - minimum + 1
+        if span * key_span < 2 ** 62:
+            dense = key - minimum
+        else:
+            unique, dense = numpy.unique(key, return_inverse = True)
+            key_span = len(unique)
+            if span * key_span >= 2 ** 62:
+                return numpy.lexsort((values,) + tuple(reversed(keys)))
+
+        code *= key_span
+        code += dense
+        span *= key_span
+
+    if span <= 2 ** 16:
+        code = code.astype('uint16')
+
+    return order[numpy.argsort(code[order], kind = 'stable')]
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
@@ -0,0 +1,1119 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that detects latency regressions as latency entries arrive,
+before the service reports a monitor as not responding.
+
+Each detector keeps a small, fixed amount of state per monitor and region so
+every sample is processed in constant time regardless of the length of the
+latency history.  Three detectors are provided:
+
+* EwmaDetector reports samples well above an exponentially weighted moving
+  average, using an exponentially weighted variance to set the band.
+
+* CusumDetector accumulates small, persistent increases above a slowly
+  moving baseline and reports a shift once the accumulated increase crosses
+  a threshold.
+
+* SeasonalDetector keeps a separate baseline for each part of a period, by
+  default each hour of the day, so that regular daily load patterns are not
+  reported.
+
+Only increases in latency are reported.  Detector state can be saved to a
+checkpoint and restored so that baselines survive process restarts.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import os
+import abc
+import math
+import json
+import tempfile
+import threading
+
+from .exceptions import CommunicationErrorException
+from . import dictionary_object as dictionary_object
+from . import fork_safety as fork_safety
+from . import latency_frame as latency_frame
+
+###############################################################################
+# Globals:
+#
+
+CHECKPOINT_VERSION = 1
+"""
+The version of the checkpoint format.
+
+"""
+
+DEFAULT_COOLDOWN = 900
+"""
+The default minimum time, in seconds, between anomalies reported by the same
+detector for the same monitor and region.
+
+"""
+
+LatencyAnomaly = dictionary_object.build_read_only_class(
+    "LatencyAnomaly",
+    "You can use this class to hold information about a latency anomaly.",
+    {
+        "monitor_id" :
+            "The monitor ID of the monitor where the anomaly was detected.",
+        "region_id" :
+            "The region ID of the region where the anomaly was detected.",
+        "timestamp" :
+            "The Unix timestamp of the sample that triggered the anomaly.",
+        "latency" :
+            "The latency of the sample that triggered the anomaly, in "
+            "seconds.",
+        "detector" :
+            "The name of the detector that reported the anomaly.",
+        "expected" :
+            "The expected latency, in seconds, from the detector's baseline.",
+        "score" :
+            "The detector's score for the sample.  For band detectors this "
+            "is the number of deviations above the baseline.  For the CUSUM "
+            "detector this is the accumulated statistic.",
+        "threshold" :
+            "The score above which the detector reports an anomaly."
+    }
+)
+"""
+Class holding a single latency anomaly.
+
+"""
+
+###############################################################################
+# Class Detector:
+#
+
+class Detector(abc.ABC):
+    """
+    Base class for incremental latency anomaly detectors.  A detector holds
+    only its parameters.  The state for each monitor and region is a short
+    list of numbers created by the initial_state method and updated in place
+    by the update method, so that it can be saved to a checkpoint.  Derived
+    classes must implement the parameters and threshold properties and the
+    initial_state and update methods.
+
+    """
+
+    NAME = None
+    """
+    The name of this detector.
+
+    """
+
+    @property
+    def name(self):
+        """
+        Read-only property holding the name of this detector.
+
+        :type: str
+
+        """
+
+        return self.NAME
+
+
+    @property
+    @abc.abstractmethod
+    def parameters(self):
+        """
+        Read-only property holding the detector's parameters, keyed by name.
+
+        :type: dict
+
+        """
+
+        raise NotImplementedError()
+
+
+    @property
+    @abc.abstractmethod
+    def threshold(self):
+        """
+        Read-only property holding the score above which the detector
+        reports an anomaly.
+
+        :type: float
+
+        """
+
+        raise NotImplementedError()
+
+
+    @abc.abstractmethod
+    def initial_state(self) -> list:
+        """
+        Method you can use to create the state for a new monitor and region.
+
+        :return:
+            Returns the new state.
+
+        :rtype: list
+
+        """
+
+        raise NotImplementedError()
+
+
+    @abc.abstractmethod
+    def update(self, state : list, timestamp : int, value : float):
+        """
+        Method you can use to add a sample to a state.
+
+        :param state:
+            The state to update.
+
+        :param timestamp:
+            The Unix timestamp of the sample.
+
+        :param value:
+            The latency of the sample, in seconds.
+
+        :return:
+            Returns None if the sample is not anomalous.  Returns a tuple
+            holding the expected latency and the score if the sample is
+            anomalous.
+
+        :type state:     list
+        :type timestamp: int
+        :type value:     float
+        :rtype:          tuple or None
+
+        """
+
+        raise NotImplementedError()
+
+
+    def __repr__(self):
+        return "%s(%s)"%(
+            type(self).__name__,
+            ", ".join(
+                "%s = %r"%(name, value)
+                for name, value in self.parameters.items()
+            )
+        )
+
+###############################################################################
+# Class EwmaDetector:
+#
+
+class EwmaDetector(Detector):
+    """
+    Detector that reports samples above a band around an exponentially
+    weighted moving average.  Reported samples update the average and
+    variance as if they lay on the edge of the band, so a single outlier
+    does not widen the band for the samples that follow.  The state is the
+    number of samples, the average, and the exponentially weighted
+    variance.
+
+    """
+
+    NAME = "ewma"
+
+    def __init__(
+            self,
+            alpha : float = 0.05,
+            bands : float = 5.0,
+            warmup : int = 30,
+            minimum_deviation : float = 0.05
+        ):
+        """
+        Method that initializes the EwmaDetector class.
+
+        :param alpha:
+            The weight given to each new sample, greater than 0 and at most
+            1.
+
+        :param bands:
+            The number of deviations above the average at which samples are
+            reported.
+
+        :param warmup:
+            The number of samples needed before samples are reported.
+
+        :param minimum_deviation:
+            The smallest deviation used, as a fraction of the average.  This
+            prevents very steady monitors from reporting small changes.
+
+        :type alpha:             float
+        :type bands:             float
+        :type warmup:            int
+        :type minimum_deviation: float
+
+        """
+
+        super().__init__()
+
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("invalid alpha %r"%alpha)
+
+        self.__alpha = float(alpha)
+        self.__bands = float(bands)
+        self.__warmup = int(warmup)
+        self.__minimum_deviation = float(minimum_deviation)
+
+
+    @property
+    def parameters(self):
+        return {
+            'alpha' : self.__alpha,
+            'bands' : self.__bands,
+            'warmup' : self.__warmup,
+            'minimum_deviation' : self.__minimum_deviation
+        }
+
+
+    @property
+    def threshold(self):
+        return self.__bands
+
+
+    def initial_state(self) -> list:
+        return [ 0, 0.0, 0.0 ]
+
+
+    def update(self, state : list, timestamp : int, value : float):
+        count, average, variance = state
+
+        result = None
+        if count >= self.__warmup:
+            deviation = max(
+                math.sqrt(variance),
+                self.__minimum_deviation * average
+            )
+            limit = average + self.__bands * deviation
+            if deviation > 0.0 and value > limit:
+                result = (average, (value - average) / deviation)
+                value = limit
+
+        if count:
+            difference = value - average
+            increment = self.__alpha * difference
+            state[1] = average + increment
+            state[2] = (1.0 - self.__alpha) * (
+                variance + difference * increment
+            )
+        else:
+            state[1] = value
+
+        state[0] = count + 1
+        return result
+
+###############################################################################
+# Class CusumDetector:
+#
+
+class CusumDetector(Detector):
+    """
+    Detector that uses a one-sided cumulative sum to report persistent
+    increases in latency that are too small to leave a band around the
+    average.  Each sample adds its number of deviations above a slowly
+    moving baseline, less an allowed drift, to a statistic that never drops
+    below zero.  A shift is reported, and the statistic cleared, when the
+    statistic crosses the threshold.  Samples more than the threshold number
+    of deviations above the baseline update the baseline as if they lay at
+    that limit.  The state is the number of samples, the baseline average
+    and variance, and the statistic.
+
+    """
+
+    NAME = "cusum"
+
+    def __init__(
+            self,
+            alpha : float = 0.01,
+            drift : float = 1.0,
+            threshold : float = 10.0,
+            warmup : int = 60,
+            minimum_deviation : float = 0.05
+        ):
+        """
+        Method that initializes the CusumDetector class.
+
+        :param alpha:
+            The weight given to each new sample by the baseline, greater
+            than 0 and at most 1.
+
+        :param drift:
+            The number of deviations above the baseline each sample may
+            lie without adding to the statistic.
+
+        :param threshold:
+            The statistic at which a shift is reported.
+
+        :param warmup:
+            The number of samples needed before the statistic is updated.
+
+        :param minimum_deviation:
+            The smallest deviation used, as a fraction of the baseline
+            average.
+
+        :type alpha:             float
+        :type drift:             float
+        :type threshold:         float
+        :type warmup:            int
+        :type minimum_deviation: float
+
+        """
+
+        super().__init__()
+
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("invalid alpha %r"%alpha)
+
+        self.__alpha = float(alpha)
+        self.__drift = float(drift)
+        self.__threshold = float(threshold)
+        self.__warmup = int(warmup)
+        self.__minimum_deviation = float(minimum_deviation)
+
+
+    @property
+    def parameters(self):
+        return {
+            'alpha' : self.__alpha,
+            'drift' : self.__drift,
+            'threshold' : self.__threshold,
+            'warmup' : self.__warmup,
+            'minimum_deviation' : self.__minimum_deviation
+        }
+
+
+    @property
+    def threshold(self):
+        return self.__threshold
+
+
+    def initial_state(self) -> list:
+        return [ 0, 0.0, 0.0, 0.0 ]
+
+
+    def update(self, state : list, timestamp : int, value : float):
+        count, average, variance, statistic = state
+
+        result = None
+        if count >= self.__warmup:
+            deviation = max(
+                math.sqrt(variance),
+                self.__minimum_deviation * average
+            )
+            if deviation > 0.0:
+                statistic = max(
+                    0.0,
+                    statistic + (value - average) / deviation - self.__drift
+                )
+                if statistic > self.__threshold:
+                    result = (average, statistic)
+                    statistic = 0.0
+
+                value = min(value, average + self.__threshold * deviation)
+
+        if count:
+            difference = value - average
+            increment = self.__alpha * difference
+            state[1] = average + increment
+            state[2] = (1.0 - self.__alpha) * (
+                variance + difference * increment
+            )
+        else:
+            state[1] = value
+
+        state[0] = count + 1
+        state[3] = statistic
+        return result
+
+###############################################################################
+# Class SeasonalDetector:
+#
+
+class SeasonalDetector(Detector):
+    """
+    Detector that keeps a separate exponentially weighted average and
+    variance for each slot of a period, by default for each hour of the day
+    in UTC, and reports samples above a band around the baseline for their
+    slot.  As with the EwmaDetector, reported samples update their slot as
+    if they lay on the edge of the band.  The state holds the number of
+    samples, the average, and the variance of each slot.
+
+    """
+
+    NAME = "seasonal"
+
+    def __init__(
+            self,
+            period : int = 86400,
+            slots : int = 24,
+            alpha : float = 0.02,
+            bands : float = 5.0,
+            warmup : int = 120,
+            minimum_deviation : float = 0.05
+        ):
+        """
+        Method that initializes the SeasonalDetector class.
+
+        :param period:
+            The length of the period, in seconds.
+
+        :param slots:
+            The number of slots the period is divided into.
+
+        :param alpha:
+            The weight given to each new sample by its slot, greater than 0
+            and at most 1.
+
+        :param bands:
+            The number of deviations above a slot's average at which samples
+            are reported.
+
+        :param warmup:
+            The number of samples a slot needs before its samples are
+            reported.
+
+        :param minimum_deviation:
+            The smallest deviation used, as a fraction of a slot's average.
+
+        :type period:            int
+        :type slots:             int
+        :type alpha:             float
+        :type bands:             float
+        :type warmup:            int
+        :type minimum_deviation: float
+
+        """
+
+        super().__init__()
+
+        if period <= 0 or slots <= 0 or period % slots:
+            raise ValueError("invalid period or slots")
+
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("invalid alpha %r"%alpha)
+
+        self.__period = int(period)
+        self.__slots = int(slots)
+        self.__slot_length = self.__period // self.__slots
+        self.__alpha = float(alpha)
+        self.__bands = float(bands)
+        self.__warmup = int(warmup)
+        self.__minimum_deviation = float(minimum_deviation)
+
+
+    @property
+    def parameters(self):
+        return {
+            'period' : self.__period,
+            'slots' : self.__slots,
+            'alpha' : self.__alpha,
+            'bands' : self.__bands,
+            'warmup' : self.__warmup,
+            'minimum_deviation' : self.__minimum_deviation
+        }
+
+
+    @property
+    def threshold(self):
+        return self.__bands
+
+
+    def initial_state(self) -> list:
+        return [ 0 ] * self.__slots + [ 0.0 ] * (2 * self.__slots)
+
+
+    def update(self, state : list, timestamp : int, value : float):
+        slot = int(timestamp) % self.__period // self.__slot_length
+        average_index = slot + self.__slots
+        variance_index = average_index + self.__slots
+
+        count = state[slot]
+        average = state[average_index]
+        variance = state[variance_index]
+
+        result = None
+        if count >= self.__warmup:
+            deviation = max(
+                math.sqrt(variance),
+                self.__minimum_deviation * average
+            )
+            limit = average + self.__bands * deviation
+            if deviation > 0.0 and value > limit:
+                result = (average, (value - average) / deviation)
+                value = limit
+
+        if count:
+            difference = value - average
+            increment = self.__alpha * difference
+            state[average_index] = average + increment
+            state[variance_index] = (1.0 - self.__alpha) * (
+                variance + difference * increment
+            )
+        else:
+            state[average_index] = value
+
+        state[slot] = count + 1
+        return result
+
+###############################################################################
+# Class AnomalyDetector:
+#
+
+class AnomalyDetector(object):
+    """
+    Class that runs a set of detectors over latency entries, keeping
+    separate state for each monitor and region.
+
+    Samples for a monitor and region that are not newer than the last sample
+    processed are skipped, so overlapping history received after a restart
+    is not counted twice.  Aggregated entries are treated as a single sample
+    holding their average.
+
+    Anomalies can be reported to a callback and, optionally, raised as
+    customer events using SpeedSentry.events_create.  Once a detector
+    reports an anomaly for a monitor and region, further anomalies from that
+    detector are suppressed until the cooldown has passed, measured using
+    sample timestamps.
+
+    Every anomaly is passed to the callback before any customer events are
+    created.  Events that cannot be created because the request fails are
+    counted by the failed_events property rather than raised, so a failed
+    event neither hides other anomalies nor aborts the update.
+
+    The class is thread safe.  Callbacks and events are issued after the
+    detector's lock is released.
+
+    """
+
+    def __init__(
+            self,
+            detectors : tuple = None,
+            callback = None,
+            api = None,
+            type_index : int = None,
+            cooldown : int = DEFAULT_COOLDOWN,
+            event_timeout : float = None
+        ):
+        """
+        Method that initializes the AnomalyDetector class.
+
+        :param detectors:
+            The detectors to run.  A value of None runs an EwmaDetector, a
+            CusumDetector, and a SeasonalDetector using default parameters.
+
+        :param callback:
+            An optional callable that is called with each reported
+            LatencyAnomaly instance.
+
+        :param api:
+            An optional SpeedSentry instance.  If specified, a customer event
+            is created for each reported anomaly.
+
+        :param type_index:
+            The customer event type used for created events.  A value of 1
+            indicates customer_1, a value of 2 indicates customer_2, etc.  If
+            not specified, then customer_1 is used.
+
+        :param cooldown:
+            The minimum time, in seconds, between anomalies reported by the
+            same detector for the same monitor and region.
+
+        :param event_timeout:
+            An optional deadline, in seconds, for each event request.
+
+        :type detectors:     tuple or None
+        :type callback:      callable or None
+        :type api:           SpeedSentry or None
+        :type type_index:    int or None
+        :type cooldown:      int
+        :type event_timeout: float or None
+
+        """
+
+        super().__init__()
+
+        if detectors is None:
+            detectors = (EwmaDetector(), CusumDetector(), SeasonalDetector())
+
+        detectors = tuple(detectors)
+        names = [ detector.name for detector in detectors ]
+        if not detectors or len(set(names)) != len(names):
+            raise ValueError("detectors must have distinct names")
+
+        self.__detectors = detectors
+        self.__callback = callback
+        self.__api = api
+        self.__type_index = type_index
+        self.__cooldown = cooldown
+        self.__event_timeout = event_timeout
+
+        self.__states = dict()
+        self.__failed_events = 0
+        self.__lock = threading.Lock()
+        self.__fork_detector = fork_safety.ForkDetector()
+
+
+    @property
+    def detectors(self):
+        """
+        Read-only property holding the detectors being run.
+
+        :type: tuple
+
+        """
+
+        return self.__detectors
+
+
+    @property
+    def failed_events(self):
+        """
+        Read-only property holding the number of customer events that could
+        not be created due to a communication error.
+
+        :type: int
+
+        """
+
+        self.reset_after_fork()
+
+        with self.__lock:
+            return self.__failed_events
+
+
+    def __len__(self):
+        self.reset_after_fork()
+
+        with self.__lock:
+            return len(self.__states)
+
+
+    def __contains__(self, key):
+        self.reset_after_fork()
+
+        with self.__lock:
+            return key in self.__states
+
+
+    def add(
+            self,
+            monitor_id : int,
+            region_id : int,
+            timestamp : int,
+            latency : float
+        ) -> list:
+        """
+        Method you can use to process a single sample.
+
+        :param monitor_id:
+            The monitor ID of the sample.
+
+        :param region_id:
+            The region ID of the sample.
+
+        :param timestamp:
+            The Unix timestamp of the sample.
+
+        :param latency:
+            The latency of the sample, in seconds.
+
+        :return:
+            Returns a list of the LatencyAnomaly instances reported.
+
+        :type monitor_id: int
+        :type region_id:  int
+        :type timestamp:  int
+        :type latency:    float
+        :rtype:           list
+
+        """
+
+        self.reset_after_fork()
+
+        anomalies = list()
+        with self.__lock:
+            self.__add(monitor_id, region_id, timestamp, latency, anomalies)
+
+        self.__report(anomalies)
+        return anomalies
+
+
+    def update(self, recent = (), aggregated = ()) -> list:
+        """
+        Method you can use to process latency entries.  Aggregated entries
+        are processed before recent entries as they are older.
+
+        :param recent:
+            The recent entries to process.  You can supply the list of
+            LatencyEntry instances or the LatencyFrame returned by
+            SpeedSentry.latency_list, or any iterable of entries such as the
+            generator returned by SpeedSentry.latency_stream.  Iterables may
+            mix LatencyEntry and AggregatedLatencyEntry instances and should
+            be in timestamp order for each monitor and region.
+
+        :param aggregated:
+            The aggregated entries to process.  You can supply the list of
+            AggregatedLatencyEntry instances or the LatencyFrame returned by
+            SpeedSentry.latency_list.
+
+        :return:
+            Returns a list of the LatencyAnomaly instances reported.
+
+        :type recent:     iterable or LatencyFrame
+        :type aggregated: iterable or LatencyFrame
+        :rtype:           list
+
+        """
+
+        self.reset_after_fork()
+
+        anomalies = list()
+        for entries in (aggregated, recent):
+            if isinstance(entries, latency_frame.LatencyFrame):
+                if entries.order[:3] != latency_frame.DEFAULT_ORDER and \
+                   entries.order[:1] != ('timestamp',):
+                    entries = entries.order_by(*latency_frame.DEFAULT_ORDER)
+
+                samples = zip(
+                    entries.monitor_id.tolist(),
+                    entries.region_id.tolist(),
+                    entries.timestamp.tolist(),
+                    entries.average.tolist()
+                )
+            else:
+                samples = (
+                    (
+                        entry['monitor_id'],
+                        entry['region_id'],
+                        entry['timestamp'],
+                        entry['latency']
+                            if entry.get('number_samples') is None
+                            else entry['average']
+                    )
+                    for entry in entries
+                )
+
+            with self.__lock:
+                add = self.__add
+                for monitor_id, region_id, timestamp, latency in samples:
+                    add(monitor_id, region_id, timestamp, latency, anomalies)
+
+        self.__report(anomalies)
+        return anomalies
+
+
+    def checkpoint(self) -> dict:
+        """
+        Method you can use to obtain the detector state for every monitor and
+        region.  The checkpoint only holds values that can be written as
+        JSON.
+
+        :return:
+            Returns the checkpoint.
+
+        :rtype: dict
+
+        """
+
+        self.reset_after_fork()
+
+        with self.__lock:
+            return {
+                'version' : CHECKPOINT_VERSION,
+                'detectors' : self.__description(),
+                'states' : [
+                    [ monitor_id, region_id, state[0], list(state[1]) ]
+                  + [ list(s) for s in state[2:] ]
+                    for (monitor_id, region_id), state in self.__states.items()
+                ]
+            }
+
+
+    def restore(self, checkpoint : dict):
+        """
+        Method you can use to replace the detector state with the state held
+        in a checkpoint.
+
+        :param checkpoint:
+            The checkpoint, as returned by the checkpoint method.  The
+            checkpoint must have been taken using detectors with the same
+            names and parameters.
+
+        :type checkpoint: dict
+
+        """
+
+        self.reset_after_fork()
+
+        if not isinstance(checkpoint, dict) or \
+           checkpoint.get('version') != CHECKPOINT_VERSION:
+            raise ValueError("unsupported anomaly detector checkpoint")
+
+        if checkpoint.get('detectors') != self.__description():
+            raise ValueError(
+                "checkpoint was taken using different detectors"
+            )
+
+        number_detectors = len(self.__detectors)
+        lengths = [
+            len(detector.initial_state()) for detector in self.__detectors
+        ]
+
+        states = dict()
+        try:
+            for entry in checkpoint['states']:
+                state = [ entry[2], list(entry[3]) ]
+                state += [ list(s) for s in entry[4:] ]
+                if len(state[1]) != number_detectors or \
+                   [ len(s) for s in state[2:] ] != lengths:
+                    raise ValueError("invalid anomaly detector state")
+
+                states[(entry[0], entry[1])] = state
+        except (KeyError, IndexError, TypeError):
+            raise ValueError("invalid anomaly detector checkpoint")
+
+        with self.__lock:
+            self.__states = states
+
+
+    def save(self, path : str):
+        """
+        Method you can use to atomically write a checkpoint to a file.
+
+        :param path:
+            The path of the checkpoint file.
+
+        :type path: str
+
+        """
+
+        checkpoint = self.checkpoint()
+        directory = os.path.dirname(os.path.abspath(path))
+        handle, temporary_path = tempfile.mkstemp(
+            dir = directory,
+            prefix = ".anomaly.",
+            suffix = ".tmp"
+        )
+
+        try:
+            with os.fdopen(handle, 'w') as fh:
+                json.dump(checkpoint, fh)
+                fh.flush()
+                os.fsync(fh.fileno())
+
+            os.replace(temporary_path, path)
+        except:
+            try:
+                os.unlink(temporary_path)
+            except OSError:
+                pass
+
+            raise
+
+
+    def load(self, path : str) -> bool:
+        """
+        Method you can use to restore a checkpoint written by the save
+        method.
+
+        :param path:
+            The path of the checkpoint file.
+
+        :return:
+            Returns True if the checkpoint was restored.  Returns False if the
+            file does not exist, in which case the current state is kept.
+
+        :type path: str
+        :rtype:     bool
+
+        """
+
+        try:
+            with open(path, 'r') as fh:
+                checkpoint = json.load(fh)
+        except FileNotFoundError:
+            return False
+
+        self.restore(checkpoint)
+        return True
+
+
+    def clear(self):
+        """
+        Method you can use to discard the state for every monitor and region.
+
+        """
+
+        self.reset_after_fork()
+
+        with self.__lock:
+            self.__states = dict()
+
+
+    def reset_after_fork(self):
+        """
+        Method you can call in a forked child process to replace the lock
+        inherited from the parent process.  Detector state is kept.  The
+        method is called automatically when the detector is used and does
+        nothing if the process has not forked.
+
+        """
+
+        if self.__fork_detector.forked():
+            self.__lock = threading.Lock()
+
+
+    def __description(self) -> list:
+        """
+        Method used internally to describe the detectors in a checkpoint.
+
+        :return:
+            Returns a list holding the name and parameters of each detector.
+
+        :rtype: list
+
+        """
+
+        return [
+            { 'name' : detector.name, 'parameters' : detector.parameters }
+            for detector in self.__detectors
+        ]
+
+
+    def __add(
+            self,
+            monitor_id : int,
+            region_id : int,
+            timestamp : int,
+            latency : float,
+            anomalies : list
+        ):
+        """
+        Method used internally to process a single sample.  The lock must be
+        held.
+
+        :param monitor_id:
+            The monitor ID of the sample.
+
+        :param region_id:
+            The region ID of the sample.
+
+        :param timestamp:
+            The Unix timestamp of the sample.
+
+        :param latency:
+            The latency of the sample, in seconds.
+
+        :param anomalies:
+            The list to append reported anomalies to.
+
+        :type monitor_id: int
+        :type region_id:  int
+        :type timestamp:  int
+        :type latency:    float
+        :type anomalies:  list
+
+        """
+
+        key = (monitor_id, region_id)
+        state = self.__states.get(key)
+        if state is None:
+            state = [ None, [ None ] * len(self.__detectors) ]
+            state += [ d.initial_state() for d in self.__detectors ]
+            self.__states[key] = state
+        elif timestamp <= state[0]:
+            return
+
+        state[0] = timestamp
+        last_reported = state[1]
+        for i, detector in enumerate(self.__detectors):
+            result = detector.update(state[i + 2], timestamp, latency)
+            if result is not None:
+                if last_reported[i] is None or \
+                   timestamp - last_reported[i] >= self.__cooldown:
+                    last_reported[i] = timestamp
+                    anomalies.append(
+                        LatencyAnomaly(
+                            {
+                                'monitor_id' : monitor_id,
+                                'region_id' : region_id,
+                                'timestamp' : timestamp,
+                                'latency' : latency,
+                                'detector' : detector.name,
+                                'expected' : result[0],
+                                'score' : result[1],
+                                'threshold' : detector.threshold
+                            }
+                        )
+                    )
+
+
+    def __report(self, anomalies : list):
+        """
+        Method used internally to pass anomalies to the callback and to
+        then create customer events.  Events that could not be created are
+        counted rather than raised so that every anomaly is reported.
+
+        :param anomalies:
+            The anomalies to report.
+
+        :type anomalies: list
+
+        """
+
+        if self.__callback is not None:
+            for anomaly in anomalies:
+                self.__callback(anomaly)
+
+        if self.__api is not None:
+            for anomaly in anomalies:
+                try:
+                    self.__api.events_create(
+                        message = (
+                            "Latency anomaly (%s) in region %d: %.3f seconds, "
+                            "expected %.3f seconds"%(
+                                anomaly.detector,
+                                anomaly.region_id,
+                                anomaly.latency,
+                                anomaly.expected
+                            )
+                        ),
+                        type_index = self.__type_index,
+                        monitor_id = anomaly.monitor_id,
+                        timeout = self.__event_timeout
+                    )
+                except CommunicationErrorException:
+                    with self.__lock:
+                        self.__failed_events += 1
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
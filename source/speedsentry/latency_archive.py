@@ -0,0 +1,1347 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that provides a compact, append-only, on-disk archive of latency
+history.  This module requires the numpy package.
+
+An archive is a directory holding, for each of the recent and aggregated
+tables, one or more segments made up of one file per column of fixed width,
+little endian values, plus a small manifest recording the segments of each
+table, the number of committed rows in each segment, and the newest timestamp
+synchronized for each query scope.  Rows within a segment are kept in
+timestamp order so that the timestamp column doubles as the index used to
+seek to a time range.  Rows newer than those held in a table's last segment
+are appended to that segment.  Older rows, such as those received for one
+monitor after newer rows were received for another, are written to a new
+segment.  Whenever the last segment holds at least half as many rows as the
+segment before it, the two are merged so that each row is rewritten a
+logarithmic number of times and a table never holds more than a few dozen
+segments.
+
+Column files are memory mapped when read.  Opening an archive only reads the
+manifest, frames returned by the archive are views onto the mapped files when
+the requested rows come from a single segment, and processes reading the same
+archive share the underlying pages.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import os
+import json
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from . import fork_safety as fork_safety
+from . import latency_frame as latency_frame
+from . import latency_store as latency_store
+
+###############################################################################
+# Globals:
+#
+
+FORMAT_VERSION = 1
+"""
+The archive format version written to the manifest.
+
+"""
+
+MANIFEST_FILENAME = "manifest.json"
+"""
+The name of the manifest file within the archive directory.
+
+"""
+
+LOCK_FILENAME = "manifest.lock"
+"""
+The name of the file used to serialize writers within the archive directory.
+
+"""
+
+COMPACTION_RATIO = 2
+"""
+A table's last two segments are merged when the segment before the last holds
+no more than this many times the rows held in the last segment.
+
+"""
+
+TABLES = {
+    'recent' : (
+        ('timestamp', '<i8'),
+        ('monitor_id', '<i8'),
+        ('region_id', '<i8'),
+        ('latency', '<f8')
+    ),
+    'aggregated' : (
+        ('timestamp', '<i8'),
+        ('monitor_id', '<i8'),
+        ('region_id', '<i8'),
+        ('latency', '<f8'),
+        ('average', '<f8'),
+        ('variance', '<f8'),
+        ('minimum', '<f8'),
+        ('maximum', '<f8'),
+        ('start_timestamp', '<i8'),
+        ('end_timestamp', '<i8'),
+        ('number_samples', '<i8')
+    )
+}
+"""
+The columns held in each table and their on-disk data types, keyed by table
+name.  The data types match those used by latency frames so that mapped
+columns can be used without conversion.
+
+"""
+
+SEQUENCE_COLUMN = ('sequence', '<i8')
+"""
+The additional column held in each table recording the order in which rows
+were added.  The first row added to a table is numbered zero.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def column_filename(table : str, name : str, segment : int = 0) -> str:
+    """
+    Function you can use to obtain the name of the file holding a column.
+
+    :param table:
+        The table name.
+
+    :param name:
+        The column name.
+
+    :param segment:
+        The identifier of the table segment holding the column.
+
+    :return:
+        Returns the file name, relative to the archive directory.
+
+    :type table:   str
+    :type name:    str
+    :type segment: int
+    :rtype:        str
+
+    """
+
+    if segment:
+        result = "%s.%s.%d"%(table, name, segment)
+    else:
+        result = "%s.%s"%(table, name)
+
+    return result
+
+
+def stored_columns(table : str) -> tuple:
+    """
+    Function you can use to obtain every column held on disk for a table.
+
+    :param table:
+        The table name.
+
+    :return:
+        Returns a tuple of column name and data type pairs.
+
+    :type table: str
+    :rtype:      tuple
+
+    """
+
+    return TABLES[table] + (SEQUENCE_COLUMN,)
+
+###############################################################################
+# Class LatencyArchive:
+#
+
+class LatencyArchive(object):
+    """
+    Class that holds latency history in memory mapped column files.
+
+    Rows can only be added.  Rows repeating an existing entry, with the same
+    timestamp, monitor ID, and region ID, are ignored so the archive can be
+    fed repeatedly with overlapping latency_list results.  Added rows become
+    visible to readers in other processes once the manifest is replaced,
+    after the column data has been written, and after those readers call
+    refresh.
+
+    The class is thread safe.  Writers in separate processes are serialized
+    with a lock file where the platform supports it.  Frames returned by the
+    archive are read-only.
+
+    """
+
+    def __init__(self, directory : str):
+        """
+        Method that initializes the LatencyArchive class.  The directory is
+        created if it does not exist.
+
+        :param directory:
+            The archive directory.
+
+        :type directory: str
+
+        """
+
+        super().__init__()
+
+        if numpy is None:
+            raise ImportError(
+                "the numpy package is required to use latency archives."
+            )
+
+        self.__directory = directory
+        os.makedirs(directory, exist_ok = True)
+
+        self.__lock = threading.Lock()
+        self.__fork_detector = fork_safety.ForkDetector()
+        self.__rows = dict()
+        self.__segments = dict()
+        self.__next_segment = dict()
+        self.__scopes = dict()
+        self.__columns = dict()
+
+        self.refresh()
+
+
+    @property
+    def directory(self):
+        """
+        Read-only property holding the archive directory.
+
+        :type: str
+
+        """
+
+        return self.__directory
+
+
+    @property
+    def number_recent(self):
+        """
+        Read-only property holding the number of recent rows currently
+        mapped.
+
+        :type: int
+
+        """
+
+        return self.__rows['recent']
+
+
+    @property
+    def number_aggregated(self):
+        """
+        Read-only property holding the number of aggregated rows currently
+        mapped.
+
+        :type: int
+
+        """
+
+        return self.__rows['aggregated']
+
+
+    @property
+    def number_segments(self):
+        """
+        Read-only property holding the number of segments currently mapped,
+        keyed by table name.
+
+        :type: dict
+
+        """
+
+        with self.__lock:
+            return {
+                table : len(segments)
+                for table, segments in self.__segments.items()
+            }
+
+
+    @property
+    def end_timestamp(self):
+        """
+        Read-only property holding the newest timestamp currently mapped, or
+        None if the archive is empty.  Entries for other monitors or regions
+        may still be missing from before this time.  The synchronize method
+        tracks the newest timestamp received separately for each query
+        scope.
+
+        :type: int or None
+
+        """
+
+        with self.__lock:
+            timestamps = [
+                int(segment['end_timestamp'])
+                for segments in self.__segments.values()
+                for segment in segments
+            ]
+
+        return max(timestamps) if timestamps else None
+
+
+    def __len__(self):
+        return self.__rows['recent'] + self.__rows['aggregated']
+
+
+    def __repr__(self):
+        return "LatencyArchive(%r, %d recent, %d aggregated)"%(
+            self.__directory,
+            self.__rows['recent'],
+            self.__rows['aggregated']
+        )
+
+
+    def recent(
+        self,
+        start_timestamp : int = None,
+        end_timestamp : int = None
+        ):
+        """
+        Method you can use to obtain recent entries within a time range.  Raw
+        entries are represented as aggregations of a single sample, as is
+        done by LatencyFrame.from_entries.
+
+        :param start_timestamp:
+            The earliest timestamp to include.  A value of None means no
+            start time.
+
+        :param end_timestamp:
+            The latest timestamp to include.  A value of None means no end
+            time.
+
+        :return:
+            Returns a frame sorted by timestamp.  The frame's columns are
+            views onto the mapped column files if the entries are held in a
+            single segment.
+
+        :type start_timestamp: int or None
+        :type end_timestamp:   int or None
+        :rtype:                LatencyFrame
+
+        """
+
+        return self.__recent_frame(
+            self.__range('recent', start_timestamp, end_timestamp)
+        )
+
+
+    def aggregated(
+        self,
+        start_timestamp : int = None,
+        end_timestamp : int = None
+        ):
+        """
+        Method you can use to obtain aggregated entries within a time range.
+
+        :param start_timestamp:
+            The earliest timestamp to include.  A value of None means no
+            start time.
+
+        :param end_timestamp:
+            The latest timestamp to include.  A value of None means no end
+            time.
+
+        :return:
+            Returns a frame sorted by timestamp.  The frame's columns are
+            views onto the mapped column files if the entries are held in a
+            single segment.
+
+        :type start_timestamp: int or None
+        :type end_timestamp:   int or None
+        :rtype:                LatencyFrame
+
+        """
+
+        return latency_frame.LatencyFrame(
+            self.__range('aggregated', start_timestamp, end_timestamp),
+            ('timestamp',)
+        )
+
+
+    def added(self, number_recent : int = 0, number_aggregated : int = 0):
+        """
+        Method you can use to obtain the entries added after a number of rows
+        were already held, regardless of their timestamps.  You can use this
+        method to incrementally process entries as they are archived.
+
+        :param number_recent:
+            The number of recent rows already processed.  Recent rows added
+            after this many rows are returned.
+
+        :param number_aggregated:
+            The number of aggregated rows already processed.  Aggregated rows
+            added after this many rows are returned.
+
+        :return:
+            Returns a tuple holding a frame of recent entries and a frame of
+            aggregated entries, both sorted by timestamp.  Adding the length
+            of each frame to the number of rows supplied gives the number of
+            rows processed once the frames are consumed.
+
+        :type number_recent:     int
+        :type number_aggregated: int
+        :rtype:                  tuple
+
+        """
+
+        recent = self.__recent_frame(self.__since('recent', number_recent))
+        aggregated = latency_frame.LatencyFrame(
+            self.__since('aggregated', number_aggregated),
+            ('timestamp',)
+        )
+
+        return recent, aggregated
+
+
+    def append(self, recent = (), aggregated = ()) -> int:
+        """
+        Method you can use to add entries to the archive.
+
+        :param recent:
+            The recent entries to add.  You can supply the list of
+            LatencyEntry instances or the LatencyFrame returned by
+            SpeedSentry.latency_list.
+
+        :param aggregated:
+            The aggregated entries to add.  You can supply the list of
+            AggregatedLatencyEntry instances or the LatencyFrame returned by
+            SpeedSentry.latency_list.
+
+        :return:
+            Returns the number of rows added.
+
+        :type recent:     list or LatencyFrame
+        :type aggregated: list or LatencyFrame
+        :rtype:           int
+
+        """
+
+        return self.__add(recent, aggregated, None, None)
+
+
+    def synchronize(self, api, timeout : float = None, **kwargs) -> int:
+        """
+        Method you can use to add entries newer than those already received
+        for the same query scope, obtained from SpeedSentry.latency_list.
+
+        :param api:
+            The API instance used to request entries.
+
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
+        :param kwargs:
+            Additional parameters, such as monitor_id or region_id, passed
+            to SpeedSentry.latency_list.  The start timestamp is always the
+            newest timestamp previously received for the same monitor_id or
+            region_id.
+
+        :return:
+            Returns the number of rows added.
+
+        :type api:     SpeedSentry
+        :type timeout: float or None
+        :rtype:        int
+
+        """
+
+        scope_name = latency_store.scope(
+            kwargs.get('monitor_id'),
+            kwargs.get('region_id')
+        )
+
+        start_timestamp = self.synchronized_timestamp(scope_name)
+        if start_timestamp is not None:
+            kwargs['start_timestamp'] = start_timestamp
+
+        recent, aggregated = api.latency_list(
+            as_frame = True,
+            timeout = timeout,
+            **kwargs
+        )
+
+        timestamps = [
+            int(numpy.max(frame.timestamp))
+            for frame in (recent, aggregated) if len(frame)
+        ]
+        if timestamps:
+            end_timestamp = max(timestamps)
+        else:
+            end_timestamp = start_timestamp
+
+        return self.__add(recent, aggregated, scope_name, end_timestamp)
+
+
+    def synchronized_timestamp(self, scope_name : str) -> int:
+        """
+        Method you can use to obtain the newest timestamp received by the
+        synchronize method for a query scope.
+
+        :param scope_name:
+            The scope name, as returned by latency_store.scope.
+
+        :return:
+            Returns the newest timestamp received.  The value None is
+            returned if the scope has never been synchronized.
+
+        :type scope_name: str
+        :rtype:           int or None
+
+        """
+
+        with self.__lock:
+            return self.__scopes.get(scope_name)
+
+
+    def refresh(self):
+        """
+        Method you can use to map rows appended by other processes since the
+        archive was opened or last refreshed.  Frames obtained earlier are
+        not affected.
+
+        """
+
+        self.reset_after_fork()
+
+        with self.__lock:
+            lock_path = os.path.join(self.__directory, LOCK_FILENAME)
+            with open(lock_path, 'a') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH)
+
+                try:
+                    self.__map(self.__read_manifest())
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+    def close(self):
+        """
+        Method you can use to release the archive's mapped column files.  The
+        files are unmapped once frames obtained from the archive are also
+        released.
+
+        """
+
+        with self.__lock:
+            self.__map(
+                {
+                    'segments' : { table : [] for table in TABLES },
+                    'next_segment' : dict(self.__next_segment),
+                    'scopes' : dict(self.__scopes)
+                }
+            )
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+
+    def reset_after_fork(self):
+        """
+        Method you can call in a forked child process to replace the lock
+        inherited from the parent process.  Mapped column files are kept and
+        shared with the parent.  The method is called automatically when the
+        archive is used and does nothing if the process has not forked.
+
+        """
+
+        if self.__fork_detector.forked():
+            self.__lock = threading.Lock()
+
+
+
+    def __add(
+        self,
+        recent,
+        aggregated,
+        scope_name : str,
+        end_timestamp : int
+        ) -> int:
+        """
+        Method used internally to add entries to the archive and record the
+        newest timestamp received for a query scope.
+
+        :param recent:
+            The recent entries to add.
+
+        :param aggregated:
+            The aggregated entries to add.
+
+        :param scope_name:
+            The synchronized scope or None if no scope should be recorded.
+
+        :param end_timestamp:
+            The newest timestamp received for the scope or None if no
+            entries have been received.
+
+        :return:
+            Returns the number of rows added.
+
+        :type recent:        list or LatencyFrame
+        :type aggregated:    list or LatencyFrame
+        :type scope_name:    str or None
+        :type end_timestamp: int or None
+        :rtype:              int
+
+        """
+
+        self.reset_after_fork()
+
+        batches = {
+            'recent' : self.__to_columns('recent', recent),
+            'aggregated' : self.__to_columns('aggregated', aggregated)
+        }
+
+        with self.__lock:
+            lock_path = os.path.join(self.__directory, LOCK_FILENAME)
+            with open(lock_path, 'a') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+
+                try:
+                    self.__map(self.__read_manifest())
+
+                    number_added = 0
+                    manifest = {
+                        'segments' : {
+                            table : [ dict(segment) for segment in segments ]
+                            for table, segments in self.__segments.items()
+                        },
+                        'next_segment' : dict(self.__next_segment),
+                        'scopes' : dict(self.__scopes)
+                    }
+                    merged = list()
+                    for table, columns in batches.items():
+                        columns = self.__new_rows(table, columns)
+                        added = columns['timestamp'].shape[0]
+                        if added:
+                            columns['sequence'] = numpy.arange(
+                                self.__rows[table],
+                                self.__rows[table] + added,
+                                dtype = SEQUENCE_COLUMN[1]
+                            )
+
+                            merged.extend(
+                                self.__write_rows(
+                                    table,
+                                    columns,
+                                    manifest
+                                )
+                            )
+                            number_added += added
+
+                    previous = self.__scopes.get(scope_name)
+                    if scope_name is not None                       and \
+                       end_timestamp is not None                    and \
+                       (previous is None or end_timestamp > previous)    :
+                        manifest['scopes'][scope_name] = end_timestamp
+                        scope_changed = True
+                    else:
+                        scope_changed = False
+
+                    if number_added or scope_changed:
+                        self.__write_manifest(manifest)
+                        self.__map(manifest)
+
+                        for table, segment_id in merged:
+                            self.__remove_segment(table, segment_id)
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+        return number_added
+
+
+    def __write_rows(self, table : str, columns : dict, manifest : dict):
+        """
+        Method used internally to write new rows to a table, either appended
+        to the table's last segment or held in a new segment, and to then
+        merge the table's last segments as needed.
+
+        :param table:
+            The table name.
+
+        :param columns:
+            The rows to write, sorted by timestamp, including the sequence
+            column.
+
+        :param manifest:
+            The manifest to be written.  The table's segments are updated.
+
+        :return:
+            Returns a list of table name and segment identifier pairs for the
+            segments that were merged and can be removed once the manifest is
+            replaced.
+
+        :type table:    str
+        :type columns:  dict
+        :type manifest: dict
+        :rtype:         list
+
+        """
+
+        segments = manifest['segments'][table]
+        added = columns['timestamp'].shape[0]
+        if segments                                                     and \
+           columns['timestamp'][0] >= segments[-1]['end_timestamp']         :
+            segment = segments[-1]
+        else:
+            segment = {
+                'id' : manifest['next_segment'][table],
+                'rows' : 0,
+                'end_timestamp' : None,
+                'end_sequence' : 0
+            }
+            manifest['next_segment'][table] += 1
+            segments.append(segment)
+
+        self.__write_columns(table, segment, columns)
+
+        segment['rows'] += added
+        segment['end_timestamp'] = int(columns['timestamp'][-1])
+        segment['end_sequence'] = int(columns['sequence'][-1]) + 1
+
+        result = list()
+        while len(segments) > 1                                       and \
+              segments[-2]['rows'] <= COMPACTION_RATIO * segments[-1]['rows']:
+            older = segments[-2]
+            newer = segments[-1]
+            segment = {
+                'id' : manifest['next_segment'][table],
+                'rows' : 0,
+                'end_timestamp' : max(
+                    older['end_timestamp'],
+                    newer['end_timestamp']
+                ),
+                'end_sequence' : max(
+                    older['end_sequence'],
+                    newer['end_sequence']
+                )
+            }
+            manifest['next_segment'][table] += 1
+
+            older_columns = self.__segment_columns(table, older)
+            newer_columns = self.__segment_columns(table, newer)
+            merged_columns = {
+                name : numpy.concatenate(
+                    (older_columns[name], newer_columns[name])
+                )
+                for name, dtype in stored_columns(table)
+            }
+            permutation = numpy.argsort(
+                merged_columns['timestamp'],
+                kind = 'stable'
+            )
+
+            self.__write_columns(
+                table,
+                segment,
+                {
+                    name : array[permutation]
+                    for name, array in merged_columns.items()
+                }
+            )
+            segment['rows'] = older['rows'] + newer['rows']
+
+            segments[-2:] = [segment]
+            result.append((table, older['id']))
+            result.append((table, newer['id']))
+
+        return result
+
+
+    def __range(self, table : str, start_timestamp : int, end_timestamp : int):
+        """
+        Method used internally to obtain a table's columns covering a time
+        range.
+
+        :param table:
+            The table name.
+
+        :param start_timestamp:
+            The earliest timestamp to include or None for no start time.
+
+        :param end_timestamp:
+            The latest timestamp to include or None for no end time.
+
+        :return:
+            Returns a dictionary of columns sorted by timestamp, keyed by
+            column name.  The columns are views onto the mapped column files
+            if the rows are held in a single segment.
+
+        :type table:           str
+        :type start_timestamp: int or None
+        :type end_timestamp:   int or None
+        :rtype:                dict
+
+        """
+
+        self.reset_after_fork()
+
+        with self.__lock:
+            segment_columns = self.__columns[table]
+
+        parts = list()
+        for columns in segment_columns:
+            timestamp = columns['timestamp']
+            if start_timestamp is None:
+                start = 0
+            else:
+                start = numpy.searchsorted(
+                    timestamp,
+                    start_timestamp,
+                    side = 'left'
+                )
+
+            if end_timestamp is None:
+                end = timestamp.shape[0]
+            else:
+                end = numpy.searchsorted(
+                    timestamp,
+                    end_timestamp,
+                    side = 'right'
+                )
+
+            if end > start:
+                parts.append(
+                    {
+                        name : columns[name][start:end]
+                        for name, dtype in TABLES[table]
+                    }
+                )
+
+        return self.__combine(table, parts)
+
+
+    def __since(self, table : str, number_rows : int):
+        """
+        Method used internally to obtain a table's rows added after a number
+        of rows were already held.
+
+        :param table:
+            The table name.
+
+        :param number_rows:
+            The number of rows already held.
+
+        :return:
+            Returns a dictionary of columns sorted by timestamp, keyed by
+            column name.
+
+        :type table:       str
+        :type number_rows: int
+        :rtype:            dict
+
+        """
+
+        self.reset_after_fork()
+
+        with self.__lock:
+            segments = self.__segments[table]
+            segment_columns = self.__columns[table]
+
+        parts = list()
+        for segment, columns in zip(segments, segment_columns):
+            if segment['end_sequence'] > number_rows:
+                keep = columns['sequence'] >= number_rows
+                if keep.all():
+                    parts.append(
+                        {
+                            name : columns[name]
+                            for name, dtype in TABLES[table]
+                        }
+                    )
+                else:
+                    parts.append(
+                        {
+                            name : columns[name][keep]
+                            for name, dtype in TABLES[table]
+                        }
+                    )
+
+        return self.__combine(table, parts)
+
+
+    def __combine(self, table : str, parts : list) -> dict:
+        """
+        Method used internally to combine rows taken from several segments.
+
+        :param table:
+            The table name.
+
+        :param parts:
+            A list of dictionaries of columns, each sorted by timestamp.
+
+        :return:
+            Returns a dictionary of columns sorted by timestamp.  A single
+            part is returned unchanged.
+
+        :type table: str
+        :type parts: list
+        :rtype:      dict
+
+        """
+
+        if not parts:
+            result = {
+                name : numpy.empty(0, dtype = dtype)
+                for name, dtype in TABLES[table]
+            }
+        elif len(parts) == 1:
+            result = parts[0]
+        else:
+            columns = {
+                name : numpy.concatenate([ part[name] for part in parts ])
+                for name, dtype in TABLES[table]
+            }
+            permutation = numpy.argsort(columns['timestamp'], kind = 'stable')
+            result = {
+                name : array[permutation] for name, array in columns.items()
+            }
+
+        return result
+
+
+    def __recent_frame(self, columns : dict):
+        """
+        Method used internally to build a frame from recent columns.  Raw
+        entries are represented as aggregations of a single sample.
+
+        :param columns:
+            The recent columns, sorted by timestamp.
+
+        :return:
+            Returns the frame.
+
+        :type columns: dict
+        :rtype:        LatencyFrame
+
+        """
+
+        columns = dict(columns)
+        latency = columns['latency']
+        timestamp = columns['timestamp']
+        number_entries = timestamp.shape[0]
+
+        columns['average'] = latency
+        columns['variance'] = numpy.broadcast_to(0.0, (number_entries,))
+        columns['minimum'] = latency
+        columns['maximum'] = latency
+        columns['start_timestamp'] = timestamp
+        columns['end_timestamp'] = timestamp
+        columns['number_samples'] = numpy.broadcast_to(
+            numpy.int64(1),
+            (number_entries,)
+        )
+
+        return latency_frame.LatencyFrame(columns, ('timestamp',))
+
+
+
+
+    def __to_columns(self, table : str, entries) -> dict:
+        """
+        Method used internally to convert entries into columns sorted by
+        timestamp, monitor ID, and region ID.
+
+        :param table:
+            The table the entries are destined for.
+
+        :param entries:
+            A list of entries or a LatencyFrame.
+
+        :return:
+            Returns a dictionary of arrays, keyed by column name.
+
+        :type table:   str
+        :type entries: list or LatencyFrame
+        :rtype:        dict
+
+        """
+
+        if isinstance(entries, latency_frame.LatencyFrame):
+            columns = {
+                name : numpy.asarray(entries.column(name), dtype = dtype)
+                for name, dtype in TABLES[table]
+            }
+        else:
+            number_entries = len(entries)
+            columns = {
+                name : numpy.fromiter(
+                    (entry[name] for entry in entries),
+                    dtype = dtype,
+                    count = number_entries
+                )
+                for name, dtype in TABLES[table]
+            }
+
+        permutation = numpy.lexsort(
+            (columns['region_id'], columns['monitor_id'], columns['timestamp'])
+        )
+
+        return { name : array[permutation] for name, array in columns.items() }
+
+
+
+    def __new_rows(self, table : str, columns : dict) -> dict:
+        """
+        Method used internally to discard rows that repeat each other or the
+        rows already held in a table.  Rows are identified by timestamp,
+        monitor ID, and region ID.
+
+        :param table:
+            The table name.
+
+        :param columns:
+            The sorted candidate rows, as returned by __to_columns.
+
+        :return:
+            Returns the rows to be added, sorted by timestamp.
+
+        :type table:   str
+        :type columns: dict
+        :rtype:        dict
+
+        """
+
+        timestamp = columns['timestamp']
+        monitor_id = columns['monitor_id']
+        region_id = columns['region_id']
+
+        keep = numpy.ones(timestamp.shape[0], dtype = bool)
+        keep[1:] = (
+              (timestamp[1:] != timestamp[:-1])
+            | (monitor_id[1:] != monitor_id[:-1])
+            | (region_id[1:] != region_id[:-1])
+        )
+
+        if timestamp.shape[0]:
+            held = set()
+            for existing in self.__columns[table]:
+                first = numpy.searchsorted(
+                    existing['timestamp'],
+                    timestamp[0],
+                    side = 'left'
+                )
+                last = numpy.searchsorted(
+                    existing['timestamp'],
+                    timestamp[-1],
+                    side = 'right'
+                )
+                if last > first:
+                    held.update(
+                        zip(
+                            existing['timestamp'][first:last].tolist(),
+                            existing['monitor_id'][first:last].tolist(),
+                            existing['region_id'][first:last].tolist()
+                        )
+                    )
+
+            if held:
+                repeated = numpy.fromiter(
+                    (
+                        key in held
+                        for key in zip(
+                            timestamp.tolist(),
+                            monitor_id.tolist(),
+                            region_id.tolist()
+                        )
+                    ),
+                    dtype = bool,
+                    count = timestamp.shape[0]
+                )
+                keep &= ~repeated
+
+        return { name : array[keep] for name, array in columns.items() }
+
+
+    def __write_columns(self, table : str, segment : dict, columns : dict):
+        """
+        Method used internally to append rows to a segment's column files.
+        Any data beyond the segment's committed rows, left by an interrupted
+        append, is discarded first.
+
+        :param table:
+            The table name.
+
+        :param segment:
+            The segment, as recorded in the manifest, prior to the append.
+
+        :param columns:
+            The rows to append, including the sequence column.
+
+        :type table:   str
+        :type segment: dict
+        :type columns: dict
+
+        """
+
+        for name, dtype in stored_columns(table):
+            path = os.path.join(
+                self.__directory,
+                column_filename(table, name, segment['id'])
+            )
+            with open(path, 'ab') as fh:
+                fh.truncate(segment['rows'] * numpy.dtype(dtype).itemsize)
+                fh.write(
+                    numpy.ascontiguousarray(
+                        columns[name],
+                        dtype = dtype
+                    ).tobytes()
+                )
+                fh.flush()
+                os.fsync(fh.fileno())
+
+
+    def __segment_columns(self, table : str, segment : dict) -> dict:
+        """
+        Method used internally to map the committed rows of a segment.
+
+        :param table:
+            The table name.
+
+        :param segment:
+            The segment, as recorded in the manifest.
+
+        :return:
+            Returns a dictionary of mapped columns, keyed by column name.
+
+        :type table:   str
+        :type segment: dict
+        :rtype:        dict
+
+        """
+
+        return {
+            name : numpy.memmap(
+                os.path.join(
+                    self.__directory,
+                    column_filename(table, name, segment['id'])
+                ),
+                dtype = dtype,
+                mode = 'r',
+                shape = (segment['rows'],)
+            )
+            for name, dtype in stored_columns(table)
+        }
+
+
+    def __remove_segment(self, table : str, segment_id : int):
+        """
+        Method used internally to remove a segment's column files that are
+        no longer referenced by the manifest.  Files that cannot be removed,
+        such as files still mapped on some platforms, are left in place.
+
+        :param table:
+            The table name.
+
+        :param segment_id:
+            The identifier of the segment to remove.
+
+        :type table:      str
+        :type segment_id: int
+
+        """
+
+        for name, dtype in stored_columns(table):
+            try:
+                os.unlink(
+                    os.path.join(
+                        self.__directory,
+                        column_filename(table, name, segment_id)
+                    )
+                )
+            except OSError:
+                pass
+
+
+    def __read_manifest(self) -> dict:
+        """
+        Method used internally to read the segments of each table along with
+        the synchronized scopes.
+
+        :return:
+            Returns a dictionary holding the list of segments and the
+            identifier to use for the next segment, both keyed by table name,
+            and the newest timestamp synchronized, keyed by scope name.  An
+            empty archive is reported if there is no manifest.
+
+        :rtype: dict
+
+        """
+
+        path = os.path.join(self.__directory, MANIFEST_FILENAME)
+        try:
+            with open(path, 'r') as fh:
+                manifest = json.load(fh)
+        except FileNotFoundError:
+            manifest = None
+
+        result = {
+            'segments' : { table : [] for table in TABLES },
+            'next_segment' : { table : 0 for table in TABLES },
+            'scopes' : dict()
+        }
+        if manifest is not None:
+            if manifest.get('version') != FORMAT_VERSION:
+                raise ValueError(
+                    "unsupported latency archive version %r"%(
+                        manifest.get('version'),
+                    )
+                )
+
+            for table in TABLES:
+                entry = manifest['tables'][table]
+                if entry['columns'] != dict(stored_columns(table)):
+                    raise ValueError(
+                        "unexpected latency archive columns in %s"%table
+                    )
+
+                result['segments'][table] = [
+                    {
+                        'id' : int(segment['id']),
+                        'rows' : int(segment['rows']),
+                        'end_timestamp' : int(segment['end_timestamp']),
+                        'end_sequence' : int(segment['end_sequence'])
+                    }
+                    for segment in entry['segments']
+                ]
+                result['next_segment'][table] = int(entry['next_segment'])
+
+            result['scopes'] = {
+                scope_name : int(timestamp)
+                for scope_name, timestamp in manifest['scopes'].items()
+            }
+
+        return result
+
+
+    def __write_manifest(self, manifest : dict):
+        """
+        Method used internally to atomically replace the manifest.
+
+        :param manifest:
+            A dictionary holding the segments, the next segment identifiers,
+            and the synchronized scopes, as returned by __read_manifest.
+
+        :type manifest: dict
+
+        """
+
+        contents = {
+            'version' : FORMAT_VERSION,
+            'tables' : {
+                table : {
+                    'segments' : manifest['segments'][table],
+                    'next_segment' : manifest['next_segment'][table],
+                    'columns' : dict(stored_columns(table))
+                }
+                for table in TABLES
+            },
+            'scopes' : manifest['scopes']
+        }
+
+        handle, temporary_path = tempfile.mkstemp(
+            dir = self.__directory,
+            prefix = ".manifest.",
+            suffix = ".tmp"
+        )
+
+        try:
+            with os.fdopen(handle, 'w') as fh:
+                json.dump(contents, fh)
+                fh.flush()
+                os.fsync(fh.fileno())
+
+            os.replace(
+                temporary_path,
+                os.path.join(self.__directory, MANIFEST_FILENAME)
+            )
+        except:
+            try:
+                os.unlink(temporary_path)
+            except OSError:
+                pass
+
+            raise
+
+
+    def __map(self, manifest : dict):
+        """
+        Method used internally to map the committed rows of each table.
+
+        :param manifest:
+            A dictionary holding the segments, the next segment identifiers,
+            and the synchronized scopes, as returned by __read_manifest.
+
+        :type manifest: dict
+
+        """
+
+        for table in TABLES:
+            segments = [
+                dict(segment)
+                for segment in manifest['segments'][table]
+                if segment['rows']
+            ]
+
+            self.__columns[table] = [
+                self.__segment_columns(table, segment) for segment in segments
+            ]
+            self.__segments[table] = segments
+            self.__rows[table] = sum(segment['rows'] for segment in segments)
+            self.__next_segment[table] = manifest['next_segment'][table]
+
+        self.__scopes = dict(manifest['scopes'])
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
@@ -0,0 +1,655 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that provides a columnar representation of latency data backed
+by NumPy arrays.  This module requires the numpy package.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+###############################################################################
+# Globals:
+#
+
+COLUMNS = (
+    ('monitor_id', 'int64'),
+    ('timestamp', 'int64'),
+    ('latency', 'float64'),
+    ('region_id', 'int64'),
+    ('average', 'float64'),
+    ('variance', 'float64'),
+    ('minimum', 'float64'),
+    ('maximum', 'float64'),
+    ('start_timestamp', 'int64'),
+    ('end_timestamp', 'int64'),
+    ('number_samples', 'int64')
+)
+"""
+The frame columns and their NumPy data types, in order.
+
+"""
+
+COLUMN_NAMES = tuple(name for name, dtype in COLUMNS)
+"""
+The names of the frame columns, in order.
+
+"""
+
+DEFAULT_ORDER = ('monitor_id', 'region_id', 'timestamp')
+"""
+The default sort order of a frame.  Each monitor, and each monitor/region
+series within a monitor, occupies a contiguous range of rows.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def column_property(name : str, description : str) -> property:
+    """
+    Function used to build a read-only property that returns a frame column.
+
+    :param name:
+        The name of the column.
+
+    :param description:
+        A description of the column.
+
+    :return:
+        Returns the property.
+
+    :type name:        str
+    :type description: str
+    :rtype:            property
+
+    """
+
+    def getter(self):
+        return self.column(name)
+
+    getter.__doc__ = "%s\n\n:type: numpy.ndarray\n"%description
+    return property(getter)
+
+###############################################################################
+# Class LatencyFrame:
+#
+
+class LatencyFrame(object):
+    """
+    Class that holds latency data as one contiguous NumPy array per field.
+
+    Raw latency entries are represented as aggregations of a single sample
+    so that raw and aggregated data share the same columns.
+
+    Rows are kept sorted by a list of key columns, by default monitor ID,
+    region ID, and timestamp.  Selecting on the leading key column, or on the
+    timestamp once it is the leading key, returns a frame whose columns are
+    views into this frame's arrays rather than copies.  Other selections are
+    supported but return copies.  You can use the order_by method to re-sort
+    a frame once so that later selections on a different column are
+    zero-copy.
+
+    """
+
+    def __init__(self, columns : dict, order : tuple = ()):
+        """
+        Method that initializes the LatencyFrame class.  You will normally
+        obtain instances from SpeedSentry.latency_list or the from_entries
+        method rather than constructing them directly.
+
+        :param columns:
+            A dictionary of one dimensional arrays, keyed by column name.  All
+            arrays must be the same length.  Missing columns are an error.
+
+        :param order:
+            The key columns the rows are already sorted by.
+
+        :type columns: dict
+        :type order:   tuple
+
+        """
+
+        super().__init__()
+
+        if numpy is None:
+            raise ImportError(
+                "the numpy package is required to use latency frames."
+            )
+
+        self.__columns = dict()
+        length = None
+        for name, dtype in COLUMNS:
+            if name not in columns:
+                raise ValueError("missing column %s"%name)
+
+            array = numpy.asarray(columns[name], dtype = dtype)
+            if array.ndim != 1:
+                raise ValueError("column %s is not one dimensional"%name)
+
+            if length is None:
+                length = array.shape[0]
+            elif array.shape[0] != length:
+                raise ValueError("column %s has the wrong length"%name)
+
+            self.__columns[name] = array
+
+        self.__order = tuple(order)
+
+
+    @classmethod
+    def from_entries(cls, raw_entries, aggregated : bool):
+        """
+        Method you can use to build a frame from raw latency entries as
+        received from the server.
+
+        :param raw_entries:
+            A sequence of dictionaries holding raw latency entries.
+
+        :param aggregated:
+            If True, the entries are aggregated entries.  If False, the
+            entries are recent entries and the aggregated columns are derived
+            from the single measured sample.
+
+        :return:
+            Returns the frame, sorted by the default order.
+
+        :type raw_entries: list
+        :type aggregated:  bool
+        :rtype:            LatencyFrame
+
+        """
+
+        if numpy is None:
+            raise ImportError(
+                "the numpy package is required to use latency frames."
+            )
+
+        if aggregated:
+            names = COLUMN_NAMES
+        else:
+            names = ('monitor_id', 'timestamp', 'latency', 'region_id')
+
+        dtypes = dict(COLUMNS)
+        number_entries = len(raw_entries)
+        columns = {
+            name : numpy.fromiter(
+                (entry[name] for entry in raw_entries),
+                dtype = dtypes[name],
+                count = number_entries
+            )
+            for name in names
+        }
+
+        return cls.__complete(columns, number_entries, aggregated)
+
+
+    @classmethod
+    def from_rows(cls, rows, names : tuple, aggregated : bool):
+        """
+        Method you can use to build a frame from rows of values, such as the
+        rows returned by LatencyStore.query_rows.
+
+        :param rows:
+            A sequence of tuples, each holding the values of one entry.
+
+        :param names:
+            The column name of each value in a row.  Recent entries need the
+            monitor_id, region_id, timestamp, and latency columns.  Aggregated
+            entries need every column.
+
+        :param aggregated:
+            If True, the rows are aggregated entries.  If False, the rows are
+            recent entries and the aggregated columns are derived from the
+            single measured sample.
+
+        :return:
+            Returns the frame, sorted by the default order.
+
+        :type rows:       list
+        :type names:      tuple
+        :type aggregated: bool
+        :rtype:           LatencyFrame
+
+        """
+
+        if numpy is None:
+            raise ImportError(
+                "the numpy package is required to use latency frames."
+            )
+
+        dtypes = dict(COLUMNS)
+        number_entries = len(rows)
+        if number_entries:
+            values = zip(*rows)
+        else:
+            values = ( () for name in names )
+
+        columns = {
+            name : numpy.fromiter(
+                value,
+                dtype = dtypes[name],
+                count = number_entries
+            )
+            for name, value in zip(names, values)
+        }
+
+        return cls.__complete(columns, number_entries, aggregated)
+
+
+    @classmethod
+    def __complete(
+        cls,
+        columns : dict,
+        number_entries : int,
+        aggregated : bool
+        ):
+        """
+        Method used internally to build a frame from decoded columns,
+        deriving the aggregated columns of recent entries.
+
+        :param columns:
+            The decoded columns, keyed by column name.
+
+        :param number_entries:
+            The number of entries.
+
+        :param aggregated:
+            If True, the columns hold aggregated entries.
+
+        :return:
+            Returns the frame, sorted by the default order.
+
+        :type columns:        dict
+        :type number_entries: int
+        :type aggregated:     bool
+        :rtype:               LatencyFrame
+
+        """
+
+        if not aggregated:
+            latency = columns['latency']
+            timestamp = columns['timestamp']
+            columns['average'] = latency
+            columns['variance'] = numpy.zeros(number_entries)
+            columns['minimum'] = latency
+            columns['maximum'] = latency
+            columns['start_timestamp'] = timestamp
+            columns['end_timestamp'] = timestamp
+            columns['number_samples'] = numpy.ones(
+                number_entries,
+                dtype = 'int64'
+            )
+
+        return cls(columns).order_by(*DEFAULT_ORDER)
+
+
+    @staticmethod
+    def concatenate(frames):
+        """
+        Method you can use to combine several frames into a single frame.
+        The result is sorted by the default order.
+
+        :param frames:
+            The frames to be combined.
+
+        :return:
+            Returns the combined frame.
+
+        :type frames: iterable of LatencyFrame
+        :rtype:       LatencyFrame
+
+        """
+
+        frames = list(frames)
+        columns = {
+            name : numpy.concatenate([ f.column(name) for f in frames ])
+            for name in COLUMN_NAMES
+        }
+
+        return LatencyFrame(columns).order_by(*DEFAULT_ORDER)
+
+
+    @property
+    def columns(self):
+        """
+        Read-only property holding the names of the frame columns.
+
+        :type: tuple
+
+        """
+
+        return COLUMN_NAMES
+
+
+    @property
+    def order(self):
+        """
+        Read-only property holding the key columns the rows are sorted by.
+
+        :type: tuple
+
+        """
+
+        return self.__order
+
+
+    monitor_id = column_property(
+        'monitor_id',
+        "The monitor ID of the monitor where each measurement was taken."
+    )
+
+    timestamp = column_property(
+        'timestamp',
+        "The Unix timestamp of each measurement.  For aggregated data this is "
+        "the timestamp of a single randomly selected sample."
+    )
+
+    latency = column_property(
+        'latency',
+        "The measured latency, in seconds.  For aggregated data this is the "
+        "latency of a single randomly selected sample."
+    )
+
+    region_id = column_property(
+        'region_id',
+        "The region ID of the region where each measurement was taken."
+    )
+
+    average = column_property(
+        'average',
+        "The average latency of the population each row represents."
+    )
+
+    variance = column_property(
+        'variance',
+        "The population variance of the population each row represents."
+    )
+
+    minimum = column_property(
+        'minimum',
+        "The lowest latency in the population each row represents."
+    )
+
+    maximum = column_property(
+        'maximum',
+        "The highest latency in the population each row represents."
+    )
+
+    start_timestamp = column_property(
+        'start_timestamp',
+        "The earliest timestamp in the population each row represents."
+    )
+
+    end_timestamp = column_property(
+        'end_timestamp',
+        "The latest timestamp in the population each row represents."
+    )
+
+    number_samples = column_property(
+        'number_samples',
+        "The number of raw samples each row represents."
+    )
+
+
+    def column(self, name : str):
+        """
+        Method you can use to obtain a column by name.
+
+        :param name:
+            The name of the column.
+
+        :return:
+            Returns the column array.
+
+        :type name: str
+        :rtype:     numpy.ndarray
+
+        """
+
+        return self.__columns[name]
+
+
+    def __getitem__(self, name : str):
+        return self.__columns[name]
+
+
+    def __len__(self):
+        return self.__columns['timestamp'].shape[0]
+
+
+    def __repr__(self):
+        return "LatencyFrame(%d rows, order = %r)"%(len(self), self.__order)
+
+
+    def order_by(self, *key_columns):
+        """
+        Method you can use to obtain a copy of this frame sorted by one or
+        more key columns.  The timestamp column is appended as the final key
+        if not already included.  If the frame is already in the requested
+        order, it is returned unchanged.
+
+        :param key_columns:
+            The names of the key columns, most significant first.
+
+        :return:
+            Returns the sorted frame.
+
+        :rtype: LatencyFrame
+
+        """
+
+        order = tuple(key_columns)
+        if 'timestamp' not in order:
+            order += ('timestamp',)
+
+        for name in order:
+            if name not in self.__columns:
+                raise ValueError("unknown column %s"%name)
+
+        if order == self.__order:
+            result = self
+        else:
+            permutation = numpy.lexsort(
+                tuple(self.__columns[name] for name in reversed(order))
+            )
+            result = LatencyFrame(
+                {
+                    name : array[permutation]
+                    for name, array in self.__columns.items()
+                },
+                order
+            )
+
+        return result
+
+
+    def monitor(self, monitor_id : int):
+        """
+        Method you can use to select the rows for a single monitor.  The
+        result shares memory with this frame if monitor ID is the leading key
+        column.
+
+        :param monitor_id:
+            The monitor ID of interest.
+
+        :return:
+            Returns the selected rows.
+
+        :type monitor_id: int
+        :rtype:           LatencyFrame
+
+        """
+
+        return self.__select('monitor_id', monitor_id, monitor_id)
+
+
+    def region(self, region_id : int):
+        """
+        Method you can use to select the rows for a single region.  The result
+        shares memory with this frame if region ID is the leading key column.
+
+        :param region_id:
+            The region ID of interest.
+
+        :return:
+            Returns the selected rows.
+
+        :type region_id: int
+        :rtype:          LatencyFrame
+
+        """
+
+        return self.__select('region_id', region_id, region_id)
+
+
+    def series(self, monitor_id : int, region_id : int):
+        """
+        Method you can use to select the rows for a single monitor as seen
+        from a single region.  The result shares memory with this frame when
+        the frame is in the default order.
+
+        :param monitor_id:
+            The monitor ID of interest.
+
+        :param region_id:
+            The region ID of interest.
+
+        :return:
+            Returns the selected rows, sorted by timestamp.
+
+        :type monitor_id: int
+        :type region_id:  int
+        :rtype:           LatencyFrame
+
+        """
+
+        if self.__order[:1] == ('region_id',):
+            result = self.region(region_id).monitor(monitor_id)
+        else:
+            result = self.monitor(monitor_id).region(region_id)
+
+        return result
+
+
+    def between(self, start_timestamp : int = None, end_timestamp : int = None):
+        """
+        Method you can use to select the rows within a time range.  The
+        result shares memory with this frame if timestamp is the leading key
+        column, as is the case after selecting a single series.
+
+        :param start_timestamp:
+            The earliest timestamp to include.  A value of None means no
+            start time.
+
+        :param end_timestamp:
+            The latest timestamp to include.  A value of None means no end
+            time.
+
+        :return:
+            Returns the selected rows.
+
+        :type start_timestamp: int or None
+        :type end_timestamp:   int or None
+        :rtype:                LatencyFrame
+
+        """
+
+        return self.__select('timestamp', start_timestamp, end_timestamp)
+
+
+    def __select(self, name : str, low, high):
+        """
+        Method used internally to select rows whose value in a column lies
+        within an inclusive range.
+
+        :param name:
+            The name of the column.
+
+        :param low:
+            The lowest value to include or None for no lower bound.
+
+        :param high:
+            The highest value to include or None for no upper bound.
+
+        :return:
+            Returns the selected rows.
+
+        :type name: str
+        :rtype:     LatencyFrame
+
+        """
+
+        values = self.__columns[name]
+        if self.__order[:1] == (name,):
+            start = 0 if low is None else numpy.searchsorted(
+                values,
+                low,
+                side = 'left'
+            )
+            end = len(values) if high is None else numpy.searchsorted(
+                values,
+                high,
+                side = 'right'
+            )
+
+            result = LatencyFrame(
+                {
+                    column : array[start:end]
+                    for column, array in self.__columns.items()
+                },
+                self.__order[1:] if low is not None and low == high
+                    else self.__order
+            )
+        else:
+            mask = numpy.ones(len(values), dtype = bool)
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+
+            result = LatencyFrame(
+                {
+                    column : array[mask]
+                    for column, array in self.__columns.items()
+                },
+                self.__order
+            )
+
+        return result
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
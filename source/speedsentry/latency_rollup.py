@@ -0,0 +1,764 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that maintains latency rollups at several time resolutions so
+that queries over long time ranges read a small number of precomputed
+buckets rather than every sample.  This module requires the numpy package.
+
+Each bucket holds the number of samples, average, population variance,
+minimum, and maximum of the samples within it, in the same form as an
+aggregated latency entry.  Buckets are merged exactly using the parallel
+variance formulas so a rollup is identical, to rounding, to computing the
+statistics from the raw samples.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import threading
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from . import fork_safety as fork_safety
+from . import latency_frame as latency_frame
+
+###############################################################################
+# Globals:
+#
+
+DEFAULT_RESOLUTIONS = (60, 3600, 86400)
+"""
+The default bucket widths, in seconds, finest first.
+
+"""
+
+DEFAULT_MAXIMUM_POINTS = 2500
+"""
+The default maximum number of buckets per monitor and region returned by a
+query.  A 90 day query is answered from hourly buckets.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def merge(frame, bucket):
+    """
+    Function you can use to merge the rows of a frame that share a monitor
+    ID, region ID, and bucket.
+
+    :param frame:
+        The frame to be merged.  Raw entries should be represented as
+        aggregations of a single sample, as is done by
+        LatencyFrame.from_entries.
+
+    :param bucket:
+        An array holding the bucket of each row.
+
+    :return:
+        Returns a frame holding one row per monitor, region, and bucket, in
+        the default order.  The timestamp column holds the bucket and the
+        latency column holds the latency of one sample from the bucket.
+
+    :type frame:  LatencyFrame
+    :type bucket: numpy.ndarray
+    :rtype:       LatencyFrame
+
+    """
+
+    permutation = numpy.lexsort((bucket, frame.region_id, frame.monitor_id))
+
+    monitor_id = frame.monitor_id[permutation]
+    region_id = frame.region_id[permutation]
+    bucket = bucket[permutation]
+
+    if len(permutation):
+        change = (
+              (monitor_id[1:] != monitor_id[:-1])
+            | (region_id[1:] != region_id[:-1])
+            | (bucket[1:] != bucket[:-1])
+        )
+        starts = numpy.concatenate(([ 0 ], numpy.flatnonzero(change) + 1))
+        group = numpy.concatenate(([ 0 ], numpy.cumsum(change)))
+    else:
+        starts = numpy.zeros(0, dtype = 'int64')
+        group = starts
+
+    def reduce(ufunc, values):
+        if len(starts):
+            result = ufunc.reduceat(values, starts)
+        else:
+            result = values[:0]
+
+        return result
+
+    number_samples = frame.number_samples[permutation]
+    weight = number_samples.astype('float64')
+    average = frame.average[permutation]
+
+    total_weight = reduce(numpy.add, weight)
+    merged_average = reduce(numpy.add, weight * average) / total_weight
+
+    # The sum of squared deviations of a merged population is the sum of
+    # each part's squared deviations plus each part's weighted squared
+    # distance from the merged mean.  For two parts this is the parallel
+    # variance formula of Chan, Golub, and LeVeque.
+    deviation = average - merged_average[group]
+    merged_variance = reduce(
+        numpy.add,
+        weight * (frame.variance[permutation] + deviation * deviation)
+    ) / total_weight
+
+    return latency_frame.LatencyFrame(
+        {
+            'monitor_id' : monitor_id[starts],
+            'timestamp' : bucket[starts],
+            'latency' : frame.latency[permutation][starts],
+            'region_id' : region_id[starts],
+            'average' : merged_average,
+            'variance' : merged_variance,
+            'minimum' : reduce(numpy.minimum, frame.minimum[permutation]),
+            'maximum' : reduce(numpy.maximum, frame.maximum[permutation]),
+            'start_timestamp' : reduce(
+                numpy.minimum,
+                frame.start_timestamp[permutation]
+            ),
+            'end_timestamp' : reduce(
+                numpy.maximum,
+                frame.end_timestamp[permutation]
+            ),
+            'number_samples' : reduce(numpy.add, number_samples)
+        },
+        latency_frame.DEFAULT_ORDER
+    )
+
+
+def rollup(frame, resolution : int):
+    """
+    Function you can use to merge the rows of a frame into buckets of a
+    fixed width.  Rows are placed in the bucket holding their start timestamp
+    and rows for different monitors or regions are never merged.
+
+    :param frame:
+        The frame to be merged.
+
+    :param resolution:
+        The bucket width, in seconds.
+
+    :return:
+        Returns a frame holding one row per monitor, region, and bucket, in
+        the default order.  The timestamp column holds the start of each
+        bucket.
+
+    :type frame:      LatencyFrame
+    :type resolution: int
+    :rtype:           LatencyFrame
+
+    """
+
+    return merge(frame, frame.start_timestamp // resolution * resolution)
+
+
+def combine(frame):
+    """
+    Function you can use to merge every row of a frame for each monitor and
+    region into a single row.
+
+    :param frame:
+        The frame to be merged.
+
+    :return:
+        Returns a frame holding one row per monitor and region.  The
+        timestamp column holds the earliest start timestamp in the frame.
+
+    :type frame: LatencyFrame
+    :rtype:      LatencyFrame
+
+    """
+
+    start_timestamp = frame.start_timestamp
+    first = start_timestamp.min() if len(start_timestamp) else 0
+    return merge(frame, numpy.full(len(start_timestamp), first))
+
+###############################################################################
+# Class RollupPyramid:
+#
+
+class RollupPyramid(object):
+    """
+    Class that holds latency rollups at several resolutions.
+
+    The pyramid is updated incrementally.  New entries are first rolled up on
+    their own at each resolution and the resulting buckets are then merged
+    with the held buckets sharing the same bucket timestamps.  Buckets are
+    held in timestamp order in arrays with spare capacity so that, when new
+    entries are newer than those already held, an update costs time
+    proportional to the new entries rather than to the history.  Older
+    entries only add the cost of copying the held buckets to make room.  No
+    resolution is ever recomputed from the raw samples.
+
+    The pyramid does not detect entries that it has already been given.  When
+    fed from a LatencyArchive using the synchronize method, only rows added
+    to the archive since the previous call are read, including rows older
+    than those already held.
+
+    The class is thread safe.  Frames returned by the pyramid are copies and
+    are not modified by later updates.
+
+    """
+
+    class _Level(object):
+        """
+        Class used internally to hold the buckets at a single resolution in
+        timestamp order.
+
+        """
+
+        __slots__ = ('columns', 'length')
+
+        ORDER = ('timestamp', 'monitor_id', 'region_id')
+
+        def __init__(self):
+            self.columns = {
+                name : numpy.zeros(0, dtype = dtype)
+                for name, dtype in latency_frame.COLUMNS
+            }
+            self.length = 0
+
+
+        def frame(self, first_row : int = 0):
+            return latency_frame.LatencyFrame(
+                {
+                    name : array[first_row:self.length]
+                    for name, array in self.columns.items()
+                },
+                RollupPyramid._Level.ORDER
+            )
+
+
+        def rows(self, rows):
+            return latency_frame.LatencyFrame(
+                {
+                    name : array[rows]
+                    for name, array in self.columns.items()
+                },
+                RollupPyramid._Level.ORDER
+            )
+
+
+        def replace_rows(self, rows, frame):
+            first_row = rows[0] if len(rows) else self.length
+            timestamp = self.columns['timestamp']
+            if first_row:
+                previous = timestamp[first_row - 1]
+            else:
+                previous = None
+
+            if len(rows) == self.length - first_row                  and \
+               (previous is None or previous < frame.timestamp[0])        :
+                self.replace_tail(first_row, frame)
+            else:
+                keep = numpy.ones(self.length, dtype = bool)
+                keep[rows] = False
+                position = numpy.searchsorted(
+                    timestamp[:self.length][keep],
+                    frame.timestamp,
+                    side = 'left'
+                )
+
+                for name, array in self.columns.items():
+                    self.columns[name] = numpy.insert(
+                        array[:self.length][keep],
+                        position,
+                        frame.column(name)
+                    )
+
+                self.length = len(self.columns['timestamp'])
+
+
+        def replace_tail(self, first_row : int, frame):
+            length = first_row + len(frame)
+            capacity = len(self.columns['timestamp'])
+            if length > capacity:
+                capacity = max(length, 2 * capacity)
+                for name, array in self.columns.items():
+                    grown = numpy.empty(capacity, dtype = array.dtype)
+                    grown[:first_row] = array[:first_row]
+                    self.columns[name] = grown
+
+            for name, array in self.columns.items():
+                array[first_row:length] = frame.column(name)
+
+            self.length = length
+
+
+    def __init__(self, resolutions : tuple = DEFAULT_RESOLUTIONS):
+        """
+        Method that initializes the RollupPyramid class.
+
+        :param resolutions:
+            The bucket widths, in seconds.  Each width must be a multiple of
+            the next finer width so that every bucket lies entirely within a
+            single bucket at each coarser resolution.
+
+        :type resolutions: tuple
+
+        """
+
+        super().__init__()
+
+        if numpy is None:
+            raise ImportError(
+                "the numpy package is required to use rollup pyramids."
+            )
+
+        resolutions = tuple(sorted(int(r) for r in resolutions))
+        if not resolutions or resolutions[0] <= 0:
+            raise ValueError("invalid resolutions")
+
+        for finer, coarser in zip(resolutions[:-1], resolutions[1:]):
+            if coarser % finer:
+                raise ValueError(
+                    "resolution %d is not a multiple of %d"%(coarser, finer)
+                )
+
+        self.__resolutions = resolutions
+        self.__levels = {
+            resolution : RollupPyramid._Level() for resolution in resolutions
+        }
+        self.__archive_rows = { 'recent' : 0, 'aggregated' : 0 }
+        self.__lock = threading.Lock()
+        self.__fork_detector = fork_safety.ForkDetector()
+
+
+    @property
+    def resolutions(self):
+        """
+        Read-only property holding the bucket widths, in seconds, finest
+        first.
+
+        :type: tuple
+
+        """
+
+        return self.__resolutions
+
+
+    def number_buckets(self, resolution : int) -> int:
+        """
+        Method you can use to determine the number of buckets held at a
+        resolution.
+
+        :param resolution:
+            The bucket width, in seconds.
+
+        :return:
+            Returns the number of buckets.
+
+        :type resolution: int
+        :rtype:           int
+
+        """
+
+        return self.__levels[resolution].length
+
+
+    def level(self, resolution : int):
+        """
+        Method you can use to obtain a copy of every bucket held at a
+        resolution.
+
+        :param resolution:
+            The bucket width, in seconds.
+
+        :return:
+            Returns the buckets in the default order.  The timestamp column
+            holds the start of each bucket.
+
+        :type resolution: int
+        :rtype:           LatencyFrame
+
+        """
+
+        self.reset_after_fork()
+
+        with self.__lock:
+            return self.__levels[resolution].frame().order_by(
+                *latency_frame.DEFAULT_ORDER
+            )
+
+
+    def update(self, recent = (), aggregated = ()) -> int:
+        """
+        Method you can use to add new entries to the pyramid.
+
+        :param recent:
+            The recent entries to add.  You can supply the list of
+            LatencyEntry instances or the LatencyFrame returned by
+            SpeedSentry.latency_list.
+
+        :param aggregated:
+            The aggregated entries to add.  You can supply the list of
+            AggregatedLatencyEntry instances or the LatencyFrame returned by
+            SpeedSentry.latency_list.  Entries spanning more than a bucket
+            are placed in the bucket holding their start timestamp.
+
+        :return:
+            Returns the number of entries added.
+
+        :type recent:     list or LatencyFrame
+        :type aggregated: list or LatencyFrame
+        :rtype:           int
+
+        """
+
+        self.reset_after_fork()
+
+        if not isinstance(recent, latency_frame.LatencyFrame):
+            recent = latency_frame.LatencyFrame.from_entries(
+                recent,
+                aggregated = False
+            )
+
+        if not isinstance(aggregated, latency_frame.LatencyFrame):
+            aggregated = latency_frame.LatencyFrame.from_entries(
+                aggregated,
+                aggregated = True
+            )
+
+        number_added = len(recent) + len(aggregated)
+        if number_added:
+            with self.__lock:
+                self.__merge(self.__concatenate((recent, aggregated)))
+
+        return number_added
+
+
+    def synchronize(self, archive) -> int:
+        """
+        Method you can use to add the rows appended to a latency archive
+        since the previous call.  The pyramid should only ever be fed from a
+        single archive.  Only the buckets covering the added rows are
+        updated.
+
+        :param archive:
+            The archive to read from.
+
+        :return:
+            Returns the number of entries added.
+
+        :type archive: LatencyArchive
+        :rtype:        int
+
+        """
+
+        self.reset_after_fork()
+
+        with self.__lock:
+            recent, aggregated = archive.added(
+                self.__archive_rows['recent'],
+                self.__archive_rows['aggregated']
+            )
+
+            number_added = len(recent) + len(aggregated)
+            if number_added:
+                self.__merge(self.__concatenate((recent, aggregated)))
+
+            self.__archive_rows['recent'] += len(recent)
+            self.__archive_rows['aggregated'] += len(aggregated)
+
+        return number_added
+
+
+    def choose_resolution(
+        self,
+        start_timestamp : int,
+        end_timestamp : int,
+        maximum_points : int = DEFAULT_MAXIMUM_POINTS
+        ) -> int:
+        """
+        Method you can use to determine the resolution used to answer a
+        query.
+
+        :param start_timestamp:
+            The earliest timestamp of interest.
+
+        :param end_timestamp:
+            The latest timestamp of interest.
+
+        :param maximum_points:
+            The maximum number of buckets per monitor and region.
+
+        :return:
+            Returns the finest resolution that covers the time range with no
+            more than the requested number of buckets, or the coarsest
+            resolution if none does.
+
+        :type start_timestamp: int
+        :type end_timestamp:   int
+        :type maximum_points:  int
+        :rtype:                int
+
+        """
+
+        result = self.__resolutions[-1]
+        for resolution in self.__resolutions:
+            first = start_timestamp // resolution
+            last = end_timestamp // resolution
+            if last - first + 1 <= maximum_points:
+                result = resolution
+                break
+
+        return result
+
+
+    def query(
+        self,
+        start_timestamp : int,
+        end_timestamp : int,
+        monitor_id : int = None,
+        region_id : int = None,
+        maximum_points : int = DEFAULT_MAXIMUM_POINTS,
+        resolution : int = None
+        ):
+        """
+        Method you can use to obtain the buckets covering a time range.
+
+        :param start_timestamp:
+            The earliest timestamp of interest.  The bucket holding this
+            timestamp is included.
+
+        :param end_timestamp:
+            The latest timestamp of interest.
+
+        :param monitor_id:
+            An optional monitor ID.  If specified, only buckets for this
+            monitor are returned.
+
+        :param region_id:
+            An optional region ID.  If specified, only buckets for this region
+            are returned.
+
+        :param maximum_points:
+            The maximum number of buckets per monitor and region.  Used to
+            choose the resolution when resolution is None.
+
+        :param resolution:
+            An optional resolution to use.  A value of None selects the
+            resolution using choose_resolution.
+
+        :return:
+            Returns a copy of the buckets in the default order.  The
+            timestamp column holds the start of each bucket.
+
+        :type start_timestamp: int
+        :type end_timestamp:   int
+        :type monitor_id:      int or None
+        :type region_id:       int or None
+        :type maximum_points:  int
+        :type resolution:      int or None
+        :rtype:                LatencyFrame
+
+        """
+
+        if resolution is None:
+            resolution = self.choose_resolution(
+                start_timestamp,
+                end_timestamp,
+                maximum_points
+            )
+
+        self.reset_after_fork()
+
+        with self.__lock:
+            frame = self.__levels[resolution].frame().between(
+                start_timestamp // resolution * resolution,
+                end_timestamp
+            )
+
+            if monitor_id is not None:
+                frame = frame.monitor(monitor_id)
+
+            if region_id is not None:
+                frame = frame.region(region_id)
+
+            return frame.order_by(*latency_frame.DEFAULT_ORDER)
+
+
+    def summary(
+        self,
+        start_timestamp : int,
+        end_timestamp : int,
+        monitor_id : int = None,
+        region_id : int = None,
+        maximum_points : int = DEFAULT_MAXIMUM_POINTS
+        ):
+        """
+        Method you can use to obtain the combined statistics of each monitor
+        and region over a time range.  The range is rounded outward to the
+        buckets of the chosen resolution.
+
+        :param start_timestamp:
+            The earliest timestamp of interest.
+
+        :param end_timestamp:
+            The latest timestamp of interest.
+
+        :param monitor_id:
+            An optional monitor ID.  If specified, only this monitor is
+            included.
+
+        :param region_id:
+            An optional region ID.  If specified, only this region is
+            included.
+
+        :param maximum_points:
+            The maximum number of buckets per monitor and region read to
+            compute the result.
+
+        :return:
+            Returns a frame holding one row per monitor and region.
+
+        :type start_timestamp: int
+        :type end_timestamp:   int
+        :type monitor_id:      int or None
+        :type region_id:       int or None
+        :type maximum_points:  int
+        :rtype:                LatencyFrame
+
+        """
+
+        return combine(
+            self.query(
+                start_timestamp,
+                end_timestamp,
+                monitor_id,
+                region_id,
+                maximum_points
+            )
+        )
+
+
+    def clear(self):
+        """
+        Method you can use to discard every bucket.
+
+        """
+
+        self.reset_after_fork()
+
+        with self.__lock:
+            for resolution in self.__resolutions:
+                self.__levels[resolution] = RollupPyramid._Level()
+
+            self.__archive_rows = { 'recent' : 0, 'aggregated' : 0 }
+    
+
+    def reset_after_fork(self):
+        """
+        Method you can call in a forked child process to replace the lock
+        inherited from the parent process.  Buckets are kept.  The method is
+        called automatically when the pyramid is used and does nothing if the
+        process has not forked.
+
+        """
+
+        if self.__fork_detector.forked():
+            self.__lock = threading.Lock()
+
+
+    def __merge(self, frame):
+        """
+        Method used internally to merge new entries into every resolution.
+
+        :param frame:
+            The new entries.
+
+        :type frame: LatencyFrame
+
+        """
+
+        changes = frame
+        for resolution in self.__resolutions:
+            changes = rollup(changes, resolution)
+
+            level = self.__levels[resolution]
+            timestamp = level.columns['timestamp'][:level.length]
+            buckets = numpy.unique(changes.timestamp)
+            first = numpy.searchsorted(timestamp, buckets, side = 'left')
+            count = (
+                numpy.searchsorted(timestamp, buckets, side = 'right') - first
+            )
+            rows = (
+                  numpy.arange(count.sum())
+                + numpy.repeat(first - (numpy.cumsum(count) - count), count)
+            )
+
+            held = level.rows(rows)
+            merged = merge(
+                self.__concatenate((held, changes)),
+                numpy.concatenate((held.timestamp, changes.timestamp))
+            )
+
+            level.replace_rows(
+                rows,
+                merged.order_by(*RollupPyramid._Level.ORDER)
+            )
+
+
+    @staticmethod
+    def __concatenate(frames):
+        """
+        Method used internally to combine frames without sorting.
+
+        :param frames:
+            The frames to combine.
+
+        :return:
+            Returns the combined, unordered frame.
+
+        :type frames: tuple
+        :rtype:       LatencyFrame
+
+        """
+
+        return latency_frame.LatencyFrame(
+            {
+                name : numpy.concatenate([ f.column(name) for f in frames ])
+                for name in latency_frame.COLUMN_NAMES
+            }
+        )
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
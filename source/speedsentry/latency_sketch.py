@@ -0,0 +1,1446 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that provides mergeable quantile sketches you can use to
+track latency percentiles over unbounded streams without keeping every
+sample.
+
+The sketches use logarithmically sized bins, as described for DDSketch.  A
+value is placed in bin i when it lies in the range (g^(i-1), g^i], where
+g = (1 + a) / (1 - a) for a relative accuracy a.  Each bin is reported as
+the point in its range within a relative distance a of every value in the
+range, so every reported percentile is within a relative distance a of the
+true value.  Because bins depend only on the relative accuracy, sketches
+built in different processes or on different nodes can be merged by adding
+bin counts, and the merged sketch has the same guarantee.
+
+When a sketch holds more than its maximum number of bins, the lowest bins
+are folded together.  The guarantee then no longer holds for the lowest
+percentiles, but continues to hold for the high percentiles that are of
+most interest for latency.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import collections.abc
+import math
+import struct
+import threading
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from . import fork_safety as fork_safety
+from . import latency_frame as latency_frame
+from . import latency_analytics as latency_analytics
+
+###############################################################################
+# Globals:
+#
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+"""
+The default relative accuracy of reported percentiles.
+
+"""
+
+DEFAULT_MAXIMUM_BINS = 2048
+"""
+The default maximum number of bins held by a sketch.  With the default
+relative accuracy this covers latencies from a microsecond to many years
+before any bins are folded together.
+
+"""
+
+MINIMUM_VALUE = 1.0E-9
+"""
+Values at or below this value, in seconds, are counted as zero.
+
+"""
+
+FORMAT_VERSION = 1
+"""
+The version of the serialized sketch format.
+
+"""
+
+SKETCH_MAGIC = b'SSQS'
+"""
+The bytes that start a serialized sketch.
+
+"""
+
+SKETCH_MAP_MAGIC = b'SSQM'
+"""
+The bytes that start a serialized sketch map.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def write_varint(output : bytearray, value : int):
+    """
+    Function you can use to append an unsigned integer to a buffer using a
+    variable number of bytes, 7 bits per byte with the low bits first.
+
+    :param output:
+        The buffer to append to.
+
+    :param value:
+        The non-negative value to append.
+
+    :type output: bytearray
+    :type value:  int
+
+    """
+
+    while value > 0x7F:
+        output.append((value & 0x7F) | 0x80)
+        value >>= 7
+
+    output.append(value)
+
+
+def read_varint(data, offset : int) -> tuple:
+    """
+    Function you can use to read an unsigned integer written by
+    write_varint.
+
+    :param data:
+        The buffer to read from.
+
+    :param offset:
+        The offset of the first byte of the value.
+
+    :return:
+        Returns a tuple holding the value and the offset just past the
+        value.
+
+    :type data:   bytes
+    :type offset: int
+    :rtype:       tuple
+
+    """
+
+    result = 0
+    shift = 0
+    while True:
+        try:
+            byte = data[offset]
+        except IndexError:
+            raise ValueError("truncated latency sketch")
+
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return (result, offset)
+
+        shift += 7
+
+
+def write_signed_varint(output : bytearray, value : int):
+    """
+    Function you can use to append a signed integer to a buffer.  The value
+    is zigzag encoded so that small negative values remain short.
+
+    :param output:
+        The buffer to append to.
+
+    :param value:
+        The value to append.
+
+    :type output: bytearray
+    :type value:  int
+
+    """
+
+    write_varint(output, 2 * value if value >= 0 else -2 * value - 1)
+
+
+def read_signed_varint(data, offset : int) -> tuple:
+    """
+    Function you can use to read a signed integer written by
+    write_signed_varint.
+
+    :param data:
+        The buffer to read from.
+
+    :param offset:
+        The offset of the first byte of the value.
+
+    :return:
+        Returns a tuple holding the value and the offset just past the
+        value.
+
+    :type data:   bytes
+    :type offset: int
+    :rtype:       tuple
+
+    """
+
+    value, offset = read_varint(data, offset)
+    return (value >> 1 if value & 1 == 0 else -(value >> 1) - 1, offset)
+
+###############################################################################
+# Class LatencySketch:
+#
+
+class LatencySketch(object):
+    """
+    Class that holds a mergeable quantile sketch of latency values.
+
+    Raw latency entries add their measured latency.  Aggregated latency
+    entries add their average, weighted by the number of samples they
+    represent, so percentiles treat each aggregated population as if every
+    sample equalled the population's average.  The sample count, average,
+    minimum, and maximum are exact.
+
+    The class is not thread safe.  Use a SketchMap, or your own lock, to
+    share sketches between threads.
+
+    """
+
+    HEADER = struct.Struct('<4sBd')
+    """
+    The layout of the magic bytes, format version, and relative accuracy
+    that start a serialized sketch.
+
+    """
+
+    SUMMARY = struct.Struct('<3d')
+    """
+    The layout of the sample total, minimum, and maximum in a serialized
+    sketch.
+
+    """
+
+    def __init__(
+            self,
+            relative_accuracy : float = DEFAULT_RELATIVE_ACCURACY,
+            maximum_bins : int = DEFAULT_MAXIMUM_BINS
+        ):
+        """
+        Method that initializes the LatencySketch class.
+
+        :param relative_accuracy:
+            The relative accuracy of reported percentiles, greater than 0
+            and less than 1.
+
+        :param maximum_bins:
+            The maximum number of bins held.
+
+        :type relative_accuracy: float
+        :type maximum_bins:      int
+
+        """
+
+        super().__init__()
+
+        relative_accuracy = float(relative_accuracy)
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError(
+                "invalid relative accuracy %r"%relative_accuracy
+            )
+
+        maximum_bins = int(maximum_bins)
+        if maximum_bins < 1:
+            raise ValueError("invalid maximum bins %r"%maximum_bins)
+
+        gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+
+        self.__relative_accuracy = relative_accuracy
+        self.__maximum_bins = maximum_bins
+        self.__gamma = gamma
+        self.__multiplier = 1.0 / math.log(gamma)
+        self.__bins = dict()
+        self.__lowest_index = None
+        self.__zero_count = 0
+        self.__count = 0
+        self.__total = 0.0
+        self.__minimum = math.inf
+        self.__maximum = -math.inf
+
+
+    @property
+    def relative_accuracy(self):
+        """
+        Read-only property holding the relative accuracy of reported
+        percentiles.
+
+        :type: float
+
+        """
+
+        return self.__relative_accuracy
+
+
+    @property
+    def maximum_bins(self):
+        """
+        Read-only property holding the maximum number of bins held.
+
+        :type: int
+
+        """
+
+        return self.__maximum_bins
+
+
+    @property
+    def number_bins(self):
+        """
+        Read-only property holding the number of bins currently held,
+        including the bin for values counted as zero.
+
+        :type: int
+
+        """
+
+        return len(self.__bins) + (1 if self.__zero_count else 0)
+
+
+    @property
+    def count(self):
+        """
+        Read-only property holding the number of samples added.
+
+        :type: int
+
+        """
+
+        return self.__count
+
+
+    @property
+    def average(self):
+        """
+        Read-only property holding the average of the samples added, or
+        None if the sketch is empty.
+
+        :type: float or None
+
+        """
+
+        return self.__total / self.__count if self.__count else None
+
+
+    @property
+    def minimum(self):
+        """
+        Read-only property holding the smallest sample added, or None if the
+        sketch is empty.
+
+        :type: float or None
+
+        """
+
+        return self.__minimum if self.__count else None
+
+
+    @property
+    def maximum(self):
+        """
+        Read-only property holding the largest sample added, or None if the
+        sketch is empty.
+
+        :type: float or None
+
+        """
+
+        return self.__maximum if self.__count else None
+
+
+    def __len__(self):
+        return self.__count
+
+
+    def __repr__(self):
+        return "LatencySketch(%d samples, %d bins)"%(
+            self.__count,
+            self.number_bins
+        )
+
+
+    def add(self, value : float, count : int = 1):
+        """
+        Method you can use to add a value to the sketch.
+
+        :param value:
+            The value, in seconds.
+
+        :param count:
+            The number of samples with this value.
+
+        :type value: float
+        :type count: int
+
+        """
+
+        if count <= 0:
+            return
+
+        if value > MINIMUM_VALUE:
+            index = math.ceil(math.log(value) * self.__multiplier)
+            if self.__lowest_index is not None and \
+               index < self.__lowest_index:
+                index = self.__lowest_index
+
+            bins = self.__bins
+            if index in bins:
+                bins[index] += count
+            else:
+                bins[index] = count
+                if len(bins) > self.__maximum_bins:
+                    self.__collapse()
+        else:
+            self.__zero_count += count
+
+        self.__count += count
+        self.__total += value * count
+        if value < self.__minimum:
+            self.__minimum = value
+
+        if value > self.__maximum:
+            self.__maximum = value
+
+
+    def add_many(
+            self,
+            values,
+            counts = None,
+            minimum : float = None,
+            maximum : float = None
+        ):
+        """
+        Method you can use to add many values at once.  This method requires
+        the numpy package.
+
+        :param values:
+            The values, in seconds.
+
+        :param counts:
+            The number of samples with each value.  A value of None adds
+            each value once.
+
+        :param minimum:
+            An optional smallest sample, used when the values are averages
+            of aggregated populations.
+
+        :param maximum:
+            An optional largest sample, used when the values are averages
+            of aggregated populations.
+
+        :type values:  numpy.ndarray or list
+        :type counts:  numpy.ndarray, list, or None
+        :type minimum: float or None
+        :type maximum: float or None
+
+        """
+
+        if numpy is None:
+            raise ImportError(
+                "the numpy package is required to add many values at once."
+            )
+
+        values = numpy.asarray(values, dtype = 'float64')
+        if counts is None:
+            counts = numpy.ones(len(values), dtype = 'int64')
+        else:
+            counts = numpy.asarray(counts, dtype = 'int64')
+
+        keep = counts > 0
+        if not keep.all():
+            values = values[keep]
+            counts = counts[keep]
+
+        if len(values) == 0:
+            return
+
+        positive = values > MINIMUM_VALUE
+        indexes = numpy.ceil(
+            numpy.log(values[positive]) * self.__multiplier
+        ).astype('int64')
+        if self.__lowest_index is not None:
+            numpy.maximum(indexes, self.__lowest_index, out = indexes)
+
+        unique, inverse = numpy.unique(indexes, return_inverse = True)
+        totals = numpy.bincount(
+            inverse,
+            weights = counts[positive],
+            minlength = len(unique)
+        )
+
+        bins = self.__bins
+        for index, total in zip(unique.tolist(), totals.tolist()):
+            bins[index] = bins.get(index, 0) + int(total)
+
+        if len(bins) > self.__maximum_bins:
+            self.__collapse()
+
+        self.__zero_count += int(counts[~positive].sum())
+        self.__count += int(counts.sum())
+        self.__total += float(numpy.dot(values, counts))
+        self.__minimum = min(
+            self.__minimum,
+            float(values.min()) if minimum is None else minimum
+        )
+        self.__maximum = max(
+            self.__maximum,
+            float(values.max()) if maximum is None else maximum
+        )
+
+
+    def update(self, recent = (), aggregated = ()) -> int:
+        """
+        Method you can use to add latency entries to the sketch.
+
+        :param recent:
+            The recent entries to add.  You can supply the list of
+            LatencyEntry instances or the LatencyFrame returned by
+            SpeedSentry.latency_list, or any iterable of entries such as the
+            generator returned by SpeedSentry.latency_stream.  Iterables may
+            mix LatencyEntry and AggregatedLatencyEntry instances.
+
+        :param aggregated:
+            The aggregated entries to add.  You can supply the list of
+            AggregatedLatencyEntry instances or the LatencyFrame returned by
+            SpeedSentry.latency_list.
+
+        :return:
+            Returns the number of entries added.
+
+        :type recent:     iterable or LatencyFrame
+        :type aggregated: iterable or LatencyFrame
+        :rtype:           int
+
+        """
+
+        number_added = 0
+        for entries in (recent, aggregated):
+            if isinstance(entries, latency_frame.LatencyFrame):
+                if len(entries):
+                    self.add_many(
+                        entries.average,
+                        entries.number_samples,
+                        float(entries.minimum.min()),
+                        float(entries.maximum.max())
+                    )
+
+                number_added += len(entries)
+            else:
+                for entry in entries:
+                    self.add_entry(entry)
+                    number_added += 1
+
+        return number_added
+
+
+    def add_entry(self, entry):
+        """
+        Method you can use to add a single latency entry to the sketch.
+
+        :param entry:
+            The entry to add.
+
+        :type entry: LatencyEntry or AggregatedLatencyEntry
+
+        """
+
+        number_samples = entry.get('number_samples')
+        if number_samples is None:
+            self.add(entry['latency'])
+        elif number_samples > 0:
+            self.add(entry['average'], number_samples)
+            self.__minimum = min(self.__minimum, entry['minimum'])
+            self.__maximum = max(self.__maximum, entry['maximum'])
+
+
+    def merge(self, other):
+        """
+        Method you can use to add the samples held by another sketch to this
+        sketch.
+
+        :param other:
+            The sketch to merge.  The sketch must use the same relative
+            accuracy.
+
+        :type other: LatencySketch
+
+        """
+
+        if other.relative_accuracy != self.__relative_accuracy:
+            raise ValueError(
+                "can not merge sketches with different relative accuracies"
+            )
+
+        state = other.__state()
+        lowest_index = state[1]
+        if lowest_index is not None and \
+           (self.__lowest_index is None or lowest_index > self.__lowest_index):
+            self.__fold(lowest_index)
+
+        bins = self.__bins
+        floor = self.__lowest_index
+        for index, count in state[0].items():
+            if floor is not None and index < floor:
+                index = floor
+
+            bins[index] = bins.get(index, 0) + count
+
+        if len(bins) > self.__maximum_bins:
+            self.__collapse()
+
+        self.__zero_count += state[2]
+        self.__count += state[3]
+        self.__total += state[4]
+        self.__minimum = min(self.__minimum, state[5])
+        self.__maximum = max(self.__maximum, state[6])
+
+
+    def copy(self):
+        """
+        Method you can use to obtain an independent copy of this sketch.
+
+        :return:
+            Returns the copy.
+
+        :rtype: LatencySketch
+
+        """
+
+        result = LatencySketch(self.__relative_accuracy, self.__maximum_bins)
+        result.merge(self)
+        return result
+
+
+    def percentile(self, percentile : float):
+        """
+        Method you can use to estimate a single percentile.
+
+        :param percentile:
+            The percentile, from 0 to 100.
+
+        :return:
+            Returns the estimated value, in seconds, or None if the sketch
+            is empty.
+
+        :type percentile: float
+        :rtype:           float or None
+
+        """
+
+        return self.percentiles((percentile,))[0]
+
+
+    def percentiles(
+            self,
+            percentiles : tuple = latency_analytics.DEFAULT_PERCENTILES
+        ) -> tuple:
+        """
+        Method you can use to estimate several percentiles at once.  Each
+        percentile is the value of the sample at rank p / 100 * (n - 1),
+        counting from zero, for n samples.  The 0th and 100th percentiles
+        are the exact minimum and maximum.
+
+        :param percentiles:
+            The percentiles, each from 0 to 100.
+
+        :return:
+            Returns a tuple holding the estimated value of each percentile,
+            in seconds.  Each value is None if the sketch is empty.
+
+        :type percentiles: tuple
+        :rtype:            tuple
+
+        """
+
+        for percentile in percentiles:
+            if not 0 <= percentile <= 100:
+                raise ValueError("invalid percentile %r"%percentile)
+
+        if self.__count == 0:
+            return (None,) * len(percentiles)
+
+        ranks = sorted(
+            (percentile / 100.0 * (self.__count - 1), i)
+            for i, percentile in enumerate(percentiles)
+        )
+
+        result = [ None ] * len(percentiles)
+        position = 0
+        cumulative = self.__zero_count
+        while position < len(ranks) and ranks[position][0] < cumulative:
+            result[ranks[position][1]] = self.__minimum
+            position += 1
+
+        if position < len(ranks):
+            scale = 2.0 / (1.0 + self.__gamma)
+            for index in sorted(self.__bins):
+                cumulative += self.__bins[index]
+                if ranks[position][0] < cumulative:
+                    value = min(
+                        max(scale * self.__gamma ** index, self.__minimum),
+                        self.__maximum
+                    )
+                    while position < len(ranks) and \
+                          ranks[position][0] < cumulative:
+                        result[ranks[position][1]] = value
+                        position += 1
+
+                    if position == len(ranks):
+                        break
+
+        while position < len(ranks):
+            result[ranks[position][1]] = self.__maximum
+            position += 1
+
+        for i, percentile in enumerate(percentiles):
+            if percentile == 0:
+                result[i] = self.__minimum
+            elif percentile == 100:
+                result[i] = self.__maximum
+
+        return tuple(result)
+
+
+    def to_bytes(self) -> bytes:
+        """
+        Method you can use to serialize this sketch.  Bin indexes are delta
+        encoded and, like bin counts, written using a variable number of
+        bytes so a typical latency sketch serializes to a few hundred bytes.
+
+        :return:
+            Returns the serialized sketch.
+
+        :rtype: bytes
+
+        """
+
+        output = bytearray()
+        self.write(output)
+        return bytes(output)
+
+
+    def write(self, output : bytearray):
+        """
+        Method you can use to append this sketch to a buffer.
+
+        :param output:
+            The buffer to append to.
+
+        :type output: bytearray
+
+        """
+
+        output += LatencySketch.HEADER.pack(
+            SKETCH_MAGIC,
+            FORMAT_VERSION,
+            self.__relative_accuracy
+        )
+        write_varint(output, self.__maximum_bins)
+        write_varint(output, self.__zero_count)
+        output += LatencySketch.SUMMARY.pack(
+            self.__total,
+            self.__minimum,
+            self.__maximum
+        )
+
+        if self.__lowest_index is None:
+            write_varint(output, 0)
+        else:
+            write_varint(output, 1)
+            write_signed_varint(output, self.__lowest_index)
+
+        write_varint(output, len(self.__bins))
+        previous = 0
+        for index in sorted(self.__bins):
+            write_signed_varint(output, index - previous)
+            write_varint(output, self.__bins[index])
+            previous = index
+
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Method you can use to restore a sketch serialized by the to_bytes
+        method.
+
+        :param data:
+            The serialized sketch.
+
+        :return:
+            Returns the sketch.
+
+        :type data:  bytes
+        :rtype:      LatencySketch
+
+        """
+
+        result, offset = cls.read(data, 0)
+        if offset != len(data):
+            raise ValueError("unexpected data after latency sketch")
+
+        return result
+
+
+    @classmethod
+    def read(cls, data, offset : int) -> tuple:
+        """
+        Method you can use to read a sketch appended to a buffer by the
+        write method.
+
+        :param data:
+            The buffer to read from.
+
+        :param offset:
+            The offset of the start of the sketch.
+
+        :return:
+            Returns a tuple holding the sketch and the offset just past the
+            sketch.
+
+        :type data:   bytes
+        :type offset: int
+        :rtype:       tuple
+
+        """
+
+        header = LatencySketch.HEADER
+        summary = LatencySketch.SUMMARY
+        if len(data) < offset + header.size:
+            raise ValueError("truncated latency sketch")
+
+        magic, version, relative_accuracy = header.unpack_from(data, offset)
+        if magic != SKETCH_MAGIC:
+            raise ValueError("data is not a latency sketch")
+
+        if version != FORMAT_VERSION:
+            raise ValueError("unsupported latency sketch version %d"%version)
+
+        offset += header.size
+        maximum_bins, offset = read_varint(data, offset)
+        result = cls(relative_accuracy, maximum_bins)
+
+        zero_count, offset = read_varint(data, offset)
+        if len(data) < offset + summary.size:
+            raise ValueError("truncated latency sketch")
+
+        total, minimum, maximum = summary.unpack_from(data, offset)
+        offset += summary.size
+
+        collapsed, offset = read_varint(data, offset)
+        if collapsed:
+            lowest_index, offset = read_signed_varint(data, offset)
+        else:
+            lowest_index = None
+
+        number_bins, offset = read_varint(data, offset)
+        if number_bins > maximum_bins:
+            raise ValueError("too many bins in latency sketch")
+
+        bins = dict()
+        index = 0
+        for i in range(number_bins):
+            delta, offset = read_signed_varint(data, offset)
+            count, offset = read_varint(data, offset)
+            index += delta
+            bins[index] = count
+
+        result.__restore(
+            bins,
+            lowest_index,
+            zero_count,
+            zero_count + sum(bins.values()),
+            total,
+            minimum,
+            maximum
+        )
+
+        return (result, offset)
+
+
+    def __state(self) -> tuple:
+        """
+        Method used internally to obtain the contents of this sketch.
+
+        :return:
+            Returns a tuple holding the bins, the lowest bin index, the zero
+            count, the sample count, the sample total, the minimum, and the
+            maximum.
+
+        :rtype: tuple
+
+        """
+
+        return (
+            self.__bins,
+            self.__lowest_index,
+            self.__zero_count,
+            self.__count,
+            self.__total,
+            self.__minimum,
+            self.__maximum
+        )
+
+
+    def __restore(
+            self,
+            bins : dict,
+            lowest_index : int,
+            zero_count : int,
+            count : int,
+            total : float,
+            minimum : float,
+            maximum : float
+        ):
+        """
+        Method used internally to set the contents of this sketch.
+
+        :param bins:
+            The bin counts, keyed by bin index.
+
+        :param lowest_index:
+            The index below which values are folded, or None.
+
+        :param zero_count:
+            The number of samples counted as zero.
+
+        :param count:
+            The number of samples.
+
+        :param total:
+            The sum of the samples.
+
+        :param minimum:
+            The smallest sample.
+
+        :param maximum:
+            The largest sample.
+
+        :type bins:         dict
+        :type lowest_index: int or None
+        :type zero_count:   int
+        :type count:        int
+        :type total:        float
+        :type minimum:      float
+        :type maximum:      float
+
+        """
+
+        self.__bins = bins
+        self.__lowest_index = lowest_index
+        self.__zero_count = zero_count
+        self.__count = count
+        self.__total = total
+        self.__minimum = minimum
+        self.__maximum = maximum
+
+
+    def __collapse(self):
+        """
+        Method used internally to fold the lowest bins together so that no
+        more than the maximum number of bins are held.
+
+        """
+
+        indexes = sorted(self.__bins)
+        self.__fold(indexes[len(indexes) - self.__maximum_bins])
+
+
+    def __fold(self, lowest_index : int):
+        """
+        Method used internally to fold every bin below an index into the bin
+        at that index.
+
+        :param lowest_index:
+            The index of the lowest bin to keep.
+
+        :type lowest_index: int
+
+        """
+
+        bins = self.__bins
+        folded = 0
+        for index in [ i for i in bins if i < lowest_index ]:
+            folded += bins.pop(index)
+
+        if folded:
+            bins[lowest_index] = bins.get(lowest_index, 0) + folded
+
+        self.__lowest_index = lowest_index
+
+###############################################################################
+# Class SketchMap:
+#
+
+class SketchMap(collections.abc.Mapping):
+    """
+    Class that holds one latency sketch per monitor, per region, or per
+    monitor and region.  The map is a read-only mapping from key tuples,
+    holding the values of the grouping columns, to copies of the sketches.
+
+    Sketch maps built in different processes or on different nodes can be
+    combined with the merge method, either directly or after transferring
+    them using the to_bytes and from_bytes methods.  Sketch maps can also be
+    pickled.
+
+    The class is thread safe.
+
+    """
+
+    def __init__(
+            self,
+            by : tuple = ('monitor_id',),
+            relative_accuracy : float = DEFAULT_RELATIVE_ACCURACY,
+            maximum_bins : int = DEFAULT_MAXIMUM_BINS
+        ):
+        """
+        Method that initializes the SketchMap class.
+
+        :param by:
+            The columns to group by, any of "monitor_id" and "region_id".
+
+        :param relative_accuracy:
+            The relative accuracy of reported percentiles, greater than 0
+            and less than 1.
+
+        :param maximum_bins:
+            The maximum number of bins held by each sketch.
+
+        :type by:                tuple
+        :type relative_accuracy: float
+        :type maximum_bins:      int
+
+        """
+
+        super().__init__()
+
+        by = tuple(by)
+        if not by or len(set(by)) != len(by):
+            raise ValueError("invalid grouping columns")
+
+        for name in by:
+            if name not in latency_analytics.GROUP_COLUMNS:
+                raise ValueError("can not group by %s"%name)
+
+        self.__by = by
+        self.__template = LatencySketch(relative_accuracy, maximum_bins)
+        self.__sketches = dict()
+        self.__lock = threading.Lock()
+        self.__fork_detector = fork_safety.ForkDetector()
+
+
+    @property
+    def by(self):
+        """
+        Read-only property holding the columns the map is grouped by.
+
+        :type: tuple
+
+        """
+
+        return self.__by
+
+
+    @property
+    def relative_accuracy(self):
+        """
+        Read-only property holding the relative accuracy of reported
+        percentiles.
+
+        :type: float
+
+        """
+
+        return self.__template.relative_accuracy
+
+
+    @property
+    def maximum_bins(self):
+        """
+        Read-only property holding the maximum number of bins held by each
+        sketch.
+
+        :type: int
+
+        """
+
+        return self.__template.maximum_bins
+
+
+    def __len__(self):
+        self.reset_after_fork()
+
+        with self.__lock:
+            return len(self.__sketches)
+
+
+    def __iter__(self):
+        self.reset_after_fork()
+
+        with self.__lock:
+            return iter(list(self.__sketches))
+
+
+    def __contains__(self, key):
+        self.reset_after_fork()
+
+        with self.__lock:
+            return key in self.__sketches
+
+
+    def __getitem__(self, key):
+        self.reset_after_fork()
+
+        with self.__lock:
+            return self.__sketches[key].copy()
+
+
+    def __repr__(self):
+        return "SketchMap(by = %r, %d sketches)"%(self.__by, len(self))
+
+
+    def __reduce__(self):
+        return (type(self).from_bytes, (self.to_bytes(), ))
+
+
+    def update(self, recent = (), aggregated = ()) -> int:
+        """
+        Method you can use to add latency entries to the sketches.
+
+        :param recent:
+            The recent entries to add.  You can supply the list of
+            LatencyEntry instances or the LatencyFrame returned by
+            SpeedSentry.latency_list, or any iterable of entries such as the
+            generator returned by SpeedSentry.latency_stream.  Iterables may
+            mix LatencyEntry and AggregatedLatencyEntry instances.
+
+        :param aggregated:
+            The aggregated entries to add.  You can supply the list of
+            AggregatedLatencyEntry instances or the LatencyFrame returned by
+            SpeedSentry.latency_list.
+
+        :return:
+            Returns the number of entries added.
+
+        :type recent:     iterable or LatencyFrame
+        :type aggregated: iterable or LatencyFrame
+        :rtype:           int
+
+        """
+
+        self.reset_after_fork()
+
+        number_added = 0
+        by = self.__by
+        for entries in (recent, aggregated):
+            if isinstance(entries, latency_frame.LatencyFrame):
+                number_added += self.__update_frame(entries)
+            else:
+                with self.__lock:
+                    sketches = self.__sketches
+                    for entry in entries:
+                        key = tuple(entry[name] for name in by)
+                        sketch = sketches.get(key)
+                        if sketch is None:
+                            sketch = self.__new_sketch()
+                            sketches[key] = sketch
+
+                        sketch.add_entry(entry)
+                        number_added += 1
+
+        return number_added
+
+
+    def merge(self, other):
+        """
+        Method you can use to add the samples held by another sketch map to
+        this sketch map.
+
+        :param other:
+            The sketch map to merge.  The map must be grouped by the same
+            columns and use the same relative accuracy.
+
+        :type other: SketchMap
+
+        """
+
+        self.reset_after_fork()
+
+        if other.by != self.__by:
+            raise ValueError(
+                "can not merge sketch maps with different grouping columns"
+            )
+
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(
+                "can not merge sketches with different relative accuracies"
+            )
+
+        other_sketches = [ (key, other[key]) for key in other ]
+        with self.__lock:
+            sketches = self.__sketches
+            for key, sketch in other_sketches:
+                existing = sketches.get(key)
+                if existing is None:
+                    existing = self.__new_sketch()
+                    sketches[key] = existing
+
+                existing.merge(sketch)
+
+
+    def percentiles(
+            self,
+            percentiles : tuple = latency_analytics.DEFAULT_PERCENTILES
+        ) -> dict:
+        """
+        Method you can use to estimate percentiles for every key.
+
+        :param percentiles:
+            The percentiles, each from 0 to 100.
+
+        :return:
+            Returns a dictionary keyed by key tuple.  Each value is a tuple
+            holding the estimated value of each percentile, in seconds.
+
+        :type percentiles: tuple
+        :rtype:            dict
+
+        """
+
+        self.reset_after_fork()
+
+        with self.__lock:
+            return {
+                key : sketch.percentiles(percentiles)
+                for key, sketch in self.__sketches.items()
+            }
+
+
+    def clear(self):
+        """
+        Method you can use to discard every sketch.
+
+        """
+
+        self.reset_after_fork()
+
+        with self.__lock:
+            self.__sketches = dict()
+
+
+    def to_bytes(self) -> bytes:
+        """
+        Method you can use to serialize this sketch map.
+
+        :return:
+            Returns the serialized sketch map.
+
+        :rtype: bytes
+
+        """
+
+        self.reset_after_fork()
+
+        output = bytearray(SKETCH_MAP_MAGIC)
+        output.append(FORMAT_VERSION)
+        output.append(len(self.__by))
+        for name in self.__by:
+            output.append(latency_analytics.GROUP_COLUMNS.index(name))
+
+        self.__template.write(output)
+
+        with self.__lock:
+            write_varint(output, len(self.__sketches))
+            for key, sketch in self.__sketches.items():
+                for value in key:
+                    write_signed_varint(output, value)
+
+                sketch.write(output)
+
+        return bytes(output)
+
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Method you can use to restore a sketch map serialized by the
+        to_bytes method.
+
+        :param data:
+            The serialized sketch map.
+
+        :return:
+            Returns the sketch map.
+
+        :type data:  bytes
+        :rtype:      SketchMap
+
+        """
+
+        if len(data) < len(SKETCH_MAP_MAGIC) + 2 or \
+           data[:len(SKETCH_MAP_MAGIC)] != SKETCH_MAP_MAGIC:
+            raise ValueError("data is not a latency sketch map")
+
+        offset = len(SKETCH_MAP_MAGIC)
+        version = data[offset]
+        if version != FORMAT_VERSION:
+            raise ValueError(
+                "unsupported latency sketch map version %d"%version
+            )
+
+        number_columns = data[offset + 1]
+        offset += 2
+        try:
+            by = tuple(
+                latency_analytics.GROUP_COLUMNS[i]
+                for i in data[offset:offset + number_columns]
+            )
+        except IndexError:
+            raise ValueError("invalid latency sketch map grouping columns")
+
+        offset += number_columns
+        template, offset = LatencySketch.read(data, offset)
+        result = cls(by, template.relative_accuracy, template.maximum_bins)
+
+        number_sketches, offset = read_varint(data, offset)
+        sketches = dict()
+        for i in range(number_sketches):
+            key = list()
+            for name in by:
+                value, offset = read_signed_varint(data, offset)
+                key.append(value)
+
+            sketch, offset = LatencySketch.read(data, offset)
+            if sketch.relative_accuracy != template.relative_accuracy:
+                raise ValueError("inconsistent latency sketch map")
+
+            sketches[tuple(key)] = sketch
+
+        if offset != len(data):
+            raise ValueError("unexpected data after latency sketch map")
+
+        result.__sketches = sketches
+        return result
+
+
+    def reset_after_fork(self):
+        """
+        Method you can call in a forked child process to replace the lock
+        inherited from the parent process.  Sketches are kept.  The method
+        is called automatically when the map is used and does nothing if the
+        process has not forked.
+
+        """
+
+        if self.__fork_detector.forked():
+            self.__lock = threading.Lock()
+
+
+    def __new_sketch(self):
+        """
+        Method used internally to create an empty sketch.
+
+        :return:
+            Returns the new sketch.
+
+        :rtype: LatencySketch
+
+        """
+
+        return LatencySketch(
+            self.__template.relative_accuracy,
+            self.__template.maximum_bins
+        )
+
+
+    def __update_frame(self, frame) -> int:
+        """
+        Method used internally to add the rows of a frame.  Rows are grouped
+        using the frame's sort order, re-sorting the frame only if needed,
+        and each group is added with a single vectorized call.
+
+        :param frame:
+            The frame to add.
+
+        :return:
+            Returns the number of rows added.
+
+        :type frame: LatencyFrame
+        :rtype:      int
+
+        """
+
+        number_rows = len(frame)
+        if number_rows == 0:
+            return 0
+
+        frame = frame.order_by(*self.__by)
+        keys = [ frame.column(name) for name in self.__by ]
+
+        change = numpy.zeros(number_rows - 1, dtype = bool)
+        for key in keys:
+            change |= key[1:] != key[:-1]
+
+        starts = numpy.concatenate(([ 0 ], numpy.flatnonzero(change) + 1))
+        ends = numpy.concatenate((starts[1:], [ number_rows ]))
+        group_keys = list(zip(*(key[starts].tolist() for key in keys)))
+
+        average = frame.average
+        number_samples = frame.number_samples
+        minimum = numpy.minimum.reduceat(frame.minimum, starts).tolist()
+        maximum = numpy.maximum.reduceat(frame.maximum, starts).tolist()
+
+        with self.__lock:
+            sketches = self.__sketches
+            for i, key in enumerate(group_keys):
+                sketch = sketches.get(key)
+                if sketch is None:
+                    sketch = self.__new_sketch()
+                    sketches[key] = sketch
+
+                start = starts[i]
+                end = ends[i]
+                sketch.add_many(
+                    average[start:end],
+                    number_samples[start:end],
+                    minimum[i],
+                    maximum[i]
+                )
+
+        return number_rows
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
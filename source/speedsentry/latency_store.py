@@ -0,0 +1,648 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that keeps a local, persistent copy of latency entries so that
+repeated queries only download entries newer than those already held.
+
+Entries are held in a SQLite database keyed by monitor ID, region ID, and
+timestamp.  For each scope, either all monitors, a single monitor, or a single
+region, the store also records the range of timestamps that has been
+synchronized with the server.  Queries that fall within a synchronized range
+can be answered without a request.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import os
+import threading
+import sqlite3
+
+from . import fork_safety as fork_safety
+
+###############################################################################
+# Globals:
+#
+
+DEFAULT_FILENAME = "latency.sqlite3"
+"""
+The default name of the store database.
+
+"""
+
+RECENT_COLUMNS = (
+    'monitor_id',
+    'region_id',
+    'timestamp',
+    'latency'
+)
+"""
+The columns held for each recent latency entry.
+
+"""
+
+AGGREGATED_COLUMNS = (
+    'monitor_id',
+    'region_id',
+    'timestamp',
+    'latency',
+    'average',
+    'variance',
+    'minimum',
+    'maximum',
+    'start_timestamp',
+    'end_timestamp',
+    'number_samples'
+)
+"""
+The columns held for each aggregated latency entry.
+
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recent (
+    monitor_id INTEGER NOT NULL,
+    region_id INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    latency REAL NOT NULL,
+    PRIMARY KEY (timestamp, monitor_id, region_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS recent_monitor ON recent (monitor_id, timestamp);
+CREATE INDEX IF NOT EXISTS recent_region ON recent (region_id, timestamp);
+
+CREATE TABLE IF NOT EXISTS aggregated (
+    monitor_id INTEGER NOT NULL,
+    region_id INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    latency REAL NOT NULL,
+    average REAL NOT NULL,
+    variance REAL NOT NULL,
+    minimum REAL NOT NULL,
+    maximum REAL NOT NULL,
+    start_timestamp INTEGER NOT NULL,
+    end_timestamp INTEGER NOT NULL,
+    number_samples INTEGER NOT NULL,
+    PRIMARY KEY (timestamp, monitor_id, region_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS aggregated_monitor ON
+    aggregated (monitor_id, timestamp);
+CREATE INDEX IF NOT EXISTS aggregated_region ON
+    aggregated (region_id, timestamp);
+
+CREATE TABLE IF NOT EXISTS coverage (
+    scope TEXT PRIMARY KEY,
+    start_timestamp INTEGER,
+    end_timestamp INTEGER
+);
+"""
+"""
+The SQL used to create the store tables.
+
+"""
+
+ALL_SCOPE = "all"
+"""
+The scope covering every monitor and region.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def default_path() -> str:
+    """
+    Function you can use to obtain the default store database path.  The
+    database is placed under $XDG_CACHE_HOME/speedsentry, or
+    ~/.cache/speedsentry if XDG_CACHE_HOME is not set.
+
+    :return:
+        Returns the default store database path.
+
+    :rtype: str
+
+    """
+
+    cache_directory = os.environ.get('XDG_CACHE_HOME')
+    if not cache_directory:
+        cache_directory = os.path.join(os.path.expanduser("~"), ".cache")
+
+    return os.path.join(cache_directory, "speedsentry", DEFAULT_FILENAME)
+
+
+def scope(monitor_id : int = None, region_id : int = None) -> str:
+    """
+    Function you can use to obtain the name of the scope of a latency query.
+
+    :param monitor_id:
+        The monitor ID the query is limited to, if any.
+
+    :param region_id:
+        The region ID the query is limited to, if any.
+
+    :return:
+        Returns the scope name.
+
+    :type monitor_id: int or None
+    :type region_id:  int or None
+    :rtype:           str
+
+    """
+
+    if monitor_id is not None:
+        result = "monitor_id=%d"%int(monitor_id)
+    elif region_id is not None:
+        result = "region_id=%d"%int(region_id)
+    else:
+        result = ALL_SCOPE
+
+    return result
+
+###############################################################################
+# Class LatencyStore:
+#
+
+class LatencyStore(object):
+    """
+    Class that holds latency entries in a local SQLite database along with
+    the synchronized range for each query scope.  The class is thread safe.
+    A child process forked after the store is opened uses its own database
+    connection.
+
+    """
+
+    def __init__(self, path : str = None):
+        """
+        Method that initializes the LatencyStore class.
+
+        :param path:
+            The path of the store database.  If None, the path returned by
+            default_path is used.  The value ":memory:" creates a store that
+            is not persisted.
+
+        :type path: str or None
+
+        """
+
+        super().__init__()
+
+        self.__path = path if path is not None else default_path()
+        self.__lock = threading.Lock()
+        self.__fork_detector = fork_safety.ForkDetector()
+        self.__connection = self.__connect()
+
+
+    @property
+    def path(self):
+        """
+        Read-only property holding the path of the store database.
+
+        :type: str
+
+        """
+
+        return self.__path
+
+
+    def coverage(self, scope_name : str) -> tuple:
+        """
+        Method you can use to obtain the synchronized range for a scope.
+
+        :param scope_name:
+            The scope name, as returned by the scope function.
+
+        :return:
+            Returns a tuple holding the first and last synchronized
+            timestamps.  The first timestamp is None if the range starts with
+            the earliest available entry.  The value None is returned if the
+            scope has never been synchronized.
+
+        :type scope_name: str
+        :rtype:           tuple or None
+
+        """
+
+        self.reset_after_fork()
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT start_timestamp, end_timestamp FROM coverage "
+                "WHERE scope = ?",
+                (scope_name,)
+            ).fetchone()
+
+        return tuple(row) if row is not None else None
+
+
+    def covers(
+        self,
+        start_timestamp : int = None,
+        end_timestamp : int = None,
+        monitor_id : int = None,
+        region_id : int = None
+        ) -> bool:
+        """
+        Method you can use to determine if a query can be answered from the
+        store.  A query limited to a monitor or region can also be answered
+        from the range synchronized for all monitors.
+
+        :param start_timestamp:
+            The first timestamp of the query.  A value of None means no start
+            time.
+
+        :param end_timestamp:
+            The last timestamp of the query.  A value of None means no end
+            time and is never covered.
+
+        :param monitor_id:
+            The monitor ID the query is limited to, if any.
+
+        :param region_id:
+            The region ID the query is limited to, if any.
+
+        :return:
+            Returns True if the query lies within a synchronized range.
+
+        :type start_timestamp: int or None
+        :type end_timestamp:   int or None
+        :type monitor_id:      int or None
+        :type region_id:       int or None
+        :rtype:                bool
+
+        """
+
+        result = False
+        if end_timestamp is not None:
+            scopes = { scope(monitor_id, region_id), ALL_SCOPE }
+            for scope_name in scopes:
+                synchronized = self.coverage(scope_name)
+                if synchronized is not None:
+                    first, last = synchronized
+                    starts_within = first is None or (
+                            start_timestamp is not None
+                        and start_timestamp >= first
+                    )
+
+                    if starts_within                and \
+                       last is not None             and \
+                       end_timestamp <= last            :
+                        result = True
+
+        return result
+
+
+    def update(
+        self,
+        scope_name : str,
+        start_timestamp : int,
+        recent : list,
+        aggregated : list
+        ) -> int:
+        """
+        Method you can use to add entries received for a scope and extend the
+        scope's synchronized range.  Entries already held are kept.  The
+        request must start at or before the end of the scope's existing
+        synchronized range so the range has no gaps.
+
+        :param scope_name:
+            The scope name, as returned by the scope function.
+
+        :param start_timestamp:
+            The start timestamp of the request that returned the entries.  A
+            value of None means the request had no start time.
+
+        :param recent:
+            The recent latency entries, as dictionaries.
+
+        :param aggregated:
+            The aggregated latency entries, as dictionaries.
+
+        :return:
+            Returns the number of entries that were not already held.
+
+        :type scope_name:      str
+        :type start_timestamp: int or None
+        :type recent:          list
+        :type aggregated:      list
+        :rtype:                int
+
+        """
+
+        last = None
+        for entries in (recent, aggregated):
+            for entry in entries:
+                timestamp = entry['timestamp']
+                if last is None or timestamp > last:
+                    last = timestamp
+
+        self.reset_after_fork()
+        with self.__lock:
+            connection = self.__connection
+            with connection:
+                added = self.__insert(
+                    connection,
+                    "recent",
+                    RECENT_COLUMNS,
+                    recent
+                )
+                added += self.__insert(
+                    connection,
+                    "aggregated",
+                    AGGREGATED_COLUMNS,
+                    aggregated
+                )
+
+                row = connection.execute(
+                    "SELECT start_timestamp, end_timestamp FROM coverage "
+                    "WHERE scope = ?",
+                    (scope_name,)
+                ).fetchone()
+
+                if row is None:
+                    first = start_timestamp
+                else:
+                    first, previous_last = row
+                    if first is not None:
+                        if start_timestamp is None:
+                            first = None
+                        else:
+                            first = min(first, start_timestamp)
+
+                    if previous_last is not None and \
+                       (last is None or previous_last > last):
+                        last = previous_last
+
+                connection.execute(
+                    "INSERT OR REPLACE INTO coverage "
+                    "(scope, start_timestamp, end_timestamp) VALUES (?, ?, ?)",
+                    (scope_name, first, last)
+                )
+
+        return added
+
+
+    def query(
+        self,
+        start_timestamp : int = None,
+        end_timestamp : int = None,
+        monitor_id : int = None,
+        region_id : int = None
+        ) -> tuple:
+        """
+        Method you can use to obtain held entries.
+
+        :param start_timestamp:
+            An optional first timestamp.  A value of None means no start time.
+
+        :param end_timestamp:
+            An optional last timestamp.  A value of None means no end time.
+
+        :param monitor_id:
+            An optional monitor ID to limit the entries to.
+
+        :param region_id:
+            An optional region ID to limit the entries to.
+
+        :return:
+            Returns a tuple holding a list of recent entries followed by a list
+            of aggregated entries.  Entries are dictionaries, ordered by
+            timestamp.
+
+        :type start_timestamp: int or None
+        :type end_timestamp:   int or None
+        :type monitor_id:      int or None
+        :type region_id:       int or None
+        :rtype:                tuple
+
+        """
+
+        recent, aggregated = self.query_rows(
+            start_timestamp,
+            end_timestamp,
+            monitor_id,
+            region_id
+        )
+
+        return (
+            [ dict(zip(RECENT_COLUMNS, row)) for row in recent ],
+            [ dict(zip(AGGREGATED_COLUMNS, row)) for row in aggregated ]
+        )
+
+
+    def query_rows(
+        self,
+        start_timestamp : int = None,
+        end_timestamp : int = None,
+        monitor_id : int = None,
+        region_id : int = None
+        ) -> tuple:
+        """
+        Method you can use to obtain held entries as rows of values.  This
+        avoids the cost of building a dictionary for each entry.
+
+        :param start_timestamp:
+            An optional first timestamp.  A value of None means no start time.
+
+        :param end_timestamp:
+            An optional last timestamp.  A value of None means no end time.
+
+        :param monitor_id:
+            An optional monitor ID to limit the entries to.
+
+        :param region_id:
+            An optional region ID to limit the entries to.
+
+        :return:
+            Returns a tuple holding a list of recent rows followed by a list
+            of aggregated rows.  Each row is a tuple of values in the order
+            given by RECENT_COLUMNS or AGGREGATED_COLUMNS.  Rows are ordered
+            by timestamp.
+
+        :type start_timestamp: int or None
+        :type end_timestamp:   int or None
+        :type monitor_id:      int or None
+        :type region_id:       int or None
+        :rtype:                tuple
+
+        """
+
+        conditions = list()
+        parameters = list()
+        for column, operator, value in (
+                ('timestamp', '>=', start_timestamp),
+                ('timestamp', '<=', end_timestamp),
+                ('monitor_id', '=', monitor_id),
+                ('region_id', '=', region_id)
+            ):
+            if value is not None:
+                conditions.append("%s %s ?"%(column, operator))
+                parameters.append(value)
+
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+
+        result = list()
+        self.reset_after_fork()
+        with self.__lock:
+            for table, columns in (
+                    ("recent", RECENT_COLUMNS),
+                    ("aggregated", AGGREGATED_COLUMNS)
+                ):
+                cursor = self.__connection.execute(
+                    "SELECT %s FROM %s%s ORDER BY timestamp, monitor_id, "
+                    "region_id"%(", ".join(columns), table, where),
+                    parameters
+                )
+                result.append(cursor.fetchall())
+
+        return tuple(result)
+
+
+    def clear(self):
+        """
+        Method you can use to discard all held entries and synchronized
+        ranges.
+
+        """
+
+        self.reset_after_fork()
+        with self.__lock:
+            connection = self.__connection
+            with connection:
+                connection.execute("DELETE FROM recent")
+                connection.execute("DELETE FROM aggregated")
+                connection.execute("DELETE FROM coverage")
+
+
+    def close(self):
+        """
+        Method you can use to close the store database.
+
+        """
+
+        self.reset_after_fork()
+        with self.__lock:
+            self.__connection.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+
+    def reset_after_fork(self):
+        """
+        Method you can call in a forked child process to open a database
+        connection for the child rather than using the connection inherited
+        from the parent process.  The method is called automatically when the
+        store is used and does nothing if the process has not forked.
+
+        """
+
+        if self.__fork_detector.forked():
+            self.__lock = threading.Lock()
+            self.__connection = self.__connect()
+
+
+    def __connect(self) -> sqlite3.Connection:
+        """
+        Method used internally to open the store database, creating it if
+        needed.
+
+        :return:
+            Returns the database connection.
+
+        :rtype: sqlite3.Connection
+
+        """
+
+        if self.__path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(self.__path))
+            os.makedirs(directory, exist_ok = True)
+
+        connection = sqlite3.connect(
+            self.__path,
+            check_same_thread = False
+        )
+        connection.executescript(SCHEMA)
+
+        return connection
+
+
+    @staticmethod
+    def __insert(
+        connection : sqlite3.Connection,
+        table : str,
+        columns : tuple,
+        entries : list
+        ) -> int:
+        """
+        Method used internally to insert entries into a table.
+
+        :param connection:
+            The database connection.
+
+        :param table:
+            The table name.
+
+        :param columns:
+            The table columns.
+
+        :param entries:
+            The entries, as dictionaries.
+
+        :return:
+            Returns the number of entries that were not already held.
+
+        :type connection: sqlite3.Connection
+        :type table:      str
+        :type columns:    tuple
+        :type entries:    list
+        :rtype:           int
+
+        """
+
+        before = connection.total_changes
+        connection.executemany(
+            "INSERT OR IGNORE INTO %s (%s) VALUES (%s)"%(
+                table,
+                ", ".join(columns),
+                ", ".join("?" * len(columns))
+            ),
+            ( tuple(entry[column] for column in columns) for entry in entries )
+        )
+
+        return connection.total_changes - before
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
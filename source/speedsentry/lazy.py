@@ -0,0 +1,243 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that provides sequence and mapping types that hold raw decoded
+JSON data and only convert elements into payload class instances when they
+are accessed.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import collections.abc
+
+###############################################################################
+# Class LazyList:
+#
+
+class LazyList(collections.abc.Sequence):
+    """
+    Class that presents a list of raw values as a read-only sequence of
+    converted values.  Each value is converted the first time it is accessed
+    and the result is retained so later accesses return the same instance.
+
+    Length, slicing, and iteration do not convert values that are not
+    accessed.  Slices share the raw data with this sequence but convert
+    their elements independently.
+
+    """
+
+    def __init__(self, raw_items : list, factory, materialized : list = None):
+        """
+        Method that initializes the LazyList class.
+
+        :param raw_items:
+            The raw values.
+
+        :param factory:
+            A callable used to convert a single raw value.
+
+        :param materialized:
+            An optional list, the same length as raw_items, holding already
+            converted values or None for values not yet converted.
+
+        :type raw_items:    list
+        :type factory:      callable
+        :type materialized: list or None
+
+        """
+
+        super().__init__()
+
+        self.__raw_items = raw_items
+        self.__factory = factory
+        self.__materialized = materialized
+
+
+    @property
+    def raw(self):
+        """
+        Read-only property holding the unconverted values.
+
+        :type: list
+
+        """
+
+        return self.__raw_items
+
+
+    def __len__(self):
+        return len(self.__raw_items)
+
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if self.__materialized is not None:
+                materialized = self.__materialized[index]
+            else:
+                materialized = None
+
+            result = LazyList(
+                self.__raw_items[index],
+                self.__factory,
+                materialized
+            )
+        else:
+            materialized = self.__materialized
+            if materialized is None:
+                materialized = [ None ] * len(self.__raw_items)
+                self.__materialized = materialized
+
+            result = materialized[index]
+            if result is None:
+                result = self.__factory(self.__raw_items[index])
+                materialized[index] = result
+
+        return result
+
+
+    def __iter__(self):
+        for index in range(len(self.__raw_items)):
+            yield self[index]
+
+
+    def __eq__(self, other):
+        if isinstance(other, collections.abc.Sequence) and \
+           not isinstance(other, (str, bytes, bytearray)):
+            result = (
+                    len(self) == len(other)
+                and all(a == b for a, b in zip(self, other))
+            )
+        else:
+            result = NotImplemented
+
+        return result
+
+
+    __hash__ = None
+
+
+    def __repr__(self):
+        return "LazyList(%d items)"%len(self.__raw_items)
+
+###############################################################################
+# Class LazyDict:
+#
+
+class LazyDict(collections.abc.Mapping):
+    """
+    Class that presents a dictionary of raw values as a read-only mapping of
+    converted values.  Each value is converted the first time it is accessed
+    and the result is retained so later accesses return the same instance.
+
+    """
+
+    def __init__(self, raw_mapping : dict, factory, key_function = None):
+        """
+        Method that initializes the LazyDict class.
+
+        :param raw_mapping:
+            The raw values, keyed by raw key.
+
+        :param factory:
+            A callable used to convert a single raw value.
+
+        :param key_function:
+            An optional callable used to convert raw keys.  Keys are converted
+            up front.
+
+        :type raw_mapping:  dict
+        :type factory:      callable
+        :type key_function: callable or None
+
+        """
+
+        super().__init__()
+
+        self.__raw_mapping = raw_mapping
+        self.__factory = factory
+        self.__materialized = dict()
+
+        if key_function is not None:
+            self.__raw_keys = { key_function(k) : k for k in raw_mapping }
+        else:
+            self.__raw_keys = None
+
+
+    @property
+    def raw(self):
+        """
+        Read-only property holding the unconverted values keyed by raw key.
+
+        :type: dict
+
+        """
+
+        return self.__raw_mapping
+
+
+    def __len__(self):
+        return len(self.__raw_mapping)
+
+
+    def __iter__(self):
+        if self.__raw_keys is not None:
+            return iter(self.__raw_keys)
+        else:
+            return iter(self.__raw_mapping)
+
+
+    def __contains__(self, key):
+        if self.__raw_keys is not None:
+            return key in self.__raw_keys
+        else:
+            return key in self.__raw_mapping
+
+
+    def __getitem__(self, key):
+        try:
+            result = self.__materialized[key]
+        except KeyError:
+            if self.__raw_keys is not None:
+                raw_key = self.__raw_keys[key]
+            else:
+                raw_key = key
+
+            result = self.__factory(self.__raw_mapping[raw_key])
+            self.__materialized[key] = result
+
+        return result
+
+
+    def __repr__(self):
+        return "LazyDict(%d items)"%len(self.__raw_mapping)
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
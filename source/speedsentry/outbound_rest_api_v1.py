@@ -34,12 +34,21 @@ from typing import Union
 import time
 import struct
 import hashlib
-import hmac
 import json
 import base64
-import requests
+import threading
+import functools
+import concurrent.futures
 
 from .exceptions import CommunicationErrorException
+from .exceptions import TimeoutException
+from .exceptions import DeadlineExceededException
+from .exceptions import CircuitOpenException
+from . import dictionary_object as dictionary_object
+from . import transport as transport
+from . import codec as codec_module
+from . import policy as policy
+from . import fork_safety as fork_safety
 
 ###############################################################################
 # Globals:
@@ -70,203 +79,1994 @@ also minimizing computation time for the selected hash algorithm.
 
 """
 
+DEFAULT_TIME_DELTA_REFRESH_INTERVAL = 900
+"""
+The default interval, in seconds, after which the time delta is proactively
+refreshed.
+
+"""
+
+DEFAULT_WINDOW_GUARD = 0.5
+"""
+The default guard period, in seconds, before a signing window boundary.
+Requests expected to reach the server within this period of a boundary are
+held until the boundary has passed.
+
+"""
+
+DEFAULT_CHUNK_SIZE = 65536
+"""
+The default size, in bytes, of the chunks read from streamed responses.
+
+"""
+
+ServerStatistics = dictionary_object.build_read_only_class(
+    "ServerStatistics",
+    "You can use this class to hold statistics on a server's request and "
+    "clock skew handling.",
+    {
+        "requests" :
+            "The number of signed requests sent, including retries.",
+        "authentication_retries" :
+            "The number of requests that were rejected with a 401 status and "
+            "retried after refreshing the time delta.",
+        "time_delta_refreshes" :
+            "The total number of requests made to the time delta endpoint.",
+        "proactive_refreshes" :
+            "The number of time delta refreshes performed before the time "
+            "delta was known to be stale.",
+        "boundary_deferrals" :
+            "The number of requests held briefly so that they would reach the "
+            "server after, rather than across, a signing window boundary.",
+        "retries_avoided" :
+            "An estimate of the number of 401 retries avoided.  The value "
+            "counts boundary deferrals plus requests whose signing window "
+            "differed from the window the stale time delta would have "
+            "produced.",
+        "time_delta" :
+            "The current estimated offset between the server clock and the "
+            "local clock, in seconds.",
+        "round_trip_time" :
+            "The smoothed round trip time to the server, in seconds."
+    }
+)
+"""
+Class holding server statistics.  See ClockSkewTracker.statistics.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def fix_slug(slug : str) -> str:
+    """
+    Function used to fix a provided slug, removing leading and trailing
+    slashes.
+
+    :param slug:
+        The slug to be cleaned.
+
+    :return:
+        Returns the cleaned slug.
+
+    :type slug: str
+    :rtype:     str
+
+    """
+
+    if slug.startswith('/'):
+        slug = slug[1:]
+
+    if slug.endswith('/'):
+        slug = slug[:-1]
+
+    return slug
+
+
+def fix_authority(authority : str) -> str:
+    """
+    Function used to fix a provided authority, removing trailing slashes.
+
+    :param authority:
+        The authority to be fixed.
+
+    :return:
+        Returns the cleaned authority.
+
+    :type authority: str
+    :rtype:          str
+
+    """
+
+    if authority.endswith('/'):
+        authority = authority[:-1]
+
+    return authority
+
+
+def build_headers(user_agent : str, payload : str) -> dict:
+    """
+    Function used to build the HTTP headers sent with a request.
+
+    :param user_agent:
+        The user agent string to report.
+
+    :param payload:
+        The payload being sent.
+
+    :return:
+        Returns a dictionary of headers.
+
+    :type user_agent: str
+    :type payload:    str
+    :rtype:           dict
+
+    """
+
+    return {
+        'User-Agent' : user_agent,
+        'Content-Type' : 'application/json',
+        'Content-Length' : str(len(payload))
+    }
+
+
+def build_time_delta_payload() -> str:
+    """
+    Function used to build the payload sent to the time delta endpoint.
+
+    :return:
+        Returns the JSON encoded payload.
+
+    :rtype: str
+
+    """
+
+    return json.dumps({ 'timestamp' : int(time.time()) })
+
+
+def decode_time_delta_response(
+    status_code : int,
+    text,
+    codec : codec_module.JsonCodec = None
+    ) -> int:
+    """
+    Function used to decode a response from the time delta endpoint.  An
+    exception is raised if the response is invalid.
+
+    :param status_code:
+        The received HTTP status code.
+
+    :param text:
+        The received response body.
+
+    :param codec:
+        The JSON codec used to decode the response.  If None, the standard
+        library is used.
+
+    :return:
+        Returns the measured time delta, in seconds.
+
+    :type status_code: int
+    :type text:        str or bytes
+    :type codec:       codec.JsonCodec or None
+    :rtype:            int
+
+    """
+
+    if status_code == 200:
+        try:
+            if codec is not None:
+                json_result = codec.loads(text)
+            else:
+                json_result = json.loads(text)
+        except:
+            raise CommunicationErrorException(
+                status_message = "/td : not JSON response"
+            )
+
+        if 'status' in json_result:
+            if len(json_result) == 2         and \
+               'status' in json_result       and \
+               'time_delta' in json_result   and \
+               json_result['status'] == 'OK'     :
+                try:
+                    result = int(json_result['time_delta'])
+                except:
+                    raise CommunicationErrorException(
+                        status_message = "/td : invalid returned value"
+                    )
+            else:
+                raise CommunicationErrorException(
+                    status_message = json_result['status']
+                )
+        else:
+            raise CommunicationErrorException(
+                status_message = "/td : unexpected response"
+            )
+    else:
+        raise CommunicationErrorException(status_code = status_code)
+
+    return result
+
+
+def decode_message_response(
+    slug : str,
+    status_code : int,
+    text,
+    codec : codec_module.JsonCodec = None
+    ): # -> Union[dict, NoneType]
+    """
+    Function used to decode a JSON response to a signed message.
+
+    :param slug:
+        The slug the message was sent to.
+
+    :param status_code:
+        The received HTTP status code.
+
+    :param text:
+        The received response body.
+
+    :param codec:
+        The JSON codec used to decode the response.  If None, the standard
+        library is used.
+
+    :return:
+        Returns a dictionary with the response or None if the provided hash
+        was invalid.
+
+    :type slug:        str
+    :type status_code: int
+    :type text:        str or bytes
+    :type codec:       codec.JsonCodec or None
+    :rtype:            dict or None
+
+    """
+
+    if status_code == 200:
+        try:
+            if codec is not None:
+                result = codec.loads(text)
+            else:
+                result = json.loads(text)
+        except:
+            raise CommunicationErrorException(
+                status_message = "%s : not JSON response"%slug
+            )
+    elif status_code == 401:
+        result = None
+    else:
+        raise CommunicationErrorException(status_code = status_code)
+
+    return result
+
+
+def decode_binary_response(status_code : int, content : bytes):
+    # -> Union[bytes, NoneType]
+    """
+    Function used to decode a binary response to a signed message.
+
+    :param status_code:
+        The received HTTP status code.
+
+    :param content:
+        The received response body.
+
+    :return:
+        Returns the response body or None if the provided hash was invalid.
+
+    :type status_code: int
+    :type content:     bytes
+    :rtype:            bytes or None
+
+    """
+
+    if status_code == 200:
+        result = content
+    elif status_code == 401:
+        result = None
+    else:
+        raise CommunicationErrorException(status_code = status_code)
+
+    return result
+
+
+def check_streamed_response(status_code : int) -> bool:
+    """
+    Function used to check the status of a streamed response before the
+    response body is read.
+
+    :param status_code:
+        The received HTTP status code.
+
+    :return:
+        Returns True if the response body can be read.  Returns False if the
+        provided hash was invalid.
+
+    :type status_code: int
+    :rtype:            bool
+
+    """
+
+    if status_code == 200:
+        result = True
+    elif status_code == 401:
+        result = False
+    else:
+        raise CommunicationErrorException(status_code = status_code)
+
+    return result
+
+
+def restore_time_delta(
+    clock,
+    time_delta_store,
+    authority : str,
+    customer_identifier : str
+    ):
+    """
+    Function used to seed a clock skew tracker from a time delta store.
+
+    :param clock:
+        The tracker to be seeded.
+
+    :param time_delta_store:
+        The store to read from.  If None, this function does nothing.
+
+    :param authority:
+        The server authority.
+
+    :param customer_identifier:
+        The customer identifier.
+
+    :type clock:               ClockSkewTracker
+    :type time_delta_store:    time_delta_store.TimeDeltaStore or None
+    :type authority:           str
+    :type customer_identifier: str
+
+    """
+
+    if time_delta_store is not None:
+        entry = time_delta_store.load(authority, customer_identifier)
+        if entry is not None:
+            time_delta, round_trip_time, age = entry
+            clock.restore(time_delta, round_trip_time, age)
+
+
+def save_time_delta(
+    clock,
+    time_delta_store,
+    authority : str,
+    customer_identifier : str
+    ):
+    """
+    Function used to save the time delta held by a clock skew tracker.
+
+    :param clock:
+        The tracker holding the time delta.
+
+    :param time_delta_store:
+        The store to write to.  If None, this function does nothing.
+
+    :param authority:
+        The server authority.
+
+    :param customer_identifier:
+        The customer identifier.
+
+    :type clock:               ClockSkewTracker
+    :type time_delta_store:    time_delta_store.TimeDeltaStore or None
+    :type authority:           str
+    :type customer_identifier: str
+
+    """
+
+    if time_delta_store is not None:
+        time_delta_store.save(
+            authority,
+            customer_identifier,
+            clock.time_delta,
+            clock.round_trip_time
+        )
+
+###############################################################################
+# Class MessageSigner:
+#
+
+class MessageSigner(object):
+    """
+    Class that builds signed message payloads.  The keyed inner and outer HMAC
+    hash states for the current 30 second window are computed once and cached
+    so that signing a message only requires copying those states and hashing
+    the message.
+
+    """
+
+    WINDOW_DURATION = 30
+    """
+    The duration of a signing window, in seconds.
+
+    """
+
+    def __init__(self, customer_identifier : str, customer_secret : bytes):
+        """
+        Method that initializes the MessageSigner class.
+
+        :param customer_identifier:
+            The customer identifier to place in each payload.
+
+        :param customer_secret:
+            The customer secret used to sign messages.
+
+        :type customer_identifier: str
+        :type customer_secret:     bytes
+
+        """
+
+        super().__init__()
+
+        self.__customer_identifier = customer_identifier
+        self.__customer_secret = bytes(customer_secret)
+        self.__keyed_state = (None, None, None)
+
+        # The envelope holds only the customer identifier and two base-64
+        # strings so we build it from a template.  The result is identical to
+        # json.dumps applied to the equivalent dictionary.
+
+        self.__envelope_prefix = '{"cid": %s, "data": "'%json.dumps(
+            customer_identifier
+        )
+
+
+    @staticmethod
+    def window(time_delta : int) -> int:
+        """
+        Method you can use to determine the current signing window.
+
+        :param time_delta:
+            The time delta between this machine and the server, in seconds.
+            The value may include a fractional component.
+
+        :return:
+            Returns the signing window index.
+
+        :type time_delta: int or float
+        :rtype:           int
+
+        """
+
+        return int((time.time() + time_delta) / MessageSigner.WINDOW_DURATION)
+
+
+    def sign(self, raw_message : bytes, window : int) -> bytes:
+        """
+        Method you can use to calculate the HMAC of a message for a given
+        signing window.
+
+        :param raw_message:
+            The raw message to be signed.
+
+        :param window:
+            The signing window index.
+
+        :return:
+            Returns the raw message digest.
+
+        :type raw_message: bytes
+        :type window:      int
+        :rtype:            bytes
+
+        """
+
+        cached_window, inner_state, outer_state = self.__keyed_state
+        if cached_window != window:
+            key = self.__customer_secret + struct.pack('<Q', window)
+            inner_state, outer_state = self.__keyed_states(key)
+            self.__keyed_state = (window, inner_state, outer_state)
+
+        inner = inner_state.copy()
+        inner.update(raw_message)
+
+        outer = outer_state.copy()
+        outer.update(inner.digest())
+
+        return outer.digest()
+
+
+    def build_payload(self, message, time_delta : int) -> str:
+        """
+        Method you can use to build a signed message payload.
+
+        :param message:
+            The message to be sent.
+
+        :param time_delta:
+            The time delta between this machine and the server, in seconds.
+            The value may include a fractional component.
+
+        :return:
+            Returns the JSON encoded, signed payload.
+
+        :type message:    dict or list
+        :type time_delta: int or float
+        :rtype:           str
+
+        """
+
+        raw_message = codec_module.encode_signed_message(message)
+        raw_hash = self.sign(raw_message, self.window(time_delta))
+
+        return "".join(
+            (
+                self.__envelope_prefix,
+                base64.b64encode(raw_message).decode('ascii'),
+                '", "hash": "',
+                base64.b64encode(raw_hash).decode('ascii'),
+                '"}'
+            )
+        )
+
+
+    def __keyed_states(self, key : bytes) -> tuple:
+        """
+        Method used internally to calculate the inner and outer hash states of
+        an HMAC for a given key, per RFC 2104.
+
+        :param key:
+            The HMAC key.
+
+        :return:
+            Returns a tuple holding the inner and outer hash states.
+
+        :type key: bytes
+        :rtype:    tuple
+
+        """
+
+        block_size = HASH_ALGORITHM().block_size
+        if len(key) > block_size:
+            key = HASH_ALGORITHM(key).digest()
+
+        key = key.ljust(block_size, b'\0')
+
+        inner_state = HASH_ALGORITHM(bytes(b ^ 0x36 for b in key))
+        outer_state = HASH_ALGORITHM(bytes(b ^ 0x5C for b in key))
+
+        return (inner_state, outer_state)
+
+###############################################################################
+# Class ClockSkewTracker:
+#
+
+class ClockSkewTracker(object):
+    """
+    Class that tracks the clock offset between this machine and a server.
+
+    The time delta endpoint reports the difference between the server clock
+    when the request arrived and the local timestamp placed in the request.
+    That value includes the one-way network latency.  This class removes half
+    of the measured round trip time to estimate the true offset and then adds
+    back the smoothed one-way latency when predicting when a new request will
+    reach the server.
+
+    The class performs no I/O.  Callers ask whether a refresh is due, how long
+    to wait before signing, and what time delta to sign with, and report
+    measurements back.  The class is thread safe.  Call reset_after_fork in a
+    forked child process before using an instance created by the parent.
+
+    """
+
+    SMOOTHING_FACTOR = 0.125
+    """
+    The weight applied to new round trip time samples.
+
+    """
+
+    def __init__(
+        self,
+        refresh_interval : float = DEFAULT_TIME_DELTA_REFRESH_INTERVAL,
+        window_guard : float = DEFAULT_WINDOW_GUARD
+        ):
+        """
+        Method that initializes the ClockSkewTracker class.
+
+        :param refresh_interval:
+            The interval, in seconds, after which the time delta should be
+            refreshed proactively.  A value of None disables proactive
+            refresh.
+
+        :param window_guard:
+            The guard period, in seconds, before a signing window boundary.
+            A value of 0 disables deferral.
+
+        :type refresh_interval: float or None
+        :type window_guard:     float
+
+        """
+
+        super().__init__()
+
+        self.__refresh_interval = refresh_interval
+        self.__window_guard = window_guard
+
+        self.__offset = 0
+        self.__previous_offset = None
+        self.__round_trip_time = None
+        self.__last_refresh = time.monotonic()
+
+        self.__requests = 0
+        self.__authentication_retries = 0
+        self.__time_delta_refreshes = 0
+        self.__proactive_refreshes = 0
+        self.__boundary_deferrals = 0
+        self.__corrected_windows = 0
+
+        self.__lock = threading.RLock()
+        self.__fork_detector = fork_safety.ForkDetector()
+
+
+    @property
+    def time_delta(self):
+        """
+        Read-only property holding the estimated offset between the server
+        clock and the local clock, in seconds.
+
+        :type: float
+
+        """
+
+        return self.__offset
+
+
+    @property
+    def round_trip_time(self):
+        """
+        Read-only property holding the smoothed round trip time, in seconds.
+        The value is None until a round trip has been measured.
+
+        :type: float or None
+
+        """
+
+        return self.__round_trip_time
+
+
+    @property
+    def statistics(self):
+        """
+        Read-only property holding a snapshot of the tracked statistics.
+
+        :type: ServerStatistics
+
+        """
+
+        with self.__lock:
+            return ServerStatistics(
+                {
+                    'requests' : self.__requests,
+                    'authentication_retries' : self.__authentication_retries,
+                    'time_delta_refreshes' : self.__time_delta_refreshes,
+                    'proactive_refreshes' : self.__proactive_refreshes,
+                    'boundary_deferrals' : self.__boundary_deferrals,
+                    'retries_avoided' : (
+                          self.__boundary_deferrals
+                        + self.__corrected_windows
+                    ),
+                    'time_delta' : self.__offset,
+                    'round_trip_time' : self.__round_trip_time
+                }
+            )
+
+
+    def refresh_due(self) -> bool:
+        """
+        Method you can use to determine if a proactive refresh of the time
+        delta is due.
+
+        :return:
+            Returns True if the time delta should be refreshed.
+
+        :rtype: bool
+
+        """
+
+        return (
+                self.__refresh_interval is not None
+            and   time.monotonic() - self.__last_refresh \
+                > self.__refresh_interval
+        )
+
+
+    def signing_delay(self) -> float:
+        """
+        Method you can use to determine how long to wait before signing a
+        request.  A non-zero value is returned when the request is expected to
+        reach the server just before a signing window boundary.
+
+        :return:
+            Returns the delay, in seconds.
+
+        :rtype: float
+
+        """
+
+        delay = 0
+        if self.__window_guard > 0:
+            arrival = time.time() + self.signing_time_delta()
+            remaining = (
+                  MessageSigner.WINDOW_DURATION
+                - arrival % MessageSigner.WINDOW_DURATION
+            )
+
+            if remaining < self.__window_guard:
+                delay = remaining
+                with self.__lock:
+                    self.__boundary_deferrals += 1
+
+        return delay
+
+
+    def signing_time_delta(self) -> float:
+        """
+        Method you can use to obtain the time delta to sign a request with.
+        The value includes the estimated one-way latency so that the signing
+        window matches the server clock when the request arrives.
+
+        :return:
+            Returns the time delta, in seconds.
+
+        :rtype: float
+
+        """
+
+        with self.__lock:
+            if self.__round_trip_time is not None:
+                result = self.__offset + self.__round_trip_time / 2.0
+            else:
+                result = self.__offset
+
+        return result
+
+
+    def record_request(self, time_delta : float):
+        """
+        Method you can use to record that a signed request was sent.
+
+        :param time_delta:
+            The time delta used to sign the request.
+
+        :type time_delta: float
+
+        """
+
+        with self.__lock:
+            self.__requests += 1
+            if self.__previous_offset is not None:
+                previous = time_delta - self.__offset + self.__previous_offset
+                if MessageSigner.window(previous) != \
+                   MessageSigner.window(time_delta):
+                    self.__corrected_windows += 1
+
+
+    def record_round_trip(self, round_trip_time : float):
+        """
+        Method you can use to report a measured round trip time.
+
+        :param round_trip_time:
+            The measured round trip time, in seconds.
+
+        :type round_trip_time: float
+
+        """
+
+        with self.__lock:
+            if self.__round_trip_time is None:
+                self.__round_trip_time = round_trip_time
+            else:
+                self.__round_trip_time += (
+                      ClockSkewTracker.SMOOTHING_FACTOR
+                    * (round_trip_time - self.__round_trip_time)
+                )
+
+
+    def record_authentication_failure(self):
+        """
+        Method you can use to report that a request was rejected because the
+        time delta was stale.
+
+        """
+
+        with self.__lock:
+            self.__authentication_retries += 1
+
+
+    def record_time_delta(
+        self,
+        time_delta : int,
+        round_trip_time : float,
+        proactive : bool
+        ):
+        """
+        Method you can use to report a response from the time delta endpoint.
+
+        :param time_delta:
+            The time delta reported by the server.
+
+        :param round_trip_time:
+            The measured round trip time of the time delta request, in
+            seconds.
+
+        :param proactive:
+            If True, the refresh was performed before the time delta was known
+            to be stale.
+
+        :type time_delta:      int
+        :type round_trip_time: float
+        :type proactive:       bool
+
+        """
+
+        with self.__lock:
+            self.record_round_trip(round_trip_time)
+
+            new_offset = time_delta - round_trip_time / 2.0
+            if proactive:
+                self.__previous_offset = self.__offset
+                self.__proactive_refreshes += 1
+            else:
+                self.__previous_offset = None
+
+            self.__offset = new_offset
+            self.__last_refresh = time.monotonic()
+            self.__time_delta_refreshes += 1
+
+
+    def restore(
+        self,
+        time_delta : float,
+        round_trip_time : float,
+        age : float
+        ):
+        """
+        Method you can use to seed this tracker with a previously measured
+        time delta.
+
+        :param time_delta:
+            The previously estimated offset, in seconds.
+
+        :param round_trip_time:
+            The previously measured round trip time, in seconds.
+
+        :param age:
+            The age of the measurement, in seconds.  The next proactive refresh
+            is scheduled relative to when the measurement was taken.
+
+        :type time_delta:      float
+        :type round_trip_time: float or None
+        :type age:             float
+
+        """
+
+        with self.__lock:
+            self.__offset = time_delta
+            self.__previous_offset = None
+            self.__round_trip_time = round_trip_time
+            self.__last_refresh = time.monotonic() - age
+
+
+    def record_refresh_attempt(self):
+        """
+        Method you can use to report a failed proactive refresh.  The next
+        proactive refresh will be deferred by a full refresh interval.
+
+        """
+
+        self.__last_refresh = time.monotonic()
+
+
+    def reset_after_fork(self):
+        """
+        Method you can call in a forked child process to replace the lock
+        inherited from the parent process.  The measured time delta and round
+        trip time are kept.  The method does nothing if the process has not
+        forked.
+
+        """
+
+        if self.__fork_detector.forked():
+            self.__lock = threading.RLock()
+
 ###############################################################################
 # Class Server:
 #
 
-class Server(object):
-    """
-    Class that tracks information about a remote server.
+class Server(object):
+    """
+    Class that tracks information about a remote server.  Instances can be
+    shared across threads.  When the time delta must be refreshed, one
+    thread queries the server while the other threads wait for the result.
+
+    Instances can also be inherited by processes forked from the process that
+    created them.  On first use in the child, pooled connections, locks, and
+    worker threads are replaced.  The measured time delta is kept.
+
+    """
+
+    class _HedgedCall(object):
+        """
+        Class used internally to track the requests sent for a single hedged
+        call.
+
+        """
+
+        __slots__ = (
+            'lock',
+            'done',
+            'outstanding',
+            'answered',
+            'duplicate',
+            'response',
+            'error'
+        )
+
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.done = threading.Event()
+            self.outstanding = 1
+            self.answered = False
+            self.duplicate = False
+            self.response = None
+            self.error = None
+
+
+    def __init__(
+        self,
+        customer_identifier : str,
+        customer_secret : bytes,
+        authority : str,
+        time_delta_slug : str = DEFAULT_TIME_DELTA_SLUG,
+        connection_pool : transport.Transport = None,
+        pool_size : int = transport.DEFAULT_POOL_SIZE,
+        maximum_connections_per_host : int = \
+            transport.DEFAULT_MAXIMUM_CONNECTIONS_PER_HOST,
+        idle_timeout : float = transport.DEFAULT_IDLE_TIMEOUT,
+        time_delta_refresh_interval : float = \
+            DEFAULT_TIME_DELTA_REFRESH_INTERVAL,
+        window_guard : float = DEFAULT_WINDOW_GUARD,
+        time_delta_store = None,
+        codec : codec_module.JsonCodec = None,
+        retry_policy : policy.RetryPolicy = None,
+        circuit_breaker : policy.CircuitBreaker = None,
+        hedging_policy : policy.HedgingPolicy = None
+        ):
+        """
+        Method that initializes the Server class.
+
+        :param customer_identifier:
+            Your customer identifier encoded as an ASCII string of 16
+            hexidecimal digits.
+
+        :param customer_secret:
+            Your customer secret.
+
+        :param authority:
+            The server authority.
+
+        :param time_delta_slug:
+            The endpoint used to determine the time delta between this
+            machine and the server.
+
+        :param connection_pool:
+            An optional transport to use to communicate with the server.  If
+            supplied, the transport can be shared with other Server instances
+            and will not be closed when this instance is closed.  If None, a
+            transport will be created and owned by this instance.
+
+        :param pool_size:
+            The number of per-host connection pools to keep.  Ignored if a
+            connection pool is supplied.
+
+        :param maximum_connections_per_host:
+            The maximum number of connections kept open to any single host.
+            Ignored if a connection pool is supplied.
+
+        :param idle_timeout:
+            The time, in seconds, pooled connections can remain idle before
+            being discarded.  A value of None disables idle eviction.  Ignored
+            if a connection pool is supplied.
+
+        :param time_delta_refresh_interval:
+            The interval, in seconds, after which the time delta is refreshed
+            before the next request rather than waiting for a request to be
+            rejected.  A value of None disables proactive refresh.
+
+        :param window_guard:
+            Requests expected to reach the server within this many seconds of
+            a signing window boundary are held until the boundary passes.  A
+            value of 0 disables this behavior.
+
+        :param time_delta_store:
+            An optional store used to persist the measured time delta across
+            process restarts.  If supplied, a fresh stored time delta is used
+            in place of an initial time delta of zero.
+
+        :param codec:
+            The JSON codec used to decode responses.  If None, the fastest
+            installed codec is used.  Signed payloads do not depend on the
+            codec.
+
+        :param retry_policy:
+            The policy used to determine request timeouts and retries.  If
+            None, a policy with default settings is used.
+
+        :param circuit_breaker:
+            The circuit breaker used to reject requests while the service is
+            degraded.  The breaker can be shared with other Server instances.
+            If None, a breaker with default settings is used.
+
+        :param hedging_policy:
+            An optional policy used to send a duplicate request when a read
+            request is slower than usual.  The first response received is
+            used.  A value of None disables hedging.
+
+        :type customer_identifier:          str
+        :type customer_secret:              bytes
+        :type authority:                    str
+        :type time_delta_slug:              str
+        :type connection_pool:              transport.Transport or None
+        :type pool_size:                    int
+        :type maximum_connections_per_host: int
+        :type idle_timeout:                 float or None
+        :type time_delta_refresh_interval:  float or None
+        :type window_guard:                 float
+        :type time_delta_store:             time_delta_store.TimeDeltaStore
+        :type codec:                        codec.JsonCodec or None
+        :type retry_policy:                 policy.RetryPolicy or None
+        :type circuit_breaker:              policy.CircuitBreaker or None
+        :type hedging_policy:               policy.HedgingPolicy or None
+
+        """
+
+        super().__init__()
+
+        self.__codec = codec if codec is not None \
+                           else codec_module.default_codec()
+        self.__retry_policy = retry_policy if retry_policy is not None \
+                                  else policy.RetryPolicy()
+        self.__circuit_breaker = circuit_breaker \
+                                     if circuit_breaker is not None \
+                                     else policy.CircuitBreaker()
+        self.__retries = 0
+        self.__timeouts = 0
+        self.__statistics_lock = threading.Lock()
+
+        self.__hedging_policy = hedging_policy
+        self.__hedges = 0
+        self.__hedges_won = 0
+        self.__hedge_executor = self.__create_hedge_executor()
+        self.__hedge_slots = self.__create_hedge_slots()
+
+        self.__customer_identifier = customer_identifier
+        self.__signer = MessageSigner(customer_identifier, customer_secret)
+        self.__authority = fix_authority(authority)
+        self.__time_delta_slug = fix_slug(time_delta_slug)
+        self.__clock = ClockSkewTracker(
+            refresh_interval = time_delta_refresh_interval,
+            window_guard = window_guard
+        )
+        self.__time_delta_generation = 0
+        self.__time_delta_lock = threading.Lock()
+
+        self.__time_delta_store = time_delta_store
+        restore_time_delta(
+            self.__clock,
+            time_delta_store,
+            self.__authority,
+            customer_identifier
+        )
+
+        if connection_pool is None:
+            self.__transport = transport.Transport(
+                pool_size = pool_size,
+                maximum_connections_per_host = maximum_connections_per_host,
+                idle_timeout = idle_timeout
+            )
+            self.__owns_transport = True
+        else:
+            self.__transport = connection_pool
+            self.__owns_transport = False
+
+        self.__fork_detector = fork_safety.ForkDetector()
+
+
+    @property
+    def codec(self):
+        """
+        Read-only property holding the JSON codec used to decode responses.
+
+        :type: codec.JsonCodec
+
+        """
+
+        return self.__codec
+
+
+    @property
+    def connection_pool(self):
+        """
+        Read-only property holding the transport used by this server.
+
+        :type: transport.Transport
+
+        """
+
+        return self.__transport
+
+
+    @property
+    def statistics(self):
+        """
+        Read-only property holding a snapshot of request and clock skew
+        statistics for this server.
+
+        :type: ServerStatistics
+
+        """
+
+        return self.__clock.statistics
+
+
+    @property
+    def retry_policy(self):
+        """
+        Read-only property holding the policy used to determine request
+        timeouts and retries.
+
+        :type: policy.RetryPolicy
+
+        """
+
+        return self.__retry_policy
+
+
+    @property
+    def circuit_breaker(self):
+        """
+        Read-only property holding the circuit breaker used by this server.
+
+        :type: policy.CircuitBreaker
+
+        """
+
+        return self.__circuit_breaker
+
+
+    @property
+    def hedging_policy(self):
+        """
+        Read-only property holding the hedging policy used by this server.
+
+        :type: policy.HedgingPolicy or None
+
+        """
+
+        return self.__hedging_policy
+
+
+    @property
+    def policy_statistics(self):
+        """
+        Read-only property holding a snapshot of retry, hedging, and circuit
+        breaker statistics for this server.  Circuit breaker values are shared
+        by all servers using the same breaker.
+
+        :type: policy.PolicyStatistics
+
+        """
+
+        return policy.PolicyStatistics(
+            {
+                'retries' : self.__retries,
+                'timeouts' : self.__timeouts,
+                'circuit_state' : self.__circuit_breaker.state,
+                'consecutive_failures' : \
+                    self.__circuit_breaker.consecutive_failures,
+                'circuit_opens' : self.__circuit_breaker.opens,
+                'circuit_rejections' : self.__circuit_breaker.rejections,
+                'hedges' : self.__hedges,
+                'hedges_won' : self.__hedges_won
+            }
+        )
+
+
+    def close(self):
+        """
+        Method you can use to release any pooled connections held by this
+        server.  Connection pools supplied by the caller are left open.
+
+        """
+
+        self.reset_after_fork()
+        if self.__hedge_executor is not None:
+            self.__hedge_executor.shutdown(wait = False)
+
+        if self.__owns_transport:
+            self.__transport.close()
+
+
+    def reset_after_fork(self):
+        """
+        Method you can call in a forked child process to replace the pooled
+        connections, locks, and hedging worker threads inherited from the
+        parent process.  The measured time delta, latency samples, and
+        circuit breaker state are kept.  The method is called automatically
+        when a request is issued and does nothing if the process has not
+        forked.
+
+        """
+
+        if self.__fork_detector.forked():
+            self.__statistics_lock = threading.Lock()
+            self.__time_delta_lock = threading.Lock()
+            self.__hedge_executor = self.__create_hedge_executor()
+            self.__hedge_slots = self.__create_hedge_slots()
+
+            if self.__hedging_policy is not None:
+                self.__hedging_policy.estimator.reset_after_fork()
+
+            self.__clock.reset_after_fork()
+            self.__circuit_breaker.reset_after_fork()
+            self.__transport.reset_after_fork()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+
+    def post_message(
+        self,
+        slug : str,
+        message : dict,
+        timeout : float = None
+        ) -> dict:
+        """
+        Method that will issue a request to a remote server.  If needed, the
+        method will query for an updated time delta and perform a retry.
+
+        Note that this method will raise an exception if communication was not
+        successful.
+
+        :param slug:
+            The slug to be used.
+
+        :param message:
+            A dictionary holding the message to be sent.
+
+        :param timeout:
+            An optional deadline, in seconds, for the call including any
+            retries.
+
+        :return:
+            Returns a dictionary with the response.
+
+        :type slug:    str
+        :type message: dict
+        :type timeout: float or None
+        :rtype:        dict
+
+        """
+
+        return self.__post(
+            fix_slug(slug),
+            message,
+            self.__post_message,
+            timeout,
+            hedge = True
+        )
+
+
+    def post_binary_message(
+        self,
+        slug : str,
+        message : dict,
+        timeout : float = None
+        ) -> dict:
+        """
+        Method that will issue a request to a remote server.  If needed, the
+        method will query for an updated time delta and perform a retry.
+
+        Note that this method will raise an exception if communication was not
+        successful.
+
+        :param slug:
+            The slug to be used.
+
+        :param message:
+            A dictionary holding the message to be sent.
+
+        :param timeout:
+            An optional deadline, in seconds, for the call including any
+            retries.
+
+        :return:
+            Returns a dictionary with the response.
+
+        :type slug:    str
+        :type message: dict
+        :type timeout: float or None
+        :rtype:        dict
+
+        """
+
+        return self.__post(
+            fix_slug(slug),
+            message,
+            self.__post_binary_message,
+            timeout,
+            hedge = True
+        )
+
+
+    def post_streamed_message(
+        self,
+        slug : str,
+        message : dict,
+        chunk_size : int = DEFAULT_CHUNK_SIZE,
+        timeout : float = None
+        ):
+        """
+        Method that will issue a request to a remote server and return the
+        response body incrementally.  If needed, the method will query for an
+        updated time delta and perform a retry.  The retry is performed
+        before any of the response body is read.
+
+        The returned iterator holds a pooled connection until it is exhausted
+        or closed.
+
+        Note that this method will raise an exception if communication was not
+        successful.
+
+        :param slug:
+            The slug to be used.
+
+        :param message:
+            A dictionary holding the message to be sent.
+
+        :param chunk_size:
+            The maximum size of each returned chunk, in bytes.
+
+        :param timeout:
+            An optional deadline, in seconds, for the call including any
+            retries.  The deadline applies until the response headers are
+            received.  The read timeout of the retry policy is applied while
+            the body is read.
+
+        :return:
+            Returns an iterator over bytes objects holding the response body.
+
+        :type slug:       str
+        :type message:    dict
+        :type chunk_size: int
+        :type timeout:    float or None
+        :rtype:           iterator of bytes
+
+        """
+
+        response = self.__post(
+            fix_slug(slug),
+            message,
+            self.__post_streamed_message,
+            timeout
+        )
+
+        return self.__iterate_content(response, chunk_size)
+
+
+    def __post(
+        self,
+        slug : str,
+        message : dict,
+        post_function,
+        timeout : float,
+        hedge : bool = False
+        ):
+        """
+        Method used internally to issue a request, applying the retry policy
+        and circuit breaker.  Transient failures of idempotent requests are
+        retried after a randomized, exponentially increasing delay.  Only
+        server side failures are recorded by the circuit breaker.  If the
+        circuit breaker opens while a call is being retried, the last server
+        error is raised rather than CircuitOpenException.  Calls that run out
+        of time because of the caller's own deadline raise
+        DeadlineExceededException without being recorded as failures.
+
+        :param slug:
+            The cleaned slug to be used.
+
+        :param message:
+            A dictionary holding the message to be sent.
+
+        :param post_function:
+            The method used to send the message.  The method should return None
+            if the message could not be authenticated.
+
+        :param timeout:
+            The deadline, in seconds, for the call.  A value of None means no
+            deadline.
+
+        :param hedge:
+            If True, the request can be hedged.  The post function must not
+            return resources that need to be released.
+
+        :return:
+            Returns the response.
+
+        :type slug:          str
+        :type message:       dict
+        :type post_function: callable
+        :type timeout:       float or None
+        :type hedge:         bool
+        :rtype:              dict or bytes
+
+        """
+
+        self.reset_after_fork()
+
+        deadline = policy.Deadline(timeout) if timeout is not None else None
+        attempt = 0
+        last_error = None
+        response = None
+        while response is None:
+            if deadline is not None:
+                deadline.check(slug)
+
+            if not self.__circuit_breaker.allow():
+                if last_error is not None:
+                    # This call's own failures opened the breaker so report
+                    # the last of them rather than hiding it.
+
+                    raise last_error
+
+                raise CircuitOpenException(
+                    status_message = "%s : circuit breaker is open"%slug
+                )
+
+            try:
+                response = self.__authenticated_post(
+                    slug,
+                    message,
+                    post_function,
+                    deadline,
+                    hedge
+                )
+            except DeadlineExceededException:
+                with self.__statistics_lock:
+                    self.__timeouts += 1
+
+                self.__circuit_breaker.record_abandoned()
+                raise
+            except CommunicationErrorException as e:
+                if isinstance(e, TimeoutException):
+                    with self.__statistics_lock:
+                        self.__timeouts += 1
+
+                    if deadline is not None and \
+                       deadline.remaining() <= policy.MINIMUM_TIMEOUT:
+                        # The attempt's timeouts were cut short to fit the
+                        # caller's deadline so this says nothing about the
+                        # health of the server.
+
+                        self.__circuit_breaker.record_abandoned()
+                        raise DeadlineExceededException(
+                            status_message = "%s : deadline of %g s exceeded"%(
+                                slug,
+                                deadline.timeout
+                            )
+                        ) from e
+
+                if e.status_code is not None and \
+                   not self.__retry_policy.is_retryable_status(e.status_code):
+                    self.__circuit_breaker.record_success()
+                    raise
+
+                self.__circuit_breaker.record_failure()
+                if not self.__retry_policy.may_retry(slug, attempt):
+                    raise
+
+                delay = self.__retry_policy.backoff(attempt)
+                if deadline is not None and delay >= deadline.remaining():
+                    raise
+
+                time.sleep(delay)
+                attempt += 1
+                last_error = e
+                with self.__statistics_lock:
+                    self.__retries += 1
+            else:
+                self.__circuit_breaker.record_success()
 
-    """
+        return response
 
-    def __init__(
+
+    def __authenticated_post(
         self,
-        customer_identifier : str,
-        customer_secret : bytes,
-        authority : str,
-        time_delta_slug : str = DEFAULT_TIME_DELTA_SLUG,
+        slug : str,
+        message : dict,
+        post_function,
+        deadline : policy.Deadline,
+        hedge : bool
         ):
         """
-        Method that initializes the Server class.
+        Method used internally to issue a request, refreshing the time delta
+        proactively when due and retrying once if the request is rejected.
 
-        :param customer_identifier:
-            Your customer identifier encoded as an ASCII string of 16
-            hexidecimal digits.
+        :param slug:
+            The cleaned slug to be used.
 
-        :param customer_secret:
-            Your customer secret.
+        :param message:
+            A dictionary holding the message to be sent.
 
-        :param authority:
-            The server authority.
+        :param post_function:
+            The method used to send the message.  The method should return None
+            if the message could not be authenticated.
 
-        :param time_delta_slug:
-            The endpoint used to determine the time delta between this
-            machine and the server.
+        :param deadline:
+            The deadline for the call, if any.
 
-        :type customer_identifier: str
-        :type customer_secret:     bytes
-        :type authority:           str
-        :type time_delta_slug:     str
+        :param hedge:
+            If True, the request can be hedged.
+
+        :return:
+            Returns the response.
+
+        :type slug:          str
+        :type message:       dict
+        :type post_function: callable
+        :type deadline:      policy.Deadline or None
+        :type hedge:         bool
+        :rtype:              dict or bytes
 
         """
 
-        super().__init__()
+        if hedge                                    and \
+           self.__hedging_policy is not None        and \
+           self.__hedging_policy.is_hedged(slug)       :
+            send_function = functools.partial(
+                self.__hedged_post,
+                post_function = post_function
+            )
+        else:
+            send_function = post_function
 
-        self.__customer_identifier = customer_identifier
-        self.__customer_secret = customer_secret
-        self.__authority = self.__fix_authority(authority)
-        self.__time_delta_slug = self.__fix_slug(time_delta_slug)
-        self.__current_time_delta = 0
+        if self.__clock.refresh_due():
+            try:
+                self.__refresh_time_delta(
+                    self.__time_delta_generation,
+                    proactive = True,
+                    deadline = deadline
+                )
+            except CommunicationErrorException:
+                self.__clock.record_refresh_attempt()
+
+        generation = self.__time_delta_generation
+        response = send_function(slug, message, deadline)
+        if response is None:
+            self.__clock.record_authentication_failure()
+            self.__refresh_time_delta(
+                generation,
+                proactive = False,
+                deadline = deadline
+            )
+            response = send_function(slug, message, deadline)
+            if response is None:
+                raise CommunicationErrorException(status_code = 401)
 
+        return response
 
-    def post_message(self, slug : str, message : dict) -> dict:
-        """
-        Method that will issue a request to a remote server.  If needed, the
-        method will query for an updated time delta and perform a retry.
 
-        Note that this method will raise an exception if communication was not
-        successful.
+    def __hedged_post(
+        self,
+        slug : str,
+        message : dict,
+        deadline : policy.Deadline,
+        post_function
+        ):
+        """
+        Method used internally to send a request and, if no response is
+        received within the hedge delay, send a duplicate request.  The
+        original request is sent on its own thread so it never waits for a
+        hedging worker.  The duplicate is sent from the hedging thread pool,
+        the hedge delay being measured from the time the original request is
+        sent.  No duplicate is sent if every hedging worker is busy.  The
+        first response received is returned.  The slower request is left to
+        finish in the background and its response is discarded.
 
         :param slug:
-            The slug to be used.
+            The cleaned slug to be used.
 
         :param message:
             A dictionary holding the message to be sent.
 
+        :param deadline:
+            The deadline for the call, if any.
+
+        :param post_function:
+            The method used to send the message.
+
         :return:
-            Returns a dictionary with the response.
+            Returns the response.  The value None is returned if the message
+            could not be authenticated.
 
-        :type slug:    str
-        :type message: dict
-        :rtype:        dict
+        :type slug:          str
+        :type message:       dict
+        :type deadline:      policy.Deadline or None
+        :type post_function: callable
+        :rtype:              dict, bytes, or None
 
         """
 
-        fixed_slug = self.__fix_slug(slug)
-        response = self.__post_message(fixed_slug, message)
-        if response is None:
-            new_time_delta = self.__time_delta()
-            if new_time_delta is not None:
-                self.__current_time_delta = new_time_delta
-                response = self.__post_message(fixed_slug, message)
-                if response is None:
-                    raise CommunicationErrorException(status_code = 401)
+        call = Server._HedgedCall()
+        send_time = time.monotonic() + self.__hedging_policy.delay(slug)
+        threading.Thread(
+            target = self.__run_hedged,
+            args = (call, False, slug, message, deadline, post_function),
+            name = "speedsentry-request",
+            daemon = True
+        ).start()
+
+        if self.__hedge_slots.acquire(blocking = False):
+            self.__hedge_executor.submit(
+                self.__send_hedge,
+                call,
+                slug,
+                message,
+                deadline,
+                post_function,
+                send_time
+            )
 
-        return response
+        call.done.wait()
+        if not call.answered:
+            raise call.error
+
+        if call.duplicate:
+            with self.__statistics_lock:
+                self.__hedges_won += 1
+
+        return call.response
 
 
-    def post_binary_message(self, slug : str, message : dict) -> dict:
+    def __send_hedge(
+        self,
+        call,
+        slug : str,
+        message : dict,
+        deadline : policy.Deadline,
+        post_function,
+        send_time : float
+        ):
         """
-        Method that will issue a request to a remote server.  If needed, the
-        method will query for an updated time delta and perform a retry.
+        Method used internally by the hedging thread pool to send a duplicate
+        request if the call has not completed by a given time.  The hedging
+        slot held for this method is released on exit.
 
-        Note that this method will raise an exception if communication was not
-        successful.
+        :param call:
+            The hedged call.
 
         :param slug:
-            The slug to be used.
+            The cleaned slug to be used.
+
+        :param message:
+            A dictionary holding the message to be sent.
+
+        :param deadline:
+            The deadline for the call, if any.
+
+        :param post_function:
+            The method used to send the message.
+
+        :param send_time:
+            The monotonic time at which the duplicate request is sent.
+
+        :type call:          Server._HedgedCall
+        :type slug:          str
+        :type message:       dict
+        :type deadline:      policy.Deadline or None
+        :type post_function: callable
+        :type send_time:     float
+
+        """
+
+        try:
+            if not call.done.wait(max(0.0, send_time - time.monotonic())):
+                with call.lock:
+                    send = not call.done.is_set()
+                    if send:
+                        call.outstanding += 1
+
+                if send:
+                    with self.__statistics_lock:
+                        self.__hedges += 1
+
+                    self.__run_hedged(
+                        call,
+                        True,
+                        slug,
+                        message,
+                        deadline,
+                        post_function
+                    )
+        finally:
+            self.__hedge_slots.release()
+
+
+    def __run_hedged(
+        self,
+        call,
+        duplicate : bool,
+        slug : str,
+        message : dict,
+        deadline : policy.Deadline,
+        post_function
+        ):
+        """
+        Method used internally to send one request of a hedged call and
+        record its outcome.  The call completes with the first response
+        received or, once every request sent has failed, with the first
+        exception raised.
+
+        :param call:
+            The hedged call.
+
+        :param duplicate:
+            If True, the request is the duplicate request.
+
+        :param slug:
+            The cleaned slug to be used.
+
+        :param message:
+            A dictionary holding the message to be sent.
+
+        :param deadline:
+            The deadline for the call, if any.
+
+        :param post_function:
+            The method used to send the message.
+
+        :type call:          Server._HedgedCall
+        :type duplicate:     bool
+        :type slug:          str
+        :type message:       dict
+        :type deadline:      policy.Deadline or None
+        :type post_function: callable
+
+        """
+
+        try:
+            response = self.__timed_post(
+                slug,
+                message,
+                deadline,
+                post_function
+            )
+        except Exception as e:
+            with call.lock:
+                call.outstanding -= 1
+                if call.error is None:
+                    call.error = e
+
+                if call.outstanding == 0 and not call.answered:
+                    call.done.set()
+        else:
+            with call.lock:
+                call.outstanding -= 1
+                if not call.answered:
+                    call.answered = True
+                    call.duplicate = duplicate
+                    call.response = response
+                    call.done.set()
+
+
+    def __timed_post(
+        self,
+        slug : str,
+        message : dict,
+        deadline : policy.Deadline,
+        post_function
+        ):
+        """
+        Method used internally to send a request and record the response time
+        with the hedging policy.
+
+        :param slug:
+            The cleaned slug to be used.
 
         :param message:
             A dictionary holding the message to be sent.
 
+        :param deadline:
+            The deadline for the call, if any.
+
+        :param post_function:
+            The method used to send the message.
+
         :return:
-            Returns a dictionary with the response.
+            Returns the response.
 
-        :type slug:    str
-        :type message: dict
-        :rtype:        dict
+        :type slug:          str
+        :type message:       dict
+        :type deadline:      policy.Deadline or None
+        :type post_function: callable
+        :rtype:              dict, bytes, or None
 
         """
 
-        fixed_slug = self.__fix_slug(slug)
-        response = self.__post_binary_message(fixed_slug, message)
-        if response is None:
-            new_time_delta = self.__time_delta()
-            if new_time_delta is not None:
-                self.__current_time_delta = new_time_delta
-                response = self.__post_binary_message(fixed_slug, message)
-                if response is None:
-                    raise CommunicationErrorException(status_code = 401)
-
-        print(str(type(response)))
+        start = time.monotonic()
+        response = post_function(slug, message, deadline)
+        if response is not None:
+            self.__hedging_policy.record(slug, time.monotonic() - start)
+
         return response
 
 
-    def __time_delta(self): # -> Union(int, NoneType)
+    def __create_hedge_executor(self):
+        # -> Union[concurrent.futures.ThreadPoolExecutor, NoneType]
+        """
+        Method used internally to create the thread pool used to issue hedged
+        requests.
+
+        :return:
+            Returns the thread pool.  The value None is returned if hedging is
+            disabled.
+
+        :rtype: concurrent.futures.ThreadPoolExecutor or None
+
+        """
+
+        if self.__hedging_policy is not None:
+            result = concurrent.futures.ThreadPoolExecutor(
+                max_workers = self.__hedging_policy.maximum_workers,
+                thread_name_prefix = "speedsentry-hedge"
+            )
+        else:
+            result = None
+
+        return result
+
+
+    def __create_hedge_slots(self) -> threading.Semaphore:
+        """
+        Method used internally to create the semaphore that counts idle
+        hedging workers so duplicate requests are never queued.
+
+        :return:
+            Returns the semaphore.
+
+        :rtype: threading.Semaphore
+
+        """
+
+        if self.__hedging_policy is not None:
+            result = threading.Semaphore(self.__hedging_policy.maximum_workers)
+        else:
+            result = threading.Semaphore(0)
+
+        return result
+
+
+    def __refresh_time_delta(
+        self,
+        generation : int,
+        proactive : bool,
+        deadline : policy.Deadline = None
+        ):
+        """
+        Method used internally to measure the time delta and round trip time
+        to the server.  Concurrent callers that used the same time delta
+        share a single request to the time delta endpoint.  Callers arriving
+        while the request is in flight wait for it and then use its result.
+
+        :param generation:
+            The time delta generation the caller last used.
+
+        :param proactive:
+            If True, the refresh is being performed before the time delta is
+            known to be stale.
+
+        :param deadline:
+            The deadline for the call, if any.
+
+        :type generation: int
+        :type proactive:  bool
+        :type deadline:   policy.Deadline or None
+
+        """
+
+        if deadline is None:
+            acquired = self.__time_delta_lock.acquire()
+        else:
+            acquired = self.__time_delta_lock.acquire(
+                timeout = deadline.remaining()
+            )
+
+        if not acquired:
+            raise DeadlineExceededException(
+                status_message = "%s : deadline of %g s exceeded"%(
+                    self.__time_delta_slug,
+                    deadline.timeout
+                )
+            )
+
+        try:
+            if generation == self.__time_delta_generation:
+                start = time.monotonic()
+                new_time_delta = self.__time_delta(deadline)
+                round_trip_time = time.monotonic() - start
+
+                if new_time_delta is not None:
+                    self.__clock.record_time_delta(
+                        new_time_delta,
+                        round_trip_time,
+                        proactive
+                    )
+                    save_time_delta(
+                        self.__clock,
+                        self.__time_delta_store,
+                        self.__authority,
+                        self.__customer_identifier
+                    )
+
+                self.__time_delta_generation += 1
+        finally:
+            self.__time_delta_lock.release()
+
+
+    def __time_delta(
+        self,
+        deadline : policy.Deadline = None
+        ): # -> Union(int, NoneType)
         """
         Function you can use to determine the system clock time delta between
         us and a remote server.
 
-        :param website_url:
-            The website URL to determine the time delta with.
-
-        :param webhook:
-            The time-delta webhook on the remote server.
+        :param deadline:
+            The deadline for the call, if any.
 
         :return:
             Returns the measured time delta, in seconds.
 
-        :type website_url: str
-        :type webhook:     str
-        :rtype:            int or None
+        :type deadline: policy.Deadline or None
+        :rtype:         int or None
 
         """
 
         url = "%s/%s"%(self.__authority, self.__time_delta_slug)
+        payload = build_time_delta_payload()
 
-        message_payload = { 'timestamp' : int(time.time()) }
-        payload = json.dumps(message_payload)
-
-        response = requests.post(
+        response = self.__transport.post(
             url,
             data = payload,
-            headers = {
-                'User-Agent' : 'Inesonic, LLC',
-                'Content-Type' : 'application/json',
-                'Content-Length' : str(len(payload))
-            }
+            headers = build_headers('Inesonic, LLC', payload),
+            timeout = self.__retry_policy.timeouts(deadline)
         )
 
-        if response.status_code == 200:
-            try:
-                json_result = json.loads(response.text)
-            except:
-                raise CommunicationErrorException(
-                    status_message = "/td : not JSON response"
-                )
-
-            if 'status' in json_result:
-                if len(json_result) == 2         and \
-                   'status' in json_result       and \
-                   'time_delta' in json_result   and \
-                   json_result['status'] == 'OK'     :
-                    try:
-                        result = int(json_result['time_delta'])
-                    except:
-                        raise CommunicationErrorException(
-                            status_message = "/td : invalid returned value"
-                        )
-                else:
-                    raise CommunicationErrorException(
-                        status_message = json_response['status']
-                    )
-            else:
-                raise CommunicationErrorException(
-                    status_message = "/td : unexpected response"
-                )
-        else:
-            raise CommunicationErrorException(
-                status_code = response.status_code
-            )
-
-        return result
+        return decode_time_delta_response(
+            response.status_code,
+            response.content,
+            self.__codec
+        )
 
 
     def __post_message(
         self,
         slug : str,
-        message : dict
+        message : dict,
+        deadline : policy.Deadline
         ): # -> Union(dict, NoneType):
         """
         Method that will issue a request to a remote server.
@@ -277,74 +2077,34 @@ class Server(object):
         :param message:
             A dictionary holding the message to be sent.
 
+        :param deadline:
+            The deadline for the call, if any.
+
         :return:
             Returns a dictionary with the response or None if the provided hash
             was invalid.
 
-        :type slug:    str
-        :type message: dict
-        :rtype:        dict or None
+        :type slug:     str
+        :type message:  dict
+        :type deadline: policy.Deadline or None
+        :rtype:         dict or None
 
         """
 
-        url = "%s/%s"%(self.__authority, slug)
-        raw_message = json.dumps(message).encode('utf-8')
-
-        hash_time_value = int(
-              (int(time.time()) + self.__current_time_delta)
-            / 30
-        )
-
-        hash_time_data = struct.pack('<Q', hash_time_value)
-        key = self.__customer_secret + hash_time_data
-
-        raw_hash = hmac.new(
-            key = key,
-            msg = raw_message,
-            digestmod = HASH_ALGORITHM
-        ).digest()
-
-        encoded_message = base64.b64encode(raw_message)
-        encoded_hash = base64.b64encode(raw_hash)
-
-        message_payload = {
-            'cid' : self.__customer_identifier,
-            'data' : encoded_message.decode('utf-8'),
-            'hash' : encoded_hash.decode('utf-8')
-        }
-
-        payload = json.dumps(message_payload)
-        response = requests.post(
-            url,
-            data = payload,
-            headers = {
-                'User-Agent' : 'Python API: ' + self.__customer_identifier,
-                'Content-Type' : 'application/json',
-                'Content-Length' : str(len(payload))
-            }
+        response = self.__send(slug, message, deadline)
+        return decode_message_response(
+            slug,
+            response.status_code,
+            response.content,
+            self.__codec
         )
 
-        if response.status_code == 200:
-            try:
-                result = json.loads(response.text)
-            except:
-                raise CommunicationErrorException(
-                    status_message = "%s : not JSON response"
-                )
-        elif response.status_code == 401:
-            result = None
-        else:
-            raise CommunicationErrorException(
-                status_code = response.status_code
-            )
-
-        return result
-
 
     def __post_binary_message(
         self,
         slug : str,
-        message : dict
+        message : dict,
+        deadline : policy.Deadline
         ): # -> Union[bytes, NoneType]
         """
         Method that will issue a request to a remote server that expects a
@@ -356,109 +2116,146 @@ class Server(object):
         :param message:
             A dictionary holding the message to be sent.
 
+        :param deadline:
+            The deadline for the call, if any.
+
         :return:
             Returns a bytes object holding the response.  The value None is
             returned if the message could not be authenticated.
 
-        :type slug:    str
-        :type message: dict
-        :rtype:        bytes or None
+        :type slug:     str
+        :type message:  dict
+        :type deadline: policy.Deadline or None
+        :rtype:         bytes or None
 
         """
 
-        url = "%s/%s"%(self.__authority, slug)
-        raw_message = json.dumps(message).encode('utf-8')
+        response = self.__send(slug, message, deadline)
+        return decode_binary_response(response.status_code, response.content)
 
-        hash_time_value = int(
-              (int(time.time()) + self.__current_time_delta)
-            / 30
-        )
 
-        hash_time_data = struct.pack('<Q', hash_time_value)
-        key = self.__customer_secret + hash_time_data
+    def __post_streamed_message(
+        self,
+        slug : str,
+        message : dict,
+        deadline : policy.Deadline
+        ): # -> Union[requests.Response, NoneType]
+        """
+        Method that will issue a request to a remote server without reading
+        the response body.
 
-        raw_hash = hmac.new(
-            key = key,
-            msg = raw_message,
-            digestmod = HASH_ALGORITHM
-        ).digest()
+        :param slug:
+            The slug to be used.
 
-        encoded_message = base64.b64encode(raw_message)
-        encoded_hash = base64.b64encode(raw_hash)
+        :param message:
+            A dictionary holding the message to be sent.
 
-        message_payload = {
-            'cid' : self.__customer_identifier,
-            'data' : encoded_message.decode('utf-8'),
-            'hash' : encoded_hash.decode('utf-8')
-        }
+        :param deadline:
+            The deadline for the call, if any.
 
-        payload = json.dumps(message_payload)
-        response = requests.post(
-            url,
-            data = payload,
-            headers = {
-                'User-Agent' : 'Python API: ' + self.__customer_identifier,
-                'Content-Type' : 'application/json',
-                'Content-Length' : str(len(payload))
-            }
-        )
+        :return:
+            Returns the unread response.  The value None is returned if the
+            message could not be authenticated.
 
-        if response.status_code == 200:
-            result = response.content
-        elif response.status_code == 401:
-            result = None
-        else:
-            raise CommunicationErrorException(
-                status_code = response.status_code
-            )
+        :type slug:     str
+        :type message:  dict
+        :type deadline: policy.Deadline or None
+        :rtype:         requests.Response or None
 
-        return result
+        """
+
+        response = self.__send(slug, message, deadline, stream = True)
+        try:
+            readable = check_streamed_response(response.status_code)
+        except:
+            response.close()
+            raise
+
+        if not readable:
+            response.close()
+            response = None
+
+        return response
 
 
-    def __fix_slug(self, slug : str) -> str:
+    def __iterate_content(self, response, chunk_size : int):
         """
-        Method used to fix a provided slug, removing leading and trailing
-        slashes.
+        Generator used internally to read a streamed response body.  The
+        response is closed once the body has been read or the generator is
+        closed.
 
-        :param slug:
-            The slug to be cleaned.
+        :param response:
+            The unread response.
 
-        :return:
-            Returns the cleaned slug.
+        :param chunk_size:
+            The maximum size of each chunk, in bytes.
 
-        :type slug: str
-        :rtype:     str
+        :type response:   requests.Response
+        :type chunk_size: int
 
         """
 
-        if slug.startswith('/'):
-            slug = slug[1:]
+        try:
+            for chunk in response.iter_content(chunk_size = chunk_size):
+                yield chunk
+        finally:
+            response.close()
+
 
-        if slug.endswith('/'):
-            slug = slug[:-1]
+    def __send(
+        self,
+        slug : str,
+        message : dict,
+        deadline : policy.Deadline = None,
+        stream : bool = False
+        ):
+        """
+        Method used internally to sign and send a message.
 
-        return slug
+        :param slug:
+            The slug to be used.
 
+        :param message:
+            A dictionary holding the message to be sent.
 
-    def __fix_authority(self, authority : str) -> str:
-        """
-        Method used to fix a provided authority, removing trailing slashes.
+        :param deadline:
+            The deadline for the call, if any.  Request timeouts are reduced
+            so that the request cannot outlive the deadline.
 
-        :param authority:
-            The authority to be fixed.
+        :param stream:
+            If True, the response body is not read.
 
         :return:
-            Returns the cleaned authority.
+            Returns the raw response.
 
-        :type authority: str
-        :rtype:          str
+        :type slug:     str
+        :type message:  dict
+        :type deadline: policy.Deadline or None
+        :type stream:   bool
+        :rtype:         requests.Response
 
         """
 
-        if authority.endswith('/'):
-            authority = authority[:-1]
+        delay = self.__clock.signing_delay()
+        if delay > 0:
+            time.sleep(delay)
+
+        time_delta = self.__clock.signing_time_delta()
+        self.__clock.record_request(time_delta)
+
+        url = "%s/%s"%(self.__authority, slug)
+        payload = self.__signer.build_payload(message, time_delta)
 
-        return authority
+        return self.__transport.post(
+            url,
+            data = payload,
+            headers = build_headers(
+                'Python API: ' + self.__customer_identifier,
+                payload
+            ),
+            stream = stream,
+            timeout = self.__retry_policy.timeouts(deadline)
+        )
 
 ###############################################################################
 # Main:
@@ -0,0 +1,621 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that provides a cache of rendered latency plots bounded by the
+number of bytes held rather than the number of plots.
+
+Requests are identified by their parameters with defaults filled in, so that
+requests differing only in whether a default was stated share an entry.
+Start and end timestamps are rounded down to a configurable time bucket so
+that rolling requests, such as the last 24 hours, made within the same bucket
+share an entry.  Plots can optionally also be kept in a directory, allowing
+plots to survive process restarts and to be shared between processes.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import os
+import time
+import hashlib
+import tempfile
+import threading
+import collections
+
+from . import dictionary_object as dictionary_object
+from . import fork_safety as fork_safety
+from . import single_flight as single_flight
+
+###############################################################################
+# Globals:
+#
+
+SLUG = "/v1/latency/plot"
+"""
+The slug of the endpoint whose responses are cached.
+
+"""
+
+DEFAULT_PARAMETERS = {
+    'width' : 1024,
+    'height' : 768,
+    'plot_type' : "history",
+    'format' : "png",
+    'log_scale' : False
+}
+"""
+The server's default plot parameters, used to identify requests that differ
+only in whether a default was stated.
+
+"""
+
+DEFAULT_MAXIMUM_BYTES = 32 * 1024 * 1024
+"""
+The default maximum number of bytes of plot data held in memory.
+
+"""
+
+DEFAULT_MAXIMUM_DISK_BYTES = 256 * 1024 * 1024
+"""
+The default maximum number of bytes of plot data held on disk.
+
+"""
+
+DEFAULT_TIME_TO_LIVE = 300
+"""
+The default time, in seconds, a plot is considered fresh.
+
+"""
+
+DEFAULT_TIME_BUCKET = 300
+"""
+The default time, in seconds, timestamps are rounded down to.
+
+"""
+
+FILE_SUFFIX = ".plot"
+"""
+The suffix of the files holding plots on disk.
+
+"""
+
+PlotCacheStatistics = dictionary_object.build_read_only_class(
+    "PlotCacheStatistics",
+    "You can use this class to hold statistics on the plot cache.",
+    {
+        "hits" :
+            "The number of calls answered from memory.",
+        "disk_hits" :
+            "The number of calls answered from disk.",
+        "misses" :
+            "The number of calls that required a request.",
+        "evictions" :
+            "The number of plots discarded from memory to stay within the "
+            "byte budget.",
+        "disk_evictions" :
+            "The number of plots discarded from disk to stay within the disk "
+            "byte budget.",
+        "entries" :
+            "The number of plots currently held in memory.",
+        "bytes" :
+            "The number of bytes of plot data currently held in memory.",
+        "disk_bytes" :
+            "The number of bytes of plot data currently held on disk."
+    }
+)
+"""
+Class holding plot cache statistics.
+
+"""
+
+###############################################################################
+# Class PlotCache:
+#
+
+class PlotCache(object):
+    """
+    Class that caches rendered latency plots.  The class is thread safe.  A
+    child process forked after the cache is created keeps the plots held in
+    memory.
+
+    """
+
+    class _Entry(object):
+        """
+        Class used internally to hold a single cached plot.
+
+        """
+
+        __slots__ = ('data', 'expires')
+
+        def __init__(self, data : bytes, expires : float):
+            self.data = data
+            self.expires = expires
+
+
+    def __init__(
+        self,
+        maximum_bytes : int = DEFAULT_MAXIMUM_BYTES,
+        time_to_live : float = DEFAULT_TIME_TO_LIVE,
+        time_bucket : int = DEFAULT_TIME_BUCKET,
+        directory : str = None,
+        maximum_disk_bytes : int = DEFAULT_MAXIMUM_DISK_BYTES
+        ):
+        """
+        Method that initializes the PlotCache class.
+
+        :param maximum_bytes:
+            The maximum number of bytes of plot data held in memory.  Plots
+            larger than this are not held in memory.
+
+        :param time_to_live:
+            The time, in seconds, a plot is considered fresh.
+
+        :param time_bucket:
+            The time, in seconds, start and end timestamps are rounded down
+            to before the plot is requested.  A value of None or 0 disables
+            rounding.
+
+        :param directory:
+            An optional directory used to hold plots on disk.  Plots are
+            written to the directory when received and read from it when
+            they are no longer held in memory.  The directory is created if
+            it does not exist.  A value of None disables the disk tier.
+
+        :param maximum_disk_bytes:
+            The maximum number of bytes of plot data held on disk.
+
+        :type maximum_bytes:      int
+        :type time_to_live:       float
+        :type time_bucket:        int or None
+        :type directory:          str or None
+        :type maximum_disk_bytes: int
+
+        """
+
+        super().__init__()
+
+        self.__maximum_bytes = maximum_bytes
+        self.__time_to_live = time_to_live
+        self.__time_bucket = time_bucket
+        self.__directory = directory
+        self.__maximum_disk_bytes = maximum_disk_bytes
+
+        self.__entries = collections.OrderedDict()
+        self.__bytes = 0
+        self.__disk_files = collections.OrderedDict()
+        self.__disk_bytes = 0
+        self.__lock = threading.Lock()
+        self.__fork_detector = fork_safety.ForkDetector()
+
+        self.__hits = 0
+        self.__disk_hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__disk_evictions = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok = True)
+            self.__scan_directory()
+
+
+    @property
+    def maximum_bytes(self):
+        """
+        Read-only property holding the maximum number of bytes of plot data
+        held in memory.
+
+        :type: int
+
+        """
+
+        return self.__maximum_bytes
+
+
+    @property
+    def time_bucket(self):
+        """
+        Read-only property holding the time, in seconds, timestamps are
+        rounded down to.
+
+        :type: int or None
+
+        """
+
+        return self.__time_bucket
+
+
+    @property
+    def directory(self):
+        """
+        Read-only property holding the directory used to hold plots on disk.
+
+        :type: str or None
+
+        """
+
+        return self.__directory
+
+
+    @property
+    def statistics(self):
+        """
+        Read-only property holding a snapshot of cache statistics.
+
+        :type: PlotCacheStatistics
+
+        """
+
+        with self.__lock:
+            return PlotCacheStatistics(
+                {
+                    'hits' : self.__hits,
+                    'disk_hits' : self.__disk_hits,
+                    'misses' : self.__misses,
+                    'evictions' : self.__evictions,
+                    'disk_evictions' : self.__disk_evictions,
+                    'entries' : len(self.__entries),
+                    'bytes' : self.__bytes,
+                    'disk_bytes' : self.__disk_bytes
+                }
+            )
+
+
+    def normalize(self, message : dict) -> dict:
+        """
+        Method you can use to obtain the request that is sent for a set of
+        plot parameters.  Start and end timestamps are rounded down to the
+        time bucket.
+
+        :param message:
+            The plot parameters.
+
+        :return:
+            Returns the parameters to be sent.
+
+        :type message: dict
+        :rtype:        dict
+
+        """
+
+        result = dict(message)
+        if self.__time_bucket:
+            for name in ('start_timestamp', 'end_timestamp'):
+                value = result.get(name)
+                if value is not None:
+                    result[name] = (
+                        int(value) // self.__time_bucket * self.__time_bucket
+                    )
+
+        return result
+
+
+    def key(self, message : dict) -> tuple:
+        """
+        Method you can use to obtain the key identifying a set of plot
+        parameters.
+
+        :param message:
+            The plot parameters.
+
+        :return:
+            Returns a hashable key.
+
+        :type message: dict
+        :rtype:        tuple
+
+        """
+
+        parameters = dict(DEFAULT_PARAMETERS)
+        parameters.update(
+            (k, v) for k, v in self.normalize(message).items()
+            if v is not None
+        )
+
+        return single_flight.canonical_key(SLUG, parameters)
+
+
+    def get(self, message : dict, fetch, timeout : float = None):
+        """
+        Method you can use to obtain a plot, from the cache if possible.
+
+        :param message:
+            The plot parameters.
+
+        :param fetch:
+            A callable that takes the parameters to be sent and a timeout and
+            returns the plot as a bytes object.  Exceptions raised by the
+            callable are passed to the caller and nothing is cached.
+
+        :param timeout:
+            An optional deadline, in seconds, passed to the callable.
+
+        :return:
+            Returns a read-only memoryview of the plot.  Plots held in memory
+            are returned without being copied.
+
+        :type message: dict
+        :type fetch:   callable
+        :type timeout: float or None
+        :rtype:        memoryview
+
+        """
+
+        self.reset_after_fork()
+
+        key = self.key(message)
+        now = time.monotonic()
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and now < entry.expires:
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+                data = entry.data
+            else:
+                data = None
+
+        if data is None and self.__directory is not None:
+            data = self.__read_file(key)
+            if data is not None:
+                with self.__lock:
+                    self.__disk_hits += 1
+
+                self.__store(key, data, write_file = False)
+
+        if data is None:
+            with self.__lock:
+                self.__misses += 1
+
+            data = bytes(fetch(self.normalize(message), timeout))
+            self.__store(key, data, write_file = True)
+
+        return memoryview(data)
+
+
+    def invalidate(self):
+        """
+        Method you can use to discard every cached plot, including plots
+        held on disk.
+
+        """
+
+        self.reset_after_fork()
+
+        with self.__lock:
+            self.__entries.clear()
+            self.__bytes = 0
+
+            paths = list(self.__disk_files)
+            self.__disk_files.clear()
+            self.__disk_bytes = 0
+
+        for path in paths:
+            self.__remove_file(path)
+
+
+    def reset_after_fork(self):
+        """
+        Method you can call in a forked child process to replace the lock
+        inherited from the parent process.  Cached plots are kept.  The method
+        is called automatically when the cache is used and does nothing if
+        the process has not forked.
+
+        """
+
+        if self.__fork_detector.forked():
+            self.__lock = threading.Lock()
+
+
+    def __store(self, key : tuple, data : bytes, write_file : bool):
+        """
+        Method used internally to add a plot to the cache, evicting the least
+        recently used plots to stay within the byte budgets.
+
+        :param key:
+            The cache key.
+
+        :param data:
+            The plot.
+
+        :param write_file:
+            If True, the plot is also written to the disk tier, if enabled.
+
+        :type key:        tuple
+        :type data:       bytes
+        :type write_file: bool
+
+        """
+
+        size = len(data)
+        with self.__lock:
+            previous = self.__entries.pop(key, None)
+            if previous is not None:
+                self.__bytes -= len(previous.data)
+
+            if size <= self.__maximum_bytes:
+                self.__entries[key] = PlotCache._Entry(
+                    data,
+                    time.monotonic() + self.__time_to_live
+                )
+                self.__bytes += size
+
+                while self.__bytes > self.__maximum_bytes:
+                    _, evicted = self.__entries.popitem(last = False)
+                    self.__bytes -= len(evicted.data)
+                    self.__evictions += 1
+
+        if write_file and self.__directory is not None:
+            self.__write_file(key, data)
+
+
+    def __path(self, key : tuple) -> str:
+        """
+        Method used internally to obtain the path of the file holding a plot.
+
+        :param key:
+            The cache key.
+
+        :return:
+            Returns the file path.
+
+        :type key: tuple
+        :rtype:    str
+
+        """
+
+        digest = hashlib.sha256(key[1].encode('utf-8')).hexdigest()
+        return os.path.join(self.__directory, digest + FILE_SUFFIX)
+
+
+    def __read_file(self, key : tuple):
+        """
+        Method used internally to read a fresh plot from disk.
+
+        :param key:
+            The cache key.
+
+        :return:
+            Returns the plot or None if no fresh plot is held on disk.
+
+        :type key: tuple
+        :rtype:    bytes or None
+
+        """
+
+        path = self.__path(key)
+        try:
+            if time.time() - os.stat(path).st_mtime < self.__time_to_live:
+                with open(path, 'rb') as fh:
+                    result = fh.read()
+
+                with self.__lock:
+                    if path in self.__disk_files:
+                        self.__disk_files.move_to_end(path)
+            else:
+                result = None
+        except OSError:
+            result = None
+
+        return result
+
+
+    def __write_file(self, key : tuple, data : bytes):
+        """
+        Method used internally to atomically write a plot to disk, removing
+        the least recently used files to stay within the disk byte budget.
+        Errors writing the file are ignored.
+
+        :param key:
+            The cache key.
+
+        :param data:
+            The plot.
+
+        :type key:  tuple
+        :type data: bytes
+
+        """
+
+        path = self.__path(key)
+        if len(data) <= self.__maximum_disk_bytes:
+            try:
+                handle, temporary_path = tempfile.mkstemp(
+                    dir = self.__directory,
+                    prefix = ".plot.",
+                    suffix = ".tmp"
+                )
+
+                try:
+                    with os.fdopen(handle, 'wb') as fh:
+                        fh.write(data)
+
+                    os.replace(temporary_path, path)
+                except:
+                    self.__remove_file(temporary_path)
+                    raise
+            except OSError:
+                pass
+            else:
+                removed = list()
+                with self.__lock:
+                    self.__disk_bytes -= self.__disk_files.pop(path, 0)
+                    self.__disk_files[path] = len(data)
+                    self.__disk_bytes += len(data)
+
+                    while self.__disk_bytes > self.__maximum_disk_bytes:
+                        evicted, size = self.__disk_files.popitem(
+                            last = False
+                        )
+                        self.__disk_bytes -= size
+                        self.__disk_evictions += 1
+                        removed.append(evicted)
+
+                for evicted in removed:
+                    self.__remove_file(evicted)
+
+
+    def __scan_directory(self):
+        """
+        Method used internally to index the plots already held on disk,
+        oldest first.
+
+        """
+
+        files = list()
+        with os.scandir(self.__directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(FILE_SUFFIX) and entry.is_file():
+                    status = entry.stat()
+                    files.append((status.st_mtime, entry.path, status.st_size))
+
+        for modified, path, size in sorted(files):
+            self.__disk_files[path] = size
+            self.__disk_bytes += size
+
+
+    @staticmethod
+    def __remove_file(path : str):
+        """
+        Method used internally to remove a file, ignoring errors.
+
+        :param path:
+            The path of the file to remove.
+
+        :type path: str
+
+        """
+
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
@@ -0,0 +1,647 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that renders latency plots locally from latency data you have
+already obtained, accepting the same plot parameters as
+SpeedSentry.latency_plot.  This module requires the numpy and matplotlib
+packages.  JPEG output also requires the pillow package.
+
+History plots are decimated to the plot width before drawing.  Each pixel
+column is drawn as a vertical stroke from the lowest to the highest latency
+it holds, which is what the undecimated line would look like at that width,
+so the drawing cost does not grow with the length of the history.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import io
+import sys
+import multiprocessing
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import matplotlib.figure
+    import matplotlib.backends.backend_agg
+except ImportError:
+    matplotlib = None
+
+from . import latency_frame as latency_frame
+
+###############################################################################
+# Globals:
+#
+
+PLOT_TYPES = ("history", "histogram")
+"""
+The supported plot types.
+
+"""
+
+FORMATS = {
+    "png" : "png",
+    "jpg" : "jpeg"
+}
+"""
+The supported image formats and the matplotlib format used for each.
+
+"""
+
+DEFAULT_WIDTH = 1024
+"""
+The default plot width, in pixels.
+
+"""
+
+DEFAULT_HEIGHT = 768
+"""
+The default plot height, in pixels.
+
+"""
+
+MINIMUM_SIZE = 100
+"""
+The smallest supported plot width or height, in pixels.
+
+"""
+
+MAXIMUM_SIZE = 2048
+"""
+The largest supported plot width or height, in pixels.
+
+"""
+
+DOTS_PER_INCH = 100
+"""
+The resolution used to convert plot sizes in pixels to figure sizes.
+
+"""
+
+PIXELS_PER_BIN = 8
+"""
+The width, in pixels, of each histogram bin.
+
+"""
+
+PLOT_PARAMETERS = frozenset(
+    (
+        'monitor_id',
+        'region_id',
+        'start_timestamp',
+        'end_timestamp',
+        'title',
+        'x_axis_label',
+        'y_axis_label',
+        'minimum_latency',
+        'maximum_latency',
+        'log_scale',
+        'width',
+        'height',
+        'plot_type',
+        'format'
+    )
+)
+"""
+The plot parameters accepted by the renderer.
+
+"""
+
+worker_renderer = None
+"""
+The renderer used by worker processes.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def decimate(timestamp, values, width : int) -> tuple:
+    """
+    Function you can use to reduce a time series to the lowest and highest
+    value within each of a number of equally spaced time columns.
+
+    :param timestamp:
+        The timestamps of the series, in ascending order.
+
+    :param values:
+        The values of the series.
+
+    :param width:
+        The number of time columns.
+
+    :return:
+        Returns a tuple holding the timestamps and values of the decimated
+        series.  Each non-empty column contributes its first timestamp with
+        its lowest value followed by its last timestamp with its highest
+        value.  Series with no more than two values per column are returned
+        unchanged.
+
+    :type timestamp: numpy.ndarray
+    :type values:    numpy.ndarray
+    :type width:     int
+    :rtype:          tuple
+
+    """
+
+    number_values = len(timestamp)
+    if number_values > 2 * width:
+        first = int(timestamp[0])
+        span = int(timestamp[-1]) - first + 1
+        column = (timestamp - first) * width // span
+
+        starts = numpy.concatenate(
+            ([ 0 ], numpy.flatnonzero(column[1:] != column[:-1]) + 1)
+        )
+        ends = numpy.concatenate((starts[1:], [ number_values ])) - 1
+
+        result_timestamp = numpy.empty(2 * len(starts), dtype = 'int64')
+        result_timestamp[0::2] = timestamp[starts]
+        result_timestamp[1::2] = timestamp[ends]
+
+        result_values = numpy.empty(2 * len(starts), dtype = 'float64')
+        result_values[0::2] = numpy.minimum.reduceat(values, starts)
+        result_values[1::2] = numpy.maximum.reduceat(values, starts)
+
+        result = (result_timestamp, result_values)
+    else:
+        result = (timestamp, values)
+
+    return result
+
+
+def initialize_worker(renderer):
+    """
+    Function used to initialize each worker process used by
+    PlotRenderer.render_many.
+
+    :param renderer:
+        The renderer used by the worker.
+
+    :type renderer: PlotRenderer
+
+    """
+
+    global worker_renderer
+    worker_renderer = renderer
+
+
+def render_in_worker(parameters : dict) -> bytes:
+    """
+    Function used by worker processes to render a single plot.
+
+    :param parameters:
+        The plot parameters.
+
+    :return:
+        Returns the plot image.
+
+    :type parameters: dict
+    :rtype:           bytes
+
+    """
+
+    return worker_renderer.render(**parameters)
+
+###############################################################################
+# Class PlotRenderer:
+#
+
+class PlotRenderer(object):
+    """
+    Class that renders latency plots from latency data held locally.
+
+    Data is supplied once and any number of plots can then be rendered from
+    it.  Recent entries are treated as aggregations of a single sample.
+    History plots show the average latency of each entry.  Histograms count
+    each entry's average latency once per sample it represents.
+
+    """
+
+    def __init__(self, recent = (), aggregated = ()):
+        """
+        Method that initializes the PlotRenderer class.
+
+        :param recent:
+            The recent entries to plot.  You can supply the list of
+            LatencyEntry instances or the LatencyFrame returned by
+            SpeedSentry.latency_list, or any LatencyFrame.
+
+        :param aggregated:
+            The aggregated entries to plot.  You can supply the list of
+            AggregatedLatencyEntry instances or the LatencyFrame returned by
+            SpeedSentry.latency_list.
+
+        :type recent:     list or LatencyFrame
+        :type aggregated: list or LatencyFrame
+
+        """
+
+        super().__init__()
+
+        if numpy is None or matplotlib is None:
+            raise ImportError(
+                "the numpy and matplotlib packages are required to render "
+                "plots."
+            )
+
+        if not isinstance(recent, latency_frame.LatencyFrame):
+            recent = latency_frame.LatencyFrame.from_entries(
+                recent,
+                aggregated = False
+            )
+
+        if not isinstance(aggregated, latency_frame.LatencyFrame):
+            aggregated = latency_frame.LatencyFrame.from_entries(
+                aggregated,
+                aggregated = True
+            )
+
+        if len(aggregated):
+            frame = latency_frame.LatencyFrame.concatenate(
+                (recent, aggregated)
+            )
+        else:
+            frame = recent
+
+        self.__frame = frame.order_by('timestamp')
+
+
+    @property
+    def frame(self):
+        """
+        Read-only property holding the plotted data, sorted by timestamp.
+
+        :type: LatencyFrame
+
+        """
+
+        return self.__frame
+
+
+    def render(self, **kwargs) -> bytes:
+        """
+        Method you can use to render a plot.
+
+        :param monitor_id:
+            An optional monitor ID.  Data from all monitors is used if this
+            parameter is not included.
+
+        :param region_id:
+            An optional region ID.  Data from all regions is used if this
+            parameter is not included.
+
+        :param start_timestamp:
+            An optional Unix timestamp indicating the start of the plotted
+            data.  If excluded, the oldest data is included.
+
+        :param end_timestamp:
+            An optional Unix timestamp indicating the end of the plotted
+            data.  If excluded, the newest data is included.
+
+        :param title:
+            An optional title to place on the plot.
+
+        :param x_axis_label:
+            An optional label to apply to the horizontal axis.
+
+        :param y_axis_label:
+            An optional label to apply to the vertical axis.
+
+        :param minimum_latency:
+            The lower bound for the latency values to plot.  If excluded, a
+            bound is selected based on the data.
+
+        :param maximum_latency:
+            The upper bound for the latency values to plot.  If excluded, a
+            bound is selected based on the data.
+
+        :param log_scale:
+            A boolean value indicating that a log scale should be used for
+            latency values.  This value is only used for history plots.
+
+        :param width:
+            The desired plot width, in pixels.  Value can range from 100 to
+            2048.  The value 1024 will be used by default.
+
+        :param height:
+            The desired plot height, in pixels.  Value can range from 100 to
+            2048.  The value 768 will be used by default.
+
+        :param plot_type:
+            The plot type to be generated.  Supported values are "history"
+            and "histogram".  A history plot will be generated by default.
+
+        :param format:
+            The format of the returned data.  Value can be "jpg" or "png".
+            PNG encoded plots will be returned by default.
+
+        :return:
+            Returns a bytes object holding the plot image.
+
+        :type monitor_id:      int
+        :type region_id:       int
+        :type start_timestamp: int
+        :type end_timestamp:   int
+        :type title:           str
+        :type x_axis_label:    str
+        :type y_axis_label:    str
+        :type minimum_latency: float
+        :type maximum_latency: float
+        :type log_scale:       bool
+        :type width:           int
+        :type height:          int
+        :type plot_type:       str
+        :type format:          str
+        :rtype:                bytes
+
+        """
+
+        unknown = set(kwargs) - PLOT_PARAMETERS
+        if unknown:
+            raise ValueError(
+                "unknown plot parameters %s"%", ".join(sorted(unknown))
+            )
+
+        width = int(kwargs.get('width', DEFAULT_WIDTH))
+        height = int(kwargs.get('height', DEFAULT_HEIGHT))
+        if not MINIMUM_SIZE <= width <= MAXIMUM_SIZE or \
+           not MINIMUM_SIZE <= height <= MAXIMUM_SIZE    :
+            raise ValueError("invalid plot size")
+
+        plot_type = kwargs.get('plot_type', "history")
+        if plot_type not in PLOT_TYPES:
+            raise ValueError("invalid plot type %r"%plot_type)
+
+        image_format = kwargs.get('format', "png")
+        if image_format not in FORMATS:
+            raise ValueError("invalid format %r"%image_format)
+
+        frame = self.__frame.between(
+            kwargs.get('start_timestamp'),
+            kwargs.get('end_timestamp')
+        )
+        if kwargs.get('monitor_id') is not None:
+            frame = frame.monitor(kwargs['monitor_id'])
+        if kwargs.get('region_id') is not None:
+            frame = frame.region(kwargs['region_id'])
+
+        figure = matplotlib.figure.Figure(
+            figsize = (width / DOTS_PER_INCH, height / DOTS_PER_INCH),
+            dpi = DOTS_PER_INCH
+        )
+        canvas = matplotlib.backends.backend_agg.FigureCanvasAgg(figure)
+        axes = figure.add_subplot(1, 1, 1)
+
+        minimum_latency = kwargs.get('minimum_latency')
+        maximum_latency = kwargs.get('maximum_latency')
+        if plot_type == "history":
+            self.__draw_history(
+                axes,
+                frame,
+                width,
+                minimum_latency,
+                maximum_latency,
+                bool(kwargs.get('log_scale', False))
+            )
+            x_axis_label = "Date/Time"
+            y_axis_label = "Latency (seconds)"
+        else:
+            self.__draw_histogram(
+                axes,
+                frame,
+                width,
+                minimum_latency,
+                maximum_latency
+            )
+            x_axis_label = "Latency (seconds)"
+            y_axis_label = "Samples"
+
+        axes.set_xlabel(kwargs.get('x_axis_label', x_axis_label))
+        axes.set_ylabel(kwargs.get('y_axis_label', y_axis_label))
+        if kwargs.get('title') is not None:
+            axes.set_title(kwargs['title'])
+
+        figure.tight_layout()
+
+        output = io.BytesIO()
+        canvas.print_figure(
+            output,
+            format = FORMATS[image_format],
+            dpi = DOTS_PER_INCH
+        )
+
+        return output.getvalue()
+
+
+    def render_many(
+        self,
+        requests,
+        processes : int = None,
+        context = None
+        ) -> list:
+        """
+        Method you can use to render a number of plots in parallel using a
+        pool of worker processes.  On Linux, worker processes are forked by
+        default so the data is shared with them rather than copied to each.
+        Other platforms use their default start method, as forking a process
+        that uses system frameworks is unsafe on macOS.
+
+        :param requests:
+            An iterable of dictionaries, each holding the parameters for one
+            plot as accepted by the render method.
+
+        :param processes:
+            The number of worker processes.  A value of None uses one process
+            per CPU.  A value of 1 renders the plots in this process.
+
+        :param context:
+            An optional multiprocessing context used to start the worker
+            processes.  A value of None selects the context as described
+            above.
+
+        :return:
+            Returns a list holding the plot images, in the order requested.
+
+        :type requests:  iterable of dict
+        :type processes: int or None
+        :type context:   multiprocessing.context.BaseContext or None
+        :rtype:          list
+
+        """
+
+        requests = list(requests)
+        if processes == 1 or len(requests) <= 1:
+            result = [ self.render(**request) for request in requests ]
+        else:
+            if context is None:
+                if sys.platform.startswith("linux"):
+                    context = multiprocessing.get_context("fork")
+                else:
+                    context = multiprocessing.get_context()
+
+            with context.Pool(
+                    processes,
+                    initializer = initialize_worker,
+                    initargs = (self,)
+                ) as pool:
+                result = pool.map(render_in_worker, requests, chunksize = 1)
+
+        return result
+
+
+    @staticmethod
+    def __draw_history(
+        axes,
+        frame,
+        width : int,
+        minimum_latency : float,
+        maximum_latency : float,
+        log_scale : bool
+        ):
+        """
+        Method used internally to draw a history plot.
+
+        :param axes:
+            The axes to draw on.
+
+        :param frame:
+            The data to plot, sorted by timestamp.
+
+        :param width:
+            The plot width, in pixels.
+
+        :param minimum_latency:
+            The lower latency bound or None.
+
+        :param maximum_latency:
+            The upper latency bound or None.
+
+        :param log_scale:
+            If True, a log scale is used for latency values.
+
+        :type axes:            matplotlib.axes.Axes
+        :type frame:           LatencyFrame
+        :type width:           int
+        :type minimum_latency: float or None
+        :type maximum_latency: float or None
+        :type log_scale:       bool
+
+        """
+
+        timestamp, latency = decimate(frame.timestamp, frame.average, width)
+        axes.plot(
+            timestamp.astype('datetime64[s]'),
+            latency,
+            linewidth = 1
+        )
+
+        if log_scale:
+            axes.set_yscale('log')
+
+        if minimum_latency is not None or maximum_latency is not None:
+            axes.set_ylim(minimum_latency, maximum_latency)
+
+        axes.grid(True)
+
+
+    @staticmethod
+    def __draw_histogram(
+        axes,
+        frame,
+        width : int,
+        minimum_latency : float,
+        maximum_latency : float
+        ):
+        """
+        Method used internally to draw a histogram.
+
+        :param axes:
+            The axes to draw on.
+
+        :param frame:
+            The data to plot.
+
+        :param width:
+            The plot width, in pixels.
+
+        :param minimum_latency:
+            The lower latency bound or None.
+
+        :param maximum_latency:
+            The upper latency bound or None.
+
+        :type axes:            matplotlib.axes.Axes
+        :type frame:           LatencyFrame
+        :type width:           int
+        :type minimum_latency: float or None
+        :type maximum_latency: float or None
+
+        """
+
+        average = frame.average
+        if len(average):
+            low = (
+                minimum_latency if minimum_latency is not None
+                    else average.min()
+            )
+            high = (
+                maximum_latency if maximum_latency is not None
+                    else average.max()
+            )
+        else:
+            low = minimum_latency if minimum_latency is not None else 0.0
+            high = maximum_latency if maximum_latency is not None else 1.0
+
+        if high <= low:
+            high = low + 1.0
+
+        counts, edges = numpy.histogram(
+            average,
+            bins = max(1, width // PIXELS_PER_BIN),
+            range = (low, high),
+            weights = frame.number_samples
+        )
+
+        axes.bar(
+            edges[:-1],
+            counts,
+            width = numpy.diff(edges),
+            align = 'edge'
+        )
+        axes.set_xlim(low, high)
+        axes.grid(True, axis = 'y')
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
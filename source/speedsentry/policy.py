@@ -0,0 +1,1018 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that provides the timeout, retry, hedging, and circuit breaker
+policies used when issuing requests.  The classes in this module perform no
+I/O and can be shared by the synchronous and asynchronous servers.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import time
+import random
+import threading
+import collections
+
+from .exceptions import DeadlineExceededException
+from . import dictionary_object as dictionary_object
+from . import fork_safety as fork_safety
+
+###############################################################################
+# Globals:
+#
+
+DEFAULT_CONNECT_TIMEOUT = 10.0
+"""
+The default time, in seconds, allowed to establish a connection.
+
+"""
+
+DEFAULT_READ_TIMEOUT = 60.0
+"""
+The default time, in seconds, allowed between bytes received from the server.
+
+"""
+
+MINIMUM_TIMEOUT = 0.001
+"""
+The smallest timeout, in seconds, passed to the transport when a deadline is
+nearly exhausted.
+
+"""
+
+DEFAULT_MAXIMUM_RETRIES = 3
+"""
+The default number of times a failed idempotent request is retried.
+
+"""
+
+DEFAULT_INITIAL_BACKOFF = 0.2
+"""
+The default upper bound, in seconds, of the delay before the first retry.
+
+"""
+
+DEFAULT_MAXIMUM_BACKOFF = 10.0
+"""
+The default upper bound, in seconds, of the delay before any retry.
+
+"""
+
+DEFAULT_RETRYABLE_STATUS_CODES = frozenset((429, 500, 502, 503, 504))
+"""
+HTTP status codes that indicate a transient server side failure.
+
+"""
+
+DEFAULT_IDEMPOTENT_ACTIONS = frozenset(('get', 'list', 'plot'))
+"""
+The final slug components of endpoints that can safely be retried.
+
+"""
+
+DEFAULT_FAILURE_THRESHOLD = 5
+"""
+The default number of consecutive failures that will open a circuit breaker.
+
+"""
+
+DEFAULT_RECOVERY_TIMEOUT = 30.0
+"""
+The default time, in seconds, a circuit breaker stays open before a trial
+request is allowed.
+
+"""
+
+DEFAULT_HEDGE_PERCENTILE = 95.0
+"""
+The default latency percentile after which a duplicate request is sent.
+
+"""
+
+DEFAULT_HEDGE_INITIAL_DELAY = 0.1
+"""
+The default hedge delay, in seconds, used until enough latency samples have
+been collected for an endpoint.
+
+"""
+
+DEFAULT_HEDGE_MINIMUM_DELAY = 0.005
+"""
+The default lower bound, in seconds, of the hedge delay.
+
+"""
+
+DEFAULT_HEDGE_WINDOW = 200
+"""
+The default number of recent latency samples kept per endpoint.
+
+"""
+
+DEFAULT_HEDGE_MINIMUM_SAMPLES = 20
+"""
+The default number of samples needed before the measured percentile is used.
+
+"""
+
+DEFAULT_HEDGE_MAXIMUM_WORKERS = 4
+"""
+The default number of worker threads used to send duplicate, hedged, requests.
+
+"""
+
+DEFAULT_HEDGED_ACTIONS = frozenset(('get', 'list'))
+"""
+The final slug components of endpoints that can be hedged.
+
+"""
+
+PolicyStatistics = dictionary_object.build_read_only_class(
+    "PolicyStatistics",
+    "You can use this class to hold statistics on request retries and the "
+    "state of the circuit breaker.",
+    {
+        "retries" :
+            "The number of requests retried after a transient failure.",
+        "timeouts" :
+            "The number of requests that timed out.",
+        "circuit_state" :
+            "The circuit breaker state, one of \"closed\", \"open\", or "
+            "\"half_open\".",
+        "consecutive_failures" :
+            "The number of consecutive failed requests.",
+        "circuit_opens" :
+            "The number of times the circuit breaker has opened.",
+        "circuit_rejections" :
+            "The number of requests rejected because the circuit breaker was "
+            "open.",
+        "hedges" :
+            "The number of duplicate, hedged, requests sent.",
+        "hedges_won" :
+            "The number of hedged requests that completed before the original "
+            "request."
+    }
+)
+"""
+Class holding retry and circuit breaker statistics.
+
+"""
+
+###############################################################################
+# Class Deadline:
+#
+
+class Deadline(object):
+    """
+    Class that tracks the time remaining for a single call, including any
+    retries and time delta refreshes.
+
+    """
+
+    def __init__(self, timeout : float):
+        """
+        Method that initializes the Deadline class.
+
+        :param timeout:
+            The time, in seconds, allowed for the call.
+
+        :type timeout: float
+
+        """
+
+        super().__init__()
+
+        self.__timeout = timeout
+        self.__expires = time.monotonic() + timeout
+
+
+    @property
+    def timeout(self):
+        """
+        Read-only property holding the time, in seconds, originally allowed
+        for the call.
+
+        :type: float
+
+        """
+
+        return self.__timeout
+
+
+    def remaining(self) -> float:
+        """
+        Method you can use to determine the time remaining.
+
+        :return:
+            Returns the time remaining, in seconds.  The value is never
+            negative.
+
+        :rtype: float
+
+        """
+
+        return max(0.0, self.__expires - time.monotonic())
+
+
+    def check(self, slug : str):
+        """
+        Method you can use to raise an exception if the deadline has passed.
+
+        :param slug:
+            The slug of the call, used in the exception message.
+
+        :type slug: str
+
+        """
+
+        if self.__expires <= time.monotonic():
+            raise DeadlineExceededException(
+                status_message = "%s : deadline of %g s exceeded"%(
+                    slug,
+                    self.__timeout
+                )
+            )
+
+###############################################################################
+# Class RetryPolicy:
+#
+
+class RetryPolicy(object):
+    """
+    Class that determines request timeouts and if, and when, a failed
+    request should be retried.  Only requests to idempotent endpoints are
+    retried.  Retry delays use exponential backoff with full jitter.
+
+    """
+
+    def __init__(
+        self,
+        connect_timeout : float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout : float = DEFAULT_READ_TIMEOUT,
+        maximum_retries : int = DEFAULT_MAXIMUM_RETRIES,
+        initial_backoff : float = DEFAULT_INITIAL_BACKOFF,
+        maximum_backoff : float = DEFAULT_MAXIMUM_BACKOFF,
+        retryable_status_codes = DEFAULT_RETRYABLE_STATUS_CODES,
+        idempotent_actions = DEFAULT_IDEMPOTENT_ACTIONS
+        ):
+        """
+        Method that initializes the RetryPolicy class.
+
+        :param connect_timeout:
+            The time, in seconds, allowed to establish a connection.  A value
+            of None means no limit.
+
+        :param read_timeout:
+            The time, in seconds, allowed between bytes received from the
+            server.  A value of None means no limit.
+
+        :param maximum_retries:
+            The maximum number of retries of a single call.  A value of 0
+            disables retries.
+
+        :param initial_backoff:
+            The upper bound, in seconds, of the delay before the first retry.
+            The bound doubles with each retry.
+
+        :param maximum_backoff:
+            The upper bound, in seconds, of the delay before any retry.
+
+        :param retryable_status_codes:
+            HTTP status codes that indicate a transient failure.
+
+        :param idempotent_actions:
+            The final slug components of endpoints that can be retried.
+
+        :type connect_timeout:        float or None
+        :type read_timeout:           float or None
+        :type maximum_retries:        int
+        :type initial_backoff:        float
+        :type maximum_backoff:        float
+        :type retryable_status_codes: iterable of int
+        :type idempotent_actions:     iterable of str
+
+        """
+
+        super().__init__()
+
+        self.__connect_timeout = connect_timeout
+        self.__read_timeout = read_timeout
+        self.__maximum_retries = maximum_retries
+        self.__initial_backoff = initial_backoff
+        self.__maximum_backoff = maximum_backoff
+        self.__retryable_status_codes = frozenset(retryable_status_codes)
+        self.__idempotent_actions = frozenset(idempotent_actions)
+
+
+    @property
+    def connect_timeout(self):
+        """
+        Read-only property holding the connect timeout, in seconds.
+
+        :type: float or None
+
+        """
+
+        return self.__connect_timeout
+
+
+    @property
+    def read_timeout(self):
+        """
+        Read-only property holding the read timeout, in seconds.
+
+        :type: float or None
+
+        """
+
+        return self.__read_timeout
+
+
+    @property
+    def maximum_retries(self):
+        """
+        Read-only property holding the maximum number of retries per call.
+
+        :type: int
+
+        """
+
+        return self.__maximum_retries
+
+
+    def timeouts(self, deadline : Deadline = None):
+        # -> Union[tuple, NoneType]
+        """
+        Method you can use to obtain the connect and read timeouts for a
+        single attempt.  Timeouts are reduced so that the attempt cannot
+        outlive the deadline.
+
+        :param deadline:
+            The deadline for the call, if any.
+
+        :return:
+            Returns a tuple holding the connect and read timeouts, in seconds.
+            Either value may be None.
+
+        :type deadline: Deadline or None
+        :rtype:         tuple
+
+        """
+
+        connect_timeout = self.__connect_timeout
+        read_timeout = self.__read_timeout
+        if deadline is not None:
+            remaining = max(deadline.remaining(), MINIMUM_TIMEOUT)
+            if connect_timeout is None or connect_timeout > remaining:
+                connect_timeout = remaining
+            if read_timeout is None or read_timeout > remaining:
+                read_timeout = remaining
+
+        return (connect_timeout, read_timeout)
+
+
+    def is_idempotent(self, slug : str) -> bool:
+        """
+        Method you can use to determine if an endpoint can be retried.
+
+        :param slug:
+            The endpoint slug.
+
+        :return:
+            Returns True if the endpoint is idempotent.
+
+        :type slug: str
+        :rtype:     bool
+
+        """
+
+        return slug.rstrip("/").rsplit("/", 1)[-1] in self.__idempotent_actions
+
+
+    def is_retryable_status(self, status_code : int) -> bool:
+        """
+        Method you can use to determine if an HTTP status code indicates a
+        transient failure.
+
+        :param status_code:
+            The HTTP status code.  A value of None is never retryable.
+
+        :return:
+            Returns True if the status code indicates a transient failure.
+
+        :type status_code: int or None
+        :rtype:            bool
+
+        """
+
+        return status_code in self.__retryable_status_codes
+
+
+    def may_retry(self, slug : str, attempt : int) -> bool:
+        """
+        Method you can use to determine if a failed attempt may be retried.
+
+        :param slug:
+            The endpoint slug.
+
+        :param attempt:
+            The zero based index of the failed attempt.
+
+        :return:
+            Returns True if another attempt may be made.
+
+        :type slug:    str
+        :type attempt: int
+        :rtype:        bool
+
+        """
+
+        return attempt < self.__maximum_retries and self.is_idempotent(slug)
+
+
+    def backoff(self, attempt : int) -> float:
+        """
+        Method you can use to obtain the delay before a retry.
+
+        :param attempt:
+            The zero based index of the failed attempt.
+
+        :return:
+            Returns the delay, in seconds.
+
+        :rtype: float
+
+        """
+
+        bound = min(
+            self.__maximum_backoff,
+            self.__initial_backoff * (2 ** attempt)
+        )
+
+        return random.uniform(0, bound)
+
+###############################################################################
+# Class LatencyEstimator:
+#
+
+class LatencyEstimator(object):
+    """
+    Class that keeps a rolling window of recent response times per endpoint.
+    The class is thread safe.
+
+    """
+
+    def __init__(self, window : int = DEFAULT_HEDGE_WINDOW):
+        """
+        Method that initializes the LatencyEstimator class.
+
+        :param window:
+            The number of recent samples kept per endpoint.
+
+        :type window: int
+
+        """
+
+        super().__init__()
+
+        self.__window = window
+        self.__samples = dict()
+        self.__lock = threading.Lock()
+        self.__fork_detector = fork_safety.ForkDetector()
+
+
+    def reset_after_fork(self):
+        """
+        Method you can call in a forked child process to replace the lock
+        inherited from the parent process.  Recorded samples are kept.  The
+        method does nothing if the process has not forked.
+
+        """
+
+        if self.__fork_detector.forked():
+            self.__lock = threading.Lock()
+
+
+    def record(self, slug : str, elapsed : float):
+        """
+        Method you can use to record a response time.
+
+        :param slug:
+            The endpoint slug.
+
+        :param elapsed:
+            The response time, in seconds.
+
+        :type slug:    str
+        :type elapsed: float
+
+        """
+
+        with self.__lock:
+            samples = self.__samples.get(slug)
+            if samples is None:
+                samples = collections.deque(maxlen = self.__window)
+                self.__samples[slug] = samples
+
+            samples.append(elapsed)
+
+
+    def number_samples(self, slug : str) -> int:
+        """
+        Method you can use to determine the number of samples held for an
+        endpoint.
+
+        :param slug:
+            The endpoint slug.
+
+        :return:
+            Returns the number of samples.
+
+        :type slug: str
+        :rtype:     int
+
+        """
+
+        with self.__lock:
+            samples = self.__samples.get(slug)
+            return len(samples) if samples is not None else 0
+
+
+    def percentile(self, slug : str, percentile : float):
+        # -> Union[float, NoneType]
+        """
+        Method you can use to obtain a response time percentile for an
+        endpoint using the nearest rank method.
+
+        :param slug:
+            The endpoint slug.
+
+        :param percentile:
+            The desired percentile, from 0 to 100.
+
+        :return:
+            Returns the response time, in seconds.  The value None is returned
+            if no samples have been recorded.
+
+        :type slug:       str
+        :type percentile: float
+        :rtype:           float or None
+
+        """
+
+        with self.__lock:
+            samples = self.__samples.get(slug)
+            ordered = sorted(samples) if samples else None
+
+        if ordered:
+            rank = int(round(percentile / 100.0 * (len(ordered) - 1)))
+            result = ordered[min(max(rank, 0), len(ordered) - 1)]
+        else:
+            result = None
+
+        return result
+
+
+    def percentiles(self, percentile : float) -> dict:
+        """
+        Method you can use to obtain a response time percentile for every
+        endpoint.
+
+        :param percentile:
+            The desired percentile, from 0 to 100.
+
+        :return:
+            Returns a dictionary of response times, in seconds, keyed by slug.
+
+        :type percentile: float
+        :rtype:           dict
+
+        """
+
+        with self.__lock:
+            slugs = list(self.__samples)
+
+        return { slug : self.percentile(slug, percentile) for slug in slugs }
+
+###############################################################################
+# Class HedgingPolicy:
+#
+
+class HedgingPolicy(object):
+    """
+    Class that determines if, and when, a duplicate request should be sent
+    for a slow read request.  The hedge delay tracks a percentile of recent
+    response times for each endpoint so that only the slowest responses are
+    duplicated.
+
+    """
+
+    def __init__(
+        self,
+        percentile : float = DEFAULT_HEDGE_PERCENTILE,
+        initial_delay : float = DEFAULT_HEDGE_INITIAL_DELAY,
+        minimum_delay : float = DEFAULT_HEDGE_MINIMUM_DELAY,
+        window : int = DEFAULT_HEDGE_WINDOW,
+        minimum_samples : int = DEFAULT_HEDGE_MINIMUM_SAMPLES,
+        maximum_workers : int = DEFAULT_HEDGE_MAXIMUM_WORKERS,
+        hedged_actions = DEFAULT_HEDGED_ACTIONS
+        ):
+        """
+        Method that initializes the HedgingPolicy class.
+
+        :param percentile:
+            The response time percentile, from 0 to 100, after which a
+            duplicate request is sent.
+
+        :param initial_delay:
+            The hedge delay, in seconds, used until minimum_samples responses
+            have been measured for an endpoint.
+
+        :param minimum_delay:
+            The lower bound, in seconds, of the hedge delay.
+
+        :param window:
+            The number of recent response times kept per endpoint.
+
+        :param minimum_samples:
+            The number of response times needed before the measured
+            percentile is used.
+
+        :param maximum_workers:
+            The number of worker threads used by each server to send
+            duplicate requests.  Original requests are sent on their own
+            threads.  No duplicate is sent while every worker is busy.
+
+        :param hedged_actions:
+            The final slug components of endpoints that can be hedged.
+
+        :type percentile:      float
+        :type initial_delay:   float
+        :type minimum_delay:   float
+        :type window:          int
+        :type minimum_samples: int
+        :type maximum_workers: int
+        :type hedged_actions:  iterable of str
+
+        """
+
+        super().__init__()
+
+        self.__percentile = percentile
+        self.__initial_delay = initial_delay
+        self.__minimum_delay = minimum_delay
+        self.__minimum_samples = minimum_samples
+        self.__maximum_workers = maximum_workers
+        self.__hedged_actions = frozenset(hedged_actions)
+        self.__estimator = LatencyEstimator(window)
+
+
+    @property
+    def percentile(self):
+        """
+        Read-only property holding the percentile used to set the hedge
+        delay.
+
+        :type: float
+
+        """
+
+        return self.__percentile
+
+
+    @property
+    def maximum_workers(self):
+        """
+        Read-only property holding the number of worker threads used by each
+        server to send hedged requests.
+
+        :type: int
+
+        """
+
+        return self.__maximum_workers
+
+
+    @property
+    def estimator(self):
+        """
+        Read-only property holding the rolling per-endpoint latency estimate.
+
+        :type: LatencyEstimator
+
+        """
+
+        return self.__estimator
+
+
+    def is_hedged(self, slug : str) -> bool:
+        """
+        Method you can use to determine if requests to an endpoint can be
+        hedged.
+
+        :param slug:
+            The endpoint slug.
+
+        :return:
+            Returns True if the endpoint can be hedged.
+
+        :type slug: str
+        :rtype:     bool
+
+        """
+
+        return slug.rstrip("/").rsplit("/", 1)[-1] in self.__hedged_actions
+
+
+    def delay(self, slug : str) -> float:
+        """
+        Method you can use to obtain the time to wait for a response before
+        sending a duplicate request.
+
+        :param slug:
+            The endpoint slug.
+
+        :return:
+            Returns the hedge delay, in seconds.
+
+        :type slug: str
+        :rtype:     float
+
+        """
+
+        if self.__estimator.number_samples(slug) < self.__minimum_samples:
+            result = self.__initial_delay
+        else:
+            result = self.__estimator.percentile(slug, self.__percentile)
+
+        return max(result, self.__minimum_delay)
+
+
+    def record(self, slug : str, elapsed : float):
+        """
+        Method you can use to record a measured response time.
+
+        :param slug:
+            The endpoint slug.
+
+        :param elapsed:
+            The response time, in seconds.
+
+        :type slug:    str
+        :type elapsed: float
+
+        """
+
+        self.__estimator.record(slug, elapsed)
+
+###############################################################################
+# Class CircuitBreaker:
+#
+
+class CircuitBreaker(object):
+    """
+    Class that stops requests from being sent while the service appears to be
+    degraded.  The breaker opens after a number of consecutive failures.  Once
+    the recovery timeout has passed a single trial request is allowed.  The
+    breaker closes if the trial succeeds and reopens if it fails.
+
+    A breaker may be shared by several servers and threads talking to the
+    same service.
+
+    """
+
+    CLOSED = "closed"
+    """
+    State value indicating requests are allowed.
+
+    """
+
+    OPEN = "open"
+    """
+    State value indicating requests are rejected.
+
+    """
+
+    HALF_OPEN = "half_open"
+    """
+    State value indicating a single trial request is in progress.
+
+    """
+
+    def __init__(
+        self,
+        failure_threshold : int = DEFAULT_FAILURE_THRESHOLD,
+        recovery_timeout : float = DEFAULT_RECOVERY_TIMEOUT
+        ):
+        """
+        Method that initializes the CircuitBreaker class.
+
+        :param failure_threshold:
+            The number of consecutive failures that will open the breaker.  A
+            value of None disables the breaker.
+
+        :param recovery_timeout:
+            The time, in seconds, the breaker stays open before a trial
+            request is allowed.
+
+        :type failure_threshold: int or None
+        :type recovery_timeout:  float
+
+        """
+
+        super().__init__()
+
+        self.__failure_threshold = failure_threshold
+        self.__recovery_timeout = recovery_timeout
+
+        self.__state = CircuitBreaker.CLOSED
+        self.__opened_at = 0
+        self.__consecutive_failures = 0
+        self.__opens = 0
+        self.__rejections = 0
+
+        self.__lock = threading.Lock()
+        self.__fork_detector = fork_safety.ForkDetector()
+
+
+    @property
+    def state(self):
+        """
+        Read-only property holding the current breaker state.
+
+        :type: str
+
+        """
+
+        return self.__state
+
+
+    @property
+    def consecutive_failures(self):
+        """
+        Read-only property holding the number of consecutive failures.
+
+        :type: int
+
+        """
+
+        return self.__consecutive_failures
+
+
+    @property
+    def opens(self):
+        """
+        Read-only property holding the number of times the breaker opened.
+
+        :type: int
+
+        """
+
+        return self.__opens
+
+
+    @property
+    def rejections(self):
+        """
+        Read-only property holding the number of rejected requests.
+
+        :type: int
+
+        """
+
+        return self.__rejections
+
+
+    def allow(self) -> bool:
+        """
+        Method you should call before sending a request.
+
+        :return:
+            Returns True if the request may be sent.  Returns False if the
+            request should be rejected.
+
+        :rtype: bool
+
+        """
+
+        with self.__lock:
+            if self.__state == CircuitBreaker.CLOSED:
+                result = True
+            elif self.__state == CircuitBreaker.OPEN and \
+                 time.monotonic() - self.__opened_at >= \
+                     self.__recovery_timeout:
+                self.__state = CircuitBreaker.HALF_OPEN
+                result = True
+            else:
+                self.__rejections += 1
+                result = False
+
+        return result
+
+
+    def record_success(self):
+        """
+        Method you should call when the server responds, even with an error
+        status that does not indicate a server side failure.
+
+        """
+
+        with self.__lock:
+            self.__consecutive_failures = 0
+            self.__state = CircuitBreaker.CLOSED
+
+
+    def record_failure(self):
+        """
+        Method you should call when a request fails due to a timeout, a
+        connection error, or a transient server side failure.
+
+        """
+
+        with self.__lock:
+            self.__consecutive_failures += 1
+            if self.__state == CircuitBreaker.HALF_OPEN:
+                self.__open()
+            elif self.__state == CircuitBreaker.CLOSED            and \
+                 self.__failure_threshold is not None              and \
+                 self.__consecutive_failures >= self.__failure_threshold:
+                self.__open()
+
+
+    def record_abandoned(self):
+        """
+        Method you should call when a request ends without an outcome, for
+        example because the caller's own deadline expired.  The failure count
+        is unchanged.  If the request was the trial request, the breaker
+        returns to the open state so that the next request becomes the trial.
+
+        """
+
+        with self.__lock:
+            if self.__state == CircuitBreaker.HALF_OPEN:
+                self.__state = CircuitBreaker.OPEN
+
+
+    def reset(self):
+        """
+        Method you can use to force the breaker closed.
+
+        """
+
+        with self.__lock:
+            self.__consecutive_failures = 0
+            self.__state = CircuitBreaker.CLOSED
+
+
+    def reset_after_fork(self):
+        """
+        Method you can call in a forked child process to replace the lock
+        inherited from the parent process.  The breaker state is kept.  The
+        method does nothing if the process has not forked.
+
+        """
+
+        if self.__fork_detector.forked():
+            self.__lock = threading.Lock()
+
+
+    def __open(self):
+        """
+        Method used internally to open the breaker.  The caller must hold the
+        lock.
+
+        """
+
+        self.__state = CircuitBreaker.OPEN
+        self.__opened_at = time.monotonic()
+        self.__opens += 1
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
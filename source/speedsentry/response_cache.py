@@ -0,0 +1,501 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that provides a size bounded, time limited cache of responses
+from endpoints whose data changes rarely.
+
+Each cached endpoint has its own time to live.  Once an entry expires it can
+still be returned for a short period while a fresh copy is fetched in the
+background.  When the cache is full the least recently used entry is
+discarded.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import time
+import threading
+import collections
+
+from . import dictionary_object as dictionary_object
+from . import fork_safety as fork_safety
+from . import single_flight as single_flight
+
+###############################################################################
+# Globals:
+#
+
+DEFAULT_TIME_TO_LIVE = {
+    "/v1/capabilities/get" : 300,
+    "/v1/hosts/get" : 300,
+    "/v1/hosts/list" : 300,
+    "/v1/regions/get" : 3600,
+    "/v1/regions/list" : 3600
+}
+"""
+The default time, in seconds, responses are considered fresh, keyed by
+endpoint slug.  Endpoints not listed are not cached.
+
+"""
+
+DEFAULT_STALE_WHILE_REVALIDATE = 60
+"""
+The default time, in seconds, an expired response can be returned while a
+fresh copy is fetched in the background.
+
+"""
+
+DEFAULT_MAXIMUM_ENTRIES = 256
+"""
+The default maximum number of cached responses.
+
+"""
+
+DEFAULT_INVALIDATIONS = {
+    "/v1/monitors/update" : (
+        "/v1/hosts/get",
+        "/v1/hosts/list",
+        "/v1/monitors/get",
+        "/v1/monitors/list",
+        "/v1/multiple/list"
+    )
+}
+"""
+The cached endpoints affected by each updating endpoint, keyed by the slug of
+the updating endpoint.
+
+"""
+
+CacheStatistics = dictionary_object.build_read_only_class(
+    "CacheStatistics",
+    "You can use this class to hold statistics on the response cache.",
+    {
+        "hits" :
+            "The number of calls answered with a fresh cached response.",
+        "stale_hits" :
+            "The number of calls answered with an expired cached response "
+            "while a fresh copy was fetched.",
+        "misses" :
+            "The number of calls that required a request.",
+        "refreshes" :
+            "The number of background refreshes performed.",
+        "refresh_failures" :
+            "The number of background refreshes that failed.",
+        "evictions" :
+            "The number of responses discarded to make room for others.",
+        "invalidations" :
+            "The number of responses discarded by invalidation.",
+        "entries" :
+            "The number of responses currently cached."
+    }
+)
+"""
+Class holding response cache statistics.
+
+"""
+
+###############################################################################
+# Class ResponseCache:
+#
+
+class ResponseCache(object):
+    """
+    Class that caches responses from endpoints whose data changes rarely.
+    The class is thread safe.  A child process forked after the cache is
+    created keeps the cached responses.
+
+    """
+
+    class _Entry(object):
+        """
+        Class used internally to hold a single cached response.
+
+        """
+
+        __slots__ = ('response', 'expires', 'stale_until', 'refreshing')
+
+        def __init__(self, response, expires : float, stale_until : float):
+            self.response = response
+            self.expires = expires
+            self.stale_until = stale_until
+            self.refreshing = False
+
+
+    def __init__(
+        self,
+        time_to_live : dict = None,
+        stale_while_revalidate : float = DEFAULT_STALE_WHILE_REVALIDATE,
+        maximum_entries : int = DEFAULT_MAXIMUM_ENTRIES,
+        invalidations : dict = None
+        ):
+        """
+        Method that initializes the ResponseCache class.
+
+        :param time_to_live:
+            A dictionary holding the time, in seconds, responses from each
+            endpoint are considered fresh, keyed by endpoint slug.  Endpoints
+            not listed are not cached.  If None, DEFAULT_TIME_TO_LIVE is
+            used.
+
+        :param stale_while_revalidate:
+            The time, in seconds, after a response expires that it can still
+            be returned while a fresh copy is fetched in the background.  A
+            value of 0 disables background refresh.
+
+        :param maximum_entries:
+            The maximum number of cached responses.
+
+        :param invalidations:
+            A dictionary holding the cached endpoint slugs affected by each
+            updating endpoint, keyed by the updating endpoint's slug.  If
+            None, DEFAULT_INVALIDATIONS is used.
+
+        :type time_to_live:           dict or None
+        :type stale_while_revalidate: float
+        :type maximum_entries:        int
+        :type invalidations:          dict or None
+
+        """
+
+        super().__init__()
+
+        self.__time_to_live = dict(
+            time_to_live if time_to_live is not None
+                else DEFAULT_TIME_TO_LIVE
+        )
+        self.__stale_while_revalidate = stale_while_revalidate
+        self.__maximum_entries = maximum_entries
+        self.__invalidations = dict(
+            invalidations if invalidations is not None
+                else DEFAULT_INVALIDATIONS
+        )
+
+        self.__entries = collections.OrderedDict()
+        self.__generation = 0
+        self.__lock = threading.Lock()
+        self.__fork_detector = fork_safety.ForkDetector()
+
+        self.__hits = 0
+        self.__stale_hits = 0
+        self.__misses = 0
+        self.__refreshes = 0
+        self.__refresh_failures = 0
+        self.__evictions = 0
+        self.__invalidation_count = 0
+
+
+    @property
+    def time_to_live(self):
+        """
+        Read-only property holding a copy of the per-endpoint time to live
+        values, in seconds.
+
+        :type: dict
+
+        """
+
+        return dict(self.__time_to_live)
+
+
+    @property
+    def maximum_entries(self):
+        """
+        Read-only property holding the maximum number of cached responses.
+
+        :type: int
+
+        """
+
+        return self.__maximum_entries
+
+
+    @property
+    def statistics(self):
+        """
+        Read-only property holding a snapshot of cache statistics.
+
+        :type: CacheStatistics
+
+        """
+
+        with self.__lock:
+            return CacheStatistics(
+                {
+                    'hits' : self.__hits,
+                    'stale_hits' : self.__stale_hits,
+                    'misses' : self.__misses,
+                    'refreshes' : self.__refreshes,
+                    'refresh_failures' : self.__refresh_failures,
+                    'evictions' : self.__evictions,
+                    'invalidations' : self.__invalidation_count,
+                    'entries' : len(self.__entries)
+                }
+            )
+
+
+    def is_cached(self, slug : str) -> bool:
+        """
+        Method you can use to determine if responses from an endpoint are
+        cached.
+
+        :param slug:
+            The endpoint slug.
+
+        :return:
+            Returns True if responses are cached.
+
+        :type slug: str
+        :rtype:     bool
+
+        """
+
+        return slug in self.__time_to_live
+
+
+    def get(self, slug : str, message, fetch, timeout : float = None):
+        """
+        Method you can use to obtain a response, from the cache if possible.
+        The returned response is shared with the cache and must not be
+        modified.
+
+        :param slug:
+            The endpoint slug.
+
+        :param message:
+            The request message.
+
+        :param fetch:
+            A callable that takes a timeout and returns a fresh response.
+            Exceptions raised by the callable are passed to the caller and
+            nothing is cached.  Exceptions raised during a background refresh
+            are counted and the expired response continues to be returned
+            until it is no longer usable.
+
+        :param timeout:
+            An optional deadline, in seconds, passed to the callable when a
+            response must be fetched before returning.  Background refreshes
+            are performed without a deadline.
+
+        :return:
+            Returns the response.
+
+        :type slug:    str
+        :type message: dict or list
+        :type fetch:   callable
+        :type timeout: float or None
+        :rtype:        object
+
+        """
+
+        self.reset_after_fork()
+
+        key = single_flight.canonical_key(slug, message)
+        now = time.monotonic()
+        refresh = False
+        with self.__lock:
+            generation = self.__generation
+            entry = self.__entries.get(key)
+            cached = entry is not None and now < entry.stale_until
+            if cached:
+                self.__entries.move_to_end(key)
+                if now < entry.expires:
+                    self.__hits += 1
+                else:
+                    self.__stale_hits += 1
+                    if not entry.refreshing:
+                        entry.refreshing = True
+                        refresh = True
+
+                response = entry.response
+            else:
+                self.__misses += 1
+
+        if not cached:
+            response = fetch(timeout)
+            self.__store(key, slug, response, generation)
+        elif refresh:
+            thread = threading.Thread(
+                target = self.__refresh,
+                args = (key, slug, fetch, generation),
+                name = "speedsentry-cache-refresh",
+                daemon = True
+            )
+            thread.start()
+
+        return response
+
+
+    def invalidate(self, slug : str = None, message = None):
+        """
+        Method you can use to discard cached responses.
+
+        :param slug:
+            The endpoint slug.  If None, every cached response is discarded.
+
+        :param message:
+            The request message.  If None, every cached response from the
+            endpoint is discarded.  Ignored if slug is None.
+
+        :type slug:    str or None
+        :type message: dict, list, or None
+
+        """
+
+        self.reset_after_fork()
+
+        with self.__lock:
+            if slug is None:
+                keys = list(self.__entries)
+            elif message is None:
+                keys = [ key for key in self.__entries if key[0] == slug ]
+            else:
+                key = single_flight.canonical_key(slug, message)
+                keys = [ key ] if key in self.__entries else []
+
+            for key in keys:
+                del self.__entries[key]
+
+            self.__invalidation_count += len(keys)
+            self.__generation += 1
+
+
+    def invalidate_affected(self, slug : str):
+        """
+        Method you can use to discard cached responses affected by a call to
+        an updating endpoint.
+
+        :param slug:
+            The slug of the updating endpoint.
+
+        :type slug: str
+
+        """
+
+        for affected_slug in self.__invalidations.get(slug, ()):
+            self.invalidate(affected_slug)
+
+
+    def reset_after_fork(self):
+        """
+        Method you can call in a forked child process to replace the lock
+        inherited from the parent process.  Cached responses are kept.
+        Refreshes in progress in the parent are abandoned and will be retried
+        by the child.  The method is called automatically when the cache is
+        used and does nothing if the process has not forked.
+
+        """
+
+        if self.__fork_detector.forked():
+            self.__lock = threading.Lock()
+            for entry in self.__entries.values():
+                entry.refreshing = False
+
+
+    def __store(self, key : tuple, slug : str, response, generation : int):
+        """
+        Method used internally to add a response to the cache.  The response
+        is discarded if the cache was invalidated after the response was
+        requested.
+
+        :param key:
+            The cache key.
+
+        :param slug:
+            The endpoint slug.
+
+        :param response:
+            The response to cache.
+
+        :param generation:
+            The invalidation generation when the response was requested.
+
+        :type key:        tuple
+        :type slug:       str
+        :type response:   object
+        :type generation: int
+
+        """
+
+        now = time.monotonic()
+        expires = now + self.__time_to_live[slug]
+        entry = ResponseCache._Entry(
+            response,
+            expires,
+            expires + self.__stale_while_revalidate
+        )
+
+        with self.__lock:
+            if generation == self.__generation:
+                self.__entries[key] = entry
+                self.__entries.move_to_end(key)
+                while len(self.__entries) > self.__maximum_entries:
+                    self.__entries.popitem(last = False)
+                    self.__evictions += 1
+
+
+    def __refresh(self, key : tuple, slug : str, fetch, generation : int):
+        """
+        Method used internally to fetch a fresh response in the background.
+
+        :param key:
+            The cache key.
+
+        :param slug:
+            The endpoint slug.
+
+        :param fetch:
+            A callable that takes a timeout and returns a fresh response.
+
+        :param generation:
+            The invalidation generation when the refresh was requested.
+
+        :type key:        tuple
+        :type slug:       str
+        :type fetch:      callable
+        :type generation: int
+
+        """
+
+        try:
+            response = fetch(None)
+        except Exception:
+            with self.__lock:
+                self.__refresh_failures += 1
+                entry = self.__entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False
+        else:
+            with self.__lock:
+                self.__refreshes += 1
+
+            self.__store(key, slug, response, generation)
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
@@ -0,0 +1,228 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that provides single-flight request coalescing.  Concurrent
+calls with the same key share a single in-flight call and all receive its
+result.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import threading
+import json
+
+from .exceptions import DeadlineExceededException
+from . import fork_safety as fork_safety
+
+###############################################################################
+# Functions:
+#
+
+def canonical_key(slug : str, message) -> tuple:
+    """
+    Function you can use to build a key identifying a request.  Messages that
+    differ only in dictionary key order produce the same key.
+
+    :param slug:
+        The request slug.
+
+    :param message:
+        The request message.
+
+    :return:
+        Returns a hashable key.
+
+    :type slug:    str
+    :type message: dict or list
+    :rtype:        tuple
+
+    """
+
+    return (
+        slug,
+        json.dumps(message, sort_keys = True, separators = (',', ':'))
+    )
+
+###############################################################################
+# Class SingleFlight:
+#
+
+class SingleFlight(object):
+    """
+    Class that coalesces concurrent calls with the same key.  The first
+    caller, the leader, performs the call.  Callers arriving while the call
+    is in flight wait for and share the leader's result or exception.  Calls
+    arriving after the result is available start a new call.
+
+    """
+
+    class _Call(object):
+        """
+        Class used internally to track a single in-flight call.
+
+        """
+
+        __slots__ = ('done', 'result', 'exception', 'followers')
+
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.exception = None
+            self.followers = 0
+
+
+    def __init__(self):
+        """
+        Method that initializes the SingleFlight class.
+
+        """
+
+        super().__init__()
+
+        self.__lock = threading.Lock()
+        self.__calls = dict()
+        self.__leaders = 0
+        self.__followers = 0
+        self.__fork_detector = fork_safety.ForkDetector()
+
+
+    @property
+    def leaders(self):
+        """
+        Read-only property holding the number of calls actually performed.
+
+        :type: int
+
+        """
+
+        return self.__leaders
+
+
+    @property
+    def followers(self):
+        """
+        Read-only property holding the number of calls that shared the
+        result of another in-flight call.
+
+        :type: int
+
+        """
+
+        return self.__followers
+
+
+    def call(self, key, function, timeout : float = None) -> tuple:
+        """
+        Method you can use to perform a call, or to wait for an identical
+        in-flight call.
+
+        :param key:
+            A hashable key identifying the call.
+
+        :param function:
+            A callable taking no parameters that performs the call.
+
+        :param timeout:
+            An optional time, in seconds, to wait for an in-flight call.  A
+            DeadlineExceededException is raised if the in-flight call does
+            not complete in time.  The in-flight call is not affected.
+
+        :return:
+            Returns a tuple holding the result and a boolean value.  The
+            boolean value is True if the result is shared with another
+            caller.  Callers sharing a result, including the leader, should
+            copy it before modifying it.
+
+        :type key:      object
+        :type function: callable
+        :type timeout:  float or None
+        :rtype:         tuple
+
+        """
+
+        self.reset_after_fork()
+        with self.__lock:
+            call = self.__calls.get(key)
+            if call is None:
+                call = SingleFlight._Call()
+                self.__calls[key] = call
+                self.__leaders += 1
+                leader = True
+            else:
+                call.followers += 1
+                self.__followers += 1
+                leader = False
+
+        if leader:
+            try:
+                call.result = function()
+            except BaseException as e:
+                call.exception = e
+            finally:
+                with self.__lock:
+                    del self.__calls[key]
+
+                call.done.set()
+
+            if call.exception is not None:
+                raise call.exception
+
+            shared = call.followers > 0
+        else:
+            if not call.done.wait(timeout):
+                raise DeadlineExceededException(
+                    status_message = "deadline of %g s exceeded waiting for "
+                                     "in-flight request"%timeout
+                )
+
+            if call.exception is not None:
+                raise call.exception
+
+            shared = True
+
+        return (call.result, shared)
+
+
+    def reset_after_fork(self):
+        """
+        Method you can call in a forked child process to replace the lock
+        inherited from the parent process and to forget calls that were in
+        flight in the parent.  The method is called automatically by the call
+        method and does nothing if the process has not forked.
+
+        """
+
+        if self.__fork_detector.forked():
+            self.__lock = threading.Lock()
+            self.__calls = dict()
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
@@ -29,11 +29,23 @@ API.
 
 from typing import Union
 import base64
-import json
+import copy
 
 from .exceptions import *
 from . import outbound_rest_api_v1 as outbound_rest_api_v1
 from . import dictionary_object as dictionary_object
+from . import transport as transport
+from . import time_delta_store as time_delta_store
+from . import latency_store as latency_store
+from . import json_stream as json_stream
+from . import latency_frame as latency_frame
+from . import lazy as lazy
+from . import codec as codec_module
+from . import policy as policy
+from . import single_flight as single_flight
+from . import batching as batching
+from . import response_cache as response_cache_module
+from . import plot_cache as plot_cache_module
 
 ###############################################################################
 # Globals:
@@ -46,10 +58,23 @@ standard scheme in order to comply with PEP 440.
 
 """
 
+LATENCY_QUERY_PARAMETERS = frozenset(
+    ('start_timestamp', 'end_timestamp', 'monitor_id', 'region_id')
+)
+"""
+The latency query parameters that can be answered from a latency store.
+
+"""
+
 ###############################################################################
 # Payload classes:
 #
 
+ServerStatistics = outbound_rest_api_v1.ServerStatistics
+PolicyStatistics = policy.PolicyStatistics
+CacheStatistics = response_cache_module.CacheStatistics
+PlotCacheStatistics = plot_cache_module.PlotCacheStatistics
+
 Capabilities = dictionary_object.build_read_only_class(
     "Capabilities",
     "You can use this class to hold information about capabilities available "
@@ -295,131 +320,306 @@ AggregatedLatencyEntry = dictionary_object.build_read_only_class(
 )
 
 
+
 ###############################################################################
-# Class SpeedSentry:
+# Functions:
 #
 
-class SpeedSentry(object):
+def decode_customer_secret(customer_identifier, customer_secret) -> bytes:
     """
-    Class you can use to access the SpeedSentry REST API.
+    Function used to validate a customer identifier and customer secret.
+
+    :param customer_identifier:
+        Your customer identifier encoded as an ASCII string of 16 hexidecimal
+        digits.
+
+    :param customer_secret:
+        Your customer secret.  If you supply the secret as a string then the
+        secret will be decoded.  If you supply the secret as a bytes or
+        bytearray object, then the secret will be used, unmodified.
+
+    :return:
+        Returns the decoded customer secret.
+
+    :type customer_identifier: str
+    :type customer_secret:     str, bytes, or bytearray.
+    :rtype:                    bytes or bytearray
 
     """
 
-    SECRET_LENGTH = outbound_rest_api_v1.SECRET_LENGTH
+    if len(customer_identifier) != 16:
+        raise CustomerIdentifierException(
+            "invalid customer identifier length."
+        )
+
+    try:
+        customer_identifier_value = int(customer_identifier, 16)
+    except:
+        raise CustomerIdentifierException(
+            "customer identifier must contain only the digits 0 through 9 "
+            "and A through F (case insensitive)."
+        )
+
+    if customer_identifier_value < 0:
+        raise CustomerIdentifierException(
+            "invalid customer identifier value."
+        )
+
+    if isinstance(customer_secret, str):
+        try:
+            secret = base64.b64decode(customer_secret, validate = True)
+        except:
+            raise CustomerSecretException("Invalid base-64 string")
+    else:
+        secret = customer_secret
+
+    if len(secret) != outbound_rest_api_v1.SECRET_LENGTH:
+        raise CustomerSecretException("Invalid secret length.")
+
+    return secret
+
+
+def build_events_list_message(
+    start_timestamp : int = None,
+    end_timestamp : int = None
+    ) -> dict:
     """
-    The expected length of the customer secret after decoding, in bytes.
+    Function used to build the message sent to the /v1/events/list endpoint.
+
+    :param start_timestamp:
+        An optional starting Unix timestamp for events.
+
+    :param end_timestamp:
+        An optional ending Unix timestamp for events.
+
+    :return:
+        Returns the message to be sent.
+
+    :type start_timestamp: int or None
+    :type end_timestamp:   int or None
+    :rtype:                dict
 
     """
 
-    AUTHORITY = "https://rest.1.speed-sentry.com"
+    message = dict()
+    if start_timestamp is not None:
+        message['start_timestamp'] = start_timestamp
+
+    if end_timestamp is not None:
+        message['end_timestamp'] = end_timestamp
+
+    return message
+
+
+def build_events_create_message(
+    message : str,
+    type_index = None,
+    monitor_id = None
+    ) -> dict:
     """
-    The authority for the customer REST API.
+    Function used to build the message sent to the /v1/events/create endpoint.
+
+    :param message:
+        The message to be sent as part of the event.
+
+    :param type_index:
+        A value indicating the type of customer event to be created.
+
+    :param monitor_id:
+        An optional monitor ID you can tie to this message.
+
+    :return:
+        Returns the message to be sent.
+
+    :type message:    str
+    :type type_index: int or None
+    :type monitor_id: int or None
+    :rtype:           dict
 
     """
 
-    def __init__(self, customer_identifier, customer_secret):
-        """
-        Method you can use to initialize the SpeedSentry REST API.
+    msg = { 'message' : message }
+    if monitor_id is not None:
+        msg['monitor_id'] = monitor_id
 
-        :param customer_identifier:
-            Your customer identifier encoded as an ASCII string of 16
-            hexidecimal digits.
+    if type_index is not None:
+        msg['type'] = type_index
 
-        :param customer_secret:
-            Your customer secret.  If you supply the secret as a string then
-            the secret will be decoded.  If you supply the secret as a bytes or
-            bytearray object, then the secret will be used, unmodified.
+    return msg
+
+
+def build_monitors_update_message(monitor_data : list) -> list:
+    """
+    Function used to build the message sent to the /v1/monitors/update
+    endpoint.  Post content and keywords are base-64 encoded.
+
+    :param monitor_data:
+        A list of MonitorEntry instances.
+
+    :return:
+        Returns the message to be sent.
+
+    :type monitor_data: list
+    :rtype:             list
+
+    """
+
+    message = list()
+    number_entries = len(monitor_data)
+    for i in range(number_entries):
+        entry = dict(monitor_data[i])
+        if 'post_content' in entry:
+            post_content = entry['post_content']
+            if isinstance(post_content, str):
+                post_content = post_content.encode('utf-8')
+
+            entry['post_content'] = base64.b64encode(
+                post_content
+            ).decode('utf-8')
+
+        if 'keywords' in entry:
+            keywords = list()
+            for keyword in entry['keywords']:
+                if isinstance(keyword, str):
+                    kw = base64.b64encode(keyword.encode('utf-8'))
+                else:
+                    kw = base64.b64encode(keyword)
+
+                keywords.append(kw.decode('utf-8'))
+
+            entry['keywords'] = keywords
+
+        message.append(entry)
 
-        :type customer_identifier: str
-        :type customer_secret:     str, bytes, or bytearray.
+    return message
 
+###############################################################################
+# Class ResponseDecoder:
+#
+
+class ResponseDecoder(object):
+    """
+    Class that converts decoded JSON responses from the SpeedSentry REST API
+    into payload class instances.  Each method is named after the endpoint
+    whose response it decodes.  An instance is shared by the synchronous and
+    asynchronous clients so both return identical results.
+
+    """
+
+    def __init__(
+        self,
+        compact_records : bool = False,
+        lazy_records : bool = False
+        ):
         """
+        Method that initializes the ResponseDecoder class.
 
-        if len(customer_identifier) != 16:
-            raise CustomerIdentifierException(
-                "invalid customer identifier length."
-            )
+        :param compact_records:
+            If True, compact slotted record classes are used in place of the
+            dict subclasses defined by this module.
 
-        try:
-            customer_identifier_value = int(customer_identifier, 16)
-        except:
-            raise CustomerIdentifierException(
-                "customer identifier must contain only the digits 0 through 9 "
-                "and A through F (case insensitive)."
-            )
+        :param lazy_records:
+            If True, list endpoints return lazy.LazyList and lazy.LazyDict
+            instances that only create records for the elements accessed.
 
-        if customer_identifier_value < 0:
-            raise CustomerIdentifierException(
-                "invalid customer identifier value."
-            )
+        :type compact_records: bool
+        :type lazy_records:    bool
 
-        if isinstance(customer_secret, str):
-            try:
-                secret = base64.b64decode(customer_secret, validate = True)
-            except:
-                raise CustomerSecretException("Invalid base-64 string")
-        else:
-            secret = customer_secret
+        """
 
-        if len(secret) != SpeedSentry.SECRET_LENGTH:
-            raise CustomerSecretException("Invalid secret length.")
+        super().__init__()
 
-        self.__rest_api = outbound_rest_api_v1.Server(
-            customer_identifier = customer_identifier,
-            customer_secret = secret,
-            authority = SpeedSentry.AUTHORITY
+        self.__lazy_records = lazy_records
+
+        if compact_records:
+            record_class = dictionary_object.slotted_class
+        else:
+            record_class = lambda c: c
+
+        self.__capabilities_class = record_class(Capabilities)
+        self.__host_scheme_class = record_class(HostScheme)
+        self.__monitor_class = record_class(Monitor)
+        self.__region_class = record_class(Region)
+        self.__event_class = record_class(Event)
+        self.__latency_entry_class = record_class(LatencyEntry)
+        self.__aggregated_latency_entry_class = record_class(
+            AggregatedLatencyEntry
         )
 
 
-    def capabilities_get(self) -> Capabilities:
+    def check_status(self, slug : str, response : dict) -> dict:
         """
-        Method you can use to obtain information on what features are supported
-        by your subscription.
+        Method used to check a response for successful status.
+
+        :param slug:
+            The slug the message was sent to.
+
+        :param response:
+            The decoded response.
 
         :return:
-            Returns a Capabilities instance you can use to determine the
-            features supported by your subscription.
+            Returns the response.
 
-        :rtype: Capabilities
+        :type slug:     str
+        :type response: dict
+        :rtype:         dict
 
         """
 
-        response = self.__post_message(
-            slug = "/v1/capabilities/get",
-            message = dict()
-        )
+        if 'status' in response:
+            status = response['status']
+            if status != 'OK':
+                raise CommunicationErrorException(
+                    status_message = "%s : %s"%(slug, status)
+                )
+        else:
+            raise CommunicationErrorException(
+                status_message = "%s : unexpected response"%slug
+            )
+
+        return response
+
+
+    def capabilities_get(self, response : dict) -> Capabilities:
+        """
+        Method that decodes a /v1/capabilities/get response.
+
+        :param response:
+            The decoded response.
+
+        :return:
+            Returns a Capabilities instance.
+
+        :type response: dict
+        :rtype:         Capabilities
+
+        """
 
         if 'capabilities' not in response:
             raise CommunicationErrorException(
                 status_message = "/v1/capabilities/get : missing capabilities"
             )
 
-        return Capabilities(response['capabilities'])
+        return self.__capabilities_class(response['capabilities'])
 
 
-    def hosts_get(self, host_scheme_id : int) -> HostScheme:
+    def hosts_get(self, response : dict) -> HostScheme:
         """
-        Method you can use to obtain a single host/scheme entry indexed by
-        host/scheme ID.
+        Method that decodes a /v1/hosts/get response.
 
-        :param host_scheme_id:
-            The host/scheme ID of the desired host/scheme.
+        :param response:
+            The decoded response.
 
         :return:
-            Returns single HostScheme instance.
+            Returns a HostScheme instance.
 
-        :type host_scheme_id: int
-        :rtype:               HostScheme
+        :type response: dict
+        :rtype:         HostScheme
 
         """
 
-        response = self.__post_message(
-            slug = "/v1/hosts/get",
-            message = { 'host_scheme_id' : host_scheme_id }
-        )
-
         if 'host_scheme' in response:
-            result = HostScheme(response['host_scheme'])
+            result = self.__host_scheme_class(response['host_scheme'])
         else:
             raise CommunicationErrorException(
                 status_message = "/v1/hosts/get : missing response data"
@@ -428,28 +628,24 @@ class SpeedSentry(object):
         return result
 
 
-    def hosts_list(self) -> dict:
+    def hosts_list(self, response : dict) -> dict:
         """
-        Method you can use to obtain a dictionary of host/scheme instances
-        indexed by host/scheme ID.
+        Method that decodes a /v1/hosts/list response.
+
+        :param response:
+            The decoded response.
 
         :return:
             Returns a dictionary of HostScheme instances indexed by the
             host/scheme ID.
 
-        :rtype: dict of HostScheme instances
+        :type response: dict
+        :rtype:         dict of HostScheme instances
 
         """
 
-        response = self.__post_message(
-            slug = "/v1/hosts/list",
-            message = dict()
-        )
-
         if 'host_schemes' in response:
-            result = dict()
-            for host_scheme_id, host_entry in response['host_schemes'].items():
-                result[host_scheme_id] = HostScheme(host_entry)
+            result = self.host_schemes(response['host_schemes'])
         else:
             raise CommunicationErrorException(
                 status_message = "/v1/hosts/list : missing response data"
@@ -458,29 +654,23 @@ class SpeedSentry(object):
         return result
 
 
-    def monitors_get(self, monitor_id : int) -> Monitor:
+    def monitors_get(self, response : dict) -> Monitor:
         """
-        Method you can use to obtain information on a single monitor.
+        Method that decodes a /v1/monitors/get response.
 
-        :param monitor_id:
-            The ID of the desired monitor.
+        :param response:
+            The decoded response.
 
         :return:
-            Returns a Monitor instance describing this monitor.
+            Returns a Monitor instance.
 
-        :type monitor_id: int
-        :rtype:           Monitor instance
+        :type response: dict
+        :rtype:         Monitor
 
         """
 
-        response = self.__post_message(
-            slug = "/v1/monitors/get",
-            message = { 'monitor_id' : monitor_id }
-        )
-
         if 'monitor' in response:
-            monitor_data = response['monitor']
-            result = self.__post_process_monitor(monitor_data)
+            result = self.monitor(response['monitor'])
         else:
             raise CommunicationErrorException(
                 status_message = "/v1/monitors/get : missing response data"
@@ -489,39 +679,23 @@ class SpeedSentry(object):
         return result
 
 
-    def monitors_list(self, order_by : str = "monitor_id") -> dict:
+    def monitors_list(self, response : dict) -> dict:
         """
-        Method you can use to obtain a list of all monitors.
+        Method that decodes a /v1/monitors/list response.
 
-        :param order_by:
-            A string indicating the desired method the monitors should be
-            indexed.  Supported values are "monitor_id", "user_ordering",
-            or "url".
+        :param response:
+            The decoded response.
 
         :return:
             Returns a dictionary of Monitor instances.
 
-        :type order_by: str
+        :type response: dict
         :rtype:         dict of Monitor instances
 
         """
 
-        response = self.__post_message(
-            slug = "/v1/monitors/list",
-            message = { 'order_by' : order_by }
-        )
-
-        print(json.dumps(response, indent = 4));
         if 'monitors' in response:
-            result = dict()
-            monitors_data = response['monitors']
-            for k, monitor_data in monitors_data.items():
-                if isinstance(monitor_data, dict):
-                    result[k] = self.__post_process_monitor(monitor_data)
-                else:
-                    result[k] = [ self.__post_process_monitor(md)
-                                  for md in monitor_data
-                                ]
+            result = self.monitors(response['monitors'])
         else:
             raise CommunicationErrorException(
                 status_message = "/v1/monitors/list : missing response data"
@@ -530,73 +704,23 @@ class SpeedSentry(object):
         return result
 
 
-    def monitors_update(self, monitor_data : list):
-        """
-        Method you can use to update monitor settings.
-
-        :param monitor_data:
-            A list of MonitorEntry instances.  The first entry has a user
-            ordering of 0, the second entry has a user ordering of 1, etc.
-
-        :type monitor_data: list
-
-        """
-
-        message = list()
-        number_entries = len(monitor_data)
-        for i in range(number_entries):
-            entry = dict(monitor_data[i])
-            if 'post_content' in entry:
-                post_content = entry['post_content']
-                if isinstance(post_content, str):
-                    post_content = post_content.encode('utf-8')
-
-                entry['post_content'] = base64.b64encode(
-                    post_content
-                ).decode('utf-8')
-
-            if 'keywords' in entry:
-                keywords = list()
-                for keyword in entry['keywords']:
-                    if isinstance(keyword, str):
-                        kw = base64.b64encode(keyword.encode('utf-8'))
-                    else:
-                        kw = base64.b64encode(keyword)
-
-                    keywords.append(kw.decode('utf-8'))
-
-                entry['keywords'] = keywords
-
-            message.append(entry)
-
-        self.__post_message(
-            slug = "/v1/monitors/update",
-            message = message
-        )
-
-
-    def regions_get(self, region_id : int) -> Region:
+    def regions_get(self, response : dict) -> Region:
         """
-        Method you can use to obtain information on a single region.
+        Method that decodes a /v1/regions/get response.
 
-        :param region_id:
-            The ID of the desired region.
+        :param response:
+            The decoded response.
 
         :return:
-            Returns a Region instance describing this region.
+            Returns a Region instance.
 
-        :type region_id: int
-        :rtype:          Region instance
+        :type response: dict
+        :rtype:         Region
 
         """
 
-        response = self.__post_message(
-            slug = "/v1/regions/get",
-            message = { 'region_id' : region_id }
-        )
-
         if 'region' in response:
-            result = Region(response['region'])
+            result = self.__region_class(response['region'])
         else:
             raise CommunicationErrorException(
                 status_message = "/v1/regions/get : missing response data"
@@ -605,23 +729,32 @@ class SpeedSentry(object):
         return result
 
 
-    def regions_list(self) -> dict:
+    def regions_list(self, response : dict) -> dict:
         """
-        Method you can use to obtain a dictionary holding information on all
-        regions.  The dictionary will be indexed by region ID.
+        Method that decodes a /v1/regions/list response.
+
+        :param response:
+            The decoded response.
 
         :return:
-            Returns a dictionary of regions by region ID.
+            Returns a dictionary of Region instances by region ID.
 
-        :rtype: dict
+        :type response: dict
+        :rtype:         dict
 
         """
 
-        response = self.__post_message(slug = "/v1/regions/list",message = {})
         if 'regions' in response:
-            result = dict()
-            for region_id, region_data in response['regions'].items():
-                result[int(region_id)] = Region(region_data)
+            if self.__lazy_records:
+                result = lazy.LazyDict(
+                    response['regions'],
+                    self.__region_class,
+                    key_function = int
+                )
+            else:
+                result = dict()
+                for region_id, region_data in response['regions'].items():
+                    result[int(region_id)] = self.__region_class(region_data)
         else:
             raise CommunicationErrorException(
                 status_message = "/v1/regions/list : missing response data"
@@ -630,28 +763,23 @@ class SpeedSentry(object):
         return result
 
 
-    def events_get(self, event_id : int) -> Event:
+    def events_get(self, response : dict) -> Event:
         """
-        Method you can use to obtain information on a single event.
+        Method that decodes a /v1/events/get response.
 
-        :param event_id:
-            The ID of the desired event.
+        :param response:
+            The decoded response.
 
         :return:
-            Returns an Event instance describing the event.
+            Returns an Event instance.
 
-        :type event_id: int
-        :rtype:         Event instance
+        :type response: dict
+        :rtype:         Event
 
         """
 
-        response = self.__post_message(
-            slug = "/v1/events/get",
-            message = { 'event_id' : event_id }
-        )
-
         if 'event' in response:
-            result = Event(response['event'])
+            result = self.__event_class(response['event'])
         else:
             raise CommunicationErrorException(
                 status_message = "/v1/events/get : missing response data"
@@ -660,47 +788,23 @@ class SpeedSentry(object):
         return result
 
 
-    def events_list(
-        self,
-        start_timestamp : int = None,
-        end_timestamp : int = None
-        ) -> list:
+    def events_list(self, response : dict) -> list:
         """
-        Method you can use to obtain a list of events.
-
-        :param start_timestamp:
-            An optional starting Unix timestamp for events.  A value of None
-            means no start time.
+        Method that decodes a /v1/events/list response.
 
-        :param end_timestamp:
-            An optional ending Unix timestamp for events.  A value of None
-            means no end time.
+        :param response:
+            The decoded response.
 
         :return:
-            Returns a list of events.
+            Returns a list of Event instances.
 
-        :type start_timestamp: int or None
-        :type end_timestamp:   int or None
-        :rtype:                list
+        :type response: dict
+        :rtype:         list
 
         """
 
-        message = dict()
-        if start_timestamp is not None:
-            message['start_timestamp'] = start_timestamp
-
-        if end_timestamp is not None:
-            message['end_timestamp'] = end_timestamp
-
-        response = self.__post_message(
-            slug = "/v1/events/list",
-            message = message
-        )
-
         if 'events' in response:
-            result = list()
-            for event in response['events']:
-                result.append(Event(event))
+            result = self.events(response['events'])
         else:
             raise CommunicationErrorException(
                 status_message = "/v1/events/list : missing response data"
@@ -709,109 +813,1513 @@ class SpeedSentry(object):
         return result
 
 
-    def events_create(
-        self,
-        message : str,
-        type_index = None,
-        monitor_id = None
-        ):
+    def status_get(self, response : dict) -> str:
         """
-        Method you can use to generate a customer event.
-
-        :param message:
-            The message to be sent as part of the event.
+        Method that decodes a /v1/status/get response.
 
-        :param type_index:
-            A value indicating the type of customer event to be created.  A
-            value of 1 indicates customer_1, a value of 2 indicates customer_2,
-            etc.  If not specified, then customer_1 is used.
+        :param response:
+            The decoded response.
 
-        :param monitor_id:
-            An optional monitor ID you can tie to this message.  If not
-            specified or None, then the first monitor ID is used.
+        :return:
+            Returns the monitor status string.
 
-        :type message:    str
-        :type monitor_id: int or None
+        :type response: dict
+        :rtype:         str
 
         """
 
-        msg = { 'message' : message }
-        if monitor_id is not None:
-            msg['monitor_id'] = monitor_id
+        if 'monitor_status' in response:
+            result = response['monitor_status']
+        else:
+            raise CommunicationErrorException(
+                status_message = "/v1/status/get : missing response data"
+            )
 
-        if type_index is not None:
-            msg['type'] = type_index
+        return result
 
-        self.__post_message(slug = "/v1/events/create", message = msg)
 
+    def status_list(self, response : dict) -> dict:
+        """
+        Method that decodes a /v1/status/list response.
+
+        :param response:
+            The decoded response.
+
+        :return:
+            Returns a dictionary of status strings keyed by monitor ID.
+
+        :type response: dict
+        :rtype:         dict
+
+        """
+
+        if 'monitor_status' in response:
+            result = self.monitor_status(response['monitor_status'])
+        else:
+            raise CommunicationErrorException(
+                status_message = "/v1/status/list : missing response data"
+            )
+
+        return result
+
+
+    def multiple_list(self, response : dict) -> dict:
+        """
+        Method that decodes a /v1/multiple/list response.
+
+        :param response:
+            The decoded response.
+
+        :return:
+            Returns a dictionary holding authorities, monitors, events, and
+            status values.
+
+        :type response: dict
+        :rtype:         dict
+
+        """
+
+        if 'monitors' in response       and \
+           'host_schemes' in response   and \
+           'events' in response         and \
+           'monitor_status' in response     :
+            result = {
+                'authorities' : self.host_schemes(response['host_schemes']),
+                'monitors' : self.monitors(response['monitors']),
+                'events' : self.events(response['events']),
+                'status' : self.monitor_status(response['monitor_status'])
+            }
+        else:
+            raise CommunicationErrorException(
+                status_message = "/v1/status/list : missing response data"
+            )
+
+        return result
+
+
+    def latency_list(self, response : dict) -> tuple:
+        """
+        Method that decodes a /v1/latency/list response.
+
+        :param response:
+            The decoded response.
+
+        :return:
+            Returns a tuple holding a list of LatencyEntry instances followed
+            by a list of AggregatedLatencyEntry instances.
+
+        :type response: dict
+        :rtype:         tuple
+
+        """
+
+        if 'recent' in response and 'aggregated' in response:
+            recent = response['recent']
+            aggregated = response['aggregated']
+
+            if self.__lazy_records:
+                result = (
+                    lazy.LazyList(recent, self.latency_entry),
+                    lazy.LazyList(aggregated, self.aggregated_latency_entry)
+                )
+            else:
+                result = (
+                    [ self.latency_entry(s) for s in recent ],
+                    [ self.aggregated_latency_entry(s) for s in aggregated ]
+                )
+        else:
+            raise CommunicationErrorException(
+                status_message = "/v1/latency/list : missing response data"
+            )
+
+        return result
+
+
+    def latency_frames(self, response : dict) -> tuple:
+        """
+        Method that decodes a /v1/latency/list response into columnar
+        frames.
+
+        :param response:
+            The decoded response.
+
+        :return:
+            Returns a tuple holding a LatencyFrame of recent entries followed
+            by a LatencyFrame of aggregated entries.
+
+        :type response: dict
+        :rtype:         tuple
+
+        """
+
+        if 'recent' in response and 'aggregated' in response:
+            try:
+                result = (
+                    latency_frame.LatencyFrame.from_entries(
+                        response['recent'],
+                        aggregated = False
+                    ),
+                    latency_frame.LatencyFrame.from_entries(
+                        response['aggregated'],
+                        aggregated = True
+                    )
+                )
+            except (KeyError, TypeError, ValueError):
+                raise CommunicationErrorException(
+                    status_message = "/v1/latency/list : invalid response data"
+                )
+        else:
+            raise CommunicationErrorException(
+                status_message = "/v1/latency/list : missing response data"
+            )
+
+        return result
+
+
+    def latency_rows(self, recent : list, aggregated : list) -> tuple:
+        """
+        Method that converts rows held by a latency store into latency
+        entries without first building a dictionary for each row.
+
+        :param recent:
+            The recent rows, as returned by LatencyStore.query_rows.
+
+        :param aggregated:
+            The aggregated rows, as returned by LatencyStore.query_rows.
+
+        :return:
+            Returns a tuple holding a list of LatencyEntry instances followed
+            by a list of AggregatedLatencyEntry instances.
+
+        :type recent:     list
+        :type aggregated: list
+        :rtype:           tuple
+
+        """
+
+        latency_entry_class = self.__latency_entry_class
+        aggregated_latency_entry_class = self.__aggregated_latency_entry_class
+        recent_columns = latency_store.RECENT_COLUMNS
+        aggregated_columns = latency_store.AGGREGATED_COLUMNS
+
+        if self.__lazy_records:
+            result = (
+                lazy.LazyList(
+                    recent,
+                    lambda row: latency_entry_class(zip(recent_columns, row))
+                ),
+                lazy.LazyList(
+                    aggregated,
+                    lambda row: aggregated_latency_entry_class(
+                        zip(aggregated_columns, row)
+                    )
+                )
+            )
+        else:
+            result = (
+                [
+                    latency_entry_class(zip(recent_columns, row))
+                    for row in recent
+                ],
+                [
+                    aggregated_latency_entry_class(
+                        zip(aggregated_columns, row)
+                    )
+                    for row in aggregated
+                ]
+            )
+
+        return result
+
+
+    def latency_row_frames(self, recent : list, aggregated : list) -> tuple:
+        """
+        Method that converts rows held by a latency store into columnar
+        frames.
+
+        :param recent:
+            The recent rows, as returned by LatencyStore.query_rows.
+
+        :param aggregated:
+            The aggregated rows, as returned by LatencyStore.query_rows.
+
+        :return:
+            Returns a tuple holding a LatencyFrame of recent entries followed
+            by a LatencyFrame of aggregated entries.
+
+        :type recent:     list
+        :type aggregated: list
+        :rtype:           tuple
+
+        """
+
+        return (
+            latency_frame.LatencyFrame.from_rows(
+                recent,
+                latency_store.RECENT_COLUMNS,
+                aggregated = False
+            ),
+            latency_frame.LatencyFrame.from_rows(
+                aggregated,
+                latency_store.AGGREGATED_COLUMNS,
+                aggregated = True
+            )
+        )
+
+
+    def latency_stream(self, members):
+        """
+        Generator that decodes a /v1/latency/list response one entry at a
+        time.  Entries are yielded in the order they are received.  Note that
+        the response status may follow the entries so a failed status can be
+        reported after some entries have been yielded.
+
+        :param members:
+            An iterable of (key, value, is_element) tuples as produced by the
+            json_stream.JsonObjectStream class with 'recent' and 'aggregated'
+            listed as array keys.
+
+        :type members: iterable of tuple
+
+        """
+
+        slug = "/v1/latency/list"
+        status = None
+        received = set()
+        for key, value, is_element in members:
+            if key == 'recent' or key == 'aggregated':
+                if key == 'recent':
+                    entry_class = self.latency_entry
+                else:
+                    entry_class = self.aggregated_latency_entry
+
+                if is_element:
+                    yield entry_class(value)
+                elif isinstance(value, list):
+                    for raw_entry in value:
+                        yield entry_class(raw_entry)
+                else:
+                    raise CommunicationErrorException(
+                        status_message = "%s : missing response data"%slug
+                    )
+
+                received.add(key)
+            elif key == 'status':
+                status = value
+                self.check_status(slug, { 'status' : status })
+
+        if status is None:
+            raise CommunicationErrorException(
+                status_message = "%s : unexpected response"%slug
+            )
+
+        if len(received) != 2:
+            raise CommunicationErrorException(
+                status_message = "%s : missing response data"%slug
+            )
+
+
+    def latency_entry(self, raw_entry : dict) -> LatencyEntry:
+        """
+        Method that converts a raw recent latency entry into a LatencyEntry
+        instance.
+
+        :param raw_entry:
+            The raw latency entry.
+
+        :return:
+            Returns the latency entry.
+
+        :type raw_entry: dict
+        :rtype:          LatencyEntry
+
+        """
+
+        return self.__latency_entry_class(raw_entry)
+
+
+    def aggregated_latency_entry(
+        self,
+        raw_entry : dict
+        ) -> AggregatedLatencyEntry:
+        """
+        Method that converts a raw aggregated latency entry into an
+        AggregatedLatencyEntry instance.
+
+        :param raw_entry:
+            The raw aggregated latency entry.
+
+        :return:
+            Returns the aggregated latency entry.
+
+        :type raw_entry: dict
+        :rtype:          AggregatedLatencyEntry
+
+        """
+
+        return self.__aggregated_latency_entry_class(raw_entry)
+
+
+    def host_schemes(self, raw_host_schemes : dict) -> dict:
+        """
+        Method that converts raw host/scheme data into HostScheme instances.
+
+        :param raw_host_schemes:
+            The raw host/scheme data indexed by host/scheme ID.
+
+        :return:
+            Returns a dictionary of HostScheme instances.
+
+        :type raw_host_schemes: dict
+        :rtype:                 dict
+
+        """
+
+        if self.__lazy_records:
+            result = lazy.LazyDict(raw_host_schemes, self.__host_scheme_class)
+        else:
+            result = dict()
+            for host_scheme_id, host_entry in raw_host_schemes.items():
+                result[host_scheme_id] = self.__host_scheme_class(host_entry)
+
+        return result
+
+
+    def monitors(self, raw_monitors : dict) -> dict:
+        """
+        Method that converts raw monitor data into Monitor instances.  Entries
+        can be either a single monitor or a list of monitors.
+
+        :param raw_monitors:
+            The raw monitor data.
+
+        :return:
+            Returns a dictionary of Monitor instances or lists of Monitor
+            instances.
+
+        :type raw_monitors: dict
+        :rtype:             dict
+
+        """
+
+        if self.__lazy_records:
+            result = lazy.LazyDict(raw_monitors, self.__monitor_group)
+        else:
+            result = dict()
+            for k, monitor_data in raw_monitors.items():
+                result[k] = self.__monitor_group(monitor_data)
+
+        return result
+
+
+    def events(self, raw_events : list) -> list:
+        """
+        Method that converts raw event data into Event instances.
+
+        :param raw_events:
+            The raw event data.
+
+        :return:
+            Returns a list of Event instances.
+
+        :type raw_events: list
+        :rtype:           list
+
+        """
+
+        if self.__lazy_records:
+            result = lazy.LazyList(raw_events, self.__event_class)
+        else:
+            result = [ self.__event_class(event) for event in raw_events ]
+
+        return result
+
+
+    def monitor_status(self, raw_monitor_status : dict) -> dict:
+        """
+        Method that converts raw monitor status data into a dictionary keyed
+        by integer monitor ID.
+
+        :param raw_monitor_status:
+            The raw monitor status data.
+
+        :return:
+            Returns a dictionary of status values by monitor ID.
+
+        :type raw_monitor_status: dict
+        :rtype:                   dict
+
+        """
+
+        return { int(k) : v for k, v in raw_monitor_status.items() }
+
+
+    def monitor(self, monitor_data : dict) -> Monitor:
+        """
+        Method used to decode base-64 encoded monitor entries.
+
+        :param monitor_data:
+            The raw received monitor data.
+
+        :return:
+            Returns a Monitor instance holding the processed data.
+
+        :type monitor_data: dict
+        :rtype:             Monitor
+
+        """
+
+        processed = dict(monitor_data)
+        keywords = list()
+        for raw_keyword in monitor_data['keywords']:
+            try:
+                decoded_keyword = base64.b64decode(
+                    raw_keyword,
+                    validate = True
+                )
+            except:
+                raise DecodingErrorException(
+                    status_message = "could not decode keywords."
+                )
+
+            keywords.append(decoded_keyword)
+
+        processed['keywords'] = keywords
+
+        try:
+            post_content = base64.b64decode(
+                monitor_data['post_content'],
+                validate = True
+            )
+        except:
+            raise DecodingErrorException(
+                status_message = "could not decode post content."
+            )
+
+        processed['post_content'] = post_content
+
+        return self.__monitor_class(processed)
+
+
+    def __monitor_group(self, monitor_data):
+        # -> Union[Monitor, list, lazy.LazyList]
+        """
+        Method used internally to decode either a single monitor or a list of
+        monitors.
+
+        :param monitor_data:
+            The raw received monitor data.
+
+        :return:
+            Returns a Monitor instance or a list of Monitor instances.
+
+        :type monitor_data: dict or list
+        :rtype:             Monitor, list, or lazy.LazyList
+
+        """
+
+        if isinstance(monitor_data, dict):
+            result = self.monitor(monitor_data)
+        elif self.__lazy_records:
+            result = lazy.LazyList(monitor_data, self.monitor)
+        else:
+            result = [ self.monitor(md) for md in monitor_data ]
+
+        return result
+
+###############################################################################
+# Class RequestBatch:
+#
+
+class RequestBatch(batching.Batch):
+    """
+    Class returned by SpeedSentry.batch.  Each lookup returns a future.  All
+    lookups of the same kind are resolved from a single list request.
+
+    """
+
+    def hosts_get(self, host_scheme_id : int) -> batching.BatchFuture:
+        """
+        Method you can use to look up a single host/scheme entry.
+
+        :param host_scheme_id:
+            The host/scheme ID of the desired host/scheme.
+
+        :return:
+            Returns a future holding a HostScheme instance.
+
+        :type host_scheme_id: int
+        :rtype:               BatchFuture
+
+        """
+
+        return self.load('hosts_get', host_scheme_id)
+
+
+    def monitors_get(self, monitor_id : int) -> batching.BatchFuture:
+        """
+        Method you can use to look up a single monitor.
+
+        :param monitor_id:
+            The ID of the desired monitor.
+
+        :return:
+            Returns a future holding a Monitor instance.
+
+        :type monitor_id: int
+        :rtype:           BatchFuture
+
+        """
+
+        return self.load('monitors_get', monitor_id)
+
+
+    def regions_get(self, region_id : int) -> batching.BatchFuture:
+        """
+        Method you can use to look up a single region.
+
+        :param region_id:
+            The ID of the desired region.
+
+        :return:
+            Returns a future holding a Region instance.
+
+        :type region_id: int
+        :rtype:          BatchFuture
+
+        """
+
+        return self.load('regions_get', region_id)
+
+
+    def status_get(self, monitor_id : int) -> batching.BatchFuture:
+        """
+        Method you can use to look up the status of a single monitor.
+
+        :param monitor_id:
+            The ID of the desired monitor.
+
+        :return:
+            Returns a future holding "unknown", "working", or "failed".
+
+        :type monitor_id: int
+        :rtype:           BatchFuture
+
+        """
+
+        return self.load('status_get', monitor_id)
+
+###############################################################################
+# Class SpeedSentry:
+#
+
+class SpeedSentry(object):
+    """
+    Class you can use to access the SpeedSentry REST API.  A single instance
+    can be shared by any number of threads.  Sharing an instance lets threads
+    share pooled connections and the measured time delta.
+
+    An instance created before a fork, such as in a pre-fork application
+    server or a multiprocessing pool, can be used in the child processes.
+    Each child opens its own connections and keeps the measured time delta.
+
+    """
+
+    SECRET_LENGTH = outbound_rest_api_v1.SECRET_LENGTH
+    """
+    The expected length of the customer secret after decoding, in bytes.
+
+    """
+
+    AUTHORITY = "https://rest.1.speed-sentry.com"
+    """
+    The authority for the customer REST API.
+
+    """
+
+    def __init__(
+        self,
+        customer_identifier,
+        customer_secret,
+        connection_pool : transport.Transport = None,
+        pool_size : int = transport.DEFAULT_POOL_SIZE,
+        maximum_connections_per_host : int = \
+            transport.DEFAULT_MAXIMUM_CONNECTIONS_PER_HOST,
+        idle_timeout : float = transport.DEFAULT_IDLE_TIMEOUT,
+        authority : str = None,
+        time_delta_refresh_interval : float = \
+            outbound_rest_api_v1.DEFAULT_TIME_DELTA_REFRESH_INTERVAL,
+        window_guard : float = outbound_rest_api_v1.DEFAULT_WINDOW_GUARD,
+        time_delta_store : time_delta_store.TimeDeltaStore = None,
+        compact_records : bool = False,
+        lazy_records : bool = False,
+        codec : codec_module.JsonCodec = None,
+        retry_policy : policy.RetryPolicy = None,
+        circuit_breaker : policy.CircuitBreaker = None,
+        hedging_policy : policy.HedgingPolicy = None,
+        coalesce_requests : bool = True,
+        batch_window : float = None,
+        response_cache : response_cache_module.ResponseCache = None,
+        latency_store : latency_store.LatencyStore = None,
+        plot_cache : plot_cache_module.PlotCache = None
+        ):
+        """
+        Method you can use to initialize the SpeedSentry REST API.
+
+        All requests issued by this instance share a single pool of persistent
+        connections.  You should call the close method, or use this instance
+        as a context manager, to release those connections when you are
+        finished.
+
+        :param customer_identifier:
+            Your customer identifier encoded as an ASCII string of 16
+            hexidecimal digits.
+
+        :param customer_secret:
+            Your customer secret.  If you supply the secret as a string then
+            the secret will be decoded.  If you supply the secret as a bytes or
+            bytearray object, then the secret will be used, unmodified.
+
+        :param connection_pool:
+            An optional transport instance to share between multiple
+            SpeedSentry instances.  If None, a transport will be created and
+            owned by this instance.
+
+        :param pool_size:
+            The number of per-host connection pools to keep.  Ignored if a
+            connection pool is supplied.
+
+        :param maximum_connections_per_host:
+            The maximum number of connections kept open to any single host.
+            Ignored if a connection pool is supplied.
+
+        :param idle_timeout:
+            The time, in seconds, pooled connections can remain idle before
+            being discarded.  A value of None disables idle eviction.  Ignored
+            if a connection pool is supplied.
+
+        :param authority:
+            An optional authority to use in place of the default SpeedSentry
+            REST API authority.
+
+        :param time_delta_refresh_interval:
+            The interval, in seconds, after which the measured time delta
+            between this machine and the server is refreshed before the next
+            request.  A value of None disables proactive refresh so the time
+            delta is only refreshed after a request is rejected.
+
+        :param window_guard:
+            Requests expected to reach the server within this many seconds of
+            a signing window boundary are held until the boundary passes.  A
+            value of 0 disables this behavior.
+
+        :param time_delta_store:
+            An optional TimeDeltaStore used to persist the measured time delta
+            across process restarts.  Short-lived processes sharing a store
+            avoid a rejected first request on hosts with skewed clocks.
+
+        :param compact_records:
+            If True, results are returned as compact, slotted record classes
+            built by dictionary_object.slotted_class rather than dict
+            subclasses.  Compact records use far less memory and support the
+            same attribute and mapping access but are not dict instances.
+
+        :param lazy_records:
+            If True, list results hold the raw response data and only create
+            records for the elements you access.  Lists are returned as
+            LazyList instances and dictionaries as LazyDict instances.
+
+        :param codec:
+            The JSON codec used to decode responses.  If None, the fastest
+            installed codec is used.  Signed payloads do not depend on the
+            codec.
+
+        :param retry_policy:
+            The policy used to determine connect and read timeouts and to
+            retry idempotent requests after transient failures.  If None, a
+            RetryPolicy with default settings is used.
+
+        :param circuit_breaker:
+            The CircuitBreaker used to fail fast while the service is
+            degraded.  You can share a breaker between instances.  If None, a
+            breaker with default settings is used.
+
+        :param hedging_policy:
+            An optional HedgingPolicy.  If supplied, a duplicate request is
+            sent when a get or list request has not completed within a
+            percentile of recent response times for that endpoint.  The first
+            response received is used.  Updates and event creation are never
+            hedged.  A value of None disables hedging.
+
+        :param coalesce_requests:
+            If True, concurrent identical get and list calls from multiple
+            threads share a single in-flight request.  Each caller receives
+            its own copy of the result.
+
+        :param batch_window:
+            If supplied, calls to hosts_get, monitors_get, regions_get, and
+            status_get made by concurrent threads within this many seconds
+            are collected into a single call to the equivalent list endpoint.
+            Each call is delayed by up to the window.  A value of None
+            disables windowed batching.  You can also use the batch method to
+            collect lookups explicitly.
+
+        :param response_cache:
+            An optional ResponseCache used to answer calls to endpoints whose
+            data changes rarely, such as capabilities_get, hosts_list, and
+            regions_list, without a request.  Calls to monitors_update
+            discard the cached responses they affect.  A value of None
+            disables caching.
+
+        :param latency_store:
+            An optional LatencyStore holding a local copy of latency entries.
+            If supplied, latency_list answers queries that lie within a
+            synchronized range from the store, and you can use latency_sync
+            and latency_query to download only entries newer than those
+            already held.
+
+        :param plot_cache:
+            An optional PlotCache used to answer repeated latency_plot calls
+            without a request.  A value of None disables plot caching.
+
+        :type customer_identifier:          str
+        :type customer_secret:              str, bytes, or bytearray.
+        :type connection_pool:              transport.Transport or None
+        :type pool_size:                    int
+        :type maximum_connections_per_host: int
+        :type idle_timeout:                 float or None
+        :type authority:                    str or None
+        :type time_delta_refresh_interval:  float or None
+        :type window_guard:                 float
+        :type time_delta_store:             TimeDeltaStore or None
+        :type compact_records:              bool
+        :type lazy_records:                 bool
+        :type codec:                        codec.JsonCodec or None
+        :type retry_policy:                 RetryPolicy or None
+        :type circuit_breaker:              CircuitBreaker or None
+        :type hedging_policy:               HedgingPolicy or None
+        :type coalesce_requests:            bool
+        :type batch_window:                 float or None
+        :type response_cache:               ResponseCache or None
+        :type latency_store:                LatencyStore or None
+        :type plot_cache:                   PlotCache or None
+
+        """
+
+        secret = decode_customer_secret(customer_identifier, customer_secret)
+
+        self.__rest_api = outbound_rest_api_v1.Server(
+            customer_identifier = customer_identifier,
+            customer_secret = secret,
+            authority = authority or SpeedSentry.AUTHORITY,
+            connection_pool = connection_pool,
+            pool_size = pool_size,
+            maximum_connections_per_host = maximum_connections_per_host,
+            idle_timeout = idle_timeout,
+            time_delta_refresh_interval = time_delta_refresh_interval,
+            window_guard = window_guard,
+            time_delta_store = time_delta_store,
+            codec = codec,
+            retry_policy = retry_policy,
+            circuit_breaker = circuit_breaker,
+            hedging_policy = hedging_policy
+        )
+
+        self.__decoder = ResponseDecoder(compact_records, lazy_records)
+
+        if coalesce_requests:
+            self.__single_flight = single_flight.SingleFlight()
+        else:
+            self.__single_flight = None
+
+        self.__loaders = {
+            'hosts_get' : (
+                lambda timeout: self.hosts_list(timeout = timeout),
+                "/v1/hosts/get"
+            ),
+            'monitors_get' : (
+                lambda timeout: self.monitors_list(timeout = timeout),
+                "/v1/monitors/get"
+            ),
+            'regions_get' : (
+                lambda timeout: self.regions_list(timeout = timeout),
+                "/v1/regions/get"
+            ),
+            'status_get' : (
+                lambda timeout: self.status_list(timeout = timeout),
+                "/v1/status/get"
+            )
+        }
+
+        if batch_window is not None:
+            self.__batch_loaders = {
+                name : batching.BatchLoader(fetch_all, slug, batch_window)
+                for name, (fetch_all, slug) in self.__loaders.items()
+            }
+        else:
+            self.__batch_loaders = None
+
+        self.__response_cache = response_cache
+        self.__latency_store = latency_store
+        self.__plot_cache = plot_cache
+
+
+    @property
+    def statistics(self):
+        """
+        Read-only property holding a snapshot of request and clock skew
+        statistics, including an estimate of the number of authentication
+        retries avoided.
+
+        :type: ServerStatistics
+
+        """
+
+        return self.__rest_api.statistics
+
+
+    @property
+    def policy_statistics(self):
+        """
+        Read-only property holding a snapshot of retry and hedge counts and
+        the state of the circuit breaker.
+
+        :type: PolicyStatistics
+
+        """
+
+        return self.__rest_api.policy_statistics
+
+
+    @property
+    def circuit_breaker(self):
+        """
+        Read-only property holding the circuit breaker used by this instance.
+        You can use the breaker's reset method to close it manually.
+
+        :type: CircuitBreaker
+
+        """
+
+        return self.__rest_api.circuit_breaker
+
+
+    @property
+    def hedging_policy(self):
+        """
+        Read-only property holding the hedging policy used by this instance.
+        You can use the policy's estimator to inspect the rolling
+        per-endpoint response time estimates.
+
+        :type: HedgingPolicy or None
+
+        """
+
+        return self.__rest_api.hedging_policy
+
+
+    @property
+    def coalesced_requests(self):
+        """
+        Read-only property holding the number of calls that shared the
+        result of an identical in-flight request rather than sending their
+        own.
+
+        :type: int
+
+        """
+
+        if self.__single_flight is not None:
+            result = self.__single_flight.followers
+        else:
+            result = 0
+
+        return result
+
+
+    @property
+    def response_cache(self):
+        """
+        Read-only property holding the response cache used by this instance.
+        You can use the cache's invalidate method to discard cached
+        responses.
+
+        :type: ResponseCache or None
+
+        """
+
+        return self.__response_cache
+
+
+    @property
+    def latency_store(self):
+        """
+        Read-only property holding the local latency store used by this
+        instance.
+
+        :type: LatencyStore or None
+
+        """
+
+        return self.__latency_store
+
+
+    @property
+    def plot_cache(self):
+        """
+        Read-only property holding the plot cache used by this instance.  You
+        can use the cache's statistics property to obtain hit and miss
+        counts.
+
+        :type: PlotCache or None
+
+        """
+
+        return self.__plot_cache
+
+
+    @property
+    def cache_statistics(self):
+        """
+        Read-only property holding a snapshot of response cache hit and miss
+        counts.  The value None is returned if caching is disabled.
+
+        :type: CacheStatistics or None
+
+        """
+
+        if self.__response_cache is not None:
+            result = self.__response_cache.statistics
+        else:
+            result = None
+
+        return result
+
+
+    def close(self):
+        """
+        Method you can use to release any pooled connections held by this
+        instance.  Connection pools supplied by the caller are left open.
+
+        """
+
+        self.__rest_api.close()
+
+
+    def reset_after_fork(self):
+        """
+        Method you can call in a forked child process to replace the pooled
+        connections, locks, and in-flight request state inherited from the
+        parent process.  The measured time delta is kept.  Calling this method
+        is optional as the state is replaced on first use in the child.  The
+        method does nothing if the process has not forked.
+
+        """
+
+        self.__rest_api.reset_after_fork()
+
+        if self.__single_flight is not None:
+            self.__single_flight.reset_after_fork()
+
+        if self.__batch_loaders is not None:
+            for loader in self.__batch_loaders.values():
+                loader.reset_after_fork()
+
+        if self.__response_cache is not None:
+            self.__response_cache.reset_after_fork()
+
+        if self.__latency_store is not None:
+            self.__latency_store.reset_after_fork()
+
+        if self.__plot_cache is not None:
+            self.__plot_cache.reset_after_fork()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+
+    def batch(self, timeout : float = None):
+        """
+        Method you can use to collect lookups of individual hosts, monitors,
+        regions, and monitor status values into a single request per
+        endpoint.  Lookups made through the returned batch return futures.
+        The requests are issued when the with block exits or when the first
+        result is requested::
+
+            with api.batch() as batch:
+                status = [ batch.status_get(i) for i in monitor_ids ]
+
+            values = [ s.result() for s in status ]
+
+        :param timeout:
+            An optional deadline, in seconds, for each list request.
+
+        :return:
+            Returns a new RequestBatch instance.
+
+        :type timeout: float or None
+        :rtype:        RequestBatch
+
+        """
+
+        return RequestBatch(self.__loaders, timeout)
+
+
+    def capabilities_get(self, timeout : float = None) -> Capabilities:
+        """
+        Method you can use to obtain information on what features are supported
+        by your subscription.
+
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
+        :return:
+            Returns a Capabilities instance you can use to determine the
+            features supported by your subscription.
+
+        :type timeout: float or None
+        :rtype:        Capabilities
+
+        """
+
+        response = self.__post_message(
+            slug = "/v1/capabilities/get",
+            message = dict(),
+            timeout = timeout
+        )
+
+        return self.__decoder.capabilities_get(response)
+
+
+    def hosts_get(
+        self,
+        host_scheme_id : int,
+        timeout : float = None
+        ) -> HostScheme:
+        """
+        Method you can use to obtain a single host/scheme entry indexed by
+        host/scheme ID.
+
+        :param host_scheme_id:
+            The host/scheme ID of the desired host/scheme.
+
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
+        :return:
+            Returns single HostScheme instance.
+
+        :type host_scheme_id: int
+        :type timeout:        float or None
+        :rtype:               HostScheme
+
+        """
+
+        if self.__batch_loaders is not None:
+            result = self.__batch_loaders['hosts_get'].load(
+                host_scheme_id,
+                timeout
+            )
+        else:
+            response = self.__post_message(
+                slug = "/v1/hosts/get",
+                message = { 'host_scheme_id' : host_scheme_id },
+                timeout = timeout
+            )
+
+            result = self.__decoder.hosts_get(response)
+
+        return result
+
+
+    def hosts_list(self, timeout : float = None) -> dict:
+        """
+        Method you can use to obtain a dictionary of host/scheme instances
+        indexed by host/scheme ID.
+
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
+        :return:
+            Returns a dictionary of HostScheme instances indexed by the
+            host/scheme ID.
+
+        :type timeout: float or None
+        :rtype:        dict of HostScheme instances
+
+        """
+
+        response = self.__post_message(
+            slug = "/v1/hosts/list",
+            message = dict(),
+            timeout = timeout
+        )
+
+        return self.__decoder.hosts_list(response)
+
+
+    def monitors_get(
+        self,
+        monitor_id : int,
+        timeout : float = None
+        ) -> Monitor:
+        """
+        Method you can use to obtain information on a single monitor.
+
+        :param monitor_id:
+            The ID of the desired monitor.
+
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
+        :return:
+            Returns a Monitor instance describing this monitor.
+
+        :type monitor_id: int
+        :type timeout:    float or None
+        :rtype:           Monitor instance
+
+        """
+
+        if self.__batch_loaders is not None:
+            result = self.__batch_loaders['monitors_get'].load(
+                monitor_id,
+                timeout
+            )
+        else:
+            response = self.__post_message(
+                slug = "/v1/monitors/get",
+                message = { 'monitor_id' : monitor_id },
+                timeout = timeout
+            )
+
+            result = self.__decoder.monitors_get(response)
+
+        return result
+
+
+    def monitors_list(
+        self,
+        order_by : str = "monitor_id",
+        timeout : float = None
+        ) -> dict:
+        """
+        Method you can use to obtain a list of all monitors.
+
+        :param order_by:
+            A string indicating the desired method the monitors should be
+            indexed.  Supported values are "monitor_id", "user_ordering",
+            or "url".
+
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
+        :return:
+            Returns a dictionary of Monitor instances.
+
+        :type order_by: str
+        :type timeout:  float or None
+        :rtype:         dict of Monitor instances
+
+        """
+
+        response = self.__post_message(
+            slug = "/v1/monitors/list",
+            message = { 'order_by' : order_by },
+            timeout = timeout
+        )
+
+        return self.__decoder.monitors_list(response)
+
+
+    def monitors_update(self, monitor_data : list, timeout : float = None):
+        """
+        Method you can use to update monitor settings.
+
+        :param monitor_data:
+            A list of MonitorEntry instances.  The first entry has a user
+            ordering of 0, the second entry has a user ordering of 1, etc.
+
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
+        :type monitor_data: list
+        :type timeout:      float or None
+
+        """
+
+        self.__post_message(
+            slug = "/v1/monitors/update",
+            message = build_monitors_update_message(monitor_data),
+            timeout = timeout
+        )
+
+
+    def regions_get(self, region_id : int, timeout : float = None) -> Region:
+        """
+        Method you can use to obtain information on a single region.
+
+        :param region_id:
+            The ID of the desired region.
+
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
+        :return:
+            Returns a Region instance describing this region.
+
+        :type region_id: int
+        :type timeout:   float or None
+        :rtype:          Region instance
+
+        """
+
+        if self.__batch_loaders is not None:
+            result = self.__batch_loaders['regions_get'].load(
+                region_id,
+                timeout
+            )
+        else:
+            response = self.__post_message(
+                slug = "/v1/regions/get",
+                message = { 'region_id' : region_id },
+                timeout = timeout
+            )
+
+            result = self.__decoder.regions_get(response)
+
+        return result
+
+
+    def regions_list(self, timeout : float = None) -> dict:
+        """
+        Method you can use to obtain a dictionary holding information on all
+        regions.  The dictionary will be indexed by region ID.
+
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
+        :return:
+            Returns a dictionary of regions by region ID.
+
+        :type timeout: float or None
+        :rtype:        dict
+
+        """
+
+        response = self.__post_message(
+            slug = "/v1/regions/list",
+            message = dict(),
+            timeout = timeout
+        )
+
+        return self.__decoder.regions_list(response)
+
+
+    def events_get(self, event_id : int, timeout : float = None) -> Event:
+        """
+        Method you can use to obtain information on a single event.
+
+        :param event_id:
+            The ID of the desired event.
+
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
+        :return:
+            Returns an Event instance describing the event.
+
+        :type event_id: int
+        :type timeout:  float or None
+        :rtype:         Event instance
+
+        """
+
+        response = self.__post_message(
+            slug = "/v1/events/get",
+            message = { 'event_id' : event_id },
+            timeout = timeout
+        )
+
+        return self.__decoder.events_get(response)
+
+
+    def events_list(
+        self,
+        start_timestamp : int = None,
+        end_timestamp : int = None,
+        timeout : float = None
+        ) -> list:
+        """
+        Method you can use to obtain a list of events.
+
+        :param start_timestamp:
+            An optional starting Unix timestamp for events.  A value of None
+            means no start time.
+
+        :param end_timestamp:
+            An optional ending Unix timestamp for events.  A value of None
+            means no end time.
+
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
+        :return:
+            Returns a list of events.
+
+        :type start_timestamp: int or None
+        :type end_timestamp:   int or None
+        :type timeout:         float or None
+        :rtype:                list
+
+        """
+
+        response = self.__post_message(
+            slug = "/v1/events/list",
+            message = build_events_list_message(
+                start_timestamp,
+                end_timestamp
+            ),
+            timeout = timeout
+        )
+
+        return self.__decoder.events_list(response)
+
+
+    def events_create(
+        self,
+        message : str,
+        type_index = None,
+        monitor_id = None,
+        timeout : float = None
+        ):
+        """
+        Method you can use to generate a customer event.
+
+        :param message:
+            The message to be sent as part of the event.
+
+        :param type_index:
+            A value indicating the type of customer event to be created.  A
+            value of 1 indicates customer_1, a value of 2 indicates customer_2,
+            etc.  If not specified, then customer_1 is used.
+
+        :param monitor_id:
+            An optional monitor ID you can tie to this message.  If not
+            specified or None, then the first monitor ID is used.
 
-    def status_get(self, monitor_id : int) -> str:
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
+        :type message:    str
+        :type monitor_id: int or None
+        :type timeout:    float or None
+
+        """
+
+        self.__post_message(
+            slug = "/v1/events/create",
+            message = build_events_create_message(
+                message,
+                type_index,
+                monitor_id
+            ),
+            timeout = timeout
+        )
+
+
+    def status_get(self, monitor_id : int, timeout : float = None) -> str:
         """
         Method you can use to obtain status on a specific monitor.
 
         :param monitor_id:
             The ID of the desired monitor.
 
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
         :return:
             Returns a string holding "unknown", "working", or "failed"
             indicating the last reported status for this monitor.
 
         :type monitor_id: int
+        :type timeout:    float or None
         :rtype:           str
 
         """
 
-        response = self.__post_message(
-            slug = "/v1/status/get",
-            message = { 'monitor_id' : monitor_id }
-        )
-
-        if 'monitor_status' in response:
-            result = response['monitor_status']
+        if self.__batch_loaders is not None:
+            result = self.__batch_loaders['status_get'].load(
+                monitor_id,
+                timeout
+            )
         else:
-            raise CommunicationErrorException(
-                status_message = "/v1/status/get : missing response data"
+            response = self.__post_message(
+                slug = "/v1/status/get",
+                message = { 'monitor_id' : monitor_id },
+                timeout = timeout
             )
 
+            result = self.__decoder.status_get(response)
+
         return result
 
 
-    def status_list(self) -> dict:
+    def status_list(self, timeout : float = None) -> dict:
         """
         Method you can use to obtain a dictionary holding the status for each
         monitor under your subscription.
 
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
         :return:
             Returns a dictionary holding the status of each monitor under your
             subscription.  The dictionary is keyed by monitor ID.  Each entry
             holds one of "unknown", "working", or "failed" indicating the last
             reported status for the monitor.
 
-        :rtype: dict
+        :type timeout: float or None
+        :rtype:        dict
 
         """
 
         response = self.__post_message(
             slug = "/v1/status/list",
-            message = dict()
+            message = dict(),
+            timeout = timeout
         )
 
-        if 'monitor_status' in response:
-            monitor_status = response['monitor_status']
-            result = { int(k) : v for k, v in monitor_status.items() }
-        else:
-            raise CommunicationErrorException(
-                status_message = "/v1/status/list : missing response data"
-            )
-
-        return result
+        return self.__decoder.status_list(response)
 
 
-    def multiple_list(self) -> dict:
+    def multiple_list(self, timeout : float = None) -> dict:
         """
         Method you can use to obtain a dictionary holding multiple useful
         values in a single request.
 
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
         :return:
             Returns a dictionary holding:
                 * A dictionary of monitors by user order.
@@ -819,61 +2327,34 @@ class SpeedSentry(object):
                 * A dictionary of events in chronological order.
                 * A dictionary of monitor status values by monitor ID.
 
-        :rtype: dict
+        :type timeout: float or None
+        :rtype:        dict
 
         """
 
         response = self.__post_message(
             slug = "/v1/multiple/list",
-            message = dict()
+            message = dict(),
+            timeout = timeout
         )
 
-        if 'monitors' in response       and \
-           'host_schemes' in response   and \
-           'events' in response         and \
-           'monitor_status' in response     :
-            events = list()
-            for event in response['events']:
-                events.append(Event(event))
-
-            raw_monitor_status = response['monitor_status']
-            monitor_status = { int(k) : v
-                               for k, v in raw_monitor_status.items()
-                             }
-
-            authorities = dict()
-            for host_scheme_id, host_entry in response['host_schemes'].items():
-                authorities[host_scheme_id] = HostScheme(host_entry)
-
-            raw_monitors_data = response['monitors']
-            monitors = dict()
-            for k, monitor_data in raw_monitors_data.items():
-                if isinstance(monitor_data, dict):
-                    monitors[k] = self.__post_process_monitor(monitor_data)
-                else:
-                    monitors[k] = [ self.__post_process_monitor(md)
-                                    for md in monitor_data
-                                  ]
-
-            result = {
-                'authorities' : authorities,
-                'monitors' : monitors,
-                'events' : events,
-                'status' : monitor_status
-            }
-        else:
-            raise CommunicationErrorException(
-                status_message = "/v1/status/list : missing response data"
-            )
-
-        return result
+        return self.__decoder.multiple_list(response)
 
 
-    def latency_list(self, **kwargs) -> tuple:
+    def latency_list(
+        self,
+        as_frame : bool = False,
+        timeout : float = None,
+        **kwargs
+        ) -> tuple:
         """
         Method you can use to obtain latency entries.  Information can be
         limited to a specific timeframe, region, and/or monitor.
 
+        :param as_frame:
+            If True, entries are returned as columnar LatencyFrame instances
+            rather than lists of entries.  Requires the numpy package.
+
         :param start_timestamp:
             An optional starting Unix timestamp for events.  A value of None
             means no start time.
@@ -892,6 +2373,10 @@ class SpeedSentry(object):
             monitor will be included.  Note that this parameter is mutually
             exclusive with region_id.
 
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
         :return:
             Returns a tuple holding a list of LatencyEntry instances followed
             by a list of AggregatedLatencyEntry instances.  The most recent
@@ -899,32 +2384,276 @@ class SpeedSentry(object):
             aggregation of older values stored at a lower resolution and with
             additional information.
 
-        :rtype: tuple
+            If as_frame is True, the tuple holds a LatencyFrame of recent
+            values followed by a LatencyFrame of aggregated values.
+
+        If a latency store was supplied and the requested time range lies
+        within a range already synchronized, entries are read from the store
+        and no request is sent.
+
+        :type as_frame:        bool
+        :type start_timestamp: int
+        :type end_timestamp:   int
+        :type region_id:       int
+        :type monitor_id:      int
+        :type timeout:         float or None
+        :rtype:                tuple
+
+        """
+
+        if self.__latency_store is not None                      and \
+           set(kwargs) <= LATENCY_QUERY_PARAMETERS                and \
+           self.__latency_store.covers(**kwargs)                     :
+            recent, aggregated = self.__latency_store.query_rows(**kwargs)
+            if as_frame:
+                result = self.__decoder.latency_row_frames(recent, aggregated)
+            else:
+                result = self.__decoder.latency_rows(recent, aggregated)
+        else:
+            response = self.__post_message(
+                slug = "/v1/latency/list",
+                message = kwargs,
+                timeout = timeout
+            )
+
+            if as_frame:
+                result = self.__decoder.latency_frames(response)
+            else:
+                result = self.__decoder.latency_list(response)
+
+        return result
+
+
+    def latency_sync(
+        self,
+        monitor_id : int = None,
+        region_id : int = None,
+        timeout : float = None
+        ) -> int:
+        """
+        Method you can use to download latency entries newer than those held
+        in the latency store.  The first call for a given monitor, region, or
+        for all monitors downloads the full history.  Later calls only request
+        entries from the last synchronized timestamp onward.
+
+        :param monitor_id:
+            An optional monitor ID.  If specified, only entries for this
+            monitor are synchronized.  Note that this parameter is mutually
+            exclusive with region_id.
+
+        :param region_id:
+            An optional region ID.  If specified, only entries for this region
+            are synchronized.  Note that this parameter is mutually exclusive
+            with monitor_id.
+
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
+        :return:
+            Returns the number of entries added to the store.
+
+        :type monitor_id: int or None
+        :type region_id:  int or None
+        :type timeout:    float or None
+        :rtype:           int
 
         """
 
+        if self.__latency_store is None:
+            raise ValueError("no latency store")
+
+        scope_name = latency_store.scope(monitor_id, region_id)
+        coverage = self.__latency_store.coverage(scope_name)
+        start_timestamp = coverage[1] if coverage is not None else None
+
+        message = dict()
+        if start_timestamp is not None:
+            message['start_timestamp'] = start_timestamp
+
+        if monitor_id is not None:
+            message['monitor_id'] = monitor_id
+
+        if region_id is not None:
+            message['region_id'] = region_id
+
         response = self.__post_message(
             slug = "/v1/latency/list",
-            message = kwargs
+            message = message,
+            timeout = timeout
         )
 
-        if 'recent' in response and 'aggregated' in response:
-            recent = response['recent']
-            aggregated = response['aggregated']
+        if 'recent' not in response or 'aggregated' not in response:
+            raise CommunicationErrorException(
+                status_message = "/v1/latency/list : missing response data"
+            )
 
-            result = (
-                [ LatencyEntry(s) for s in recent ],
-                [ AggregatedLatencyEntry(s) for s in aggregated ]
+        try:
+            result = self.__latency_store.update(
+                scope_name,
+                start_timestamp,
+                response['recent'],
+                response['aggregated']
             )
-        else:
+        except (KeyError, TypeError):
             raise CommunicationErrorException(
-                status_message = "/v1/latency/list : missing response data"
+                status_message = "/v1/latency/list : invalid response data"
+            )
+
+        return result
+
+
+    def latency_query(
+        self,
+        as_frame : bool = False,
+        timeout : float = None,
+        **kwargs
+        ) -> tuple:
+        """
+        Method you can use to obtain latency entries through the latency
+        store.  Entries newer than those held are downloaded first using
+        latency_sync.  The query is then answered from the store.
+
+        :param as_frame:
+            If True, entries are returned as columnar LatencyFrame instances
+            rather than lists of entries.  Requires the numpy package.
+
+        :param start_timestamp:
+            An optional starting Unix timestamp for events.  A value of None
+            means no start time.
+
+        :param end_timestamp:
+            An optional ending Unix timestamp for events.  A value of None
+            means no end time.
+
+        :param region_id:
+            An optional region ID.  If specified, then only values for this
+            region will be included.  Note that this parameter is mutually
+            exclusive with monitor_id.
+
+        :param monitor_id:
+            An optional monitor ID.  If specified, then only values for this
+            monitor will be included.  Note that this parameter is mutually
+            exclusive with region_id.
+
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
+        :return:
+            Returns a tuple holding a list of LatencyEntry instances followed
+            by a list of AggregatedLatencyEntry instances, ordered by
+            timestamp.  If as_frame is True, the tuple holds a LatencyFrame
+            of recent values followed by a LatencyFrame of aggregated values.
+
+        :type as_frame:        bool
+        :type start_timestamp: int
+        :type end_timestamp:   int
+        :type region_id:       int
+        :type monitor_id:      int
+        :type timeout:         float or None
+        :rtype:                tuple
+
+        """
+
+        if self.__latency_store is None:
+            raise ValueError("no latency store")
+
+        if not set(kwargs) <= LATENCY_QUERY_PARAMETERS:
+            raise ValueError(
+                "unexpected parameters %s"%", ".join(
+                    sorted(set(kwargs) - LATENCY_QUERY_PARAMETERS)
+                )
+            )
+
+        if not self.__latency_store.covers(**kwargs):
+            self.latency_sync(
+                monitor_id = kwargs.get('monitor_id'),
+                region_id = kwargs.get('region_id'),
+                timeout = timeout
             )
 
+        recent, aggregated = self.__latency_store.query_rows(**kwargs)
+
+        if as_frame:
+            result = self.__decoder.latency_row_frames(recent, aggregated)
+        else:
+            result = self.__decoder.latency_rows(recent, aggregated)
+
         return result
 
 
-    def latency_plot(self, **kwargs) -> bytes:
+    def latency_stream(
+        self,
+        chunk_size : int = outbound_rest_api_v1.DEFAULT_CHUNK_SIZE,
+        timeout : float = None,
+        **kwargs
+        ):
+        """
+        Generator you can use to obtain latency entries one at a time as the
+        response is received.  Unlike latency_list, the full response is never
+        held in memory so peak memory use is bounded by the chunk size rather
+        than by the length of the latency history.
+
+        Recent values are yielded as LatencyEntry instances and older,
+        aggregated values as AggregatedLatencyEntry instances.  The request is
+        sent when the first entry is requested.  The underlying connection is
+        held until the generator is exhausted or closed.
+
+        :param chunk_size:
+            The size, in bytes, of the chunks read from the response.
+
+        :param start_timestamp:
+            An optional starting Unix timestamp for events.  A value of None
+            means no start time.
+
+        :param end_timestamp:
+            An optional ending Unix timestamp for events.  A value of None
+            means no end time.
+
+        :param region_id:
+            An optional region ID.  If specified, then only values for this
+            region will be included.  Note that this parameter is mutually
+            exclusive with monitor_id.
+
+        :param monitor_id:
+            An optional monitor ID.  If specified, then only values for this
+            monitor will be included.  Note that this parameter is mutually
+            exclusive with region_id.
+
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
+        :type chunk_size:      int
+        :type start_timestamp: int
+        :type end_timestamp:   int
+        :type region_id:       int
+        :type monitor_id:      int
+        :type timeout:         float or None
+
+        """
+
+        chunks = self.__rest_api.post_streamed_message(
+            slug = "/v1/latency/list",
+            message = kwargs,
+            chunk_size = chunk_size,
+            timeout = timeout
+        )
+
+        try:
+            members = json_stream.JsonObjectStream(
+                chunks,
+                array_keys = ('recent', 'aggregated')
+            )
+
+            for entry in self.__decoder.latency_stream(members):
+                yield entry
+        finally:
+            chunks.close()
+
+
+    def latency_plot(self, timeout : float = None, **kwargs) -> bytes:
         """
         Method you can use to obtain a pre-generated plot of latency data.
 
@@ -985,8 +2714,15 @@ class SpeedSentry(object):
             The format of the returned data.  Value can be "jpg" or "png".  PNG
             encoded plots will be returned by default.
 
+        :param timeout:
+            An optional deadline, in seconds, for the request including any
+            retries.  A value of None means no deadline.
+
         :return:
-            Returns a bytes object holding the plot image.
+            Returns a bytes object holding the plot image.  If a plot cache
+            was supplied, a read-only memoryview of the cached plot image is
+            returned instead.  Start and end timestamps are then rounded down
+            to the cache's time bucket before the plot is requested.
 
         :type monitor_id:      int
         :type region_id:       int
@@ -1002,20 +2738,69 @@ class SpeedSentry(object):
         :type height:          int
         :type plot_type:       str
         :type format:          str
-        :rtype:                bytes
+        :type timeout:         float or None
+        :rtype:                bytes or memoryview
+
+        """
+
+        if self.__plot_cache is not None:
+            result = self.__plot_cache.get(kwargs, self.__fetch_plot, timeout)
+        else:
+            result = self.__fetch_plot(kwargs, timeout)
+
+        return result
+
+
+    def __fetch_plot(self, message : dict, timeout : float = None) -> bytes:
+        """
+        Method used internally to request a latency plot.  Identical
+        concurrent requests are coalesced.
+
+        :param message:
+            A dictionary holding the plot parameters.
+
+        :param timeout:
+            An optional deadline, in seconds, for the request.
+
+        :return:
+            Returns the plot image.
+
+        :type message: dict
+        :type timeout: float or None
+        :rtype:        bytes
 
         """
 
-        return self.__rest_api.post_binary_message(
-            slug = "/v1/latency/plot",
-            message = kwargs
+        slug = "/v1/latency/plot"
+        post = lambda: self.__rest_api.post_binary_message(
+            slug = slug,
+            message = message,
+            timeout = timeout
         )
 
+        if self.__single_flight is not None:
+            result, _ = self.__single_flight.call(
+                single_flight.canonical_key(slug, message),
+                post,
+                timeout
+            )
+        else:
+            result = post()
+
+        return result
+
 
-    def __post_message(self, slug : str, message : dict) -> dict:
+    def __post_message(
+        self,
+        slug : str,
+        message : dict,
+        timeout : float = None
+        ) -> dict:
         """
         Method used internally to post a message and check for successful
-        status.
+        status.  Responses from cached endpoints are returned from the
+        response cache when possible.  Calls to updating endpoints discard
+        the cached responses they affect.
 
         :param slug:
             The slug to be used.
@@ -1023,76 +2808,91 @@ class SpeedSentry(object):
         :param message:
             A dictionary holding the message to be sent.
 
+        :param timeout:
+            An optional deadline, in seconds, for the request.
+
         :return:
             Returns a dictionary with the response or None if the provided hash
             was invalid.
 
         :type slug:    str
         :type message: dict
+        :type timeout: float or None
         :rtype:        dict or None
 
         """
 
-        response = self.__rest_api.post_message(slug = slug, message = message)
-        if 'status' in response:
-            status = response['status']
-            if status != 'OK':
-                raise CommunicationErrorException(
-                    status_message = "%s : %s"%(slug, status)
+        cache = self.__response_cache
+        if cache is None:
+            result = self.__fetch_message(slug, message, timeout)
+        elif cache.is_cached(slug):
+            result = copy.deepcopy(
+                cache.get(
+                    slug,
+                    message,
+                    lambda t: self.__fetch_message(slug, message, t),
+                    timeout
                 )
-        else:
-            raise CommunicationErrorException(
-                status_message = "%s : unexpected response"%slug
             )
+        elif not self.__rest_api.retry_policy.is_idempotent(slug):
+            try:
+                result = self.__fetch_message(slug, message, timeout)
+            finally:
+                cache.invalidate_affected(slug)
+        else:
+            result = self.__fetch_message(slug, message, timeout)
 
-        return response
+        return result
 
 
-    def __post_process_monitor(self, monitor_data : dict) -> dict:
+    def __fetch_message(
+        self,
+        slug : str,
+        message : dict,
+        timeout : float = None
+        ) -> dict:
         """
-        Method used internally to decode base-64 encoded entries.
+        Method used internally to post a message and check for successful
+        status.  Identical concurrent get and list requests are coalesced.
 
-        :param monitor_data:
-            The raw received monitor data.
+        :param slug:
+            The slug to be used.
 
-        :return:
-            Returns a Monitor instance holding the processed data.
+        :param message:
+            A dictionary holding the message to be sent.
 
-        :type monitor_data: dict
-        :rtype:             Monitor
+        :param timeout:
+            An optional deadline, in seconds, for the request.
 
-        """
+        :return:
+            Returns a dictionary with the response.
 
-        processed = monitor_data;
-        keywords = list()
-        for raw_keyword in monitor_data['keywords']:
-            try:
-                decoded_keyword = base64.b64decode(
-                    raw_keyword,
-                    validate = True
-                )
-            except:
-                raise DecodingErrorException(
-                    status_message = "could not decode keywords."
-                )
+        :type slug:    str
+        :type message: dict
+        :type timeout: float or None
+        :rtype:        dict
 
-            keywords.append(decoded_keyword)
+        """
 
-        processed['keywords'] = keywords
+        post = lambda: self.__rest_api.post_message(
+            slug = slug,
+            message = message,
+            timeout = timeout
+        )
 
-        try:
-            post_content = base64.b64decode(
-                monitor_data['post_content'],
-                validate = True
-            )
-        except:
-            raise DecodingErrorException(
-                status_message = "could not decode post content."
+        if self.__single_flight is not None                             and \
+           self.__rest_api.retry_policy.is_idempotent(slug)                :
+            response, shared = self.__single_flight.call(
+                single_flight.canonical_key(slug, message),
+                post,
+                timeout
             )
+            if shared:
+                response = copy.deepcopy(response)
+        else:
+            response = post()
 
-        processed['post_content'] = post_content
-
-        return Monitor(processed)
+        return self.__decoder.check_status(slug, response)
 
 ###############################################################################
 # Test code:
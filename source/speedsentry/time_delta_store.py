@@ -0,0 +1,369 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that persists measured server time deltas to disk so that new
+processes can start with a known time delta rather than discovering it through
+a rejected request.
+
+The store is a small JSON file.  Updates are written to a temporary file and
+atomically renamed into place.  On platforms that support it, updates are also
+serialized with an advisory lock so concurrent processes do not lose each
+other's entries.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import os
+import time
+import json
+import tempfile
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+###############################################################################
+# Globals:
+#
+
+DEFAULT_TIME_TO_LIVE = 3600
+"""
+The default time, in seconds, a stored time delta is considered fresh.
+
+"""
+
+DEFAULT_FILENAME = "time_delta.json"
+"""
+The default name of the store file.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def default_path() -> str:
+    """
+    Function you can use to obtain the default store file path.  The file is
+    placed under $XDG_CACHE_HOME/speedsentry, or ~/.cache/speedsentry if
+    XDG_CACHE_HOME is not set.
+
+    :return:
+        Returns the default store file path.
+
+    :rtype: str
+
+    """
+
+    cache_directory = os.environ.get('XDG_CACHE_HOME')
+    if not cache_directory:
+        cache_directory = os.path.join(os.path.expanduser("~"), ".cache")
+
+    return os.path.join(cache_directory, "speedsentry", DEFAULT_FILENAME)
+
+###############################################################################
+# Class TimeDeltaStore:
+#
+
+class TimeDeltaStore(object):
+    """
+    Class that persists measured time deltas keyed by server authority and
+    customer identifier.  Errors reading or writing the store are ignored so
+    that a missing or unwritable store never prevents requests from being
+    sent.
+
+    """
+
+    def __init__(
+        self,
+        path : str = None,
+        time_to_live : float = DEFAULT_TIME_TO_LIVE
+        ):
+        """
+        Method that initializes the TimeDeltaStore class.
+
+        :param path:
+            The path of the store file.  If None, the path returned by
+            default_path is used.
+
+        :param time_to_live:
+            The time, in seconds, a stored time delta is considered fresh.
+
+        :type path:         str or None
+        :type time_to_live: float
+
+        """
+
+        super().__init__()
+
+        self.__path = path if path is not None else default_path()
+        self.__time_to_live = time_to_live
+
+
+    @property
+    def path(self):
+        """
+        Read-only property holding the path of the store file.
+
+        :type: str
+
+        """
+
+        return self.__path
+
+
+    @property
+    def time_to_live(self):
+        """
+        Read-only property holding the time, in seconds, a stored time delta
+        is considered fresh.
+
+        :type: float
+
+        """
+
+        return self.__time_to_live
+
+
+    def load(self, authority : str, customer_identifier : str):
+        # -> Union[tuple, NoneType]
+        """
+        Method you can use to obtain a stored time delta.
+
+        :param authority:
+            The server authority.
+
+        :param customer_identifier:
+            The customer identifier.
+
+        :return:
+            Returns a tuple holding the time delta, the round trip time, and
+            the age of the entry in seconds.  None is returned if there is no
+            fresh entry.
+
+        :type authority:           str
+        :type customer_identifier: str
+        :rtype:                    tuple or None
+
+        """
+
+        entries = self.__read()
+        entry = entries.get(self.__key(authority, customer_identifier))
+
+        result = None
+        if isinstance(entry, dict):
+            try:
+                age = time.time() - float(entry['timestamp'])
+                if 0 <= age <= self.__time_to_live:
+                    round_trip_time = entry.get('round_trip_time')
+                    result = (
+                        float(entry['time_delta']),
+                        float(round_trip_time)
+                            if round_trip_time is not None else None,
+                        age
+                    )
+            except (KeyError, TypeError, ValueError):
+                result = None
+
+        return result
+
+
+    def save(
+        self,
+        authority : str,
+        customer_identifier : str,
+        time_delta : float,
+        round_trip_time : float = None
+        ):
+        """
+        Method you can use to store a measured time delta.  Stale entries for
+        other servers and customers are pruned at the same time.
+
+        :param authority:
+            The server authority.
+
+        :param customer_identifier:
+            The customer identifier.
+
+        :param time_delta:
+            The measured time delta, in seconds.
+
+        :param round_trip_time:
+            The measured round trip time, in seconds.
+
+        :type authority:           str
+        :type customer_identifier: str
+        :type time_delta:          float
+        :type round_trip_time:     float or None
+
+        """
+
+        try:
+            directory = os.path.dirname(os.path.abspath(self.__path))
+            os.makedirs(directory, exist_ok = True)
+
+            with open(self.__path + ".lock", 'a') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+
+                try:
+                    now = time.time()
+                    entries = {
+                        k : v for k, v in self.__read().items()
+                        if self.__fresh(v, now)
+                    }
+
+                    entries[self.__key(authority, customer_identifier)] = {
+                        'time_delta' : time_delta,
+                        'round_trip_time' : round_trip_time,
+                        'timestamp' : now
+                    }
+
+                    self.__write(directory, entries)
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        except OSError:
+            pass
+
+
+    def __fresh(self, entry, now : float) -> bool:
+        """
+        Method used internally to determine if an entry is fresh.
+
+        :param entry:
+            The entry to check.
+
+        :param now:
+            The current Unix timestamp.
+
+        :return:
+            Returns True if the entry is fresh.
+
+        :type entry: dict
+        :type now:   float
+        :rtype:      bool
+
+        """
+
+        try:
+            result = now - float(entry['timestamp']) <= self.__time_to_live
+        except (KeyError, TypeError, ValueError):
+            result = False
+
+        return result
+
+
+    def __read(self) -> dict:
+        """
+        Method used internally to read the store file.
+
+        :return:
+            Returns the stored entries.  An empty dictionary is returned if
+            the store could not be read.
+
+        :rtype: dict
+
+        """
+
+        try:
+            with open(self.__path, 'r') as fh:
+                result = json.load(fh)
+        except (OSError, ValueError):
+            result = dict()
+
+        if not isinstance(result, dict):
+            result = dict()
+
+        return result
+
+
+    def __write(self, directory : str, entries : dict):
+        """
+        Method used internally to atomically replace the store file.
+
+        :param directory:
+            The directory holding the store file.
+
+        :param entries:
+            The entries to be written.
+
+        :type directory: str
+        :type entries:   dict
+
+        """
+
+        handle, temporary_path = tempfile.mkstemp(
+            dir = directory,
+            prefix = ".time_delta.",
+            suffix = ".tmp"
+        )
+
+        try:
+            with os.fdopen(handle, 'w') as fh:
+                json.dump(entries, fh)
+                fh.flush()
+                os.fsync(fh.fileno())
+
+            os.replace(temporary_path, self.__path)
+        except:
+            try:
+                os.unlink(temporary_path)
+            except OSError:
+                pass
+
+            raise
+
+
+    def __key(self, authority : str, customer_identifier : str) -> str:
+        """
+        Method used internally to build the key for an entry.
+
+        :param authority:
+            The server authority.
+
+        :param customer_identifier:
+            The customer identifier.
+
+        :return:
+            Returns the entry key.
+
+        :type authority:           str
+        :type customer_identifier: str
+        :rtype:                    str
+
+        """
+
+        return "%s %s"%(authority, customer_identifier.upper())
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
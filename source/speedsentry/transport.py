@@ -0,0 +1,350 @@
+#!/usr/bin/python
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+#
+#   This program is free software; you can redistribute it and/or modify it
+#   under the terms of the GNU Lesser General Public License as published by
+#   the Free Software Foundation; either version 3 of the License, or (at your
+#   option) any later version.
+#
+#   This program is distributed in the hope that it will be useful, but WITHOUT
+#   ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#   FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public
+#   License for more details.
+#
+#   You should have received a copy of the GNU Lesser General Public License
+#   along with this program; if not, write to the Free Software Foundation,
+#   Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+###############################################################################
+
+"""
+Python module that provides a pooled, keep-alive HTTP transport used to
+communicate with the SpeedSentry REST API.
+
+Connections are held open between requests so that successive requests to the
+same authority avoid a fresh TCP and TLS handshake.  Connections that have
+been idle longer than a configurable period are discarded.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import time
+import threading
+import requests
+import requests.adapters
+
+from .exceptions import CommunicationErrorException
+from .exceptions import TimeoutException
+from . import fork_safety as fork_safety
+
+###############################################################################
+# Globals:
+#
+
+DEFAULT_POOL_SIZE = 4
+"""
+The default number of per-host connection pools to keep.
+
+"""
+
+DEFAULT_MAXIMUM_CONNECTIONS_PER_HOST = 10
+"""
+The default maximum number of connections to keep open to any single host.
+
+"""
+
+DEFAULT_IDLE_TIMEOUT = 60
+"""
+The default time, in seconds, a pooled connection can remain idle before it is
+discarded.
+
+"""
+
+###############################################################################
+# Class Transport:
+#
+
+class Transport(object):
+    """
+    Class that manages a pool of persistent HTTP connections.  A single
+    instance can be shared by any number of Server instances and threads.
+    Idle connections are only discarded while no request is in flight.  A
+    child process forked after the transport is created opens its own
+    connections rather than using those inherited from its parent.
+
+    """
+
+    def __init__(
+        self,
+        pool_size : int = DEFAULT_POOL_SIZE,
+        maximum_connections_per_host : int = \
+            DEFAULT_MAXIMUM_CONNECTIONS_PER_HOST,
+        idle_timeout : float = DEFAULT_IDLE_TIMEOUT,
+        block_when_exhausted : bool = False
+        ):
+        """
+        Method that initializes the Transport class.
+
+        :param pool_size:
+            The number of per-host connection pools to keep.
+
+        :param maximum_connections_per_host:
+            The maximum number of connections that will be kept open to any
+            single host.
+
+        :param idle_timeout:
+            The time, in seconds, that the pool can sit unused before all
+            pooled connections are discarded.  A value of None disables idle
+            eviction.
+
+        :param block_when_exhausted:
+            If True, requests will wait for a free connection when the per-host
+            limit is reached.  If False, additional connections will be opened
+            but will not be returned to the pool.
+
+        :type pool_size:                    int
+        :type maximum_connections_per_host: int
+        :type idle_timeout:                 float or None
+        :type block_when_exhausted:         bool
+
+        """
+
+        super().__init__()
+
+        self.__pool_size = pool_size
+        self.__maximum_connections_per_host = maximum_connections_per_host
+        self.__idle_timeout = idle_timeout
+        self.__block_when_exhausted = block_when_exhausted
+
+        self.__session = self.__create_session()
+        self.__last_used = time.monotonic()
+        self.__closed = False
+
+        self.__lock = threading.Lock()
+        self.__in_flight = 0
+        self.__fork_detector = fork_safety.ForkDetector()
+
+
+    @property
+    def pool_size(self):
+        """
+        Read-only property holding the number of per-host connection pools.
+
+        :type: int
+
+        """
+
+        return self.__pool_size
+
+
+    @property
+    def maximum_connections_per_host(self):
+        """
+        Read-only property holding the maximum number of connections kept open
+        to any single host.
+
+        :type: int
+
+        """
+
+        return self.__maximum_connections_per_host
+
+
+    @property
+    def idle_timeout(self):
+        """
+        Read-only property holding the idle eviction timeout, in seconds.
+
+        :type: float or None
+
+        """
+
+        return self.__idle_timeout
+
+
+    @property
+    def closed(self):
+        """
+        Read-only property that holds True if this transport has been closed.
+
+        :type: bool
+
+        """
+
+        return self.__closed
+
+
+    def post(
+        self,
+        url : str,
+        data,
+        headers : dict,
+        stream : bool = False,
+        timeout = None
+        ) -> requests.Response:
+        """
+        Method you can use to issue an HTTP POST request over a pooled
+        connection.  Timeouts are reported with TimeoutException.  Failures
+        to connect, or connections dropped before a response is received,
+        are reported with CommunicationErrorException with no status code.
+
+        :param url:
+            The URL to post to.
+
+        :param data:
+            The request body.
+
+        :param headers:
+            A dictionary of headers to include with the request.
+
+        :param stream:
+            If True, the response body is not read until requested.  The
+            caller must consume or close the response to return the
+            connection to the pool.
+
+        :param timeout:
+            An optional tuple holding the connect and read timeouts, in
+            seconds.  A value of None means no limit.
+
+        :return:
+            Returns the received response.
+
+        :type url:     str
+        :type data:    str or bytes
+        :type headers: dict
+        :type stream:  bool
+        :type timeout: tuple or None
+        :rtype:        requests.Response
+
+        """
+
+        self.reset_after_fork()
+        with self.__lock:
+            if self.__closed:
+                raise ValueError("transport is closed")
+
+            self.__evict_idle()
+            self.__in_flight += 1
+
+        try:
+            response = self.__session.post(
+                url,
+                data = data,
+                headers = headers,
+                stream = stream,
+                timeout = timeout
+            )
+        except requests.exceptions.Timeout as e:
+            raise TimeoutException(status_message = "%s : %s"%(url, str(e)))
+        except requests.exceptions.ConnectionError as e:
+            raise CommunicationErrorException(
+                status_message = "%s : %s"%(url, str(e))
+            )
+        finally:
+            with self.__lock:
+                self.__in_flight -= 1
+                self.__last_used = time.monotonic()
+
+        return response
+
+
+    def evict(self):
+        """
+        Method you can use to discard all pooled connections.  The transport
+        remains usable.  New connections will be opened as needed.
+
+        """
+
+        self.reset_after_fork()
+        self.__session.close()
+
+
+    def reset_after_fork(self):
+        """
+        Method you can call in a forked child process to discard the
+        connections inherited from the parent process.  The inherited
+        connections are abandoned rather than closed so nothing is sent on
+        connections the parent continues to use.  The method is called
+        automatically when the transport is used and does nothing if the
+        process has not forked.
+
+        """
+
+        if self.__fork_detector.forked():
+            self.__lock = threading.Lock()
+            self.__in_flight = 0
+            self.__session = self.__create_session()
+            self.__last_used = time.monotonic()
+
+
+    def close(self):
+        """
+        Method you can use to close this transport and release all pooled
+        connections.
+
+        """
+
+        self.reset_after_fork()
+        with self.__lock:
+            if not self.__closed:
+                self.__closed = True
+                self.__session.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+
+    def __evict_idle(self):
+        """
+        Method used internally to discard pooled connections that have been
+        idle longer than the idle timeout.  The caller must hold the lock.
+
+        """
+
+        if self.__idle_timeout is not None and self.__in_flight == 0:
+            idle_time = time.monotonic() - self.__last_used
+            if idle_time > self.__idle_timeout:
+                self.__session.close()
+
+
+    def __create_session(self) -> requests.Session:
+        """
+        Method used internally to create a session with pooled adapters.
+
+        :return:
+            Returns the newly created session.
+
+        :rtype: requests.Session
+
+        """
+
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections = self.__pool_size,
+            pool_maxsize = self.__maximum_connections_per_host,
+            pool_block = self.__block_when_exhausted
+        )
+
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    import sys
+    sys.stderr.write(
+        "*** This module is not intended to be run as a script..\n"
+    )
+    exit(1)
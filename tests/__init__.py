@@ -0,0 +1,12 @@
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Tests for the SpeedSentry Python API.  The tests issue requests against the
+stand-in server in the benchmarks directory.  You can run the tests using:
+
+    python3 -m unittest discover tests
+
+"""
@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Tests of the time delta handling of the asyncio SpeedSentry REST API.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import asyncio
+import base64
+import unittest
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "benchmarks"
+    )
+)
+
+import speedsentry
+import stand_in_server
+
+###############################################################################
+# Globals:
+#
+
+REFRESH_INTERVAL = 0.2
+"""
+The time delta refresh interval used by the tests, in seconds.
+
+"""
+
+###############################################################################
+# Class TestAsyncTimeDelta:
+#
+
+class TestAsyncTimeDelta(unittest.TestCase):
+    """
+    Tests of the proactive time delta refresh issued by AsyncSpeedSentry.
+
+    """
+
+    def test_failed_refresh_is_recorded(self):
+        """
+        Method that checks that a proactive refresh whose connection is
+        dropped does not fail the request that triggered it and is not
+        retried before the next refresh interval.
+
+        """
+
+        secret = base64.b64encode(stand_in_server.CUSTOMER_SECRET)
+        with stand_in_server.StandInServer() as server:
+            async def run():
+                async with speedsentry.AsyncSpeedSentry(
+                        stand_in_server.CUSTOMER_IDENTIFIER,
+                        secret.decode('utf-8'),
+                        authority = server.authority,
+                        time_delta_refresh_interval = REFRESH_INTERVAL
+                    ) as api:
+                    await api.status_list()
+                    probes = server.time_delta_count
+
+                    await asyncio.sleep(1.5 * REFRESH_INTERVAL)
+                    server.time_delta_drop_count = 1
+                    status = await api.status_list()
+                    self.assertEqual(server.time_delta_count, probes + 1)
+                    self.assertEqual(server.time_delta_drop_count, 0)
+
+                    await api.status_list()
+                    self.assertEqual(server.time_delta_count, probes + 1)
+
+                return status
+
+            self.assertTrue(asyncio.run(run()))
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    unittest.main()
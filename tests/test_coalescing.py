@@ -0,0 +1,166 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Tests of the coalescing of concurrent identical requests.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import base64
+import threading
+import unittest
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "benchmarks"
+    )
+)
+
+import speedsentry
+import stand_in_server
+
+###############################################################################
+# Globals:
+#
+
+NUMBER_THREADS = 8
+"""
+The number of threads calling the API together.
+
+"""
+
+RESPONSE_DELAY = 0.2
+"""
+The simulated server response time, in seconds.  The delay is long enough
+for every thread to join the first thread's request.
+
+"""
+
+###############################################################################
+# Class TestCoalescing:
+#
+
+class TestCoalescing(unittest.TestCase):
+    """
+    Tests of concurrent identical calls made through a shared SpeedSentry
+    instance.
+
+    """
+
+    def test_identical_calls_share_one_request(self):
+        """
+        Method that checks that concurrent identical calls send a single
+        request and that every caller receives its own result.
+
+        """
+
+        requests, results = self.call_together(coalesce_requests = True)
+
+        self.assertEqual(requests, 1)
+        self.assertEqual(len(results), NUMBER_THREADS)
+        self.assertEqual(
+            len(set(id(result) for result in results)),
+            NUMBER_THREADS
+        )
+        for result in results[1:]:
+            self.assertEqual(result, results[0])
+
+        results[0][1] = "changed"
+        for result in results[1:]:
+            self.assertEqual(result[1], "working")
+
+
+    def test_disabled_coalescing(self):
+        """
+        Method that checks that every call sends its own request when
+        coalescing is disabled.
+
+        """
+
+        requests, results = self.call_together(coalesce_requests = False)
+
+        self.assertEqual(requests, NUMBER_THREADS)
+        self.assertEqual(len(results), NUMBER_THREADS)
+
+
+    def call_together(self, coalesce_requests : bool) -> tuple:
+        """
+        Method that has a number of threads call status_list at the same
+        moment using a shared API instance.
+
+        :param coalesce_requests:
+            If True, identical requests are coalesced.
+
+        :return:
+            Returns a tuple holding the number of requests received by the
+            stand-in server and the list of results.
+
+        :type coalesce_requests: bool
+        :rtype:                  tuple
+
+        """
+
+        secret = base64.b64encode(stand_in_server.CUSTOMER_SECRET)
+        with stand_in_server.StandInServer(
+                response_delay = RESPONSE_DELAY
+            ) as server:
+            api = speedsentry.SpeedSentry(
+                stand_in_server.CUSTOMER_IDENTIFIER,
+                secret.decode('utf-8'),
+                authority = server.authority,
+                maximum_connections_per_host = NUMBER_THREADS,
+                coalesce_requests = coalesce_requests
+            )
+
+            with api:
+                api.capabilities_get()
+                starting_requests = server.request_count
+
+                barrier = threading.Barrier(NUMBER_THREADS)
+                results = list()
+                errors = list()
+
+                def worker():
+                    try:
+                        barrier.wait()
+                        results.append(api.status_list())
+                    except Exception as e:
+                        errors.append(repr(e))
+
+                threads = [
+                    threading.Thread(target = worker)
+                    for i in range(NUMBER_THREADS)
+                ]
+                for thread in threads:
+                    thread.start()
+
+                for thread in threads:
+                    thread.join()
+
+                self.assertEqual(errors, [])
+                number_requests = server.request_count - starting_requests
+
+        return (number_requests, results)
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    unittest.main()
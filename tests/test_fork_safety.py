@@ -0,0 +1,174 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Tests of the use of a SpeedSentry instance by forked worker processes.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import base64
+import multiprocessing
+import unittest
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "benchmarks"
+    )
+)
+
+import speedsentry
+import stand_in_server
+
+###############################################################################
+# Globals:
+#
+
+NUMBER_PROCESSES = 4
+"""
+The number of forked worker processes.
+
+"""
+
+NUMBER_CALLS = 5
+"""
+The number of calls issued by each worker process.
+
+"""
+
+CLOCK_SKEW = 120
+"""
+The amount, in seconds, the stand-in server clock is ahead of the local clock.
+
+"""
+
+api = None
+"""
+The API instance shared with the worker processes.
+
+"""
+
+###############################################################################
+# Functions:
+#
+
+def worker(number_calls : int) -> list:
+    """
+    Function run in each worker process.
+
+    :param number_calls:
+        The number of calls to issue.
+
+    :return:
+        Returns a list of errors.
+
+    :type number_calls: int
+    :rtype:             list
+
+    """
+
+    errors = list()
+    for i in range(number_calls):
+        try:
+            status = api.status_list()
+            if status.get(1) != "working":
+                errors.append("unexpected result")
+        except Exception as e:
+            errors.append(repr(e))
+
+    return errors
+
+###############################################################################
+# Class TestForkSafety:
+#
+
+class TestForkSafety(unittest.TestCase):
+    """
+    Tests of a SpeedSentry instance created in a parent process and used by
+    forked worker processes.
+
+    """
+
+    @unittest.skipUnless(hasattr(os, "fork"), "fork is not supported")
+    def test_workers_use_their_own_connections(self):
+        """
+        Method that checks that forked workers never send requests over the
+        parent's connections, reuse the parent's time delta, and leave the
+        parent's connection usable.
+
+        """
+
+        global api
+
+        secret = base64.b64encode(stand_in_server.CUSTOMER_SECRET)
+        with stand_in_server.StandInServer(time_skew = CLOCK_SKEW) as server:
+            api = speedsentry.SpeedSentry(
+                stand_in_server.CUSTOMER_IDENTIFIER,
+                secret.decode('utf-8'),
+                authority = server.authority
+            )
+
+            with api:
+                api.capabilities_get()
+                api.status_list()
+
+                parent_ports = set(server.client_ports)
+                starting_ports = server.client_ports.copy()
+                starting_time_deltas = server.time_delta_count
+                starting_rejections = server.unauthorized_count
+
+                context = multiprocessing.get_context("fork")
+                with context.Pool(NUMBER_PROCESSES) as pool:
+                    results = pool.map(
+                        worker,
+                        [ NUMBER_CALLS ] * NUMBER_PROCESSES,
+                        chunksize = 1
+                    )
+
+                worker_ports = server.client_ports - starting_ports
+                self.assertEqual(
+                    [ error for errors in results for error in errors ],
+                    []
+                )
+                self.assertEqual(
+                    sum(worker_ports.values()),
+                    NUMBER_PROCESSES * NUMBER_CALLS
+                )
+                self.assertFalse(set(worker_ports) & parent_ports)
+                self.assertEqual(
+                    server.time_delta_count,
+                    starting_time_deltas
+                )
+                self.assertEqual(
+                    server.unauthorized_count,
+                    starting_rejections
+                )
+
+                before = server.client_ports.copy()
+                api.status_list()
+                self.assertLessEqual(
+                    set(server.client_ports - before),
+                    parent_ports
+                )
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+#!/usr/bin/python3
+#-*-python-*-##################################################################
+# Copyright 2021-2022 Inesonic, LLC
+# All Rights Reserved
+###############################################################################
+
+"""
+Tests of a SpeedSentry instance shared by many threads.
+
+"""
+
+###############################################################################
+# Import:
+#
+
+import sys
+import os
+import base64
+import threading
+import unittest
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+)
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "benchmarks"
+    )
+)
+
+import speedsentry
+import stand_in_server
+
+###############################################################################
+# Globals:
+#
+
+NUMBER_ROUNDS = 6
+"""
+The number of calls made by each thread.
+
+"""
+
+RESPONSE_DELAY = 0.01
+"""
+The simulated server response time, in seconds.
+
+"""
+
+CLOCK_SHIFT = 600
+"""
+The amount, in seconds, the stand-in server clock is shifted during each run.
+
+"""
+
+###############################################################################
+# Class TestThreading:
+#
+
+class TestThreading(unittest.TestCase):
+    """
+    Tests of the recovery of a shared SpeedSentry instance from a clock shift
+    seen by many threads at the same moment.
+
+    """
+
+    def test_clock_shift_with_8_threads(self):
+        """
+        Method that checks clock shift recovery with 8 threads.
+
+        """
+
+        self.check_clock_shift(8)
+
+
+    def test_clock_shift_with_64_threads(self):
+        """
+        Method that checks clock shift recovery with 64 threads.
+
+        """
+
+        self.check_clock_shift(64)
+
+
+    def check_clock_shift(self, number_threads : int):
+        """
+        Method that has a number of threads call a shared API instance,
+        shifting the stand-in server clock half way through, and checks that
+        every call succeeds after exactly one time delta request.
+
+        :param number_threads:
+            The number of threads.
+
+        :type number_threads: int
+
+        """
+
+        secret = base64.b64encode(stand_in_server.CUSTOMER_SECRET)
+        with stand_in_server.StandInServer(
+                response_delay = RESPONSE_DELAY
+            ) as server:
+            api = speedsentry.SpeedSentry(
+                stand_in_server.CUSTOMER_IDENTIFIER,
+                secret.decode('utf-8'),
+                authority = server.authority,
+                maximum_connections_per_host = number_threads,
+                coalesce_requests = False
+            )
+
+            with api:
+                api.capabilities_get()
+                starting_time_deltas = server.time_delta_count
+
+                barrier = threading.Barrier(number_threads)
+                errors = list()
+
+                def worker():
+                    try:
+                        for round_index in range(NUMBER_ROUNDS):
+                            if round_index == NUMBER_ROUNDS // 2:
+                                if barrier.wait() == 0:
+                                    server.time_skew += CLOCK_SHIFT
+
+                                barrier.wait()
+
+                            status = api.status_list()
+                            if status.get(1) != "working":
+                                errors.append("unexpected result")
+                    except Exception as e:
+                        errors.append(repr(e))
+                        barrier.abort()
+
+                threads = [
+                    threading.Thread(target = worker)
+                    for i in range(number_threads)
+                ]
+                for thread in threads:
+                    thread.start()
+
+                for thread in threads:
+                    thread.join()
+
+                self.assertEqual(errors, [])
+                self.assertEqual(
+                    server.time_delta_count - starting_time_deltas,
+                    1
+                )
+
+###############################################################################
+# Main:
+#
+
+if __name__ == "__main__":
+    unittest.main()